@@ -9,23 +9,595 @@ import asyncio
 import argparse
 import logging
 import json
+import os
+import queue
 from datetime import datetime, timedelta
 from flask import Flask, jsonify, request
 from flask_cors import CORS
 import threading
 import time
+import heapq
+import itertools
+import random
+import sqlite3
+import uuid
+from collections import Counter, OrderedDict
 import requests
 
+# Lower rank runs first
+PRIORITY_RANKS = {'urgent': 0, 'high': 1, 'normal': 2, 'low': 3}
+
+# Workflow state lives under WORKFLOW_DATA_DIR, else the framework's data directory
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+
+def default_state_db_path():
+    return os.path.join(os.getenv('WORKFLOW_DATA_DIR', DEFAULT_DATA_DIR), 'workflow_state.db')
+
+
+def default_stage_concurrency():
+    """Concurrent stage calls when none is configured
+    
+    Stage calls mostly wait on other agents, so allow many in flight: an
+    eighth of the process thread limit, between 32 and 1024.
+    """
+    try:
+        import resource
+        limit, _ = resource.getrlimit(resource.RLIMIT_NPROC)
+    except (ImportError, ValueError, OSError):
+        return 256
+    if limit == resource.RLIM_INFINITY:
+        return 1024
+    return max(32, min(1024, limit // 8))
+
+
+class WorkflowExecutor:
+    """Runs workflow stage DAGs on a bounded pool of worker threads
+    
+    Each template is compiled once into a stage dependency graph. Stages whose
+    dependencies are satisfied go on a priority heap keyed by workflow
+    priority, then submission order; up to ``max_workers`` threads, started as
+    load requires, take them off the heap and make the blocking stage call
+    themselves, so a stage costs a heap push and pop rather than an event-loop
+    round trip. One timer thread enforces per-stage timeouts and retry
+    backoff. A finished stage immediately releases its dependents, so there
+    are no fixed pauses and no thread per workflow.
+    """
+    
+    def __init__(self, stage_runner, on_stage_result, on_workflow_finished,
+                 max_workers=None, default_retries=2, retry_backoff=0.5):
+        """
+        Args:
+            stage_runner: ``fn(workflow_id, stage) -> result dict`` with a
+                ``success`` flag; blocking calls are fine
+            on_stage_result: ``fn(workflow_id, stage_index, stage, result, attempts)``
+                called once per stage with its final result
+            on_workflow_finished: ``fn(workflow_id, status)`` with status
+                ``completed`` or ``failed``
+            max_workers: Stages executing concurrently across all workflows;
+                defaults to ``default_stage_concurrency()``
+            default_retries: Retries for stages without their own ``retries``
+            retry_backoff: Base delay in seconds, doubled per attempt
+        """
+        self.stage_runner = stage_runner
+        self.on_stage_result = on_stage_result
+        self.on_workflow_finished = on_workflow_finished
+        self.max_workers = max_workers or default_stage_concurrency()
+        self.default_retries = default_retries
+        self.retry_backoff = retry_backoff
+        
+        self._compiled = {}
+        self._runs = {}
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        
+        # Ready stages and the worker threads that run them
+        self._ready = []
+        self._ready_tokens = queue.SimpleQueue()
+        self._idle_workers = threading.Semaphore(0)
+        self._spawn_lock = threading.Lock()
+        self._workers = 0
+        
+        # Timeouts and retry delays as [due, sequence, callback, args];
+        # cancelled entries have callback None and are pruned lazily
+        self._timers = []
+        self._timers_changed = threading.Condition(threading.Lock())
+        self._cancelled_timers = 0
+        self._timer_thread = None
+        
+        self.metrics = {
+            'workflows_submitted': 0,
+            'stages_executed': 0,
+            'stage_retries': 0,
+            'stage_timeouts': 0
+        }
+    
+    @staticmethod
+    def compile_template(template):
+        """Build the stage dependency graph for a template
+        
+        A stage runs after the stages listed in its ``depends_on`` (indices into
+        ``stages``); without ``depends_on`` it follows the previous stage, which
+        keeps plain templates sequential.
+        """
+        stages = template['stages']
+        dependents = [[] for _ in stages]
+        indegree = [0] * len(stages)
+        
+        for index, stage in enumerate(stages):
+            depends_on = stage.get('depends_on', [index - 1] if index > 0 else [])
+            for dependency in depends_on:
+                if not 0 <= dependency < len(stages) or dependency == index:
+                    raise ValueError(f"Stage {index} has invalid dependency {dependency}")
+                dependents[dependency].append(index)
+                indegree[index] += 1
+        
+        # Kahn's algorithm to reject cycles
+        remaining = list(indegree)
+        ready = [i for i, degree in enumerate(remaining) if degree == 0]
+        visited = 0
+        while ready:
+            node = ready.pop()
+            visited += 1
+            for dependent in dependents[node]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+        if visited != len(stages):
+            raise ValueError("Workflow template has a dependency cycle")
+        
+        return {'stages': stages, 'dependents': dependents, 'indegree': indegree}
+    
+    def start(self):
+        """Start the timer thread (idempotent); workers start as stages arrive"""
+        with self._timers_changed:
+            if self._timer_thread is None:
+                self._timer_thread = threading.Thread(target=self._run_timers, daemon=True,
+                                                      name='workflow-timers')
+                self._timer_thread.start()
+    
+    def submit(self, workflow_id, template_key, template, priority='normal'):
+        """Queue a workflow's root stages; safe to call from any thread"""
+        if template_key not in self._compiled:
+            self._compiled[template_key] = self.compile_template(template)
+        compiled = self._compiled[template_key]
+        
+        run = {
+            'workflow_id': workflow_id,
+            'compiled': compiled,
+            'rank': PRIORITY_RANKS.get(priority, PRIORITY_RANKS['normal']),
+            'sequence': next(self._sequence),
+            'remaining_dependencies': list(compiled['indegree']),
+            'attempts': [0] * len(compiled['stages']),
+            'pending': len(compiled['stages']),
+            'finished': False,
+            'lock': threading.RLock(),
+            'done': threading.Event()
+        }
+        with self._lock:
+            self._runs[workflow_id] = run
+            self.metrics['workflows_submitted'] += 1
+        
+        self.start()
+        if run['pending'] == 0:
+            self._finish(run, 'completed')
+            return
+        # Roots come from the compiled graph: workers may already be releasing
+        # dependents in run['remaining_dependencies']
+        for index, degree in enumerate(compiled['indegree']):
+            if degree == 0:
+                self._enqueue(run, index)
+    
+    def _enqueue(self, run, stage_index):
+        # Within a priority, stages of older workflows go first so runs finish
+        # in submission order instead of interleaving. heapq runs in C on
+        # integer keys, so the push and the workers' pops are atomic under
+        # the GIL; each stage puts one token that a worker takes before popping
+        heapq.heappush(self._ready, (run['rank'], run['sequence'], stage_index, run))
+        self._ready_tokens.put(None)
+        if self._idle_workers.acquire(blocking=False) or self._workers >= self.max_workers:
+            return
+        with self._spawn_lock:
+            if self._workers < self.max_workers:
+                self._workers += 1
+                threading.Thread(target=self._worker, daemon=True,
+                                 name=f"workflow-stage-{self._workers}").start()
+    
+    def _worker(self):
+        while True:
+            try:
+                self._ready_tokens.get_nowait()
+            except queue.Empty:
+                # Only a worker about to block counts as idle
+                self._idle_workers.release()
+                self._ready_tokens.get()
+            _, _, stage_index, run = heapq.heappop(self._ready)
+            try:
+                if not run['finished']:
+                    self._run_stage(run, stage_index)
+            except Exception as e:
+                logging.getLogger(__name__).error(f"Stage execution error in {run['workflow_id']}: {e}")
+                self._finish(run, 'failed')
+    
+    def _run_stage(self, run, stage_index):
+        stage = run['compiled']['stages'][stage_index]
+        timeout = stage.get('timeout')
+        with run['lock']:
+            run['attempts'][stage_index] += 1
+            attempt = {'stage_index': stage_index, 'number': run['attempts'][stage_index],
+                       'state': 'running', 'timer': None}
+            if timeout is not None:
+                attempt['timer'] = self._call_later(timeout, self._time_out, run, attempt, timeout)
+        
+        try:
+            result = self.stage_runner(run['workflow_id'], stage)
+        except Exception as e:
+            result = {'success': False, 'error': str(e)}
+        
+        with run['lock']:
+            state, attempt['state'] = attempt['state'], 'returned'
+            if state == 'running':
+                self._cancel_timer(attempt['timer'])
+            elif state == 'abandoned':
+                # Timed out with retries left: a late success is kept, and a
+                # retry only starts now, never alongside this attempt
+                if not result.get('success'):
+                    result = {**result, 'error': f"Stage timed out after {timeout}s", 'retry_recommended': True}
+            else:
+                # Timed out for good; the workflow has already failed
+                return
+            self._complete_stage(run, stage_index, result, attempt['number'])
+    
+    def _time_out(self, run, attempt, timeout):
+        """Timer callback for a stage attempt still running after ``timeout``"""
+        with run['lock']:
+            if attempt['state'] != 'running':
+                return
+            with self._lock:
+                self.metrics['stage_timeouts'] += 1
+            stage_index = attempt['stage_index']
+            retries = run['compiled']['stages'][stage_index].get('retries', self.default_retries)
+            if attempt['number'] <= retries:
+                # The stage thread cannot be interrupted; decide when it returns
+                attempt['state'] = 'abandoned'
+                return
+            attempt['state'] = 'failed'
+            self._complete_stage(run, stage_index, {'success': False, 'error': f"Stage timed out after {timeout}s"},
+                                 attempt['number'])
+    
+    def _complete_stage(self, run, stage_index, result, attempts):
+        """Retry, fail or release dependents for a stage attempt's result
+        
+        Only timeouts and failures marked ``retry_recommended`` are retried.
+        Called with ``run['lock']`` held.
+        """
+        if run['finished']:
+            return
+        stage = run['compiled']['stages'][stage_index]
+        retries = stage.get('retries', self.default_retries)
+        with self._lock:
+            self.metrics['stages_executed'] += 1
+        
+        if not result.get('success') and result.get('retry_recommended', False) and attempts <= retries:
+            # Re-queue after a backoff without holding a worker
+            with self._lock:
+                self.metrics['stage_retries'] += 1
+            delay = self.retry_backoff * (2 ** (attempts - 1))
+            self._call_later(delay, self._enqueue, run, stage_index)
+            return
+        
+        self.on_stage_result(run['workflow_id'], stage_index, stage, result, attempts)
+        
+        if not result.get('success'):
+            self._finish(run, 'failed')
+            return
+        
+        run['pending'] -= 1
+        if run['pending'] == 0:
+            self._finish(run, 'completed')
+            return
+        for dependent in run['compiled']['dependents'][stage_index]:
+            run['remaining_dependencies'][dependent] -= 1
+            if run['remaining_dependencies'][dependent] == 0:
+                self._enqueue(run, dependent)
+    
+    def _finish(self, run, status):
+        with run['lock']:
+            if run['finished']:
+                return
+            run['finished'] = True
+            with self._lock:
+                self._runs.pop(run['workflow_id'], None)
+            try:
+                self.on_workflow_finished(run['workflow_id'], status)
+            finally:
+                run['done'].set()
+    
+    def _call_later(self, delay, callback, *args):
+        entry = [time.monotonic() + delay, next(self._sequence), callback, args]
+        with self._timers_changed:
+            heapq.heappush(self._timers, entry)
+            if self._timers[0] is entry:
+                self._timers_changed.notify()
+        return entry
+    
+    def _cancel_timer(self, entry):
+        if entry is None:
+            return
+        with self._timers_changed:
+            if entry[2] is None:
+                return
+            entry[2] = entry[3] = None
+            self._cancelled_timers += 1
+            # Long stage timeouts would otherwise keep every finished stage's
+            # entry on the heap until it came due
+            if self._cancelled_timers > 64 and self._cancelled_timers * 2 > len(self._timers):
+                self._timers = [timer for timer in self._timers if timer[2] is not None]
+                heapq.heapify(self._timers)
+                self._cancelled_timers = 0
+    
+    def _run_timers(self):
+        while True:
+            with self._timers_changed:
+                while True:
+                    while self._timers and self._timers[0][2] is None:
+                        heapq.heappop(self._timers)
+                        self._cancelled_timers -= 1
+                    if not self._timers:
+                        self._timers_changed.wait()
+                        continue
+                    delay = self._timers[0][0] - time.monotonic()
+                    if delay <= 0:
+                        break
+                    self._timers_changed.wait(delay)
+                _, _, callback, args = heapq.heappop(self._timers)
+            try:
+                callback(*args)
+            except Exception as e:
+                logging.getLogger(__name__).error(f"Workflow timer error: {e}")
+    
+    def wait(self, workflow_id, timeout=None):
+        """Block until a submitted workflow finishes; True if it is no longer running"""
+        run = self._runs.get(workflow_id)
+        return run is None or run['done'].wait(timeout)
+    
+    def get_metrics(self):
+        """Executor counters plus current queue depth, workers and active workflows"""
+        with self._lock:
+            metrics = dict(self.metrics)
+        return {
+            **metrics,
+            'queue_depth': len(self._ready),
+            'active_workflows': len(self._runs),
+            'workers': self._workers,
+            'max_workers': self.max_workers
+        }
+
+
+class WorkflowStateStore:
+    """Compact, durable workflow state with hot/cold tiering
+    
+    Records hold the template by workflow type, stage outcomes without their
+    payloads and an interaction count; the interactions themselves go to an
+    append-only log table. Running workflows and the most recently finished
+    ones stay in memory, everything is persisted to SQLite, and finished
+    workflows beyond ``hot_limit`` are dropped from memory and served from the
+    database. Status counts are maintained incrementally and analytics use
+    indexed queries.
+    """
+    
+    FINISHED_STATUSES = ('completed', 'failed', 'interrupted')
+    
+    def __init__(self, db_path=None, hot_limit=1000, interaction_flush_size=500):
+        db_path = db_path or default_state_db_path()
+        if db_path != ':memory:' and os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.db_path = db_path
+        self.hot_limit = hot_limit
+        self.interaction_flush_size = interaction_flush_size
+        self._hot = {}
+        self._finished_hot = OrderedDict()
+        self._pending_interactions = []
+        self._lock = threading.RLock()
+        
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self.init_database()
+        
+        # Workflows still running when the process stopped cannot be resumed
+        self._conn.execute(
+            "UPDATE workflows SET status = 'interrupted' WHERE status IN ('initiated', 'running')"
+        )
+        self._conn.commit()
+        self._status_counts = Counter(dict(
+            self._conn.execute('SELECT status, COUNT(*) FROM workflows GROUP BY status').fetchall()
+        ))
+    
+    def init_database(self):
+        """Create workflow tables and indexes"""
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS workflows (
+                id TEXT PRIMARY KEY,
+                type TEXT NOT NULL,
+                status TEXT NOT NULL,
+                priority TEXT,
+                start_time TEXT NOT NULL,
+                completion_time TEXT,
+                duration_hours REAL,
+                record TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_workflows_status_start ON workflows (status, start_time);
+            CREATE INDEX IF NOT EXISTS idx_workflows_start ON workflows (start_time);
+            CREATE INDEX IF NOT EXISTS idx_workflows_type_status ON workflows (type, status);
+            
+            CREATE TABLE IF NOT EXISTS workflow_interactions (
+                workflow_id TEXT NOT NULL,
+                sequence INTEGER NOT NULL,
+                agent TEXT,
+                action TEXT,
+                timestamp TEXT,
+                success INTEGER,
+                result TEXT,
+                PRIMARY KEY (workflow_id, sequence)
+            );
+        ''')
+    
+    @staticmethod
+    def new_workflow_id(workflow_type):
+        """Collision-free workflow ID"""
+        return f"WF_{workflow_type}_{uuid.uuid4().hex}"
+    
+    def add(self, record):
+        """Register a new workflow record and persist it"""
+        with self._lock:
+            self._hot[record['id']] = record
+            self._status_counts[record['status']] += 1
+            self._write_record(record)
+            self._conn.commit()
+    
+    def get(self, workflow_id):
+        """Workflow record from memory, falling back to the database"""
+        record = self._hot.get(workflow_id)
+        if record is not None:
+            return record
+        with self._lock:
+            row = self._conn.execute('SELECT record FROM workflows WHERE id = ?', (workflow_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def get_status(self, workflow_id):
+        """Status of a workflow, or None if unknown"""
+        record = self._hot.get(workflow_id)
+        if record is not None:
+            return record['status']
+        with self._lock:
+            row = self._conn.execute('SELECT status FROM workflows WHERE id = ?', (workflow_id,)).fetchone()
+        return row[0] if row else None
+    
+    def __contains__(self, workflow_id):
+        return self.get_status(workflow_id) is not None
+    
+    def set_status(self, workflow_id, status):
+        """Move a hot workflow to a new status"""
+        with self._lock:
+            record = self._hot[workflow_id]
+            self._status_counts[record['status']] -= 1
+            self._status_counts[status] += 1
+            record['status'] = status
+    
+    def status_counts(self):
+        """Number of workflows per status across both tiers"""
+        with self._lock:
+            return {status: count for status, count in self._status_counts.items() if count > 0}
+    
+    def running(self):
+        """Records of workflows that are still running"""
+        with self._lock:
+            return [r for r in self._hot.values() if r['status'] == 'running']
+    
+    def append_interaction(self, workflow_id, interaction):
+        """Append an agent interaction to the workflow's log"""
+        with self._lock:
+            record = self._hot[workflow_id]
+            record['interactions_count'] += 1
+            record['last_activity'] = interaction['timestamp']
+            result = interaction.get('result', {})
+            self._pending_interactions.append((
+                workflow_id, record['interactions_count'], interaction['agent'], interaction['action'],
+                interaction['timestamp'], int(bool(result.get('success'))), json.dumps(result, default=str)
+            ))
+            if len(self._pending_interactions) >= self.interaction_flush_size:
+                self._flush_interactions()
+                self._conn.commit()
+    
+    def get_interactions(self, workflow_id):
+        """Full interaction log of a workflow, oldest first"""
+        with self._lock:
+            self._flush_interactions()
+            rows = self._conn.execute(
+                '''SELECT agent, action, timestamp, result FROM workflow_interactions
+                   WHERE workflow_id = ? ORDER BY sequence''', (workflow_id,)
+            ).fetchall()
+        return [
+            {'agent': agent, 'action': action, 'timestamp': timestamp, 'result': json.loads(result)}
+            for agent, action, timestamp, result in rows
+        ]
+    
+    def finish(self, workflow_id, status, completion_time):
+        """Persist a finished workflow and evict old finished ones from memory"""
+        with self._lock:
+            self.set_status(workflow_id, status)
+            record = self._hot[workflow_id]
+            record['completion_time'] = completion_time
+            self._flush_interactions()
+            self._write_record(record)
+            self._conn.commit()
+            
+            self._finished_hot[workflow_id] = None
+            while len(self._finished_hot) > self.hot_limit:
+                evicted, _ = self._finished_hot.popitem(last=False)
+                self._hot.pop(evicted, None)
+    
+    def query_statistics(self, since=None):
+        """Status counts and completion durations for workflows started after ``since``"""
+        where, params = ('WHERE start_time >= ?', (since,)) if since else ('', ())
+        with self._lock:
+            counts = dict(self._conn.execute(
+                f'SELECT status, COUNT(*) FROM workflows {where} GROUP BY status', params
+            ).fetchall())
+            durations = self._conn.execute(
+                f'''SELECT AVG(duration_hours), MIN(duration_hours), MAX(duration_hours) FROM workflows
+                    WHERE status = 'completed' {"AND start_time >= ?" if since else ""}''', params
+            ).fetchone()
+        return {
+            'status_counts': counts,
+            'average_duration_hours': durations[0],
+            'fastest_duration_hours': durations[1],
+            'slowest_duration_hours': durations[2]
+        }
+    
+    def hot_size(self):
+        return len(self._hot)
+    
+    def close(self):
+        with self._lock:
+            self._flush_interactions()
+            self._conn.commit()
+            self._conn.close()
+    
+    def _flush_interactions(self):
+        if self._pending_interactions:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO workflow_interactions VALUES (?, ?, ?, ?, ?, ?, ?)',
+                self._pending_interactions
+            )
+            self._pending_interactions = []
+    
+    def _write_record(self, record):
+        duration = None
+        if record.get('completion_time'):
+            start = datetime.fromisoformat(record['start_time'])
+            duration = (datetime.fromisoformat(record['completion_time']) - start).total_seconds() / 3600
+        self._conn.execute(
+            '''INSERT OR REPLACE INTO workflows
+               (id, type, status, priority, start_time, completion_time, duration_hours, record)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
+            (record['id'], record['type'], record['status'], record['priority'], record['start_time'],
+             record.get('completion_time'), duration, json.dumps(record, default=str))
+        )
+
+
 class WorkflowOrchestrationAgent:
     """Advanced workflow orchestration and coordination agent"""
     
-    def __init__(self, port=8007):
+    def __init__(self, port=8007, max_concurrent_stages=None, state_db_path=None,
+                 hot_workflow_limit=1000):
         self.port = port
         self.app = Flask(__name__)
         CORS(self.app)
         self.setup_logging()
         self.setup_routes()
-        self.active_workflows = {}
+        self.workflow_store = WorkflowStateStore(state_db_path, hot_limit=hot_workflow_limit)
         self.agent_registry = self.initialize_agent_registry()
         self.workflow_templates = self.load_workflow_templates()
         self.orchestration_metrics = {
@@ -36,6 +608,12 @@ class WorkflowOrchestrationAgent:
             'agent_coordination_score': 0.94,
             'last_orchestration': None
         }
+        self.workflow_executor = WorkflowExecutor(
+            stage_runner=self.execute_workflow_stage,
+            on_stage_result=self.record_stage_result,
+            on_workflow_finished=self.finish_workflow,
+            max_workers=max_concurrent_stages
+        )
         
     def setup_logging(self):
         """Configure logging for the agent"""
@@ -87,13 +665,18 @@ class WorkflowOrchestrationAgent:
         }
         
     def load_workflow_templates(self):
-        """Load workflow templates for different processes"""
+        """Load workflow templates for different processes
+        
+        Stages follow the previous stage unless they list ``depends_on`` stage
+        indices; stages with satisfied dependencies run in parallel. Optional
+        ``retries`` overrides the executor's default retry count.
+        """
         return {
             'manuscript_submission': {
                 'stages': [
                     {'agent': 'manuscript_analysis', 'action': 'initial_analysis', 'timeout': 3600},
-                    {'agent': 'quality_assurance', 'action': 'submission_validation', 'timeout': 1800},
-                    {'agent': 'research_discovery', 'action': 'relevance_check', 'timeout': 2400}
+                    {'agent': 'quality_assurance', 'action': 'submission_validation', 'timeout': 1800, 'depends_on': [0]},
+                    {'agent': 'research_discovery', 'action': 'relevance_check', 'timeout': 2400, 'depends_on': [0]}
                 ],
                 'estimated_duration': 2,  # hours
                 'success_criteria': ['analysis_complete', 'validation_passed', 'relevance_confirmed']
@@ -138,6 +721,7 @@ class WorkflowOrchestrationAgent:
                 'port': self.port,
                 'timestamp': datetime.now().isoformat(),
                 'metrics': self.orchestration_metrics,
+                'executor': self.workflow_executor.get_metrics(),
                 'agent_registry': self.agent_registry
             })
             
@@ -168,10 +752,9 @@ class WorkflowOrchestrationAgent:
         def get_workflow_status(workflow_id):
             """Get status of a specific workflow"""
             try:
-                if workflow_id not in self.active_workflows:
-                    return jsonify({'status': 'error', 'message': 'Workflow not found'}), 404
-                
                 workflow_status = self.get_workflow_details(workflow_id)
+                if workflow_status is None:
+                    return jsonify({'status': 'error', 'message': 'Workflow not found'}), 404
                 
                 return jsonify({
                     'status': 'success',
@@ -238,100 +821,86 @@ class WorkflowOrchestrationAgent:
                 
     def initiate_workflow(self, workflow_type, workflow_data, priority):
         """Initiate a new workflow process"""
-        workflow_id = f"WF_{workflow_type}_{int(time.time())}"
+        if workflow_type not in self.workflow_templates:
+            raise ValueError(f"Unknown workflow type: {workflow_type}")
         
+        workflow_id = self.register_workflow(workflow_type, workflow_data, priority)
         self.logger.info(f"Initiating workflow {workflow_id} of type {workflow_type}")
         
-        if workflow_type not in self.workflow_templates:
-            raise ValueError(f"Unknown workflow type: {workflow_type}")
+        # Queue root stages on the shared executor
+        self.workflow_store.set_status(workflow_id, 'running')
+        self.workflow_executor.submit(workflow_id, workflow_type, self.workflow_templates[workflow_type], priority)
+        
+        return workflow_id
         
+    def register_workflow(self, workflow_type, workflow_data, priority):
+        """Create the compact state record for a new workflow"""
+        workflow_id = self.workflow_store.new_workflow_id(workflow_type)
         template = self.workflow_templates[workflow_type]
+        start_time = datetime.now()
         
-        workflow = {
+        # The template is referenced by type; interactions live in the store's log
+        self.workflow_store.add({
             'id': workflow_id,
             'type': workflow_type,
             'status': 'initiated',
             'priority': priority,
             'data': workflow_data,
-            'template': template,
             'current_stage': 0,
+            'total_stages': len(template['stages']),
             'stages_completed': [],
             'stages_failed': [],
-            'start_time': datetime.now().isoformat(),
-            'estimated_completion': (datetime.now() + timedelta(days=template['estimated_duration'])).isoformat(),
+            'start_time': start_time.isoformat(),
+            'estimated_completion': (start_time + timedelta(days=template['estimated_duration'])).isoformat(),
+            'completion_time': None,
             'progress_percentage': 0,
-            'agent_interactions': [],
-            'issues': [],
-            'metadata': {
-                'created_by': 'workflow_orchestration_agent',
-                'priority_level': priority,
-                'estimated_duration': template['estimated_duration']
-            }
-        }
-        
-        self.active_workflows[workflow_id] = workflow
-        
-        # Start workflow execution in background
-        threading.Thread(target=self.execute_workflow, args=(workflow_id,), daemon=True).start()
-        
+            'interactions_count': 0,
+            'last_activity': start_time.isoformat(),
+            'issues': []
+        })
         return workflow_id
         
-    def execute_workflow(self, workflow_id):
-        """Execute workflow stages sequentially"""
-        workflow = self.active_workflows[workflow_id]
+    def execute_workflow(self, workflow_id, timeout=None):
+        """Run a registered workflow on the executor and wait for it to finish"""
+        workflow = self.workflow_store.get(workflow_id)
+        self.workflow_store.set_status(workflow_id, 'running')
+        self.workflow_executor.submit(workflow_id, workflow['type'], self.workflow_templates[workflow['type']],
+                                      workflow['priority'])
+        self.workflow_executor.wait(workflow_id, timeout)
         
-        try:
-            workflow['status'] = 'running'
-            
-            for stage_index, stage in enumerate(workflow['template']['stages']):
-                workflow['current_stage'] = stage_index
-                
-                self.logger.info(f"Executing stage {stage_index + 1} of workflow {workflow_id}: {stage['action']}")
-                
-                # Execute stage
-                stage_result = self.execute_workflow_stage(workflow_id, stage)
-                
-                if stage_result['success']:
-                    workflow['stages_completed'].append({
-                        'stage_index': stage_index,
-                        'stage': stage,
-                        'result': stage_result,
-                        'completion_time': datetime.now().isoformat()
-                    })
-                    
-                    # Update progress
-                    workflow['progress_percentage'] = ((stage_index + 1) / len(workflow['template']['stages'])) * 100
-                    
-                else:
-                    workflow['stages_failed'].append({
-                        'stage_index': stage_index,
-                        'stage': stage,
-                        'error': stage_result.get('error', 'Unknown error'),
-                        'failure_time': datetime.now().isoformat()
-                    })
-                    
-                    workflow['status'] = 'failed'
-                    workflow['completion_time'] = datetime.now().isoformat()
-                    self.orchestration_metrics['failed_workflows'] += 1
-                    return
-                
-                # Brief pause between stages
-                time.sleep(2)
+    def record_stage_result(self, workflow_id, stage_index, stage, result, attempts):
+        """Record the final outcome of a stage reported by the executor"""
+        workflow = self.workflow_store.get(workflow_id)
+        workflow['current_stage'] = stage_index
+        
+        if result['success']:
+            workflow['stages_completed'].append({
+                'stage_index': stage_index,
+                'attempts': attempts,
+                'completion_time': datetime.now().isoformat()
+            })
             
-            # Workflow completed successfully
-            workflow['status'] = 'completed'
-            workflow['completion_time'] = datetime.now().isoformat()
-            workflow['progress_percentage'] = 100
+            # Update progress
+            workflow['progress_percentage'] = (len(workflow['stages_completed']) / workflow['total_stages']) * 100
+        else:
+            workflow['stages_failed'].append({
+                'stage_index': stage_index,
+                'error': result.get('error', 'Unknown error'),
+                'attempts': attempts,
+                'failure_time': datetime.now().isoformat()
+            })
             
+    def finish_workflow(self, workflow_id, status):
+        """Mark a workflow completed or failed once the executor is done with it"""
+        if status == 'completed':
+            self.workflow_store.get(workflow_id)['progress_percentage'] = 100
             self.orchestration_metrics['successful_completions'] += 1
             self.logger.info(f"Workflow {workflow_id} completed successfully")
-            
-        except Exception as e:
-            self.logger.error(f"Workflow execution error for {workflow_id}: {e}")
-            workflow['status'] = 'error'
-            workflow['error'] = str(e)
-            workflow['completion_time'] = datetime.now().isoformat()
+        else:
             self.orchestration_metrics['failed_workflows'] += 1
+            self.logger.warning(f"Workflow {workflow_id} failed")
+        
+        self.workflow_store.finish(workflow_id, status, datetime.now().isoformat())
             
     def execute_workflow_stage(self, workflow_id, stage):
         """Execute a single workflow stage"""
@@ -350,7 +919,7 @@ class WorkflowOrchestrationAgent:
             interaction_result = self.simulate_agent_interaction(agent_name, action, timeout)
             
             # Record interaction
-            self.active_workflows[workflow_id]['agent_interactions'].append({
+            self.workflow_store.append_interaction(workflow_id, {
                 'agent': agent_name,
                 'action': action,
                 'timestamp': datetime.now().isoformat(),
@@ -371,7 +940,6 @@ class WorkflowOrchestrationAgent:
         time.sleep(1)
         
         # Simulate successful interaction (95% success rate)
-        import random
         if random.random() < 0.95:
             return {
                 'success': True,
@@ -392,13 +960,12 @@ class WorkflowOrchestrationAgent:
             
     def get_workflow_details(self, workflow_id):
         """Get detailed information about a workflow"""
-        if workflow_id not in self.active_workflows:
+        workflow = self.workflow_store.get(workflow_id)
+        if workflow is None:
             return None
         
-        workflow = self.active_workflows[workflow_id]
-        
         # Calculate additional metrics
-        if workflow['status'] in ['completed', 'failed']:
+        if workflow['completion_time']:
             start_time = datetime.fromisoformat(workflow['start_time'])
             completion_time = datetime.fromisoformat(workflow['completion_time'])
             actual_duration = (completion_time - start_time).total_seconds() / 3600  # hours
@@ -412,15 +979,15 @@ class WorkflowOrchestrationAgent:
             'priority': workflow['priority'],
             'progress_percentage': workflow['progress_percentage'],
             'current_stage': workflow['current_stage'],
-            'total_stages': len(workflow['template']['stages']),
+            'total_stages': workflow['total_stages'],
             'stages_completed': len(workflow['stages_completed']),
             'stages_failed': len(workflow['stages_failed']),
             'start_time': workflow['start_time'],
             'estimated_completion': workflow['estimated_completion'],
             'actual_duration_hours': actual_duration,
-            'agent_interactions_count': len(workflow['agent_interactions']),
+            'agent_interactions_count': workflow['interactions_count'],
             'issues_count': len(workflow['issues']),
-            'last_activity': workflow['agent_interactions'][-1]['timestamp'] if workflow['agent_interactions'] else workflow['start_time']
+            'last_activity': workflow['last_activity']
         }
         
     def coordinate_agents(self, coordination_request):
@@ -453,19 +1020,27 @@ class WorkflowOrchestrationAgent:
         
     def calculate_workflow_analytics(self, time_period):
         """Calculate workflow analytics and performance metrics"""
+        statistics = self.workflow_store.query_statistics(self.parse_time_period(time_period))
+        counts = statistics['status_counts']
+        completed = counts.get('completed', 0)
+        failed = counts.get('failed', 0)
+        
+        def in_days(hours):
+            return round(hours / 24, 4) if hours is not None else None
+        
         analytics = {
             'time_period': time_period,
             'workflow_statistics': {
-                'total_workflows': len(self.active_workflows),
-                'completed_workflows': sum(1 for w in self.active_workflows.values() if w['status'] == 'completed'),
-                'failed_workflows': sum(1 for w in self.active_workflows.values() if w['status'] == 'failed'),
-                'running_workflows': sum(1 for w in self.active_workflows.values() if w['status'] == 'running'),
-                'success_rate': 0.94
+                'total_workflows': sum(counts.values()),
+                'completed_workflows': completed,
+                'failed_workflows': failed,
+                'running_workflows': counts.get('running', 0),
+                'success_rate': round(completed / (completed + failed), 4) if completed + failed else None
             },
             'performance_metrics': {
-                'average_completion_time': 5.2,  # days
-                'fastest_completion': 2.1,  # days
-                'slowest_completion': 12.8,  # days
+                'average_completion_time': in_days(statistics['average_duration_hours']),  # days
+                'fastest_completion': in_days(statistics['fastest_duration_hours']),  # days
+                'slowest_completion': in_days(statistics['slowest_duration_hours']),  # days
                 'efficiency_score': 0.91,
                 'bottleneck_stages': ['peer_review_process']
             },
@@ -485,6 +1060,15 @@ class WorkflowOrchestrationAgent:
         
         return analytics
         
+    @staticmethod
+    def parse_time_period(time_period):
+        """ISO cutoff for periods like ``24h``, ``30d`` or ``4w``; None for ``all`` or unknown"""
+        units = {'h': 'hours', 'd': 'days', 'w': 'weeks'}
+        if not time_period or time_period[-1] not in units or not time_period[:-1].isdigit():
+            return None
+        delta = timedelta(**{units[time_period[-1]]: int(time_period[:-1])})
+        return (datetime.now() - delta).isoformat()
+        
     def check_agent_health(self):
         """Check health status of all registered agents"""
         health_status = {
@@ -497,7 +1081,6 @@ class WorkflowOrchestrationAgent:
         
         for agent_name, agent_info in self.agent_registry.items():
             # Simulate health check (in real implementation, would make HTTP request)
-            import random
             if random.random() < 0.9:  # 90% chance of being healthy
                 status = 'healthy'
                 health_status['agents_online'] += 1
@@ -552,20 +1135,20 @@ class WorkflowOrchestrationAgent:
         """Monitor active workflows for issues"""
         current_time = datetime.now()
         
-        for workflow_id, workflow in self.active_workflows.items():
-            if workflow['status'] == 'running':
-                start_time = datetime.fromisoformat(workflow['start_time'])
-                estimated_completion = datetime.fromisoformat(workflow['estimated_completion'])
+        for workflow in self.workflow_store.running():
+            workflow_id = workflow['id']
+            start_time = datetime.fromisoformat(workflow['start_time'])
+            estimated_completion = datetime.fromisoformat(workflow['estimated_completion'])
+            
+            # Check for overdue workflows
+            if current_time > estimated_completion:
+                self.logger.warning(f"Workflow {workflow_id} is overdue")
+                workflow['issues'].append({
+                    'type': 'overdue',
+                    'message': 'Workflow exceeded estimated completion time',
+                    'timestamp': current_time.isoformat()
+                })
                 
-                # Check for overdue workflows
-                if current_time > estimated_completion:
-                    self.logger.warning(f"Workflow {workflow_id} is overdue")
-                    workflow['issues'].append({
-                        'type': 'overdue',
-                        'message': 'Workflow exceeded estimated completion time',
-                        'timestamp': current_time.isoformat()
-                    })
-                    
     def start(self):
         """Start the workflow orchestration agent"""
         self.logger.info(f"Starting Workflow Orchestration Agent on port {self.port}")
@@ -582,10 +1165,13 @@ def main():
     parser = argparse.ArgumentParser(description='Workflow Orchestration Agent')
     parser.add_argument('--port', type=int, default=8007, help='Port to run the agent on')
     parser.add_argument('--agent', type=str, default='workflow_orchestration', help='Agent name')
+    parser.add_argument('--state-db', type=str, default=None,
+                        help='Workflow state database path (default: workflow_state.db under WORKFLOW_DATA_DIR '
+                             'or the framework data directory)')
     
     args = parser.parse_args()
     
-    agent = WorkflowOrchestrationAgent(port=args.port)
+    agent = WorkflowOrchestrationAgent(port=args.port, state_db_path=args.state_db)
     agent.start()
 
 if __name__ == '__main__':
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Bulk Delivery Benchmark
+Sends one bulk reviewer invitation through a local threaded SMTP sink, with
+the previous path (unbounded gather, a new SMTP connection per message opened
+on the event loop) and through the DeliveryPipeline with pooled connections.
+The sink can delay its greeting to stand in for TLS and login round-trips.
+"""
+
+import argparse
+import asyncio
+import os
+import smtplib
+import socketserver
+import sys
+import threading
+import time
+from email.mime.text import MIMEText
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from models.communication_automation import CommunicationAutomation, MessageType, Recipient
+
+
+class SinkHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP to accept messages and discard them"""
+
+    def reply(self, line: str):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        time.sleep(self.server.handshake_delay)
+        self.reply("220 sink ready")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line[:4].upper()
+            if command in (b'EHLO', b'HELO'):
+                self.reply("250 sink")
+            elif command == b'DATA':
+                self.reply("354 end with <CRLF>.<CRLF>")
+                while self.rfile.readline() not in (b'.\r\n', b''):
+                    pass
+                with self.server.lock:
+                    self.server.messages += 1
+                self.reply("250 queued")
+            elif command == b'QUIT':
+                self.reply("221 bye")
+                return
+            else:
+                self.reply("250 ok")
+
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, handshake_delay: float):
+        super().__init__(('127.0.0.1', 0), SinkHandler)
+        self.handshake_delay = handshake_delay
+        self.messages = 0
+        self.lock = threading.Lock()
+
+
+class LegacyAutomation(CommunicationAutomation):
+    """Previous behaviour: unbounded gather, blocking SMTP handshake per message"""
+
+    async def send_bulk_messages(self, template_id, recipients, context_data, priority=None):
+        return await asyncio.gather(*(self.send_message(template_id, recipient, context_data)
+                                      for recipient in recipients))
+
+    async def _send_via_smtp(self, message):
+        msg = MIMEText(message.body, 'plain')
+        msg['From'] = self.smtp_config['from_address']
+        msg['To'] = message.recipient.email
+        msg['Subject'] = message.subject
+        server = smtplib.SMTP(self.smtp_config['host'], self.smtp_config['port'])
+        server.sendmail(msg['From'], [msg['To']], msg.as_string())
+        server.quit()
+        return True
+
+
+def recipients(count: int):
+    return [Recipient(recipient_id=f"r{number}", name=f"Reviewer {number}", email=f"reviewer{number}@example.com",
+                      phone=None, preferred_communication=MessageType.EMAIL, timezone="UTC", language="en",
+                      role="reviewer", organization="Test University", communication_preferences={})
+            for number in range(count)]
+
+
+CONTEXT = {
+    'reviewer_name': 'Dr. Reviewer', 'manuscript_title': 'Emulsion Stability', 'authors': 'A. Author',
+    'journal_name': 'Journal of Cosmetic Science', 'submission_date': '2024-01-15', 'estimated_time': '14',
+    'expertise_areas': 'formulation', 'abstract': 'Abstract', 'response_deadline': '2024-02-01',
+    'review_link': 'https://example.com/review', 'editorial_team': 'Editorial Team',
+    'reviewer_availability': 'available'
+}
+
+
+async def run(automation: CommunicationAutomation, count: int):
+    lags = []
+    stop = asyncio.Event()
+
+    async def sample_lag():
+        while not stop.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.append((time.perf_counter() - started - 0.001) * 1000)
+
+    sampler = asyncio.create_task(sample_lag())
+    started = time.perf_counter()
+    messages = await automation.send_bulk_messages('reviewer_invitation', recipients(count), CONTEXT)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await sampler
+    sent = sum(1 for message in messages if message.sent_time)
+    return sent, elapsed, np.percentile(lags, 50), np.percentile(lags, 99), max(lags)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--recipients', type=int, default=1000)
+    parser.add_argument('--handshake-ms', type=float, default=20.0,
+                        help='delay before the sink greets a new connection')
+    parser.add_argument('--pool-size', type=int, default=4)
+    args = parser.parse_args()
+
+    sink = SMTPSink(args.handshake_ms / 1000)
+    threading.Thread(target=sink.serve_forever, daemon=True).start()
+    smtp_config = {'enabled': True, 'host': '127.0.0.1', 'port': sink.server_address[1], 'use_tls': False,
+                   'from_address': 'editor@example.com', 'pool_size': args.pool_size}
+    config = {'smtp': smtp_config, 'delivery': {'providers': {'smtp': {'concurrency': args.pool_size}}}}
+
+    print(f"{args.recipients} messages, {args.handshake_ms} ms connection handshake")
+    for label, automation in (("per-message SMTP", LegacyAutomation(config)),
+                              ("DeliveryPipeline", CommunicationAutomation(config))):
+        sent, elapsed, p50, p99, worst = await run(automation, args.recipients)
+        print(f"{label:17} {sent / elapsed:7.0f} msg/s   loop lag p50 {p50:6.1f} ms   "
+              f"p99 {p99:6.1f} ms   max {worst:6.1f} ms   ({sent} sent)")
+        if automation._smtp_pool is not None:
+            print(f"{'':17} {automation._smtp_pool.connections_opened} SMTP connections opened")
+        await automation.close()
+    sink.shutdown()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Embedding Service Benchmark
+Runs concurrent search_research calls while sampling event-loop lag, with
+query encoding inline on the loop (previous behaviour) and through the
+micro-batching EmbeddingService. Uses sentence-transformers when installed,
+otherwise a NumPy encoder with a fixed per-call overhead.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from models.embedding_service import EmbeddingService
+from models.research_vector_db import VECTOR_BACKEND_AVAILABLE, ResearchQuery, ResearchVectorDB
+
+
+class NumpyEncoder:
+    """Hashed bag-of-words through two dense layers, plus a per-call overhead"""
+
+    def __init__(self, dims: int = 384, overhead_ms: float = 10.0):
+        rng = np.random.default_rng(0)
+        self.layers = [rng.normal(size=(2048, 2048)).astype(np.float32),
+                       rng.normal(size=(2048, dims)).astype(np.float32)]
+        self.overhead = overhead_ms / 1000
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True, show_progress_bar=False):
+        single = isinstance(texts, str)
+        texts = [texts] if single else texts
+        time.sleep(self.overhead)
+        features = np.zeros((len(texts), 2048), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in text.lower().split():
+                features[row, int(hashlib.md5(token.encode()).hexdigest(), 16) % 2048] += 1
+        hidden = np.tanh(features @ self.layers[0])
+        embeddings = hidden @ self.layers[1]
+        embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings[0] if single else embeddings
+
+
+class InlineEmbedder:
+    """Previous behaviour: encode synchronously on the event loop"""
+
+    def __init__(self, model):
+        self.model = model
+
+    async def encode(self, text):
+        return np.asarray(self.model.encode(text))
+
+
+class SmallCollection:
+    def __init__(self, dims: int, count: int = 2000):
+        vectors = np.random.default_rng(1).normal(size=(count, dims)).astype(np.float32)
+        self.vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    def query(self, query_embeddings, n_results, where=None, include=None):
+        include = include or ['metadatas', 'documents', 'distances']
+        similarity = self.vectors @ np.asarray(query_embeddings, dtype=np.float32).T
+        top = np.argsort(-similarity[:, 0])[:n_results]
+        result = {'ids': [[f"doc{i}" for i in top]], 'distances': [[float(1 - similarity[i, 0]) for i in top]]}
+        if 'metadatas' in include:
+            result['metadatas'] = [[{'title': f"Paper {i}", 'authors': '[]', 'keywords': '[]', 'doi': '',
+                                     'publication_date': '2024-01-01', 'journal': 'JCS', 'citation_count': 0,
+                                     'document_type': 'article', 'research_areas': '[]', 'methodology': '',
+                                     'significance_score': 0.5, 'novelty_score': 0.5} for i in top]]
+        if 'documents' in include:
+            result['documents'] = [[f"Paper {i}\n\nAbstract" for i in top]]
+        return result
+
+
+async def run(vector_db, concurrency: int, requests: int):
+    lags = []
+    stop = asyncio.Event()
+
+    async def sample_lag():
+        while not stop.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.append((time.perf_counter() - started - 0.001) * 1000)
+
+    async def client(index: int):
+        for request in range(index, requests, concurrency):
+            query = ResearchQuery(query_text=f"emulsion stability study {request} of cosmetic actives",
+                                  research_areas=[], date_range=None, min_citation_count=0,
+                                  document_types=[], methodology_filter=[], similarity_threshold=-1.0)
+            await vector_db.search_research(query, limit=5, include_related=False)
+
+    sampler = asyncio.create_task(sample_lag())
+    started = time.perf_counter()
+    await asyncio.gather(*(client(index) for index in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await sampler
+    return elapsed, np.percentile(lags, 50), np.percentile(lags, 99), max(lags)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--concurrency', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--overhead-ms', type=float, default=10.0,
+                        help='per-call overhead of the NumPy stand-in encoder')
+    args = parser.parse_args()
+
+    if VECTOR_BACKEND_AVAILABLE:
+        from sentence_transformers import SentenceTransformer
+        model = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
+        backend = "all-MiniLM-L6-v2"
+    else:
+        model = NumpyEncoder(overhead_ms=args.overhead_ms)
+        backend = f"NumPy stand-in, {args.overhead_ms} ms overhead per call"
+    dims = len(model.encode("probe"))
+
+    print(f"{args.requests} searches from {args.concurrency} concurrent clients ({backend})")
+    for label in ("inline encode", "EmbeddingService"):
+        embedder = InlineEmbedder(model) if label == "inline encode" else EmbeddingService(model)
+        vector_db = ResearchVectorDB({}, model=model, collection=SmallCollection(dims), embedder=embedder)
+        elapsed, p50, p99, worst = await run(vector_db, args.concurrency, args.requests)
+        print(f"{label:17} {args.requests / elapsed:7.0f} searches/s   loop lag p50 {p50:6.1f} ms   "
+              f"p99 {p99:6.1f} ms   max {worst:6.1f} ms")
+        if isinstance(embedder, EmbeddingService):
+            metrics = embedder.metrics()
+            print(f"{'':17} {metrics['batches']} batches, mean size {metrics['mean_batch_size']:.1f}, "
+                  f"largest {metrics['largest_batch_size']}")
+            embedder.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
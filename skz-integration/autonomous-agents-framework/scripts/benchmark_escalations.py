@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Escalation Check Benchmark
+Times one check_escalations pass over many sent messages with a few
+escalation rules: the previous scan of every (message, rule) pair versus the
+due-time heap, which only evaluates pairs that have come due.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from models.communication_automation import (
+    CommunicationAutomation, CommunicationMessage, CommunicationStatus, EscalationRule,
+    MessagePriority, MessageType, Recipient
+)
+
+
+async def legacy_check(automation: CommunicationAutomation, current_time: datetime):
+    """Previous behaviour: every stored message against every rule"""
+    for message in automation.sent_messages.values():
+        for rule in automation.escalation_rules.values():
+            if await automation._should_escalate(message, rule, current_time):
+                await automation._perform_escalation(message, rule)
+
+
+def message(number: int, sent_time: datetime) -> CommunicationMessage:
+    recipient = Recipient(recipient_id=f"r{number}", name=f"Reviewer {number}", email=f"r{number}@example.com",
+                          phone=None, preferred_communication=MessageType.EMAIL, timezone="UTC", language="en",
+                          role="reviewer", organization="Journal", communication_preferences={})
+    return CommunicationMessage(
+        message_id=f"msg_{number}", template_id='reviewer_invitation', recipient=recipient,
+        sender_agent='review_coordination_agent', subject='Invitation', body='Body', message_type=MessageType.EMAIL,
+        priority=MessagePriority.MEDIUM, scheduled_time=sent_time.isoformat(), sent_time=sent_time.isoformat(),
+        status=CommunicationStatus.SENT, context_data={}, attachments=[], tracking_data={})
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--messages', type=int, default=100000)
+    parser.add_argument('--rules', type=int, default=3)
+    parser.add_argument('--due-fraction', type=float, default=0.01,
+                        help='share of messages whose first escalation is due at the check')
+    args = parser.parse_args()
+
+    automation = CommunicationAutomation({'message_retention_minutes': 7 * 24 * 60})
+    escalated = []
+
+    async def perform_escalation(message, rule):
+        escalated.append(message.message_id)
+        message.tracking_data['escalation_count'] = message.tracking_data.get('escalation_count', 0) + 1
+
+    automation._perform_escalation = perform_escalation
+    for number in range(args.rules):
+        await automation.setup_escalation_rule(EscalationRule(
+            rule_id=f"rule_{number}", trigger_condition='no_response', escalation_delay=24 * 60 * (number + 1),
+            escalation_recipients=['editor'], escalation_template='quality_issue_alert', max_escalations=3,
+            escalation_agent='review_coordination_agent'))
+
+    now = datetime.now()
+    due = int(args.messages * args.due_fraction)
+    started = time.perf_counter()
+    for number in range(args.messages):
+        # The first `due` messages passed the shortest delay a minute ago
+        sent = now - timedelta(days=1, minutes=1) if number < due else now - timedelta(hours=number % 23)
+        automation._record_message(message(number, sent))
+    print(f"{args.messages} messages, {args.rules} rules, {due} escalations due "
+          f"(recorded in {time.perf_counter() - started:.2f} s)")
+
+    started = time.perf_counter()
+    await legacy_check(automation, now)
+    legacy_time = time.perf_counter() - started
+    legacy_escalated = len(escalated)
+    for stored in automation.sent_messages.values():
+        stored.tracking_data.clear()
+    escalated.clear()
+
+    started = time.perf_counter()
+    await automation.check_escalations(now)
+    heap_time = time.perf_counter() - started
+
+    print(f"{'scan all pairs':16} {legacy_time * 1000:9.1f} ms   {legacy_escalated} escalated")
+    print(f"{'due-time heap':16} {heap_time * 1000:9.1f} ms   {len(escalated)} escalated")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Knowledge Graph Store Benchmark
+Builds a synthetic authorship/citation/keyword graph in KnowledgeGraphStore
+and times edge insertion, compaction to disk, memory-mapped reload, k-hop
+neighbourhoods, shortest paths and PageRank.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from models.knowledge_graph_store import KnowledgeGraphStore
+
+
+def timed(label: str, function, repeats: int = 1):
+    started = time.perf_counter()
+    for _ in range(repeats):
+        result = function()
+    elapsed = (time.perf_counter() - started) / repeats
+    print(f"{label:38} {elapsed * 1000:10.1f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--documents', type=int, default=200_000)
+    parser.add_argument('--authors', type=int, default=50_000)
+    parser.add_argument('--keywords', type=int, default=10_000)
+    parser.add_argument('--queries', type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    path = os.path.join(tempfile.mkdtemp(prefix="graph_bench_"), "graph")
+    graph = KnowledgeGraphStore(path, compact_threshold=10 ** 9)
+    for doc in range(args.documents):
+        graph.add_node(f"doc{doc}", 'document')
+
+    edges = []
+    for doc in range(args.documents):
+        edges += [(f"author{a}", f"doc{doc}", 'authored') for a in rng.integers(0, args.authors, 3)]
+        edges += [(f"doc{doc}", f"kw{k}", 'contains_keyword') for k in rng.integers(0, args.keywords, 4)]
+        if doc:
+            edges += [(f"doc{doc}", f"doc{c}", 'cites') for c in rng.integers(0, doc, min(doc, 5))]
+
+    timed(f"insert {len(edges)} edges", lambda: graph.add_edges(edges))
+    timed("compact + save", graph.save)
+    graph = timed("reload (memory-mapped)", lambda: KnowledgeGraphStore(path))
+    print(f"{len(graph)} nodes, {graph.edge_count} edges")
+
+    seeds = [f"doc{doc}" for doc in rng.integers(0, args.documents, args.queries)]
+    queue = iter(seeds * 3)
+    timed("2-hop neighbourhood (citations)",
+          lambda: graph.k_hop([next(queue)], hops=2, direction='out', edge_types=['cites']), args.queries)
+    timed("2-hop neighbourhood (all edges)", lambda: graph.k_hop([next(queue)], hops=2), args.queries)
+    pairs = iter(zip(seeds, reversed(seeds)))
+    timed("shortest path (BFS, all edges)", lambda: graph.shortest_path(*next(pairs)), args.queries)
+    timed("adjacency matrix (first PageRank)", lambda: graph.adjacency_matrix('both'))
+    scores = timed("PageRank", lambda: graph.pagerank(direction='both'), 3)
+    timed("personalised PageRank", lambda: graph.pagerank(personalization={seeds[0]: 1.0}, direction='both'), 3)
+    print("top documents:", graph.top_nodes(scores, 3, node_types=['document']))
+
+
+if __name__ == '__main__':
+    main()
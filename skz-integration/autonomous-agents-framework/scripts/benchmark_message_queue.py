@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Message Queue Benchmark
+Drains a backlog of queued emails with the previous polling consumer (one
+LPOP per kind per iteration, one SMTP session per message) and with
+QueueWorker (batched LMOVE into processing lists, one SMTP session per
+batch, acknowledged after delivery, several consumers). Runs against a real
+Redis with --redis-url, otherwise the in-process LocalRedis with a simulated
+network round-trip per command or pipeline.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from services.communication_automation import MessageQueue, QueueWorker
+from services.local_redis import LocalPipeline, LocalRedis
+
+
+class RemoteLocalRedis(LocalRedis):
+    """LocalRedis that charges one round-trip per command or pipeline"""
+
+    def __init__(self, rtt: float):
+        super().__init__()
+        self.rtt = rtt
+        self.round_trips = 0
+
+    def _trip(self):
+        self.round_trips += 1
+        time.sleep(self.rtt)
+
+    def rpush(self, name, *values):
+        self._trip()
+        return super().rpush(name, *values)
+
+    def lpop(self, name):
+        self._trip()
+        return super().lpop(name)
+
+    def lmove(self, first_list, second_list, src="LEFT", dest="RIGHT"):
+        self._trip()
+        return super().lmove(first_list, second_list, src, dest)
+
+    def set(self, name, value, ex=None):
+        self._trip()
+        return super().set(name, value, ex)
+
+    def exists(self, *names):
+        self._trip()
+        return super().exists(*names)
+
+    def pipeline(self, transaction=True):
+        return RemotePipeline(self)
+
+
+class RemotePipeline(LocalPipeline):
+    def execute(self):
+        self.client._trip()
+        commands, self.commands = self.commands, []
+        # Run the commands without charging each one
+        return [getattr(LocalRedis, command)(self.client, *args, **kwargs) for command, args, kwargs in commands]
+
+
+class SimulatedEmail:
+    """SMTP stand-in: a session costs connect_ms, each message send_ms"""
+
+    def __init__(self, connect_ms: float, send_ms: float):
+        self.connect = connect_ms / 1000
+        self.send_time = send_ms / 1000
+
+    def send(self, to_email, subject, body, context=None):
+        time.sleep(self.connect + self.send_time)
+        return {"status": "sent"}
+
+    def send_batch(self, items):
+        time.sleep(self.connect + self.send_time * len(items))
+        return [{"status": "sent"} for _ in items]
+
+
+def legacy_drain(client, namespace: str, email: SimulatedEmail, total: int) -> int:
+    """Previous process_once loop: LPOP each kind in turn, send one message per call"""
+    processed = 0
+    while processed < total:
+        for kind in ["email", "sms"]:
+            item = client.lpop(f"{namespace}:{kind}")
+            if not item:
+                continue
+            data = json.loads(item)
+            data["result"] = email.send(data["to"], data["subject"], data.get("template_or_body", ""))
+            processed += 1
+            break
+    return processed
+
+
+def fill(queue: MessageQueue, count: int):
+    for start in range(0, count, 1000):
+        queue.enqueue_many("email", [{"to": f"user{number}@example.com", "subject": "Reminder",
+                                      "template_or_body": "Your review is due"}
+                                     for number in range(start, min(start + 1000, count))])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--messages', type=int, default=2000)
+    parser.add_argument('--consumers', type=int, default=4)
+    parser.add_argument('--batch-size', type=int, default=50)
+    parser.add_argument('--rtt-ms', type=float, default=0.5, help='simulated Redis round-trip (LocalRedis only)')
+    parser.add_argument('--connect-ms', type=float, default=5.0, help='simulated SMTP session setup')
+    parser.add_argument('--send-ms', type=float, default=0.5, help='simulated SMTP time per message')
+    parser.add_argument('--redis-url', help='benchmark against this Redis instead of LocalRedis (its db is flushed)')
+    args = parser.parse_args()
+
+    def client():
+        if args.redis_url:
+            import redis
+            connection = redis.Redis.from_url(args.redis_url)
+            connection.flushdb()
+            return connection
+        return RemoteLocalRedis(args.rtt_ms / 1000)
+
+    email = SimulatedEmail(args.connect_ms, args.send_ms)
+    backend = args.redis_url or f"LocalRedis, {args.rtt_ms} ms round-trip"
+    print(f"{args.messages} emails ({backend}; SMTP {args.connect_ms} ms session + {args.send_ms} ms/message)")
+
+    queue = MessageQueue(namespace="bench", client=client())
+    fill(queue, args.messages)
+    started = time.perf_counter()
+    legacy_drain(queue.client, "bench", email, args.messages)
+    elapsed = time.perf_counter() - started
+    print(f"{'polling LPOP':30} {args.messages / elapsed:8.0f} msgs/s")
+
+    for consumers in sorted({1, args.consumers}):
+        queue = MessageQueue(namespace="bench", client=client())
+        fill(queue, args.messages)
+        worker = QueueWorker(queue, email, None, consumers=consumers, batch_size=args.batch_size,
+                             block_timeout=0.1)
+        started = time.perf_counter()
+        worker.start()
+        while worker.processed < args.messages:
+            time.sleep(0.001)
+        elapsed = time.perf_counter() - started
+        worker.stop(timeout=1)
+        label = f"QueueWorker x{consumers}, batch {args.batch_size}"
+        print(f"{label:30} {args.messages / elapsed:8.0f} msgs/s")
+
+
+if __name__ == '__main__':
+    main()
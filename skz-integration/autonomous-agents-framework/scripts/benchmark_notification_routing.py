@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Notification Routing Benchmark
+Fires a burst of agent events at many notification configs, routing with
+the previous linear scan, serial recipient lookups and serial sends, and
+with the (agent_id, event_type) index, batched lookups and concurrent bulk
+fan-out. Recipient lookups sleep for --lookup-ms to stand in for a database.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from models.communication_automation import (
+    CommunicationAutomation, CommunicationTemplate, MessagePriority, MessageType, NotificationConfig
+)
+
+
+class LookupLatencyAutomation(CommunicationAutomation):
+    def __init__(self, config, lookup_seconds: float):
+        super().__init__(config)
+        self.lookup_seconds = lookup_seconds
+
+    async def _get_recipient_by_id(self, recipient_id):
+        await asyncio.sleep(self.lookup_seconds)
+        return await super()._get_recipient_by_id(recipient_id)
+
+
+async def legacy_trigger(automation: CommunicationAutomation, agent_id: str, event_type: str, event_data):
+    """Previous trigger_notification: scan all configs, look up and send one recipient at a time"""
+    for config in automation.notification_configs.values():
+        if config.agent_id == agent_id and event_type in config.event_types and config.enabled:
+            template_id = config.templates.get(event_type)
+            if template_id:
+                for recipient_id in config.recipients:
+                    recipient = await automation._get_recipient_by_id(recipient_id)
+                    if recipient:
+                        await automation.send_message(template_id, recipient, event_data, MessagePriority.MEDIUM)
+
+
+async def build(args) -> CommunicationAutomation:
+    automation = LookupLatencyAutomation({}, args.lookup_ms / 1000)
+    automation.templates['internal_alert'] = CommunicationTemplate(
+        template_id='internal_alert', name='Internal Alert', subject_template='{{event}} from {{agent}}',
+        body_template='{{event}} needs attention', message_type=MessageType.INTERNAL, agent_id='system',
+        scenario='alert', variables=['event', 'agent'], personalization_rules={}, send_conditions={},
+        follow_up_rules={})
+    rng = random.Random(0)
+    for number in range(args.configs):
+        events = rng.sample([f"event_{index}" for index in range(args.event_types)], 3)
+        await automation.setup_automated_notifications(NotificationConfig(
+            config_id=f"config_{number}", agent_id=f"agent_{number % args.agents}", event_types=events,
+            recipients=[f"user_{rng.randrange(200)}" for _ in range(args.recipients)],
+            templates={event: 'internal_alert' for event in events}, frequency_limits={},
+            quiet_hours={'enabled': False}, enabled=True))
+    return automation
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--configs', type=int, default=500)
+    parser.add_argument('--agents', type=int, default=50)
+    parser.add_argument('--event-types', type=int, default=10)
+    parser.add_argument('--recipients', type=int, default=5, help='recipients per config')
+    parser.add_argument('--events', type=int, default=500)
+    parser.add_argument('--lookup-ms', type=float, default=1.0)
+    args = parser.parse_args()
+    # Per-message INFO logging would dominate both timings
+    logging.disable(logging.INFO)
+
+    rng = random.Random(1)
+    events = [(f"agent_{rng.randrange(args.agents)}", f"event_{rng.randrange(args.event_types)}")
+              for _ in range(args.events)]
+    print(f"{args.events} events, {args.configs} configs, {args.recipients} recipients each, "
+          f"{args.lookup_ms} ms per recipient lookup")
+
+    for label in ("linear scan, serial", "indexed, batched"):
+        automation = await build(args)
+        started = time.perf_counter()
+        for agent_id, event_type in events:
+            event_data = {'event': event_type, 'agent': agent_id}
+            if label == "linear scan, serial":
+                await legacy_trigger(automation, agent_id, event_type, event_data)
+            else:
+                await automation.trigger_notification(agent_id, event_type, event_data)
+        elapsed = time.perf_counter() - started
+        print(f"{label:20} {args.events / elapsed:8.0f} events/s   {len(automation.sent_messages)} messages")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Provider Client Benchmark
+Sends reviewer invitations through a local mock SendGrid/SES HTTP server,
+first building a provider client per send (a new connection each time, as
+the SendGrid and Twilio SDK clients were used) and then with the pooled
+keep-alive clients. The server delays each new connection to stand in for
+TCP and TLS setup. A second run takes SendGrid down (slow 503s) and compares
+a fixed provider order with failover ordered by provider health.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from models.communication_automation import CommunicationAutomation, MessageType, Recipient
+from models.provider_clients import HTTPProviderClient, ProviderClientPool, ProviderHealth
+
+
+class MockProviderHandler(BaseHTTPRequestHandler):
+    """SendGrid /v3/mail/send and an SES stand-in at /ses"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in separate writes; without this, Nagle and
+        # delayed ACKs add ~40 ms to every response with a body
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        time.sleep(self.server.handshake_delay)
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        time.sleep(self.server.latency)
+        with self.server.lock:
+            self.server.requests[self.path] = self.server.requests.get(self.path, 0) + 1
+        if self.path == '/v3/mail/send' and self.server.sendgrid_down:
+            time.sleep(self.server.outage_delay)
+            self.respond(503, b'{"errors": [{"message": "unavailable"}]}')
+        elif self.path == '/v3/mail/send':
+            self.respond(202, b'', {'X-Message-Id': 'mock'})
+        else:
+            self.respond(200, json.dumps({'MessageId': 'mock'}).encode())
+
+    def respond(self, status: int, body: bytes, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockProviderServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, handshake_ms: float, latency_ms: float, outage_ms: float):
+        super().__init__(('127.0.0.1', 0), MockProviderHandler)
+        self.handshake_delay = handshake_ms / 1000
+        self.latency = latency_ms / 1000
+        self.outage_delay = outage_ms / 1000
+        self.sendgrid_down = False
+        self.connections = 0
+        self.requests = {}
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+
+class MockSES:
+    """boto3 SES client stand-in that posts to the mock server"""
+
+    def __init__(self, base_url: str, pool_size: int):
+        self.http = HTTPProviderClient(base_url, pool_size=pool_size)
+
+    def send_email(self, Source, Destination, Message):
+        return self.http.post('/ses', json={'to': Destination['ToAddresses']}).json()
+
+    def close(self):
+        self.http.close()
+
+
+class ClientPerSendPool(ProviderClientPool):
+    """Previous behaviour: a fresh client, and so a fresh connection, for every send"""
+
+    def get(self, provider, settings):
+        client = self.factories[provider](settings, 1)
+        self._clients[(provider, len(self._clients))] = client
+        return client
+
+
+class FixedOrderHealth(ProviderHealth):
+    """Always tries providers in configured order"""
+
+    def order(self, providers):
+        return list(providers)
+
+
+def _recipient(number: int) -> Recipient:
+    return Recipient(
+        recipient_id=f"reviewer_{number}", name=f"Reviewer {number}", email=f"reviewer{number}@example.com",
+        phone=None, preferred_communication=MessageType.EMAIL, timezone="UTC", language="en",
+        role="reviewer", organization="University", communication_preferences={}
+    )
+
+
+CONTEXT = {
+    'manuscript_title': 'Benchmarking Delivery', 'journal_name': 'Journal', 'deadline': '2024-01-01',
+    'manuscript_abstract': 'Abstract', 'keywords': 'delivery', 'review_link': 'https://example.com/review',
+    'editor_name': 'Editor', 'reviewer_availability': 'available'
+}
+
+
+async def run(server: MockProviderServer, pool: ProviderClientPool, health: ProviderHealth, messages: int,
+              concurrency: int):
+    automation = CommunicationAutomation({
+        'smtp': {'from_address': 'editor@example.com'},
+        'email_providers': {
+            'sendgrid': {'enabled': True, 'api_key': 'bench', 'base_url': server.url},
+            'ses': {'enabled': True, 'region': 'us-east-1', 'endpoint_url': server.url}
+        }
+    })
+    automation.provider_clients = pool
+    automation.provider_health = health
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def send(number: int):
+        async with semaphore:
+            return await automation.send_message('reviewer_invitation', _recipient(number), CONTEXT)
+
+    started = time.perf_counter()
+    sent = await asyncio.gather(*(send(number) for number in range(messages)))
+    elapsed = time.perf_counter() - started
+    pool.close()
+    await automation.close()
+    delivered = sum(1 for message in sent if message.tracking_data.get('delivery_status') == 'sent')
+    return elapsed, delivered
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--messages', type=int, default=300)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--handshake-ms', type=float, default=20.0, help='delay per new connection')
+    parser.add_argument('--latency-ms', type=float, default=2.0, help='delay per request')
+    parser.add_argument('--outage-ms', type=float, default=50.0, help='delay before SendGrid 503s during an outage')
+    args = parser.parse_args()
+    # Per-message logging, including the expected SendGrid errors during the
+    # outage, would dominate the timings
+    logging.disable(logging.ERROR)
+
+    def pool(cls):
+        return cls(factories={'ses': lambda settings, pool_size: MockSES(settings['endpoint_url'], pool_size)})
+
+    print(f"{args.messages} emails, {args.concurrency} in flight; mock provider: {args.handshake_ms} ms per "
+          f"connection, {args.latency_ms} ms per request")
+    for label, cls in (("client per send", ClientPerSendPool), ("pooled keep-alive", ProviderClientPool)):
+        server = MockProviderServer(args.handshake_ms, args.latency_ms, args.outage_ms)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        elapsed, delivered = await run(server, pool(cls), ProviderHealth(), args.messages, args.concurrency)
+        server.shutdown()
+        print(f"{label:20} {args.messages / elapsed:8.0f} msgs/s   {delivered} delivered, "
+              f"{server.connections} connections")
+
+    print(f"SendGrid outage ({args.outage_ms} ms 503s), SES healthy")
+    for label, health in (("fixed order", FixedOrderHealth()), ("health-ordered", ProviderHealth())):
+        server = MockProviderServer(args.handshake_ms, args.latency_ms, args.outage_ms)
+        server.sendgrid_down = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        elapsed, delivered = await run(server, pool(ProviderClientPool), health, args.messages, args.concurrency)
+        server.shutdown()
+        print(f"{label:20} {args.messages / elapsed:8.0f} msgs/s   {delivered} delivered, "
+              f"{server.requests.get('/v3/mail/send', 0)} SendGrid attempts")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Research Search Benchmark
+Compares search_research with per-hit related-document lookups (one get plus
+one query per hit) against the batched path (two round-trips per search).
+Uses a persistent ChromaDB collection when chromadb is installed, otherwise
+an in-memory NumPy brute-force collection with a simulated round-trip delay.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from models.research_vector_db import VECTOR_BACKEND_AVAILABLE, ResearchQuery, ResearchVectorDB
+
+
+class ArrayCollection:
+    """Brute-force cosine collection over a float32 matrix"""
+
+    def __init__(self, vectors: np.ndarray, round_trip_ms: float):
+        self.vectors = vectors
+        self.delay = round_trip_ms / 1000
+        self.round_trips = 0
+
+    def _metadata(self, index: int) -> dict:
+        return {
+            'title': f"Paper {index}", 'authors': json.dumps([f"Author {index % 997}"]),
+            'keywords': json.dumps(["emulsion", "stability"]), 'doi': f"10.1000/{index}",
+            'publication_date': "2024-01-01", 'journal': "JCS", 'citation_count': index % 300,
+            'document_type': "article", 'research_areas': json.dumps(["formulation"]),
+            'methodology': "experimental", 'significance_score': 0.5, 'novelty_score': 0.5
+        }
+
+    def _round_trip(self):
+        self.round_trips += 1
+        if self.delay:
+            time.sleep(self.delay)
+
+    def query(self, query_embeddings, n_results, where=None, include=None):
+        self._round_trip()
+        include = include or ['metadatas', 'documents', 'distances']
+        similarity = self.vectors @ np.asarray(query_embeddings, dtype=np.float32).T
+        result = {key: [] for key in ('ids', *include)}
+        for column in similarity.T:
+            top = np.argpartition(-column, n_results)[:n_results]
+            top = top[np.argsort(-column[top])]
+            result['ids'].append([f"doc{i}" for i in top])
+            if 'distances' in include:
+                result['distances'].append([float(1 - column[i]) for i in top])
+            if 'metadatas' in include:
+                result['metadatas'].append([self._metadata(i) for i in top])
+            if 'documents' in include:
+                result['documents'].append([f"Paper {i}\n\nAbstract {i}" for i in top])
+            if 'embeddings' in include:
+                result['embeddings'].append([self.vectors[i] for i in top])
+        return result
+
+    def get(self, ids, include=None):
+        self._round_trip()
+        rows = [int(doc_id[3:]) for doc_id in ids]
+        return {'ids': ids, 'embeddings': [self.vectors[i] for i in rows],
+                'metadatas': [self._metadata(i) for i in rows]}
+
+
+class FixedModel:
+    def __init__(self, dims: int):
+        self.rng = np.random.default_rng(1)
+        self.dims = dims
+
+    def encode(self, texts, **kwargs):
+        # Same call shape as SentenceTransformer under EmbeddingService: a batch in, one row per text out
+        return self.rng.normal(size=(len(texts), self.dims)).astype(np.float32)
+
+
+def unit_vectors(count: int, dims: int) -> np.ndarray:
+    vectors = np.random.default_rng(0).normal(size=(count, dims)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def chroma_collection(vectors: np.ndarray, path: str):
+    import chromadb
+    collection = chromadb.PersistentClient(path=path).get_or_create_collection(
+        name="research_documents", metadata={"hnsw:space": "cosine"})
+    stub = ArrayCollection(vectors, 0)
+    for start in range(0, len(vectors), 5000):
+        rows = range(start, min(start + 5000, len(vectors)))
+        collection.add(ids=[f"doc{i}" for i in rows], embeddings=vectors[start:rows.stop].tolist(),
+                       documents=[f"Paper {i}\n\nAbstract {i}" for i in rows],
+                       metadatas=[stub._metadata(i) for i in rows])
+    return collection
+
+
+async def per_hit_search(vector_db, query, limit):
+    # Previous behaviour: one get plus one query per hit
+    results = await vector_db.search_research(query, limit=limit, include_related=False)
+    for result in results:
+        result.related_documents = await vector_db._find_related_documents(result.document.doc_id, limit=5)
+    return results
+
+
+async def measure(search, vector_db, query, limit, repeats):
+    latencies = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        await search(vector_db, query, limit)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return np.percentile(latencies, 50), np.percentile(latencies, 95)
+
+
+async def batched_search(vector_db, query, limit):
+    return await vector_db.search_research(query, limit=limit)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--documents', type=int, default=1_000_000)
+    parser.add_argument('--dims', type=int, default=64)
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--round-trip-ms', type=float, default=2.0,
+                        help='simulated latency per call on the in-memory collection')
+    parser.add_argument('--repeats', type=int, default=20)
+    args = parser.parse_args()
+
+    vectors = unit_vectors(args.documents, args.dims)
+    if VECTOR_BACKEND_AVAILABLE:
+        collection = chroma_collection(vectors, tempfile.mkdtemp(prefix="research_bench_"))
+        backend = "chromadb"
+    else:
+        collection = ArrayCollection(vectors, args.round_trip_ms)
+        backend = f"in-memory stand-in, {args.round_trip_ms} ms per round-trip"
+
+    vector_db = ResearchVectorDB({}, model=FixedModel(args.dims), collection=collection)
+    query = ResearchQuery(query_text="emulsion stability", research_areas=[], date_range=None,
+                          min_citation_count=0, document_types=[], methodology_filter=[],
+                          similarity_threshold=-1.0)
+
+    print(f"{args.documents} documents x {args.dims} dims ({backend}), {args.limit} hits per search")
+    for label, search in (("per-hit lookups", per_hit_search), ("batched", batched_search)):
+        round_trips = getattr(collection, 'round_trips', 0)
+        p50, p95 = await measure(search, vector_db, query, args.limit, args.repeats)
+        per_search = (getattr(collection, 'round_trips', 0) - round_trips) / args.repeats
+        print(f"{label:16} p50 {p50:8.1f} ms   p95 {p95:8.1f} ms   round-trips/search {per_search:.0f}")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
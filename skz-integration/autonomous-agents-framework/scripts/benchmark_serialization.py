@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Serialization Benchmark
+Measures encoding CPU time per response for the stdlib encoder (as used by
+JSONResponse and jsonify) against the orjson and msgpack paths in
+src/serialization.py, on agent registry and manuscript list payloads.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import serialization
+from serialization import dumps, iter_encoded_list, packb
+
+
+def agent_payload(agent_count: int) -> dict:
+    """Agent list with nested performance data, as served by /api/v1/agents"""
+    now = datetime.now()
+    return {
+        "agents": [
+            {
+                "id": f"agent_{index}",
+                "name": f"Agent {index}",
+                "status": "active",
+                "last_activity": (now - timedelta(seconds=index)).isoformat(),
+                "capabilities": ["literature_search", "gap_analysis", "trend_identification"],
+                "performance": {
+                    "success_rate": random.random(), "avg_response_time": random.uniform(0.5, 5.0),
+                    "total_actions": random.randint(0, 10000),
+                    "history": [random.random() for _ in range(50)]
+                }
+            }
+            for index in range(agent_count)
+        ],
+        "total": agent_count,
+        "timestamp": now.isoformat()
+    }
+
+
+def manuscript_payload(manuscript_count: int) -> dict:
+    """Manuscript list with datetimes and NumPy scores, as built by the agents"""
+    start = datetime(2024, 1, 1)
+    return {
+        "manuscripts": [
+            {
+                "id": f"ms_{index}",
+                "title": f"Manuscript {index} on cosmetic formulation stability",
+                "authors": [{"name": f"Author {a}", "affiliation": "University"} for a in range(4)],
+                "keywords": ["stability", "emulsion", "skin"],
+                "submitted_at": start + timedelta(hours=index),
+                "status": "under_review",
+                "scores": np.round(np.random.random(4), 3),
+                "quality_score": np.float64(random.random())
+            }
+            for index in range(manuscript_count)
+        ],
+        "total_count": manuscript_count
+    }
+
+
+def stdlib_dumps(payload) -> bytes:
+    # What JSONResponse / jsonify did, plus the conversions the payload needs
+    return json.dumps(payload, default=serialization.to_builtin, separators=(",", ":")).encode("utf-8")
+
+
+def stream_dumps(payload) -> bytes:
+    # Chunked list encoding, joined to compare total CPU
+    key = next(name for name, value in payload.items() if isinstance(value, list))
+    envelope = {name: value for name, value in payload.items() if name != key}
+    return b"".join(iter_encoded_list(key, payload[key], envelope))
+
+
+def cpu_per_call(function, payload, repeats: int) -> float:
+    started = time.process_time()
+    for _ in range(repeats):
+        function(payload)
+    return (time.process_time() - started) / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeats', type=int, default=50)
+    args = parser.parse_args()
+
+    random.seed(0)
+    np.random.seed(0)
+    payloads = {
+        "agents (200)": agent_payload(200),
+        "manuscripts (1k)": manuscript_payload(1000),
+        "manuscripts (20k)": manuscript_payload(20000),
+    }
+    encoders = {
+        "stdlib json": stdlib_dumps,
+        "orjson": dumps,
+        "msgpack": packb,
+        "orjson stream": stream_dumps,
+    }
+
+    print(f"orjson available: {serialization.ORJSON_AVAILABLE}, msgpack available: {serialization.MSGPACK_AVAILABLE}")
+    print(f"{'payload':20} " + " ".join(f"{name:>15}" for name in encoders) + "   (ms CPU per response, size)")
+    for label, payload in payloads.items():
+        repeats = max(1, args.repeats // 10) if "20k" in label else args.repeats
+        cells = []
+        for encode in encoders.values():
+            cost = cpu_per_call(encode, payload, repeats) * 1000
+            cells.append(f"{cost:8.2f} {len(encode(payload)) / 1024:5.0f}k")
+        print(f"{label:20} " + " ".join(f"{cell:>15}" for cell in cells))
+
+
+if __name__ == '__main__':
+    main()
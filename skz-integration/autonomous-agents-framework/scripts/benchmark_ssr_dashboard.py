@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+SSR Dashboard Load Test
+Measures dashboard requests/sec through the ASGI app for the previous
+full-render handler, the fragment-cached handler, and conditional requests
+answered with 304, optionally with agent actions interleaved.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from fastapi import Request
+from fastapi.responses import HTMLResponse
+from fastapi.templating import Jinja2Templates
+from fastapi.testclient import TestClient
+
+import ssr_api_server
+from ssr_api_server import DashboardRenderer, app, create_default_template
+
+LEGACY_PAGE = """<html><body>
+<p>Server-Side Rendered | {{ server_time }}</p>
+<div>{{ total_agents }}</div><div>{{ active_agents }}</div><div>{{ total_tasks }}</div>
+{% for agent_id, agent in agents.items() %}
+<div class="agent-card">
+    <h3>{{ agent.name }}</h3>
+    <span class="agent-status status-{{ agent.status }}">{{ agent.status.upper() }}</span>
+    <p><strong>Capabilities:</strong> {{ agent.capabilities|join(', ') }}</p>
+    <p><strong>Success Rate:</strong> {{ (agent.performance.success_rate * 100)|round }}%</p>
+    <p><strong>Avg Response:</strong> {{ agent.performance.avg_response_time }}s</p>
+    <p><strong>Total Actions:</strong> {{ agent.performance.total_actions }}</p>
+</div>
+{% endfor %}
+</body></html>"""
+
+
+def legacy_dashboard(templates: Jinja2Templates):
+    """Previous handler: aggregates and the whole page computed per request"""
+    async def dashboard(request: Request):
+        registry = ssr_api_server.AGENT_REGISTRY
+        return templates.TemplateResponse(request, "legacy_dashboard.html", {
+            "total_agents": len(registry),
+            "active_agents": sum(1 for agent in registry.values() if agent["status"] == "active"),
+            "total_tasks": sum(agent["performance"]["total_actions"] for agent in registry.values()),
+            "agents": registry,
+            "server_time": datetime.now().isoformat()
+        })
+    return dashboard
+
+
+def pad_registry(agent_count: int):
+    """Add synthetic agents until the registry holds ``agent_count`` entries"""
+    registry = ssr_api_server.AGENT_REGISTRY
+    template = next(iter(registry.values()))
+    for index in range(len(registry), agent_count):
+        registry[f"agent_{index}"] = {**template, "name": f"Synthetic Agent {index}",
+                                      "performance": dict(template["performance"])}
+    ssr_api_server.AGENT_SNAPSHOT.load(registry)
+
+
+def measure(client: TestClient, path: str, requests: int, conditional: bool, action_every: int) -> float:
+    etag = None
+    started = time.perf_counter()
+    for index in range(requests):
+        if action_every and index % action_every == 0:
+            ssr_api_server.AGENT_SNAPSHOT.record_action("research_discovery")
+        headers = {"If-None-Match": etag} if conditional and etag else {}
+        response = client.get(path, headers=headers)
+        assert response.status_code in (200, 304)
+        etag = response.headers.get("etag", etag)
+    return requests / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--agents', type=int, default=50, help='registry size (padded with synthetic agents)')
+    parser.add_argument('--action-every', type=int, default=0,
+                        help='record an agent action every N requests (0 = never)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        create_default_template(directory)
+        (directory / "legacy_dashboard.html").write_text(LEGACY_PAGE)
+        templates = Jinja2Templates(directory=str(directory))
+
+        ssr_api_server.initialize_ssr_services()
+        pad_registry(args.agents)
+        ssr_api_server.DASHBOARD_RENDERER = DashboardRenderer(templates, ssr_api_server.AGENT_SNAPSHOT)
+        app.add_api_route("/legacy", legacy_dashboard(templates), response_class=HTMLResponse)
+        client = TestClient(app)
+
+        print(f"{args.requests} requests, {len(ssr_api_server.AGENT_REGISTRY)} agents, "
+              f"action every {args.action_every or 'never'}")
+        for label, path, conditional in [
+            ("full render (previous)", "/legacy", False),
+            ("fragment cache, 200", "/", False),
+            ("fragment cache, If-None-Match", "/", True),
+        ]:
+            rate = measure(client, path, args.requests, conditional, args.action_every)
+            print(f"  {label:32} {rate:10.0f} req/s")
+        print(f"  renders: {ssr_api_server.DASHBOARD_RENDERER.renders}")
+
+
+if __name__ == '__main__':
+    main()
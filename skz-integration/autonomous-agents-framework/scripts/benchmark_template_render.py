@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Template Rendering Benchmark
+Renders the reviewer-invitation subject and body for many reviewers by
+compiling on every message (previous behaviour), with the compiled-template
+registry, and with one render_many call per batch.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from models.communication_automation import CommunicationAutomation
+
+
+def contexts(count: int):
+    shared = {
+        'manuscript_title': 'Long-Term Stability of Pickering Emulsions in Leave-On Formulations',
+        'authors': 'A. Author, B. Author, C. Author', 'journal_name': 'Journal of Cosmetic Science',
+        'submission_date': '2024-01-15', 'estimated_time': '14',
+        'abstract': 'We study particle-stabilised emulsions under accelerated ageing. ' * 8,
+        'response_deadline': '2024-02-01', 'review_link': 'https://example.com/review/123',
+        'editorial_team': 'Editorial Team'
+    }
+    areas = ['rheology', 'colloid science', 'skin penetration', 'preservative efficacy']
+    return [dict(shared, reviewer_name=f"Dr. Reviewer {number}", expertise_areas=areas[number % len(areas)])
+            for number in range(count)]
+
+
+def measure(label: str, count: int, render):
+    started = time.perf_counter()
+    output = render()
+    elapsed = time.perf_counter() - started
+    print(f"{label:28} {count / elapsed:9.0f} renders/s")
+    return output
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--recipients', type=int, default=5000)
+    args = parser.parse_args()
+
+    automation = CommunicationAutomation({})
+    template = automation.templates['reviewer_invitation']
+    batch = contexts(args.recipients)
+    env = automation.jinja_env
+    registry = automation.template_registry
+
+    print(f"reviewer_invitation, {args.recipients} recipients")
+    expected = measure("compile per message", args.recipients, lambda: [
+        (env.from_string(template.subject_template).render(**context),
+         env.from_string(template.body_template).render(**context)) for context in batch])
+    cached = measure("compiled registry", args.recipients, lambda: [
+        registry.render(template, context) for context in batch])
+    many = measure("render_many", args.recipients, lambda: registry.render_many(template, batch))
+    assert expected == cached == many
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Trend Index Benchmark
+Measures indexing throughput and find_research_trends-style window queries
+on the month-bucketed TrendIndex for a synthetic corpus.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from models.trend_index import TrendIndex, month_index
+
+AREAS = ['cosmetic_chemistry', 'dermatology', 'materials_science', 'analytical_chemistry', 'toxicology']
+METHODS = ['experimental', 'computational', 'clinical', 'meta-analysis', 'in_vitro']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--documents', type=int, default=200_000)
+    parser.add_argument('--keywords', type=int, default=5000)
+    parser.add_argument('--years', type=int, default=20)
+    parser.add_argument('--queries', type=int, default=1000)
+    args = parser.parse_args()
+
+    random.seed(0)
+    vocabulary = [f"keyword_{i}" for i in range(args.keywords)]
+    index = TrendIndex()
+    started = time.perf_counter()
+    for doc in range(args.documents):
+        index.add(f"doc{doc}", random.sample(AREAS, random.randint(1, 2)),
+                  random.choices(vocabulary, k=5), random.choice(METHODS),
+                  f"{2024 - random.randrange(args.years)}-{random.randint(1, 12):02d}-01",
+                  random.randint(0, 200), random.uniform(0, 10))
+    build = time.perf_counter() - started
+
+    end = month_index("2024-12")
+    for window in (12, 24, 120):
+        started = time.perf_counter()
+        for _ in range(args.queries):
+            result = index.window(random.choice(AREAS), end - window + 1, end)
+            result.top_keywords(10)
+            result.monthly_average_citations()
+        elapsed = (time.perf_counter() - started) / args.queries * 1000
+        print(f"{window:4d}-month window: {elapsed:6.2f} ms per query ({result.total_papers} papers)")
+
+    cells = sum(cube.keyword_counts.nbytes + cube.keyword_novelty.nbytes for cube in index.cubes.values())
+    print(f"indexed {args.documents} documents in {build:.1f}s ({args.documents / build:.0f} docs/s), "
+          f"keyword arrays {cells / 2 ** 20:.0f} MiB")
+
+
+if __name__ == '__main__':
+    main()
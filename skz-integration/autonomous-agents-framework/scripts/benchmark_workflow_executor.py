@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Workflow Executor Benchmark
+Compares the legacy engine (one thread per workflow, sequential stages with a
+fixed pause between them) against the bounded DAG executor, using a stub stage
+call with a fixed latency so only scheduling overhead differs. The legacy
+engine runs both unbounded and capped at the executor's thread budget.
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+AGENTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'agents')
+sys.path.insert(0, AGENTS_DIR)
+
+from workflow_orchestration_agent import WorkflowExecutor, WorkflowOrchestrationAgent, default_stage_concurrency
+
+
+def stub_stage(stage_latency):
+    def run(workflow_id, stage):
+        time.sleep(stage_latency)
+        return {'success': True}
+    return run
+
+
+def run_legacy(template, workflows, stage_latency, stage_pause, max_threads=None):
+    """Replica of the old engine: a thread per workflow, stages in order with a pause
+
+    With ``max_threads`` the same engine gets a fixed thread budget: that many
+    threads each run workflows one after another.
+    """
+    runner = stub_stage(stage_latency)
+    pending = list(range(workflows))
+    pending_lock = threading.Lock()
+
+    latencies = []
+
+    def execute(workflow_id, submitted):
+        for stage in template['stages']:
+            runner(workflow_id, stage)
+            time.sleep(stage_pause)
+        latencies.append(time.perf_counter() - submitted)
+
+    def drain():
+        while True:
+            with pending_lock:
+                if not pending:
+                    return
+                i = pending.pop()
+            execute(f"WF_{i}", start)
+
+    start = time.perf_counter()
+    if max_threads:
+        threads = [threading.Thread(target=drain, daemon=True) for _ in range(min(max_threads, workflows))]
+    else:
+        threads = [threading.Thread(target=execute, args=(f"WF_{i}", time.perf_counter()), daemon=True)
+                   for i in range(workflows)]
+    for thread in threads:
+        thread.start()
+    peak_threads = threading.active_count()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, peak_threads, sum(latencies) / len(latencies)
+
+
+def run_executor(template, workflows, stage_latency, max_workers):
+    finished = threading.Event()
+    remaining = [workflows]
+    submitted = {}
+    latencies = []
+    lock = threading.Lock()
+
+    def on_finished(workflow_id, status):
+        with lock:
+            latencies.append(time.perf_counter() - submitted[workflow_id])
+            remaining[0] -= 1
+            if remaining[0] == 0:
+                finished.set()
+
+    executor = WorkflowExecutor(stub_stage(stage_latency), lambda *args: None, on_finished,
+                                max_workers=max_workers)
+    executor.start()
+
+    start = time.perf_counter()
+    for i in range(workflows):
+        submitted[f"WF_{i}"] = time.perf_counter()
+        executor.submit(f"WF_{i}", 'benchmark', template, priority='normal')
+    peak_threads = threading.active_count()
+    finished.wait()
+    return time.perf_counter() - start, max(peak_threads, threading.active_count()), sum(latencies) / len(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the workflow executor')
+    parser.add_argument('--workflows', type=int, default=2000)
+    parser.add_argument('--stage-latency', type=float, default=0.01, help='Stub stage call latency in seconds')
+    parser.add_argument('--max-workers', type=int, default=None,
+                        help='Executor workers (default: default_stage_concurrency())')
+    args = parser.parse_args()
+    max_workers = args.max_workers or default_stage_concurrency()
+
+    template = WorkflowOrchestrationAgent.load_workflow_templates(None)['manuscript_submission']
+    # The legacy engine paused 2s between stages for ~1s stage calls; keep the same ratio
+    stage_pause = 2 * args.stage_latency
+
+    # Single workflow latency isolates the removed pauses and the parallel fan-out
+    _, _, legacy_single = run_legacy(template, 1, args.stage_latency, stage_pause)
+    _, _, executor_single = run_executor(template, 1, args.stage_latency, max_workers)
+    legacy_time, legacy_threads, legacy_latency = run_legacy(template, args.workflows, args.stage_latency, stage_pause)
+    capped_time, capped_threads, capped_latency = run_legacy(template, args.workflows, args.stage_latency, stage_pause,
+                                                             max_threads=max_workers)
+    executor_time, executor_threads, executor_latency = run_executor(template, args.workflows, args.stage_latency,
+                                                                     max_workers)
+
+    print(f"manuscript_submission, {args.stage_latency * 1000:.0f} ms per stage")
+    print(f"  single workflow latency: legacy {legacy_single * 1000:.1f} ms, "
+          f"DAG executor {executor_single * 1000:.1f} ms")
+    print(f"{args.workflows} concurrent workflows")
+    print(f"  legacy (thread per workflow)  {legacy_time:6.2f}s  {args.workflows / legacy_time:8.1f} wf/s  "
+          f"mean latency {legacy_latency * 1000:7.1f} ms  peak threads {legacy_threads}")
+    print(f"  legacy ({max_workers} threads)        {capped_time:6.2f}s  {args.workflows / capped_time:8.1f} wf/s  "
+          f"mean latency {capped_latency * 1000:7.1f} ms  peak threads {capped_threads}")
+    print(f"  DAG executor ({max_workers} workers)  {executor_time:6.2f}s  "
+          f"{args.workflows / executor_time:8.1f} wf/s  mean latency {executor_latency * 1000:7.1f} ms  "
+          f"peak threads {executor_threads}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Workflow Scheduler Benchmark
+Times WorkflowOptimizer schedule generation on layered random DAGs against a
+replica of the previous implementation (linear task lookup per task,
+dependency list rebuilt per edge, full agent scan per task).
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import networkx as nx
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from models.workflow_optimizer import (
+    AgentResource, TaskPriority, WorkflowDefinition, WorkflowOptimizer, WorkflowStatus, WorkflowTask, logger
+)
+
+
+class LegacyWorkflowOptimizer(WorkflowOptimizer):
+    """Previous scheduling implementation, kept for comparison"""
+
+    async def _build_dependency_graph(self, tasks: List[WorkflowTask]) -> nx.DiGraph:
+        graph = nx.DiGraph()
+        for task in tasks:
+            graph.add_node(task.task_id, task_data=task)
+        for task in tasks:
+            for dependency in task.dependencies:
+                if dependency in [t.task_id for t in tasks]:
+                    graph.add_edge(dependency, task.task_id)
+        return graph
+
+    async def _generate_optimal_schedule(self,
+                                       workflow: WorkflowDefinition,
+                                       agents: List[AgentResource],
+                                       dependency_graph: nx.DiGraph) -> List[Dict[str, Any]]:
+        """Generate optimal task execution schedule"""
+
+        schedule = []
+
+        try:
+            # Get topological order for dependency constraints
+            execution_order = list(nx.topological_sort(dependency_graph))
+
+            # Create agent availability tracking
+            agent_availability = {}
+            for agent in agents:
+                agent_availability[agent.agent_id] = {
+                    'next_free_time': 0,
+                    'current_tasks': [],
+                    'capacity_remaining': agent.max_capacity - agent.current_load
+                }
+
+            # Schedule tasks in dependency order
+            scheduled_tasks = {}
+            current_time = 0
+
+            for task_id in execution_order:
+                task = next(t for t in workflow.tasks if t.task_id == task_id)
+
+                # Find best agent for this task
+                best_agent = await self._find_best_agent(task, agents, agent_availability)
+
+                if best_agent:
+                    # Calculate start time based on dependencies and agent availability
+                    dependency_completion_time = 0
+                    for dep_id in task.dependencies:
+                        if dep_id in scheduled_tasks:
+                            dependency_completion_time = max(
+                                dependency_completion_time,
+                                scheduled_tasks[dep_id]['end_time']
+                            )
+
+                    start_time = max(
+                        dependency_completion_time,
+                        agent_availability[best_agent.agent_id]['next_free_time']
+                    )
+
+                    end_time = start_time + task.estimated_duration
+
+                    # Schedule the task
+                    schedule_entry = {
+                        'task_id': task.task_id,
+                        'agent_id': best_agent.agent_id,
+                        'start_time': start_time,
+                        'end_time': end_time,
+                        'duration': task.estimated_duration,
+                        'priority': task.priority.value,
+                        'dependencies_met': all(dep in scheduled_tasks for dep in task.dependencies)
+                    }
+
+                    schedule.append(schedule_entry)
+                    scheduled_tasks[task_id] = schedule_entry
+
+                    # Update agent availability
+                    agent_availability[best_agent.agent_id]['next_free_time'] = end_time
+                    agent_availability[best_agent.agent_id]['capacity_remaining'] -= 1
+
+                else:
+                    logger.warning(f"No suitable agent found for task {task_id}")
+
+            # Sort schedule by start time
+            schedule.sort(key=lambda x: x['start_time'])
+
+        except Exception as e:
+            logger.error(f"Error generating schedule: {e}")
+
+        return schedule
+
+    async def _find_best_agent(self, task: WorkflowTask, agents: List[AgentResource], availability: Dict) -> Optional[AgentResource]:
+        """Find best agent for a task"""
+
+        suitable_agents = []
+
+        for agent in agents:
+            # Check if agent can handle this task type
+            if (task.agent_id == agent.agent_id or
+                task.agent_id in agent.capabilities or
+                agent.agent_type in task.resource_requirements.get('agent_types', [])):
+
+                # Check capacity
+                if availability[agent.agent_id]['capacity_remaining'] > 0:
+
+                    # Calculate suitability score
+                    score = 0.0
+
+                    # Success rate factor
+                    score += agent.success_rate * 0.4
+
+                    # Load factor (prefer less loaded agents)
+                    load_factor = 1.0 - (agent.current_load / agent.max_capacity)
+                    score += load_factor * 0.3
+
+                    # Speed factor
+                    if agent.avg_task_time > 0:
+                        speed_factor = min(1.0, task.estimated_duration / agent.avg_task_time)
+                        score += speed_factor * 0.3
+
+                    suitable_agents.append((agent, score))
+
+        # Return best agent
+        if suitable_agents:
+            suitable_agents.sort(key=lambda x: x[1], reverse=True)
+            return suitable_agents[0][0]
+
+        return None
+
+
+def build_workflow(task_count: int, agent_types: int, seed: int = 0) -> WorkflowDefinition:
+    """Layered DAG with up to three dependencies per task on earlier layers"""
+    rng = random.Random(seed)
+    layer_width = max(1, int(task_count ** 0.5))
+    tasks = []
+    for i in range(task_count):
+        layer_start = (i // layer_width) * layer_width
+        candidates = range(max(0, layer_start - layer_width), layer_start)
+        dependencies = [f"task_{d}" for d in rng.sample(candidates, min(len(candidates), rng.randint(0, 3)))]
+        tasks.append(WorkflowTask(
+            task_id=f"task_{i}", task_name=f"Task {i}", agent_id=f"capability_{rng.randrange(agent_types)}",
+            dependencies=dependencies, estimated_duration=rng.randint(5, 120),
+            priority=TaskPriority(rng.randint(1, 5)), deadline=None, resource_requirements={},
+            input_data={}, output_schema={}, retry_count=0, max_retries=2, status=WorkflowStatus.PENDING,
+            created_at=datetime.now().isoformat(), started_at=None, completed_at=None
+        ))
+    return WorkflowDefinition(
+        workflow_id="benchmark", workflow_name="Benchmark", description="", tasks=tasks, global_timeout=0,
+        parallel_limit=0, retry_policy={}, success_criteria={}, failure_handling={},
+        created_at=datetime.now().isoformat()
+    )
+
+
+def build_agents(agent_count: int, agent_types: int, capacity: int) -> List[AgentResource]:
+    # Legacy capacity is consumed per scheduled task, so it is sized to fit the whole workflow
+    return [
+        AgentResource(
+            agent_id=f"agent_{i}", agent_type="worker", current_load=0, max_capacity=capacity,
+            avg_task_time=60.0, success_rate=0.8 + (i % 20) / 100, last_active=datetime.now().isoformat(),
+            capabilities=[f"capability_{i % agent_types}"], status="online"
+        )
+        for i in range(agent_count)
+    ]
+
+
+async def time_schedule(optimizer: WorkflowOptimizer, workflow, agents):
+    start = time.perf_counter()
+    graph = await optimizer._build_dependency_graph(workflow.tasks)
+    schedule = await optimizer._generate_optimal_schedule(workflow, agents, graph)
+    return time.perf_counter() - start, schedule
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Benchmark workflow schedule generation')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 2500, 5000, 10000])
+    parser.add_argument('--agents', type=int, default=300)
+    parser.add_argument('--agent-types', type=int, default=30)
+    parser.add_argument('--legacy-limit', type=int, default=10000, help='Largest size to run the legacy version on')
+    args = parser.parse_args()
+
+    print(f"{'tasks':>7} {'legacy s':>9} {'legacy makespan':>16} {'indexed s':>10} {'indexed makespan':>17}")
+    for size in args.sizes:
+        workflow = build_workflow(size, args.agent_types)
+        legacy_agents = build_agents(args.agents, args.agent_types, capacity=size)
+        # The indexed scheduler treats capacity as concurrent slots
+        agents = build_agents(args.agents, args.agent_types, capacity=1)
+
+        elapsed, schedule = await time_schedule(WorkflowOptimizer({}), workflow, agents)
+        makespan = max(entry['end_time'] for entry in schedule)
+
+        if size <= args.legacy_limit:
+            legacy_elapsed, legacy_schedule = await time_schedule(LegacyWorkflowOptimizer({}), workflow, legacy_agents)
+            legacy = f"{legacy_elapsed:9.2f} {max(e['end_time'] for e in legacy_schedule):16d}"
+        else:
+            legacy = f"{'-':>9} {'-':>16}"
+        print(f"{size:7d} {legacy} {elapsed:10.3f} {makespan:17d}")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -11,6 +11,8 @@ from datetime import datetime, timedelta
 import random
 import time
 
+from serialization import install_json_provider, flask_list_response
+
 # Import manuscript automation components
 from routes.manuscript_automation_api import manuscript_automation_bp, init_automation
 
@@ -24,6 +26,7 @@ except ImportError as e:
 
 app = Flask(__name__)
 CORS(app)
+install_json_provider(app)
 
 # Register manuscript automation blueprint
 app.register_blueprint(manuscript_automation_bp)
@@ -562,8 +565,7 @@ def trigger_agent_action(agent_type):
 @app.route('/api/v1/manuscripts', methods=['GET'])
 def list_manuscripts():
     """List all manuscripts"""
-    return jsonify({
-        'manuscripts': manuscripts_data,
+    return flask_list_response('manuscripts', manuscripts_data, {
         'total_count': len(manuscripts_data)
     })
 
@@ -14,6 +14,8 @@ import asyncio
 import threading
 from concurrent.futures import ThreadPoolExecutor
 
+from serialization import install_json_provider
+
 # Import performance optimization components
 from performance_optimizer import PerformanceOptimizer, monitor_performance, AsyncOptimizer
 from performance_dashboard import performance_bp, performance_monitor
@@ -27,6 +29,7 @@ except ImportError:
 
 app = Flask(__name__)
 CORS(app)
+install_json_provider(app)
 
 # Initialize performance optimizer
 performance_optimizer = PerformanceOptimizer()
@@ -13,11 +13,14 @@ import time
 import os
 import sys
 
+from serialization import install_json_provider
+
 # Import the real-time notification service
 from realtime_notifications import RealtimeNotificationService
 
 app = Flask(__name__)
 CORS(app)
+install_json_provider(app)
 
 # Initialize real-time notifications
 realtime_service = RealtimeNotificationService()
@@ -11,8 +11,11 @@ from datetime import datetime, timedelta
 import random
 import time
 
+from serialization import install_json_provider, flask_list_response
+
 app = Flask(__name__)
 CORS(app)
+install_json_provider(app)
 
 # In-memory storage for demo purposes
 agents_data = {
@@ -557,8 +560,7 @@ def trigger_agent_action(agent_type):
 @app.route('/api/v1/manuscripts', methods=['GET'])
 def list_manuscripts():
     """List all manuscripts"""
-    return jsonify({
-        'manuscripts': manuscripts_data,
+    return flask_list_response('manuscripts', manuscripts_data, {
         'total_count': len(manuscripts_data)
     })
 
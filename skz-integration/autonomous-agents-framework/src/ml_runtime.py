@@ -0,0 +1,86 @@
+"""
+Lazy ML Runtime Helpers
+Defers importing torch/transformers until a model is first used, and prepares
+trained torch models for CPU serving (inference mode, dynamic int8
+quantization, TorchScript/ONNX export).
+"""
+
+import copy
+import importlib
+import logging
+import os
+from functools import lru_cache
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def load_torch():
+    """Import and return the ``torch`` module on first use"""
+    logger.info("Loading torch runtime")
+    return importlib.import_module('torch')
+
+
+@lru_cache(maxsize=None)
+def load_transformers():
+    """Import and return the ``transformers`` module on first use"""
+    logger.info("Loading transformers runtime")
+    return importlib.import_module('transformers')
+
+
+def default_device():
+    """CUDA when available, otherwise CPU"""
+    torch = load_torch()
+    return torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+
+
+def quantize_for_cpu(model):
+    """Return a dynamically int8-quantized copy of ``model`` (LSTM/Linear layers)
+
+    Falls back to an unquantized eval-mode copy when the quantization backend
+    is unavailable on this platform.
+    """
+    torch = load_torch()
+    nn = torch.nn
+    model = copy.deepcopy(model).to('cpu').eval()
+
+    try:
+        from torch.ao.quantization import quantize_dynamic
+        return quantize_dynamic(model, {nn.LSTM, nn.Linear}, dtype=torch.qint8)
+    except Exception as e:
+        logger.warning(f"Dynamic quantization unavailable, serving float model: {e}")
+        return model
+
+
+def export_model(model, example_input, path: str, export_format: str = 'torchscript') -> str:
+    """Export ``model`` for serving as TorchScript (``.ts``) or ONNX (``.onnx``)
+
+    Returns the written file path. ONNX export needs the optional ``onnx``
+    package.
+    """
+    torch = load_torch()
+    model = model.eval()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    if export_format == 'torchscript':
+        target = path if path.endswith('.ts') else f"{path}.ts"
+        with torch.inference_mode():
+            traced = torch.jit.trace(model, example_input)
+        traced.save(target)
+    elif export_format == 'onnx':
+        target = path if path.endswith('.onnx') else f"{path}.onnx"
+        torch.onnx.export(model, (example_input,), target,
+                          input_names=['input'], output_names=['output'],
+                          dynamic_axes={'input': {0: 'batch'}, 'output': {0: 'batch'}})
+    else:
+        raise ValueError(f"Unsupported export format: {export_format}")
+
+    logger.info(f"Exported model to {target}")
+    return target
+
+
+def load_torchscript(path: str, device: Optional[Any] = None):
+    """Load a TorchScript model exported by ``export_model``"""
+    torch = load_torch()
+    return torch.jit.load(path, map_location=device or 'cpu').eval()
@@ -3,18 +3,20 @@ Communication Automation System for SKZ Autonomous Agents
 Advanced automated communication, notification, and escalation management
 """
 import asyncio
+import itertools
 import logging
 import json
 import os
-from typing import Dict, List, Optional, Any, Tuple
+import time
+from collections import defaultdict, deque
+from typing import Dict, Iterable, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 from enum import Enum
-import smtplib
 try:
-    from email.mime.text import MimeText
-    from email.mime.multipart import MimeMultipart
-    from email.mime.base import MimeBase
+    from email.mime.text import MIMEText as MimeText
+    from email.mime.multipart import MIMEMultipart as MimeMultipart
+    from email.mime.base import MIMEBase as MimeBase
 except ImportError:
     # Fallback for testing environments
     MimeText = None
@@ -23,8 +25,19 @@ except ImportError:
 from email import encoders
 import jinja2
 
+from .delivery_pipeline import DeliveryPipeline, SMTPConnectionPool
+from .escalation_scheduler import EscalationScheduler
+from .provider_clients import ProviderClientPool, ProviderHealth
+from .template_registry import TemplateRegistry
+
 logger = logging.getLogger(__name__)
 
+# Keeps message ids unique when many are created within one clock tick
+_message_sequence = itertools.count(1)
+
+# Scheduler rule id for moving a settled message out of sent_messages
+_ARCHIVE = '__archive__'
+
 class MessageType(Enum):
     EMAIL = "email"
     SMS = "sms"
@@ -125,16 +138,42 @@ class CommunicationAutomation:
         self.escalation_rules = {}
         self.notification_configs = {}
         self.message_queue = []
+        
+        # Notification routing by (agent_id, event_type), recipients known
+        # without a lookup, and sliding-window send times per config/event
+        self._notification_routes: Dict[Tuple[str, str], List[NotificationConfig]] = {}
+        self.recipient_directory: Dict[str, Recipient] = {}
+        self.notification_window = config.get('notification_window_minutes', 60) * 60
+        self._notification_history: Dict[Tuple[str, str], deque] = {}
         self.sent_messages = {}
         
+        # Due (message, rule) escalations; messages with nothing left pending
+        # are archived after message_retention_minutes
+        self.escalations = EscalationScheduler()
+        self.message_retention = timedelta(minutes=config.get('message_retention_minutes', 60))
+        self.message_archive_path = config.get('message_archive_path')
+        self.archived_messages = 0
+        
         # Email configuration
         self.smtp_config = config.get('smtp', {})
+        self._smtp_pool: Optional[SMTPConnectionPool] = None
+        
+        # Provider clients are shared across the process; failover between
+        # configured providers follows their recent latency and error rate
+        self.provider_clients = ProviderClientPool.shared()
+        self.provider_health = ProviderHealth(**config.get('provider_health', {}))
+        
+        # Bounded, rate-limited delivery per provider
+        delivery_config = config.get('delivery', {})
+        self.delivery = DeliveryPipeline(delivery_config.get('providers'),
+                                         io_threads=delivery_config.get('io_threads', 16))
         
         # Template engine
         self.jinja_env = jinja2.Environment(
             loader=jinja2.BaseLoader(),
             autoescape=jinja2.select_autoescape()
         )
+        self.template_registry = TemplateRegistry(self.jinja_env)
         
         # Initialize default templates
         self._initialize_default_templates()
@@ -284,29 +323,13 @@ Automated Quality Monitoring System''',
                 raise ValueError(f"Template {template_id} not found")
             
             # Generate message content
-            subject = await self._render_template(template.subject_template, context_data)
-            body = await self._render_template(template.body_template, context_data)
+            subject, body = await self._render_message(template, context_data)
             
             # Apply personalization
             subject, body = await self._apply_personalization(template, recipient, subject, body)
             
             # Create message
-            message = CommunicationMessage(
-                message_id=f"msg_{datetime.now().timestamp()}",
-                template_id=template_id,
-                recipient=recipient,
-                sender_agent=template.agent_id,
-                subject=subject,
-                body=body,
-                message_type=template.message_type,
-                priority=priority,
-                scheduled_time=datetime.now().isoformat(),
-                sent_time=None,
-                status=CommunicationStatus.PENDING,
-                context_data=context_data,
-                attachments=[],
-                tracking_data={}
-            )
+            message = self._compose_message(template, recipient, context_data, subject, body, priority)
             
             # Check send conditions
             if await self._check_send_conditions(template, context_data):
@@ -325,7 +348,7 @@ Automated Quality Monitoring System''',
                 logger.info(f"Message {message.message_id} held due to send conditions")
             
             # Store message
-            self.sent_messages[message.message_id] = message
+            self._record_message(message)
             
             # Schedule follow-up if needed
             if template.follow_up_rules:
@@ -337,7 +360,7 @@ Automated Quality Monitoring System''',
             logger.error(f"Error sending message: {e}")
             # Create error message
             error_message = CommunicationMessage(
-                message_id=f"err_{datetime.now().timestamp()}",
+                message_id=f"err_{datetime.now().timestamp()}_{next(_message_sequence)}",
                 template_id=template_id,
                 recipient=recipient,
                 sender_agent="communication_system",
@@ -355,74 +378,328 @@ Automated Quality Monitoring System''',
             
             return error_message
     
-    async def send_bulk_messages(self, template_id: str, recipients: List[Recipient], context_data: Dict[str, Any]) -> List[CommunicationMessage]:
-        """Send bulk messages to multiple recipients"""
+    def _compose_message(self, template: CommunicationTemplate, recipient: Recipient, context_data: Dict[str, Any],
+                         subject: str, body: str, priority: MessagePriority) -> CommunicationMessage:
+        """Create a pending message from rendered content"""
+        return CommunicationMessage(
+            message_id=f"msg_{datetime.now().timestamp()}_{next(_message_sequence)}",
+            template_id=template.template_id,
+            recipient=recipient,
+            sender_agent=template.agent_id,
+            subject=subject,
+            body=body,
+            message_type=template.message_type,
+            priority=priority,
+            scheduled_time=datetime.now().isoformat(),
+            sent_time=None,
+            status=CommunicationStatus.PENDING,
+            context_data=context_data,
+            attachments=[],
+            tracking_data={}
+        )
+    
+    async def send_bulk_messages(self, template_id: str, recipients: List[Recipient], context_data: Dict[str, Any],
+                                 priority: MessagePriority = MessagePriority.MEDIUM) -> List[CommunicationMessage]:
+        """Send bulk messages to multiple recipients
         
-        messages = []
+        The template is rendered once for the shared context and personalised
+        per recipient. Delivery goes through the per-provider pipeline:
+        bounded workers, rate limits, pooled SMTP connections and one SendGrid
+        request per batch of recipients with identical content.
+        """
+        
+        template = self.templates.get(template_id)
+        if not template:
+            logger.error(f"Template {template_id} not found")
+            return [await self.send_message(template_id, recipient, context_data, priority) for recipient in recipients]
+        
+        subject, body = await self._render_message(template, context_data)
         
-        # Send messages concurrently
-        tasks = []
+        messages = []
         for recipient in recipients:
-            task = self.send_message(template_id, recipient, context_data)
-            tasks.append(task)
+            personalized_subject, personalized_body = await self._apply_personalization(
+                template, recipient, subject, body)
+            messages.append(self._compose_message(
+                template, recipient, context_data, personalized_subject, personalized_body, priority))
         
-        try:
-            messages = await asyncio.gather(*tasks, return_exceptions=True)
-        except Exception as e:
-            logger.error(f"Error in bulk message sending: {e}")
+        if await self._check_send_conditions(template, context_data):
+            outcomes = await self._deliver_bulk(messages)
+            sent_time = datetime.now().isoformat()
+            for message, success in zip(messages, outcomes):
+                if success:
+                    message.status = CommunicationStatus.SENT
+                    message.sent_time = sent_time
+                else:
+                    message.status = CommunicationStatus.FAILED
+        else:
+            logger.info(f"{len(messages)} messages held due to send conditions")
+        
+        for message in messages:
+            self._record_message(message)
+            if template.follow_up_rules:
+                await self._schedule_follow_up(message, template.follow_up_rules)
+        
+        sent = sum(1 for message in messages if message.status == CommunicationStatus.SENT)
+        logger.info(f"Bulk messaging complete: {sent}/{len(recipients)} messages sent")
         
-        # Filter successful messages
-        successful_messages = [msg for msg in messages if isinstance(msg, CommunicationMessage)]
+        return messages
+    
+    def _delivery_provider(self, message: CommunicationMessage, exclude: Iterable[str] = ()) -> Optional[str]:
+        """Provider that should deliver this message next, skipping ``exclude``; None when none is left"""
+        if message.message_type == MessageType.EMAIL:
+            providers = self.provider_health.order(self._email_providers()) or ['unconfigured']
+        elif message.message_type == MessageType.SMS:
+            providers = self.provider_health.order(self._sms_providers()) or ['unconfigured']
+        else:
+            providers = ['internal']
+        return next((provider for provider in providers if provider not in exclude), None)
+    
+    async def _deliver_bulk(self, messages: List[CommunicationMessage]) -> List[bool]:
+        """Deliver messages through the pipeline; returns success per message
         
-        logger.info(f"Bulk messaging complete: {len(successful_messages)}/{len(recipients)} messages sent")
+        Each round groups undelivered messages by the next provider to try and
+        runs every group under that provider's limits, so messages failing
+        over from one provider still respect the rate and concurrency limits
+        of the one they fall back to.
+        """
+        outcomes = [False] * len(messages)
+        tried = [set() for _ in messages]
+        pending = list(range(len(messages)))
         
-        return successful_messages
+        async def deliver_group(provider: str, indices: List[int]):
+            if provider == 'sendgrid':
+                batches = self._sendgrid_batches(messages, indices)
+            else:
+                batches = [[index] for index in indices]
+            
+            async def send_batch(batch: List[int]) -> List[bool]:
+                return await self._deliver_via(provider, [messages[index] for index in batch])
+            
+            results = await self.delivery.deliver(provider, batches, send_batch)
+            for batch, result in zip(batches, results):
+                for index, success in zip(batch, result):
+                    outcomes[index] = success
+                    tried[index].add(provider)
+        
+        while pending:
+            groups = defaultdict(list)
+            for index in pending:
+                provider = self._delivery_provider(messages[index], tried[index])
+                if provider is not None:
+                    groups[provider].append(index)
+            if not groups:
+                break
+            await asyncio.gather(*(deliver_group(provider, indices) for provider, indices in groups.items()))
+            pending = [index for indices in groups.values() for index in indices if not outcomes[index]]
+        return outcomes
+    
+    async def _deliver_via(self, provider: str, messages: List[CommunicationMessage]) -> List[bool]:
+        """Deliver through one provider only, recording its health; failures are left for the next round"""
+        if provider in ('internal', 'unconfigured'):
+            return [await self._deliver_message(message) for message in messages]
+        if provider == 'sendgrid':
+            started = time.perf_counter()
+            try:
+                results = await self._send_sendgrid_batch(messages)
+            except Exception as e:
+                logger.error(f"SendGrid batch delivery error: {e}")
+                results = [False] * len(messages)
+            # One request carries the whole batch; record the cost per message so
+            # SendGrid compares fairly with providers that send one at a time
+            self.provider_health.record('sendgrid', all(results), (time.perf_counter() - started) / len(messages))
+            return results
+        
+        results = []
+        for message in messages:
+            try:
+                results.append(await self._send_recorded(provider, message))
+            except Exception as e:
+                logger.error(f"Message delivery error via {provider}: {e}")
+                results.append(False)
+        return results
+    
+    def _sendgrid_batches(self, messages: List[CommunicationMessage], indices: List[int]) -> List[List[int]]:
+        """Group messages with identical content into personalization batches"""
+        batch_size = self.delivery.limits_for('sendgrid')['batch_size']
+        by_content = defaultdict(list)
+        for index in indices:
+            by_content[(messages[index].subject, messages[index].body)].append(index)
+        return [
+            group[start:start + batch_size]
+            for group in by_content.values()
+            for start in range(0, len(group), batch_size)
+        ]
     
     async def setup_automated_notifications(self, config: NotificationConfig):
         """Setup automated notifications for agent events"""
         
         self.notification_configs[config.config_id] = config
+        self.rebuild_notification_routes()
         logger.info(f"Setup automated notifications for {config.agent_id}")
+    
+    async def remove_automated_notifications(self, config_id: str) -> bool:
+        """Remove a notification configuration"""
+        
+        config = self.notification_configs.pop(config_id, None)
+        if config is None:
+            return False
+        for key in [key for key in self._notification_history if key[0] == config_id]:
+            del self._notification_history[key]
+        self.rebuild_notification_routes()
+        return True
+    
+    def rebuild_notification_routes(self):
+        """Index notification configs by (agent_id, event_type)
         
-    async def trigger_notification(self, agent_id: str, event_type: str, event_data: Dict[str, Any]):
+        Runs on every setup/remove; call it after editing a registered
+        config's agent_id or event_types in place.
+        """
+        
+        routes = defaultdict(list)
+        for config in self.notification_configs.values():
+            for event_type in dict.fromkeys(config.event_types):
+                routes[(config.agent_id, event_type)].append(config)
+        self._notification_routes = dict(routes)
+    
+    def register_recipients(self, recipients: Iterable[Recipient]):
+        """Make recipients available to notifications without a lookup"""
+        
+        for recipient in recipients:
+            self.recipient_directory[recipient.recipient_id] = recipient
+        
+    async def trigger_notification(self, agent_id: str, event_type: str, event_data: Dict[str, Any]) -> List[CommunicationMessage]:
         """Trigger automated notification based on agent event"""
         
         # Find applicable notification configs
-        applicable_configs = []
-        for config in self.notification_configs.values():
-            if config.agent_id == agent_id and event_type in config.event_types and config.enabled:
-                applicable_configs.append(config)
+        applicable_configs = [
+            config for config in self._notification_routes.get((agent_id, event_type), ())
+            if config.enabled
+        ]
         
+        sends = []
         for config in applicable_configs:
-            # Check frequency limits
-            if await self._check_frequency_limits(config, event_type):
-                # Check quiet hours
-                if await self._check_quiet_hours(config):
-                    # Send notifications
-                    template_id = config.templates.get(event_type)
-                    if template_id:
-                        for recipient_id in config.recipients:
-                            # Get recipient details
-                            recipient = await self._get_recipient_by_id(recipient_id)
-                            if recipient:
-                                await self.send_message(template_id, recipient, event_data, MessagePriority.MEDIUM)
+            template_id = config.templates.get(event_type)
+            # Check frequency limits and quiet hours
+            if template_id and await self._check_frequency_limits(config, event_type) \
+                    and await self._check_quiet_hours(config):
+                self._record_notification(config, event_type)
+                sends.append((template_id, config.recipients))
+        
+        if not sends:
+            return []
+        
+        # Resolve every recipient once, then fan out through the bulk path
+        recipients = await self._get_recipients_by_ids(
+            recipient_id for _, recipient_ids in sends for recipient_id in recipient_ids)
+        results = await asyncio.gather(*(
+            self.send_bulk_messages(
+                template_id,
+                [recipients[recipient_id] for recipient_id in recipient_ids if recipient_id in recipients],
+                event_data,
+                MessagePriority.MEDIUM
+            )
+            for template_id, recipient_ids in sends
+        ))
+        return [message for messages in results for message in messages]
     
     async def setup_escalation_rule(self, rule: EscalationRule):
         """Setup automatic escalation rule"""
         
         self.escalation_rules[rule.rule_id] = rule
+        
+        # Messages already awaiting a response are covered too
+        for message in self.sent_messages.values():
+            self._schedule_escalation(message, rule)
         logger.info(f"Setup escalation rule {rule.rule_id}")
     
-    async def check_escalations(self):
-        """Check for pending escalations"""
+    def _record_message(self, message: CommunicationMessage):
+        """Store a message and schedule its escalations"""
+        
+        self.sent_messages[message.message_id] = message
+        for rule in self.escalation_rules.values():
+            self._schedule_escalation(message, rule)
+        self._archive_when_settled(message, datetime.now())
+    
+    def _schedule_escalation(self, message: CommunicationMessage, rule: EscalationRule,
+                             after: Optional[datetime] = None):
+        if rule.trigger_condition != "no_response" or not message.sent_time:
+            return
+        if message.tracking_data.get('responded_at'):
+            return
+        if message.tracking_data.get('escalation_count', 0) >= rule.max_escalations:
+            return
+        
+        start = after or datetime.fromisoformat(message.sent_time)
+        due = start + timedelta(minutes=rule.escalation_delay)
+        self.escalations.schedule(message.message_id, rule.rule_id, due.timestamp())
+        self.escalations.cancel(message.message_id, _ARCHIVE)
+    
+    def _archive_when_settled(self, message: CommunicationMessage, current_time: datetime):
+        """Schedule archiving once no escalation for the message is pending"""
+        
+        if not self.escalations.pending(message.message_id):
+            archive_time = current_time + self.message_retention
+            self.escalations.schedule(message.message_id, _ARCHIVE, archive_time.timestamp())
+    
+    async def record_response(self, message_id: str, response_data: Optional[Dict[str, Any]] = None) -> bool:
+        """Record a recipient's response and cancel the message's escalations"""
+        
+        message = self.sent_messages.get(message_id)
+        if not message:
+            return False
         
         current_time = datetime.now()
+        message.tracking_data['responded_at'] = current_time.isoformat()
+        if response_data:
+            message.tracking_data['response'] = response_data
         
-        for message in self.sent_messages.values():
-            # Check if message needs escalation
-            for rule in self.escalation_rules.values():
-                if await self._should_escalate(message, rule, current_time):
-                    await self._perform_escalation(message, rule)
+        cancelled = self.escalations.cancel(message_id)
+        self._archive_when_settled(message, current_time)
+        logger.info(f"Response recorded for message {message_id}, {cancelled} escalations cancelled")
+        return True
+    
+    async def check_escalations(self, current_time: Optional[datetime] = None):
+        """Check for pending escalations
+        
+        Only (message, rule) pairs that have come due are evaluated, so a
+        check costs time proportional to the due entries, not to every
+        message ever sent.
+        """
+        
+        current_time = current_time or datetime.now()
+        archived = []
+        
+        for message_id, rule_id in self.escalations.pop_due(current_time.timestamp()):
+            message = self.sent_messages.get(message_id)
+            if not message:
+                continue
+            if rule_id == _ARCHIVE:
+                archived.append(self.sent_messages.pop(message_id))
+                continue
+            
+            rule = self.escalation_rules.get(rule_id)
+            if rule and await self._should_escalate(message, rule, current_time):
+                await self._perform_escalation(message, rule)
+                # Escalate again after another delay while escalations remain
+                self._schedule_escalation(message, rule, after=current_time)
+            self._archive_when_settled(message, current_time)
+        
+        if archived:
+            self._archive_messages(archived)
+    
+    def _archive_messages(self, messages: List[CommunicationMessage]):
+        """Drop settled messages from memory, appending them to the archive file if configured"""
+        
+        self.archived_messages += len(messages)
+        if not self.message_archive_path:
+            return
+        try:
+            with open(self.message_archive_path, 'a') as archive:
+                for message in messages:
+                    archive.write(json.dumps(asdict(message), default=lambda value: getattr(value, 'value', str(value))))
+                    archive.write('\n')
+        except OSError as e:
+            logger.error(f"Failed to archive {len(messages)} messages: {e}")
     
     async def _render_template(self, template_str: str, context: Dict[str, Any]) -> str:
         """Render Jinja2 template with context"""
@@ -434,6 +711,35 @@ Automated Quality Monitoring System''',
             logger.error(f"Template rendering error: {e}")
             return template_str
     
+    def _render_field(self, template: CommunicationTemplate, field: str, source: str, context: Dict[str, Any]) -> str:
+        try:
+            return self.template_registry.compiled(template.template_id, field, source).render(context)
+        except Exception as e:
+            logger.error(f"Template rendering error: {e}")
+            return source
+    
+    async def _render_message(self, template: CommunicationTemplate, context: Dict[str, Any]) -> Tuple[str, str]:
+        """Subject and body of a template, compiled once per template version"""
+        return (self._render_field(template, 'subject', template.subject_template, context),
+                self._render_field(template, 'body', template.body_template, context))
+    
+    async def render_many(self, template_id: str, contexts: List[Dict[str, Any]]) -> List[Tuple[str, str]]:
+        """Render a template's subject and body for many contexts in one call
+        
+        Parts of the template that only read values shared by every context
+        are rendered once for the batch.
+        """
+        
+        template = self.templates.get(template_id)
+        if not template:
+            raise ValueError(f"Template {template_id} not found")
+        
+        try:
+            return self.template_registry.render_many(template, contexts)
+        except Exception as e:
+            logger.error(f"Batch rendering of {template_id} failed, rendering individually: {e}")
+            return [await self._render_message(template, context) for context in contexts]
+    
     async def _apply_personalization(self, template: CommunicationTemplate, recipient: Recipient, subject: str, body: str) -> Tuple[str, str]:
         """Apply personalization rules to message"""
         
@@ -495,58 +801,94 @@ Automated Quality Monitoring System''',
         """Send email message using production providers or mock"""
         
         # Check for production email providers
-        if self.config.get('email_providers', {}).get('sendgrid', {}).get('enabled'):
-            return await self._send_via_sendgrid(message)
-        elif self.config.get('email_providers', {}).get('ses', {}).get('enabled'):
-            return await self._send_via_ses(message)
-        elif self.smtp_config.get('enabled', False):
-            return await self._send_via_smtp(message)
-        else:
+        providers = self._email_providers()
+        if not providers:
             # PRODUCTION: No fallback to mock - must configure email service
             raise ValueError(
                 "Email service configuration required for production. "
                 "Configure SendGrid, Amazon SES, or SMTP for production deployment. "
                 "NEVER SACRIFICE QUALITY!! No mock fallbacks in production."
             )
+        return await self._send_with_failover(message, providers)
+    
+    def _email_providers(self) -> List[str]:
+        """Enabled email providers in configured preference order"""
+        email_providers = self.config.get('email_providers', {})
+        providers = [name for name in ('sendgrid', 'ses') if email_providers.get(name, {}).get('enabled')]
+        if self.smtp_config.get('enabled', False):
+            providers.append('smtp')
+        return providers
+    
+    def _sms_providers(self) -> List[str]:
+        """Enabled SMS providers in configured preference order"""
+        return ['twilio'] if self.config.get('sms_providers', {}).get('twilio', {}).get('enabled') else []
+    
+    async def _send_with_failover(self, message: CommunicationMessage, providers: List[str]) -> bool:
+        """Try providers in health order until one delivers, recording each outcome"""
+        last_error = None
+        for provider in self.provider_health.order(providers):
+            try:
+                if await self._send_recorded(provider, message):
+                    return True
+            except Exception as e:
+                last_error = e
+            logger.warning(f"{provider} could not deliver message {message.message_id}, trying next provider")
+        if last_error is not None:
+            raise last_error
+        return False
+    
+    async def _send_recorded(self, provider: str, message: CommunicationMessage) -> bool:
+        """Send through one provider and record the outcome in its health"""
+        started = time.perf_counter()
+        success = False
+        try:
+            success = await getattr(self, f"_send_via_{provider}")(message)
+            return success
+        finally:
+            self.provider_health.record(provider, success, time.perf_counter() - started)
     
     async def _send_via_sendgrid(self, message: CommunicationMessage) -> bool:
         """Send email via SendGrid (Production Implementation)"""
+        return (await self._send_sendgrid_batch([message]))[0]
+    
+    async def _send_sendgrid_batch(self, messages: List[CommunicationMessage]) -> List[bool]:
+        """Send messages with identical subject and body in one SendGrid request
+        
+        Each recipient gets its own personalization, so recipients do not see
+        each other and tracking args stay per message.
+        """
         try:
-            # Import SendGrid here to avoid dependency issues in development
-            try:
-                import sendgrid
-                from sendgrid.helpers.mail import Mail, Email, To, Content
-            except ImportError:
-                logger.warning("SendGrid library not installed, falling back to mock")
-                raise ValueError("SendGrid library not installed. Install sendgrid package for production email delivery.")
+            client = self.provider_clients.get('sendgrid', self.config['email_providers']['sendgrid'])
+            first = messages[0]
             
-            sg = sendgrid.SendGridAPIClient(
-                api_key=self.config['email_providers']['sendgrid']['api_key']
-            )
-            
-            from_email = Email(self.smtp_config.get('from_address'))
-            to_email = To(message.recipient.email)
-            subject = message.subject
-            content = Content("text/html", message.body)
-            
-            mail = Mail(from_email, to_email, subject, content)
-            
-            # Add custom headers for tracking
-            mail.custom_args = {
-                'message_id': message.message_id,
-                'agent_id': message.sender_agent,
-                'template_id': message.template_id
+            request_body = {
+                'from': {'email': self.smtp_config.get('from_address')},
+                'subject': first.subject,
+                'content': [{'type': 'text/html', 'value': first.body}],
+                'personalizations': [
+                    {
+                        'to': [{'email': message.recipient.email, 'name': message.recipient.name}],
+                        # Custom args for tracking
+                        'custom_args': {
+                            'message_id': message.message_id,
+                            'agent_id': message.sender_agent,
+                            'template_id': message.template_id
+                        }
+                    }
+                    for message in messages
+                ]
             }
             
-            response = sg.client.mail.send.post(request_body=mail.get())
+            response = await self.delivery.run_blocking(client.post, '/v3/mail/send', request_body)
             
             if response.status_code in [200, 202]:
-                await self._log_delivery_success(message, 'sendgrid', response.headers.get('X-Message-Id'))
-                logger.info(f"Email sent via SendGrid to {message.recipient.email}")
-                return True
+                for message in messages:
+                    await self._log_delivery_success(message, 'sendgrid', response.headers.get('X-Message-Id'))
+                logger.info(f"Email sent via SendGrid to {len(messages)} recipients")
+                return [True] * len(messages)
             else:
                 logger.error(f"SendGrid error: {response.status_code}")
-                return False
+                return [False] * len(messages)
                 
         except Exception as e:
             logger.error(f"SendGrid sending error: {e}")
@@ -556,29 +898,16 @@ Automated Quality Monitoring System''',
     async def _send_via_ses(self, message: CommunicationMessage) -> bool:
         """Send email via Amazon SES (Production Implementation)"""
         try:
-            # Import boto3 here to avoid dependency issues in development
-            try:
-                import boto3
-                from botocore.exceptions import ClientError
-            except ImportError:
-                logger.warning("boto3 library not installed, falling back to mock")
-                raise ValueError("boto3 library not installed. Install boto3 package for Amazon SES email delivery.")
-            
-            ses_client = boto3.client(
-                'ses',
-                region_name=self.config['email_providers']['ses']['region'],
-                aws_access_key_id=self.config['email_providers']['ses']['aws_access_key_id'],
-                aws_secret_access_key=self.config['email_providers']['ses']['aws_secret_access_key']
-            )
+            ses_client = self.provider_clients.get('ses', self.config['email_providers']['ses'])
             
-            response = ses_client.send_email(
+            response = await self.delivery.run_blocking(lambda: ses_client.send_email(
                 Source=self.smtp_config.get('from_address'),
                 Destination={'ToAddresses': [message.recipient.email]},
                 Message={
                     'Subject': {'Data': message.subject},
                     'Body': {'Html': {'Data': message.body}}
                 }
-            )
+            ))
             
             await self._log_delivery_success(message, 'ses', response['MessageId'])
             logger.info(f"Email sent via SES to {message.recipient.email}")
@@ -617,23 +946,8 @@ Automated Quality Monitoring System''',
                 except Exception as e:
                     logger.warning(f"Failed to attach file {attachment_path}: {e}")
             
-            # Send email
-            server = smtplib.SMTP(
-                self.smtp_config.get('host', 'localhost'),
-                self.smtp_config.get('port', 587)
-            )
-            
-            if self.smtp_config.get('use_tls', True):
-                server.starttls()
-            
-            if self.smtp_config.get('username'):
-                server.login(
-                    self.smtp_config.get('username'),
-                    self.smtp_config.get('password')
-                )
-            
-            server.sendmail(msg['From'], [msg['To']], msg.as_string())
-            server.quit()
+            # Send email on a pooled connection, off the event loop
+            await self.delivery.run_blocking(self._get_smtp_pool().send, msg['From'], [msg['To']], msg.as_string())
             
             logger.info(f"Email sent via SMTP to {message.recipient.email}")
             return True
@@ -642,6 +956,18 @@ Automated Quality Monitoring System''',
             logger.error(f"SMTP sending error: {e}")
             raise ValueError(f"SMTP sending error: {e}. Check SMTP configuration and credentials.")
     
+    def _get_smtp_pool(self) -> SMTPConnectionPool:
+        if self._smtp_pool is None:
+            self._smtp_pool = SMTPConnectionPool.from_config(self.smtp_config)
+        return self._smtp_pool
+    
+    async def close(self):
+        """Close pooled SMTP connections and the delivery thread pool"""
+        if self._smtp_pool is not None:
+            await self.delivery.run_blocking(self._smtp_pool.close)
+            self._smtp_pool = None
+        self.delivery.close()
+    
     # PRODUCTION IMPLEMENTATION: Mock functions removed for production deployment
     # Development testing should use test email services and proper API sandboxes
     # For development, use: export ENVIRONMENT=development and configure test services
@@ -674,43 +1000,38 @@ Automated Quality Monitoring System''',
         """Send SMS message using production provider or mock"""
         
         # Check for production SMS provider
-        if self.config.get('sms_providers', {}).get('twilio', {}).get('enabled'):
-            return await self._send_via_twilio(message)
-        else:
+        providers = self._sms_providers()
+        if not providers:
             # PRODUCTION: No fallback to mock - must configure SMS service
             raise ValueError(
                 "SMS service configuration required for production. "
                 "Configure Twilio or alternative SMS provider for production deployment. "
                 "NEVER SACRIFICE QUALITY!! No mock fallbacks in production."
             )
+        return await self._send_with_failover(message, providers)
     
     async def _send_via_twilio(self, message: CommunicationMessage) -> bool:
         """Send SMS via Twilio (Production Implementation)"""
         try:
-            # Import Twilio here to avoid dependency issues in development
-            try:
-                from twilio.rest import Client
-                from twilio.base.exceptions import TwilioException
-            except ImportError:
-                logger.warning("Twilio library not installed, falling back to mock")
-                raise ValueError("Twilio library not installed. Install twilio package for production SMS delivery.")
-            
-            client = Client(
-                self.config['sms_providers']['twilio']['account_sid'],
-                self.config['sms_providers']['twilio']['auth_token']
-            )
+            settings = self.config['sms_providers']['twilio']
+            client = self.provider_clients.get('twilio', settings)
             
             # Truncate message for SMS length limits
             sms_body = self._format_for_sms(message.body)
             
-            message_obj = client.messages.create(
-                body=sms_body,
-                from_=self.config['sms_providers']['twilio']['from_number'],
-                to=message.recipient.phone,
-                status_callback=f"{self.config.get('webhook_base_url', '')}/sms/status/{message.message_id}"
-            )
+            response = await self.delivery.run_blocking(lambda: client.post(
+                f"/2010-04-01/Accounts/{settings['account_sid']}/Messages.json",
+                data={
+                    'Body': sms_body,
+                    'From': settings['from_number'],
+                    'To': message.recipient.phone,
+                    'StatusCallback': f"{self.config.get('webhook_base_url', '')}/sms/status/{message.message_id}"
+                }
+            ))
+            if response.status_code >= 400:
+                raise ValueError(f"HTTP {response.status_code}: {response.text[:200]}")
             
-            await self._log_delivery_success(message, 'twilio', message_obj.sid)
+            await self._log_delivery_success(message, 'twilio', response.json()['sid'])
             logger.info(f"SMS sent via Twilio to {message.recipient.phone}")
             return True
             
@@ -763,16 +1084,30 @@ Automated Quality Monitoring System''',
         logger.info(f"Follow-up scheduled for message {message.message_id}")
     
     async def _check_frequency_limits(self, config: NotificationConfig, event_type: str) -> bool:
-        """Check if message frequency limits are met"""
+        """Check if message frequency limits are met
+        
+        Counts notifications for this config and event type within the last
+        notification_window_minutes (sliding window).
+        """
         
         # Check frequency limits for event type
         limit = config.frequency_limits.get(event_type, 999)  # Default high limit
         
-        # Count recent messages (this would check actual message history)
-        recent_count = 0  # Simplified
+        history = self._notification_history.get((config.config_id, event_type))
+        if history:
+            cutoff = time.monotonic() - self.notification_window
+            while history and history[0] <= cutoff:
+                history.popleft()
+        recent_count = len(history) if history else 0
         
         return recent_count < limit
     
+    def _record_notification(self, config: NotificationConfig, event_type: str):
+        key = (config.config_id, event_type)
+        if key not in self._notification_history:
+            self._notification_history[key] = deque()
+        self._notification_history[key].append(time.monotonic())
+    
     async def _check_quiet_hours(self, config: NotificationConfig) -> bool:
         """Check if current time is within quiet hours"""
         
@@ -792,6 +1127,24 @@ Automated Quality Monitoring System''',
             # Quiet hours span midnight
             return not (current_hour >= start_hour or current_hour <= end_hour)
     
+    async def _get_recipients_by_ids(self, recipient_ids: Iterable[str]) -> Dict[str, Recipient]:
+        """Look up many recipients at once
+        
+        Registered recipients come from the directory; the rest are looked up
+        concurrently. Unknown ids are left out.
+        """
+        
+        recipient_ids = list(dict.fromkeys(recipient_ids))
+        found = {
+            recipient_id: self.recipient_directory[recipient_id]
+            for recipient_id in recipient_ids if recipient_id in self.recipient_directory
+        }
+        missing = [recipient_id for recipient_id in recipient_ids if recipient_id not in found]
+        if missing:
+            looked_up = await asyncio.gather(*(self._get_recipient_by_id(recipient_id) for recipient_id in missing))
+            found.update((recipient_id, recipient) for recipient_id, recipient in zip(missing, looked_up) if recipient)
+        return found
+    
     async def _get_recipient_by_id(self, recipient_id: str) -> Optional[Recipient]:
         """Get recipient details by ID"""
         
@@ -814,7 +1167,7 @@ Automated Quality Monitoring System''',
         """Check if message should be escalated"""
         
         # Check if escalation condition is met
-        if rule.trigger_condition == "no_response":
+        if rule.trigger_condition == "no_response" and not message.tracking_data.get('responded_at'):
             # Check if enough time has passed since sending
             if message.sent_time:
                 sent_time = datetime.fromisoformat(message.sent_time)
@@ -840,15 +1193,14 @@ Automated Quality Monitoring System''',
             }
             
             # Send escalation to each recipient
-            for recipient_id in rule.escalation_recipients:
-                recipient = await self._get_recipient_by_id(recipient_id)
-                if recipient:
-                    await self.send_message(
-                        rule.escalation_template,
-                        recipient,
-                        escalation_context,
-                        MessagePriority.HIGH
-                    )
+            recipients = await self._get_recipients_by_ids(rule.escalation_recipients)
+            if recipients:
+                await self.send_bulk_messages(
+                    rule.escalation_template,
+                    list(recipients.values()),
+                    escalation_context,
+                    MessagePriority.HIGH
+                )
             
             # Update escalation count
             message.tracking_data['escalation_count'] = message.tracking_data.get('escalation_count', 0) + 1
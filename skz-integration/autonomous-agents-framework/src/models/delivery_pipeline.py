@@ -0,0 +1,270 @@
+"""
+Delivery Pipeline for Bulk Communications
+Per-provider bounded worker pools with token-bucket rate limiting, a pool of
+persistent SMTP connections, and a thread pool that keeps blocking provider
+I/O off the event loop
+"""
+
+import asyncio
+import logging
+import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# Concurrency, rate (calls/second, None for unlimited) and batch size per provider
+DEFAULT_PROVIDER_LIMITS = {
+    'smtp': {'concurrency': 4, 'rate_per_second': None, 'batch_size': 1},
+    'sendgrid': {'concurrency': 4, 'rate_per_second': None, 'batch_size': 1000},
+    'ses': {'concurrency': 8, 'rate_per_second': 14, 'batch_size': 1},
+    'twilio': {'concurrency': 4, 'rate_per_second': 10, 'batch_size': 1},
+    'internal': {'concurrency': 32, 'rate_per_second': None, 'batch_size': 1},
+}
+
+
+class DeliveryError(Exception):
+    """Raised when the pipeline cannot hand a message to a provider"""
+
+
+class TokenBucket:
+    """Async token bucket: ``rate`` tokens per second, bursts of up to ``capacity``"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1.0)
+        self.tokens = self.capacity
+        self.clock = clock
+        self.updated = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, tokens: float = 1.0):
+        """Wait until ``tokens`` are available and take them; waiters are served in order"""
+        async with self._lock:
+            self._refill()
+            while self.tokens < tokens:
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= tokens
+
+
+class SMTPConnectionPool:
+    """
+    Reusable, authenticated SMTP connections for worker threads
+
+    Connections are opened lazily up to ``size`` and kept across messages;
+    each is replaced after ``max_messages`` sends or if the server drops it.
+    ``send`` blocks, so call it from a thread. Callers wait on a condition
+    that both returned and discarded connections signal, and get a
+    ``DeliveryError`` if nothing frees up within ``timeout``.
+    """
+
+    def __init__(self, host: str = 'localhost', port: int = 587, use_tls: bool = True,
+                 username: Optional[str] = None, password: Optional[str] = None, size: int = 4,
+                 max_messages: int = 100, timeout: float = 30.0, smtp_factory: Callable[..., Any] = smtplib.SMTP):
+        self.host = host
+        self.port = port
+        self.use_tls = use_tls
+        self.username = username
+        self.password = password
+        self.size = size
+        self.max_messages = max_messages
+        self.timeout = timeout
+        self.smtp_factory = smtp_factory
+
+        self._idle: List[List[Any]] = []
+        self._available = threading.Condition()
+        self._open = 0
+        self._closed = False
+        self.connections_opened = 0
+        self.messages_sent = 0
+
+    @classmethod
+    def from_config(cls, smtp_config: Dict[str, Any], **overrides) -> 'SMTPConnectionPool':
+        options = {
+            'host': smtp_config.get('host', 'localhost'),
+            'port': smtp_config.get('port', 587),
+            'use_tls': smtp_config.get('use_tls', True),
+            'username': smtp_config.get('username'),
+            'password': smtp_config.get('password'),
+            'size': smtp_config.get('pool_size', 4),
+            'max_messages': smtp_config.get('max_messages_per_connection', 100),
+            'timeout': smtp_config.get('timeout', 30.0),
+        }
+        options.update(overrides)
+        return cls(**options)
+
+    def _connect(self) -> List[Any]:
+        server = self.smtp_factory(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                server.starttls()
+            if self.username:
+                server.login(self.username, self.password)
+        except Exception:
+            server.close()
+            raise
+        self.connections_opened += 1
+        return [server, 0]
+
+    def _checkout(self) -> List[Any]:
+        """Most recently used idle connection, else a new one while under ``size``"""
+        deadline = time.monotonic() + self.timeout
+        with self._available:
+            while not self._idle and self._open >= self.size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise DeliveryError(f"No SMTP connection to {self.host} became free within {self.timeout}s")
+                self._available.wait(remaining)
+            if self._idle:
+                return self._idle.pop()
+            self._open += 1
+        try:
+            return self._connect()
+        except Exception:
+            self._free_slot()
+            raise
+
+    def _free_slot(self):
+        """Give back a connection slot and wake a waiter to open a fresh one"""
+        with self._available:
+            self._open -= 1
+            self._available.notify()
+
+    def _discard(self, connection: List[Any]):
+        self._free_slot()
+        try:
+            connection[0].quit()
+        except Exception:
+            try:
+                connection[0].close()
+            except Exception:
+                pass
+
+    def send(self, from_address: str, to_addresses: Sequence[str], message: str):
+        """Send one message on a pooled connection, retrying once if the server dropped it"""
+        connection = self._checkout()
+        try:
+            connection[0].sendmail(from_address, list(to_addresses), message)
+        except smtplib.SMTPServerDisconnected:
+            # Idle connections time out server-side; retry on another
+            self._discard(connection)
+            connection = self._checkout()
+            try:
+                connection[0].sendmail(from_address, list(to_addresses), message)
+            except Exception as e:
+                self._after_failure(connection, e)
+                raise
+        except Exception as e:
+            self._after_failure(connection, e)
+            raise
+
+        connection[1] += 1
+        self.messages_sent += 1
+        self._release(connection)
+
+    def _after_failure(self, connection: List[Any], error: Exception):
+        # Message-level rejections leave the connection usable
+        if isinstance(error, (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError)):
+            self._release(connection)
+        else:
+            self._discard(connection)
+
+    def _release(self, connection: List[Any]):
+        if self._closed or connection[1] >= self.max_messages:
+            self._discard(connection)
+        else:
+            with self._available:
+                self._idle.append(connection)
+                self._available.notify()
+
+    def close(self):
+        self._closed = True
+        with self._available:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            self._discard(connection)
+
+
+class DeliveryPipeline:
+    """
+    Bounded, rate-limited delivery per provider
+
+    Each provider has a concurrency limit and an optional token bucket shared
+    by every caller, so simultaneous bulk sends cannot exceed the provider's
+    limits together. Blocking SDK and SMTP calls should go through
+    ``run_blocking``.
+    """
+
+    def __init__(self, provider_limits: Optional[Dict[str, Dict[str, Any]]] = None, io_threads: int = 16):
+        self.limits = {name: dict(limits) for name, limits in DEFAULT_PROVIDER_LIMITS.items()}
+        for name, limits in (provider_limits or {}).items():
+            self.limits.setdefault(name, dict(DEFAULT_PROVIDER_LIMITS['internal'])).update(limits)
+        self.executor = ThreadPoolExecutor(max_workers=io_threads, thread_name_prefix="delivery")
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._buckets: Dict[str, Optional[TokenBucket]] = {}
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def limits_for(self, provider: str) -> Dict[str, Any]:
+        return self.limits.get(provider, DEFAULT_PROVIDER_LIMITS['internal'])
+
+    def _semaphore(self, provider: str) -> asyncio.Semaphore:
+        if provider not in self._semaphores:
+            self._semaphores[provider] = asyncio.Semaphore(self.limits_for(provider)['concurrency'])
+        return self._semaphores[provider]
+
+    def _bucket(self, provider: str) -> Optional[TokenBucket]:
+        if provider not in self._buckets:
+            limits = self.limits_for(provider)
+            rate = limits.get('rate_per_second')
+            self._buckets[provider] = TokenBucket(rate, limits.get('burst')) if rate else None
+        return self._buckets[provider]
+
+    async def run_blocking(self, function: Callable[..., T], *args) -> T:
+        """Run a blocking call on the delivery thread pool"""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+
+    async def deliver(self, provider: str, batches: Sequence[List[T]],
+                      send_batch: Callable[[List[T]], Awaitable[List[bool]]]) -> List[List[bool]]:
+        """
+        Send ``batches`` through ``send_batch`` within the provider's limits
+
+        Returns one list of per-item results per batch, in input order; a
+        batch whose send raises counts as failed for every item.
+        """
+        results: List[List[bool]] = [[] for _ in batches]
+        stats = self.stats.setdefault(provider, {'calls': 0, 'sent': 0, 'failed': 0})
+        semaphore, bucket = self._semaphore(provider), self._bucket(provider)
+        pending = iter(range(len(batches)))
+
+        async def worker():
+            for index in pending:
+                batch = batches[index]
+                async with semaphore:
+                    if bucket:
+                        await bucket.acquire()
+                    try:
+                        outcome = list(await send_batch(batch))
+                    except Exception as e:
+                        logger.error(f"{provider} delivery of {len(batch)} messages failed: {e}")
+                        outcome = [False] * len(batch)
+                stats['calls'] += 1
+                stats['sent'] += sum(outcome)
+                stats['failed'] += len(outcome) - sum(outcome)
+                results[index] = outcome
+
+        workers = min(self.limits_for(provider)['concurrency'], len(batches))
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        return results
+
+    def close(self):
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,177 @@
+"""
+Embedding Service - Off-Loop, Micro-Batched Text Encoding
+Runs sentence encoders in a worker pool so async request handlers never block
+the event loop, and coalesces encode requests that arrive within a few
+milliseconds of each other into one batched ``encode`` call
+"""
+
+import asyncio
+import logging
+import time
+from collections import Counter
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def _load_model(model_name: str):
+    """Load a sentence-transformers model once per worker process"""
+    from sentence_transformers import SentenceTransformer
+    logger.info(f"Loading embedding model {model_name}")
+    return SentenceTransformer(model_name)
+
+
+def _encode_batch(model: Union[str, Any], texts: List[str]) -> np.ndarray:
+    """Encode ``texts`` in one call; ``model`` may be a model name (process pools)"""
+    if isinstance(model, str):
+        model = _load_model(model)
+    embeddings = model.encode(texts, batch_size=len(texts), convert_to_numpy=True, show_progress_bar=False)
+    return np.asarray(embeddings).reshape(len(texts), -1)
+
+
+class EmbeddingService:
+    """
+    Batched encoder shared by concurrent coroutines
+
+    ``encode`` queues a text and returns an awaitable future. Queued texts are
+    sent to the pool as one batch once ``max_batch_size`` is reached or
+    ``max_wait_ms`` has passed since the first of them arrived. While all
+    workers are busy, new texts keep accumulating, so batches grow with load.
+
+    ``model`` is either an encoder object (shared by worker threads) or a
+    sentence-transformers model name, which each worker loads itself. Pass a
+    ``ProcessPoolExecutor`` as ``executor`` to encode in other processes; this
+    requires a model name.
+    """
+
+    def __init__(self, model: Union[str, Any], max_batch_size: int = 64, max_wait_ms: float = 5.0,
+                 executor: Optional[Executor] = None, max_workers: int = 1):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_workers = max_workers
+        self._owns_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor(max_workers=max_workers,
+                                                       thread_name_prefix="embedding")
+
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._in_flight = 0
+        self._in_flight_texts = 0
+
+        self.batches = 0
+        self.encoded = 0
+        self.failed_batches = 0
+        self.encode_seconds = 0.0
+        self.last_batch_size = 0
+        self.largest_batch_size = 0
+        self.batch_sizes: Counter = Counter()
+
+    def encode(self, text: str) -> asyncio.Future:
+        """Queue ``text``; the returned future resolves to its embedding (1-D array)"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._dispatch()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait, self._on_timer)
+        return future
+
+    async def encode_many(self, texts: List[str]) -> np.ndarray:
+        """Embeddings for several texts, batched with other callers"""
+        if not texts:
+            return np.empty((0, 0))
+        return np.stack(await asyncio.gather(*(self.encode(text) for text in texts)))
+
+    def _on_timer(self):
+        self._flush_handle = None
+        self._dispatch()
+
+    def _dispatch(self):
+        """Send queued texts to the pool, one batch per free worker"""
+        while self._pending and self._in_flight < self.max_workers:
+            batch = self._pending[:self.max_batch_size]
+            del self._pending[:self.max_batch_size]
+            # Drop requests whose callers have gone away
+            batch = [(text, future) for text, future in batch if not future.cancelled()]
+            if batch:
+                self._start_batch(batch)
+
+        if self._flush_handle is not None and not self._pending:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+    def _start_batch(self, batch: List[Tuple[str, asyncio.Future]]):
+        loop = asyncio.get_running_loop()
+        self._in_flight += 1
+        self._in_flight_texts += len(batch)
+        started = time.perf_counter()
+        task = loop.run_in_executor(self.executor, _encode_batch, self.model, [text for text, _ in batch])
+        task.add_done_callback(lambda done: self._finish_batch(batch, done, started))
+
+    def _finish_batch(self, batch: List[Tuple[str, asyncio.Future]], done: asyncio.Future, started: float):
+        self._in_flight -= 1
+        self._in_flight_texts -= len(batch)
+        self.encode_seconds += time.perf_counter() - started
+        self.batches += 1
+        self.last_batch_size = len(batch)
+        self.largest_batch_size = max(self.largest_batch_size, len(batch))
+        self.batch_sizes[len(batch)] += 1
+
+        error = done.exception()
+        if error is not None:
+            self.failed_batches += 1
+            logger.error(f"Embedding batch of {len(batch)} failed: {error}")
+        else:
+            self.encoded += len(batch)
+        for index, (_, future) in enumerate(batch):
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(done.result()[index])
+
+        # Texts queued while the workers were busy go out straight away
+        if self._pending and self._flush_handle is None:
+            self._dispatch()
+
+    @property
+    def queue_depth(self) -> int:
+        """Texts waiting for a worker"""
+        return len(self._pending)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue and batching statistics"""
+        return {
+            'queue_depth': self.queue_depth,
+            'in_flight_batches': self._in_flight,
+            'in_flight_texts': self._in_flight_texts,
+            'batches': self.batches,
+            'encoded': self.encoded,
+            'failed_batches': self.failed_batches,
+            'mean_batch_size': self.encoded / self.batches if self.batches else 0.0,
+            'last_batch_size': self.last_batch_size,
+            'largest_batch_size': self.largest_batch_size,
+            'batch_size_histogram': dict(sorted(self.batch_sizes.items())),
+            'mean_batch_seconds': self.encode_seconds / self.batches if self.batches else 0.0
+        }
+
+    def close(self):
+        """Fail queued requests and shut down the pool if this service created it"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        for _, future in self._pending:
+            if not future.done():
+                future.cancel()
+        self._pending.clear()
+        if self._owns_executor:
+            self.executor.shutdown(wait=False)
@@ -0,0 +1,93 @@
+"""
+Escalation Scheduler - Due-Time Heap for Message Escalations
+Holds one entry per (message, rule) pair keyed by the time it becomes due,
+so escalation checks only touch entries that are due
+"""
+
+import heapq
+import itertools
+from typing import Dict, List, Optional, Set, Tuple
+
+
+class EscalationScheduler:
+    """
+    Min-heap of due times for (message id, rule id) pairs
+
+    Scheduling is O(log n). Cancelling marks the entry dead in O(1); dead
+    entries are skipped when they reach the top and the heap is rebuilt
+    once they make up more than half of it. ``pop_due`` costs O(k log n)
+    for k due entries.
+    """
+
+    def __init__(self):
+        self._heap: List[list] = []
+        self._entries: Dict[Tuple[str, str], list] = {}
+        self._by_message: Dict[str, Set[str]] = {}
+        self._sequence = itertools.count()
+        self._dead = 0
+
+    def schedule(self, message_id: str, rule_id: str, due: float):
+        """Schedule a pair at ``due`` (a timestamp), replacing any existing entry"""
+        key = (message_id, rule_id)
+        if key in self._entries:
+            self._cancel(key)
+        entry = [due, next(self._sequence), message_id, rule_id, True]
+        self._entries[key] = entry
+        self._by_message.setdefault(message_id, set()).add(rule_id)
+        heapq.heappush(self._heap, entry)
+
+    def cancel(self, message_id: str, rule_id: Optional[str] = None) -> int:
+        """Cancel one pair, or every pair for the message; returns how many were pending"""
+        rule_ids = [rule_id] if rule_id is not None else list(self._by_message.get(message_id, ()))
+        cancelled = 0
+        for key in ((message_id, rule) for rule in rule_ids):
+            if key in self._entries:
+                self._cancel(key)
+                cancelled += 1
+        if self._dead > 64 and self._dead * 2 > len(self._heap):
+            self._compact()
+        return cancelled
+
+    def pop_due(self, now: float) -> List[Tuple[str, str]]:
+        """Remove and return pairs due at or before ``now``, earliest first"""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            if not entry[4]:
+                self._dead -= 1
+                continue
+            key = (entry[2], entry[3])
+            self._forget(key)
+            due.append(key)
+        return due
+
+    def pending(self, message_id: str, rule_id: Optional[str] = None) -> bool:
+        if rule_id is not None:
+            return (message_id, rule_id) in self._entries
+        return message_id in self._by_message
+
+    def next_due(self) -> Optional[float]:
+        while self._heap and not self._heap[0][4]:
+            heapq.heappop(self._heap)
+            self._dead -= 1
+        return self._heap[0][0] if self._heap else None
+
+    def _cancel(self, key: Tuple[str, str]):
+        self._forget(key)[4] = False
+        self._dead += 1
+
+    def _forget(self, key: Tuple[str, str]) -> list:
+        entry = self._entries.pop(key)
+        rules = self._by_message[key[0]]
+        rules.discard(key[1])
+        if not rules:
+            del self._by_message[key[0]]
+        return entry
+
+    def _compact(self):
+        self._heap = [entry for entry in self._heap if entry[4]]
+        heapq.heapify(self._heap)
+        self._dead = 0
+
+    def __len__(self):
+        return len(self._entries)
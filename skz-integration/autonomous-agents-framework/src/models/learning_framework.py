@@ -5,7 +5,7 @@ Phase 2 Critical Component - Enables continuous learning and improvement
 
 import json
 import numpy as np
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Iterable, Iterator
 from datetime import datetime, timedelta
 import logging
 from dataclasses import dataclass
@@ -13,6 +13,9 @@ import threading
 from collections import defaultdict
 import pickle
 import sqlite3
+import zlib
+import math
+from functools import lru_cache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -94,21 +97,201 @@ class ReinforcementLearner:
             except FileNotFoundError:
                 logger.info(f"No existing policy found for {self.agent_id}")
 
+@lru_cache(maxsize=65536)
+def _feature_bucket(token: str, buckets: int) -> int:
+    return zlib.crc32(token.encode('utf-8')) % buckets
+
+def _log_scale(magnitude: float) -> float:
+    """Power of two at or above ``log1p(magnitude)``, at least 1"""
+    log_magnitude = math.log1p(magnitude)
+    return 2.0 ** math.ceil(math.log2(log_magnitude)) if log_magnitude > 1 else 1.0
+
+def update_numeric_scales(data_points: Iterable[Dict[str, Any]], scales: Dict[str, float],
+                          grow: bool = True) -> bool:
+    """Record the log scale of each numeric key in ``scales``; returns True if one changed.
+
+    With ``grow=False`` a key keeps the scale it was first seen with, so
+    vectors encoded earlier stay comparable.
+    """
+    changed = False
+    for data in data_points:
+        for key, value in data.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                key_str = str(key)
+                if key_str in scales and not grow:
+                    continue
+                scale = _log_scale(abs(float(value)))
+                if scale > scales.get(key_str, 0.0):
+                    scales[key_str] = scale
+                    changed = True
+    return changed
+
+def encode_features_batch(data_points: List[Dict[str, Any]], dimensions: int = 128,
+                          scales: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """Feature-hash flat dicts into unit-length rows of a (n, dimensions) matrix.
+
+    Keys are hashed into the first half of each row and key/value pairs
+    (normalized numerics, lower-cased strings) into the second half, each half
+    normalized separately so key overlap and value similarity weigh equally.
+    Numerics are log-scaled by their key's entry in ``scales`` (default 1, see
+    ``update_numeric_scales``) before squashing, so large counts and
+    durations stay apart instead of all saturating near 1.
+    """
+    scales = scales or {}
+    half = dimensions // 2
+    rows, cols, values = [], [], []
+    
+    for row, data in enumerate(data_points):
+        for key, value in data.items():
+            key_str = str(key)
+            rows.append(row)
+            cols.append(_feature_bucket(key_str, half))
+            values.append(1.0)
+            
+            if isinstance(value, (int, float)):
+                # Signed log scaling squashed into [-1, 1]; keeps magnitude order
+                scaled = math.tanh(math.log1p(abs(float(value))) / scales.get(key_str, 1.0))
+                rows.append(row)
+                cols.append(half + _feature_bucket(f"{key_str}#num", half))
+                values.append(scaled if value >= 0 else -scaled)
+            elif isinstance(value, str):
+                rows.append(row)
+                cols.append(half + _feature_bucket(f"{key_str}={value.lower()}", half))
+                values.append(1.0)
+    
+    matrix = np.zeros((len(data_points), dimensions), dtype=np.float32)
+    np.add.at(matrix, (np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp)),
+              np.asarray(values, dtype=np.float32))
+    
+    for part in (matrix[:, :half], matrix[:, half:]):
+        norms = np.linalg.norm(part, axis=1, keepdims=True)
+        np.divide(part, norms, out=part, where=norms > 0)
+    
+    return matrix / np.float32(math.sqrt(2.0))
+
+def encode_features(data: Dict[str, Any], dimensions: int = 128,
+                    scales: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """Feature-hash a single flat dict; see ``encode_features_batch``"""
+    return encode_features_batch([data], dimensions, scales)[0]
+
+class PatternIndex:
+    """Fixed-length feature vectors for stored patterns, held in a NumPy matrix.
+
+    Inputs are encoded with ``encode_features``, so cosine similarity over the
+    matrix approximates the key-overlap plus value-similarity score used by
+    ``SupervisedLearner._calculate_similarity``. Numeric keys are scaled by
+    the largest magnitude stored so far; when that scale grows the stored
+    rows are re-encoded. Rows live in a ring buffer: once ``max_patterns`` is
+    reached the oldest pattern is overwritten.
+    """
+    
+    def __init__(self, dimensions: int = 128, max_patterns: int = 200000,
+                 initial_capacity: int = 1024):
+        if dimensions < 2 or dimensions % 2:
+            raise ValueError("dimensions must be an even number >= 2")
+        self.dimensions = dimensions
+        self.max_patterns = max_patterns
+        self._vectors = np.zeros((min(initial_capacity, max_patterns), dimensions), dtype=np.float32)
+        self._records: List[Dict[str, Any]] = []
+        self._head = 0  # Next slot to overwrite once the buffer is full
+        self.scales: Dict[str, float] = {}
+    
+    def __len__(self) -> int:
+        return len(self._records)
+    
+    def encode(self, data: Dict[str, Any]) -> np.ndarray:
+        """Encode a flat input dict into a unit-length feature vector"""
+        return encode_features(data, self.dimensions, self.scales)
+    
+    def add(self, record: Dict[str, Any]):
+        """Add a pattern record, evicting the oldest one when full"""
+        count = len(self._records)
+        if update_numeric_scales([record['input']], self.scales) and count:
+            # Scales only double, so a long history is re-encoded a few times at most
+            self._vectors[:count] = encode_features_batch(
+                [stored['input'] for stored in self._records], self.dimensions, self.scales)
+        vector = self.encode(record['input'])
+        
+        if count < self.max_patterns:
+            if count == len(self._vectors):
+                new_capacity = min(max(1, count) * 2, self.max_patterns)
+                grown = np.zeros((new_capacity, self.dimensions), dtype=np.float32)
+                grown[:count] = self._vectors[:count]
+                self._vectors = grown
+            self._vectors[count] = vector
+            self._records.append(record)
+        else:
+            self._vectors[self._head] = vector
+            self._records[self._head] = record
+            self._head = (self._head + 1) % self.max_patterns
+    
+    def top_k(self, data: Dict[str, Any], k: int) -> List[Tuple[int, float]]:
+        """Return (row, cosine score) pairs for the k nearest stored patterns"""
+        count = len(self._records)
+        if count == 0 or k <= 0:
+            return []
+        
+        scores = self._vectors[:count] @ self.encode(data)
+        if k < count:
+            rows = np.argpartition(-scores, k - 1)[:k]
+        else:
+            rows = np.arange(count)
+        rows = rows[np.argsort(-scores[rows], kind='stable')]
+        return [(int(row), float(scores[row])) for row in rows]
+    
+    def record(self, row: int) -> Dict[str, Any]:
+        return self._records[row]
+    
+    def records(self) -> List[Dict[str, Any]]:
+        """All stored records, oldest first"""
+        return self._records[self._head:] + self._records[:self._head]
+
 class SupervisedLearner:
     """Supervised learning for pattern recognition and classification"""
     
-    def __init__(self, agent_id: str):
+    def __init__(self, agent_id: str, max_patterns: int = 200000,
+                 feature_dimensions: int = 128, candidate_pool: int = 200):
+        """
+        Args:
+            agent_id: Agent identifier
+            max_patterns: Patterns kept per pattern type before the oldest are evicted
+            feature_dimensions: Length of the hashed feature vectors
+            candidate_pool: Nearest vector matches re-ranked with the exact
+                similarity in ``find_similar_patterns``
+        """
         self.agent_id = agent_id
-        self.patterns = {}
+        self.max_patterns = max_patterns
+        self.feature_dimensions = feature_dimensions
+        self.candidate_pool = candidate_pool
+        self.indexes: Dict[str, PatternIndex] = {}
         self.classifiers = {}
         self.lock = threading.RLock()
+    
+    def _new_index(self) -> PatternIndex:
+        return PatternIndex(dimensions=self.feature_dimensions, max_patterns=self.max_patterns)
+    
+    def export_patterns(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Copy of the stored patterns per type, oldest first, for saving"""
+        with self.lock:
+            return {pattern_type: index.records() for pattern_type, index in self.indexes.items()}
+    
+    def load_patterns(self, patterns: Dict[str, List[Dict[str, Any]]]):
+        """Replace the stored patterns, re-indexing every record"""
+        with self.lock:
+            self.indexes = {}
+            for pattern_type, records in patterns.items():
+                index = self._new_index()
+                update_numeric_scales((record['input'] for record in records), index.scales)
+                for record in records:
+                    index.add(record)
+                self.indexes[pattern_type] = index
         
     def learn_pattern(self, pattern_type: str, input_data: Dict[str, Any], 
                      output_data: Dict[str, Any], success: bool):
         """Learn a pattern from experience"""
         with self.lock:
-            if pattern_type not in self.patterns:
-                self.patterns[pattern_type] = []
+            if pattern_type not in self.indexes:
+                self.indexes[pattern_type] = self._new_index()
             
             pattern = {
                 'input': input_data,
@@ -117,22 +300,27 @@ class SupervisedLearner:
                 'created_at': datetime.now()
             }
             
-            self.patterns[pattern_type].append(pattern)
-            
-            # Keep only recent patterns
-            if len(self.patterns[pattern_type]) > 100:
-                self.patterns[pattern_type] = self.patterns[pattern_type][-50:]
+            self.indexes[pattern_type].add(pattern)
     
     def find_similar_patterns(self, input_data: Dict[str, Any], pattern_type: str, 
-                            threshold: float = 0.7) -> List[Dict[str, Any]]:
-        """Find similar patterns"""
+                            threshold: float = 0.7, top_k: int = 5,
+                            rerank: bool = True) -> List[Dict[str, Any]]:
+        """Find similar patterns
+        
+        The vector index selects the ``candidate_pool`` nearest patterns, which
+        are then re-ranked with the exact ``_calculate_similarity`` score.
+        With ``rerank=False`` the cosine score of the index is used directly.
+        """
         with self.lock:
-            if pattern_type not in self.patterns:
+            index = self.indexes.get(pattern_type)
+            if index is None:
                 return []
             
+            pool = max(self.candidate_pool, top_k) if rerank else top_k
             similar_patterns = []
-            for pattern in self.patterns[pattern_type]:
-                similarity = self._calculate_similarity(input_data, pattern['input'])
+            for row, score in index.top_k(input_data, pool):
+                pattern = index.record(row)
+                similarity = self._calculate_similarity(input_data, pattern['input']) if rerank else score
                 if similarity >= threshold:
                     pattern_copy = pattern.copy()
                     pattern_copy['similarity'] = similarity
@@ -140,7 +328,7 @@ class SupervisedLearner:
             
             # Sort by similarity
             similar_patterns.sort(key=lambda x: x['similarity'], reverse=True)
-            return similar_patterns[:5]
+            return similar_patterns[:top_k]
     
     def _calculate_similarity(self, data1: Dict[str, Any], data2: Dict[str, Any]) -> float:
         """Calculate similarity between two data structures"""
@@ -192,40 +380,196 @@ class SupervisedLearner:
         return (key_overlap + value_similarity) / 2
 
 class UnsupervisedLearner:
-    """Unsupervised learning for discovering patterns and clusters"""
+    """Unsupervised learning for discovering patterns and clusters
     
-    def __init__(self, agent_id: str):
+    Data points are feature-hashed with ``encode_features`` and clustered with
+    mini-batch k-means, updated incrementally as points arrive. Per-cluster
+    distance statistics (Welford running mean/variance) drive anomaly scoring,
+    so memory stays at O(n_clusters * feature_dimensions) however many points
+    have been seen.
+    """
+    
+    def __init__(self, agent_id: str, n_clusters: int = 8, feature_dimensions: int = 64,
+                 batch_size: int = 1024, anomaly_threshold: float = 3.0,
+                 rare_cluster_share: float = 0.01):
+        """
+        Args:
+            agent_id: Agent identifier
+            n_clusters: Number of k-means centroids
+            feature_dimensions: Length of the hashed feature vectors
+            batch_size: Points buffered per mini-batch update
+            anomaly_threshold: Distance z-score above which a point is anomalous
+            rare_cluster_share: Clusters holding less than this share of all
+                points seen are treated as anomalous as a whole
+        """
         self.agent_id = agent_id
-        self.clusters = defaultdict(list)
-        self.cluster_centers = {}
+        self.n_clusters = n_clusters
+        self.feature_dimensions = feature_dimensions
+        self.batch_size = batch_size
+        self.anomaly_threshold = anomaly_threshold
+        self.rare_cluster_share = rare_cluster_share
+        
+        self.cluster_centers: Optional[np.ndarray] = None
+        self.cluster_counts = np.zeros(n_clusters, dtype=np.int64)
+        self._distance_mean = np.zeros(n_clusters, dtype=np.float64)
+        self._distance_m2 = np.zeros(n_clusters, dtype=np.float64)
+        self._pending: List[Dict[str, Any]] = []
+        self.points_seen = 0
+        # Fixed per key once seen, so centroids stay comparable across batches
+        self.scales: Dict[str, float] = {}
         self.lock = threading.RLock()
+    
+    def _encode_batch(self, data_points: List[Dict[str, Any]]) -> np.ndarray:
+        update_numeric_scales(data_points, self.scales, grow=False)
+        return encode_features_batch(data_points, self.feature_dimensions, self.scales)
+    
+    def _init_centers(self, vectors: np.ndarray):
+        """k-means++ seeding from the first batch"""
+        rng = np.random.default_rng(zlib.crc32(self.agent_id.encode('utf-8')))
+        centers = [vectors[rng.integers(len(vectors))]]
+        closest = ((vectors - centers[0]) ** 2).sum(axis=1)
+        
+        while len(centers) < self.n_clusters:
+            total = closest.sum()
+            if total <= 0:
+                # Fewer distinct points than clusters; pad with duplicates
+                centers.append(centers[len(centers) % len(centers)])
+                continue
+            center = vectors[rng.choice(len(vectors), p=closest / total)]
+            centers.append(center)
+            closest = np.minimum(closest, ((vectors - center) ** 2).sum(axis=1))
+        
+        self.cluster_centers = np.array(centers, dtype=np.float32)
+    
+    def _assign(self, vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Nearest centroid and Euclidean distance for each vector"""
+        # ||x - c||^2 = ||x||^2 - 2 x.c + ||c||^2
+        squared = ((vectors ** 2).sum(axis=1)[:, None]
+                   - 2.0 * vectors @ self.cluster_centers.T
+                   + (self.cluster_centers ** 2).sum(axis=1)[None, :])
+        labels = squared.argmin(axis=1)
+        distances = np.sqrt(np.maximum(squared[np.arange(len(vectors)), labels], 0.0))
+        return labels, distances
+    
+    def _partial_fit_vectors(self, vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """One mini-batch k-means step; returns labels and distances for the batch"""
+        if self.cluster_centers is None:
+            self._init_centers(vectors)
+        
+        labels, distances = self._assign(vectors)
+        
+        batch_counts = np.bincount(labels, minlength=self.n_clusters)
+        batch_sums = np.zeros_like(self.cluster_centers)
+        np.add.at(batch_sums, labels, vectors)
         
-    def discover_patterns(self, data_points: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Discover patterns in data"""
+        touched = batch_counts > 0
+        new_counts = self.cluster_counts + batch_counts
+        self.cluster_centers[touched] = (
+            self.cluster_centers[touched] * self.cluster_counts[touched, None] + batch_sums[touched]
+        ) / new_counts[touched, None]
+        
+        # Merge batch distance statistics (Chan et al. parallel variance)
+        batch_dist_sum = np.bincount(labels, weights=distances, minlength=self.n_clusters)
+        batch_mean = np.divide(batch_dist_sum, batch_counts, out=np.zeros(self.n_clusters), where=touched)
+        batch_m2 = np.bincount(labels, weights=(distances - batch_mean[labels]) ** 2, minlength=self.n_clusters)
+        delta = batch_mean - self._distance_mean
+        safe_counts = np.maximum(new_counts, 1)
+        self._distance_mean = np.where(touched, self._distance_mean + delta * batch_counts / safe_counts,
+                                       self._distance_mean)
+        self._distance_m2 = np.where(touched, self._distance_m2 + batch_m2
+                                     + delta ** 2 * self.cluster_counts * batch_counts / safe_counts,
+                                     self._distance_m2)
+        
+        self.cluster_counts = new_counts
+        self.points_seen += len(vectors)
+        return labels, distances
+    
+    def partial_fit(self, data_points: List[Dict[str, Any]]):
+        """Update the clustering with a batch of data points"""
         with self.lock:
-            if not data_points:
-                return []
+            if data_points:
+                self._partial_fit_vectors(self._encode_batch(data_points))
+    
+    def observe(self, data_point: Dict[str, Any]):
+        """Buffer a single point, fitting once a full mini-batch has arrived"""
+        with self.lock:
+            self._pending.append(data_point)
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+    
+    def flush(self):
+        """Fit any buffered points"""
+        with self.lock:
+            pending, self._pending = self._pending, []
+            self.partial_fit(pending)
+    
+    def _batches(self, data_points: Iterable[Dict[str, Any]]) -> Iterator[List[Dict[str, Any]]]:
+        batch = []
+        for point in data_points:
+            batch.append(point)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    
+    def _distance_z_scores(self, labels: np.ndarray, distances: np.ndarray) -> np.ndarray:
+        counts = self.cluster_counts[labels]
+        std = np.sqrt(self._distance_m2[labels] / np.maximum(counts - 1, 1))
+        # Floor the spread so tight or tiny clusters don't flag every point
+        std = np.maximum(std, 1e-3)
+        return (distances - self._distance_mean[labels]) / std
+    
+    def discover_patterns(self, data_points: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Discover patterns in data
+        
+        Streams ``data_points`` (any iterable) through the clustering in
+        mini-batches. Each returned pattern summarises one cluster: its
+        centroid, the indices of the points assigned to it and a single
+        representative point (the one closest to the centroid).
+        """
+        with self.lock:
+            label_chunks = []
+            representatives: Dict[int, Tuple[float, int, Dict[str, Any]]] = {}
+            offset = 0
             
-            # Simple clustering based on key-value patterns
-            clusters = defaultdict(list)
+            for batch in self._batches(data_points):
+                labels, distances = self._partial_fit_vectors(self._encode_batch(batch))
+                label_chunks.append(labels.astype(np.int32))
+                
+                for cluster_id in np.unique(labels):
+                    rows = np.flatnonzero(labels == cluster_id)
+                    best = rows[distances[rows].argmin()]
+                    current = representatives.get(int(cluster_id))
+                    if current is None or distances[best] < current[0]:
+                        representatives[int(cluster_id)] = (float(distances[best]), offset + int(best), batch[best])
+                offset += len(batch)
+            
+            if not label_chunks:
+                return []
             
-            for point in data_points:
-                # Create cluster key based on data structure
-                cluster_key = self._create_cluster_key(point)
-                clusters[cluster_key].append(point)
+            all_labels = np.concatenate(label_chunks)
+            order = np.argsort(all_labels, kind='stable')
+            boundaries = np.searchsorted(all_labels[order], np.arange(self.n_clusters + 1))
             
-            # Identify significant patterns
             patterns = []
-            for cluster_key, cluster_points in clusters.items():
-                if len(cluster_points) >= 2:  # Minimum cluster size
-                    pattern = {
-                        'cluster_key': cluster_key,
-                        'frequency': len(cluster_points),
-                        'representative_point': cluster_points[0],
-                        'all_points': cluster_points,
-                        'confidence': min(1.0, len(cluster_points) / 10.0)
-                    }
-                    patterns.append(pattern)
+            for cluster_id in range(self.n_clusters):
+                point_indices = order[boundaries[cluster_id]:boundaries[cluster_id + 1]]
+                if len(point_indices) < 2:  # Minimum cluster size
+                    continue
+                
+                _, representative_index, representative_point = representatives[cluster_id]
+                patterns.append({
+                    'cluster_id': cluster_id,
+                    'cluster_key': self._create_cluster_key(representative_point),
+                    'frequency': int(len(point_indices)),
+                    'point_indices': point_indices,
+                    'representative_index': representative_index,
+                    'representative_point': representative_point,
+                    'centroid': self.cluster_centers[cluster_id].copy(),
+                    'mean_distance': float(self._distance_mean[cluster_id]),
+                    'confidence': min(1.0, len(point_indices) / 10.0)
+                })
             
             # Sort by frequency
             patterns.sort(key=lambda x: x['frequency'], reverse=True)
@@ -256,38 +600,70 @@ class UnsupervisedLearner:
         
         return f"{key_str}_{'_'.join(value_types)}"
     
-    def find_anomalies(self, data_points: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Find anomalous data points"""
+    def find_anomalies(self, data_points: Iterable[Dict[str, Any]],
+                       update: bool = True) -> List[Dict[str, Any]]:
+        """Find anomalous data points
+        
+        A point is anomalous when its distance to the nearest centroid is at
+        least ``anomaly_threshold`` standard deviations above that cluster's
+        running mean distance, or when it falls into a cluster holding less
+        than ``rare_cluster_share`` of all points seen. Anomalies reference
+        the caller's point by ``index`` rather than copying it. With
+        ``update=False`` the clustering is not changed by the scored points.
+        """
         with self.lock:
-            if len(data_points) < 3:
-                return []
-            
-            # Simple anomaly detection based on frequency
-            point_counts = defaultdict(int)
-            for point in data_points:
-                cluster_key = self._create_cluster_key(point)
-                point_counts[cluster_key] += 1
-            
-            # Find low-frequency patterns (potential anomalies)
-            total_points = len(data_points)
             anomalies = []
+            offset = 0
             
-            for point in data_points:
-                cluster_key = self._create_cluster_key(point)
-                frequency = point_counts[cluster_key] / total_points
+            for batch in self._batches(data_points):
+                vectors = self._encode_batch(batch)
+                if update or self.cluster_centers is None:
+                    labels, distances = self._partial_fit_vectors(vectors)
+                else:
+                    labels, distances = self._assign(vectors)
                 
-                if frequency < 0.1:  # Less than 10% frequency
-                    anomaly = {
-                        'point': point,
-                        'cluster_key': cluster_key,
-                        'frequency': frequency,
-                        'anomaly_score': 1.0 - frequency
-                    }
-                    anomalies.append(anomaly)
+                if self.points_seen >= 3:
+                    z_scores = self._distance_z_scores(labels, distances)
+                    shares = self.cluster_counts[labels] / self.points_seen
+                    flagged = (z_scores >= self.anomaly_threshold) | (shares < self.rare_cluster_share)
+                    
+                    for row in np.flatnonzero(flagged):
+                        z = max(float(z_scores[row]), 0.0)
+                        share = float(shares[row])
+                        anomalies.append({
+                            'index': offset + int(row),
+                            'point': batch[row],
+                            'cluster_id': int(labels[row]),
+                            'cluster_share': share,
+                            'distance': float(distances[row]),
+                            'z_score': float(z_scores[row]),
+                            'anomaly_score': max(z / (z + self.anomaly_threshold), 1.0 - share)
+                        })
+                offset += len(batch)
             
             # Sort by anomaly score
             anomalies.sort(key=lambda x: x['anomaly_score'], reverse=True)
             return anomalies
+    
+    def get_cluster_summary(self) -> List[Dict[str, Any]]:
+        """Centroid summaries for all clusters seen so far"""
+        with self.lock:
+            if self.cluster_centers is None:
+                return []
+            
+            summaries = []
+            for cluster_id in range(self.n_clusters):
+                count = int(self.cluster_counts[cluster_id])
+                if count == 0:
+                    continue
+                summaries.append({
+                    'cluster_id': cluster_id,
+                    'size': count,
+                    'share': count / self.points_seen,
+                    'mean_distance': float(self._distance_mean[cluster_id]),
+                    'distance_std': float(np.sqrt(self._distance_m2[cluster_id] / max(count - 1, 1)))
+                })
+            return summaries
 
 class MetaLearner:
     """Meta-learning for optimizing learning strategies"""
@@ -534,6 +910,9 @@ class LearningFramework:
             experience.success
         )
         
+        # Update unsupervised learner; clusters refit once a mini-batch is buffered
+        self.unsupervised_learner.observe(experience.input_data)
+        
         # Update meta learner
         performance = {
             'success_rate': 1.0 if experience.success else 0.0,
@@ -611,7 +990,7 @@ class LearningFramework:
         with self.lock:
             state = {
                 'reinforcement_learner': self.reinforcement_learner.get_policy(),
-                'supervised_learner': self.supervised_learner.patterns,
+                'supervised_learner': self.supervised_learner.export_patterns(),
                 'meta_learner': self.meta_learner.performance_history
             }
             
@@ -630,7 +1009,7 @@ class LearningFramework:
                                                               state.get('reinforcement_learner', {}))
                 
                 # Restore supervised learner
-                self.supervised_learner.patterns = state.get('supervised_learner', {})
+                self.supervised_learner.load_patterns(state.get('supervised_learner', {}))
                 
                 # Restore meta learner
                 self.meta_learner.performance_history = state.get('meta_learner', [])
@@ -0,0 +1,242 @@
+"""
+Provider Clients for Communication Delivery
+Process-wide pool of SendGrid, Twilio and SES clients that are built once and
+reused, keep-alive HTTP sessions for the REST providers, and rolling health
+per provider used to order failover
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError:
+    requests = None
+    HTTPAdapter = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASE_URLS = {
+    'sendgrid': 'https://api.sendgrid.com',
+    'twilio': 'https://api.twilio.com',
+}
+
+
+class HTTPProviderClient:
+    """
+    Keep-alive HTTP session for one provider account
+
+    Connections to ``base_url`` are pooled by the session and reused across
+    sends; ``post`` blocks, so call it from a thread.
+    """
+
+    def __init__(self, base_url: str, headers: Optional[Dict[str, str]] = None, auth: Optional[Any] = None,
+                 timeout: float = 10.0, pool_size: int = 16):
+        if requests is None:
+            raise ValueError("requests library not installed. Install requests for provider HTTP delivery.")
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update(headers or {})
+        self.session.auth = auth
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def post(self, path: str, json: Optional[Dict[str, Any]] = None, data: Optional[Dict[str, Any]] = None):
+        return self.session.post(f"{self.base_url}{path}", json=json, data=data, timeout=self.timeout)
+
+    def close(self):
+        self.session.close()
+
+
+def _sendgrid_client(settings: Dict[str, Any], pool_size: int) -> HTTPProviderClient:
+    return HTTPProviderClient(
+        settings.get('base_url', DEFAULT_BASE_URLS['sendgrid']),
+        headers={'Authorization': f"Bearer {settings['api_key']}"},
+        timeout=settings.get('timeout', 10.0),
+        pool_size=pool_size
+    )
+
+
+def _twilio_client(settings: Dict[str, Any], pool_size: int) -> HTTPProviderClient:
+    return HTTPProviderClient(
+        settings.get('base_url', DEFAULT_BASE_URLS['twilio']),
+        auth=(settings['account_sid'], settings['auth_token']),
+        timeout=settings.get('timeout', 10.0),
+        pool_size=pool_size
+    )
+
+
+def _ses_client(settings: Dict[str, Any], pool_size: int):
+    try:
+        import boto3
+        from botocore.config import Config
+    except ImportError:
+        raise ValueError("boto3 library not installed. Install boto3 package for Amazon SES email delivery.")
+    # botocore keeps its own keep-alive connection pool per client
+    return boto3.client(
+        'ses',
+        region_name=settings['region'],
+        aws_access_key_id=settings.get('aws_access_key_id'),
+        aws_secret_access_key=settings.get('aws_secret_access_key'),
+        endpoint_url=settings.get('endpoint_url'),
+        config=Config(max_pool_connections=pool_size)
+    )
+
+
+class ProviderClientPool:
+    """
+    Provider clients built once per process and shared by every sender
+
+    Clients are keyed by provider and settings, so a changed API key or
+    endpoint gets a new client. ``factories`` maps a provider to a callable
+    ``(settings, pool_size) -> client``.
+    """
+
+    _shared: Optional['ProviderClientPool'] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, factories: Optional[Dict[str, Callable[[Dict[str, Any], int], Any]]] = None,
+                 pool_size: int = 16):
+        self.factories = {'sendgrid': _sendgrid_client, 'twilio': _twilio_client, 'ses': _ses_client}
+        self.factories.update(factories or {})
+        self.pool_size = pool_size
+        self._clients: Dict[tuple, Any] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> 'ProviderClientPool':
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def get(self, provider: str, settings: Dict[str, Any]) -> Any:
+        """Client for ``provider`` with these settings, created on first use"""
+        key = (provider, tuple(sorted((name, repr(value)) for name, value in settings.items() if name != 'enabled')))
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = self.factories[provider](settings, self.pool_size)
+                    self._clients[key] = client
+        return client
+
+    def close(self):
+        with self._lock:
+            clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            close = getattr(client, 'close', None)
+            if close is not None:
+                try:
+                    close()
+                except Exception as e:
+                    logger.warning(f"Failed to close provider client: {e}")
+
+
+class ProviderHealth:
+    """
+    Recent latency and error rate per provider, and the failover order they imply
+
+    Each provider keeps its last ``window`` outcomes. After
+    ``failure_threshold`` consecutive failures it is skipped for ``cooldown``
+    seconds, then tried again; one more failure skips it again. Providers
+    with no outcomes yet rank after measured ones, in their configured order,
+    so traffic moves to an untried provider only when the others fail.
+
+    A demoted provider gets no traffic, so its figures would never recover.
+    Once it has gone ``probe_interval`` seconds without an outcome, the next
+    ``order`` call puts it first, sending it one probe call per interval.
+    """
+
+    def __init__(self, window: int = 50, failure_threshold: int = 3, cooldown: float = 30.0,
+                 error_penalty: float = 1.0, probe_interval: Optional[float] = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.window = window
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.error_penalty = error_penalty
+        self.probe_interval = probe_interval
+        self.clock = clock
+        self._outcomes: Dict[str, deque] = {}
+        self._consecutive_failures: Dict[str, int] = {}
+        self._skipped_until: Dict[str, float] = {}
+        self._last_outcome: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def record(self, provider: str, success: bool, latency: float):
+        with self._lock:
+            self._outcomes.setdefault(provider, deque(maxlen=self.window)).append((success, latency))
+            self._last_outcome[provider] = self.clock()
+            if success:
+                self._consecutive_failures[provider] = 0
+                self._skipped_until.pop(provider, None)
+                return
+            failures = self._consecutive_failures.get(provider, 0) + 1
+            self._consecutive_failures[provider] = failures
+            if failures >= self.failure_threshold:
+                if provider not in self._skipped_until:
+                    logger.warning(f"Provider {provider} failed {failures} times in a row, "
+                                   f"skipping it for {self.cooldown}s")
+                self._skipped_until[provider] = self.clock() + self.cooldown
+
+    def available(self, provider: str) -> bool:
+        return self._skipped_until.get(provider, 0.0) <= self.clock()
+
+    def error_rate(self, provider: str) -> float:
+        outcomes = self._outcomes.get(provider)
+        if not outcomes:
+            return 0.0
+        return sum(1 for success, _ in outcomes if not success) / len(outcomes)
+
+    def latency(self, provider: str) -> float:
+        """Mean latency of recent successful calls, in seconds"""
+        latencies = [latency for success, latency in self._outcomes.get(provider, ()) if success]
+        return sum(latencies) / len(latencies) if latencies else 0.0
+
+    def score(self, provider: str) -> float:
+        """Expected cost of a call: mean latency plus ``error_penalty`` seconds per unit error rate"""
+        return self.latency(provider) + self.error_penalty * self.error_rate(provider)
+
+    def order(self, providers: Sequence[str]) -> List[str]:
+        """Providers to try, best first; skipped providers go last as a final resort"""
+        with self._lock:
+            ranked = sorted(enumerate(providers), key=lambda item: (
+                not self.available(item[1]), item[1] not in self._outcomes, self.score(item[1]), item[0]))
+            ranked = [provider for _, provider in ranked]
+            probe = self._due_probe(ranked[1:])
+            if probe is not None:
+                ranked.remove(probe)
+                ranked.insert(0, probe)
+        return ranked
+
+    def _due_probe(self, demoted: Sequence[str]) -> Optional[str]:
+        """First measured, available provider not heard from for ``probe_interval``; claims the probe"""
+        if self.probe_interval is None:
+            return None
+        now = self.clock()
+        for provider in demoted:
+            if (provider in self._last_outcome and self.available(provider)
+                    and now - self._last_outcome[provider] >= self.probe_interval):
+                # Later calls wait for the probe's outcome, or another interval
+                self._last_outcome[provider] = now
+                return provider
+        return None
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                provider: {
+                    'latency': self.latency(provider),
+                    'error_rate': self.error_rate(provider),
+                    'available': self.available(provider),
+                    'calls': len(self._outcomes[provider])
+                }
+                for provider in self._outcomes
+            }
@@ -10,9 +10,19 @@ from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime
 import hashlib
-from collections import defaultdict
-import chromadb
-from sentence_transformers import SentenceTransformer
+import threading
+from collections import OrderedDict
+
+from .embedding_service import EmbeddingService
+from .knowledge_graph_store import KnowledgeGraphStore
+from .trend_index import TrendIndex, month_index, month_key
+
+try:
+    import chromadb
+    from sentence_transformers import SentenceTransformer
+    VECTOR_BACKEND_AVAILABLE = True
+except ImportError:
+    VECTOR_BACKEND_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
@@ -60,17 +70,49 @@ class ResearchResult:
 class ResearchVectorDB:
     """Unified research vector database with semantic search"""
     
-    def __init__(self, config: Dict[str, Any]):
+    # Metadata fields stored as JSON strings
+    JSON_METADATA_FIELDS = ('authors', 'keywords', 'research_areas')
+    
+    def __init__(self, config: Dict[str, Any], model=None, collection=None,
+                 embedder: Optional[EmbeddingService] = None):
         self.config = config
-        self.model = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
+        if (model is None or collection is None) and not VECTOR_BACKEND_AVAILABLE:
+            raise ImportError("ResearchVectorDB requires chromadb and sentence-transformers")
+        
+        self.model = model or SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
         
         # Initialize ChromaDB
-        self.client = chromadb.PersistentClient(path=config.get('db_path', './research_vectordb'))
-        self.collection = self.client.get_or_create_collection(
-            name="research_documents",
-            metadata={"hnsw:space": "cosine"}
+        if collection is None:
+            self.client = chromadb.PersistentClient(path=config.get('db_path', './research_vectordb'))
+            collection = self.client.get_or_create_collection(
+                name="research_documents",
+                metadata={"hnsw:space": "cosine"}
+            )
+        self.collection = collection
+        
+        # Encodes run in a worker pool, batched across concurrent requests
+        self.embedder = embedder or EmbeddingService(
+            self.model,
+            max_batch_size=config.get('embedding_batch_size', 64),
+            max_wait_ms=config.get('embedding_batch_wait_ms', 5.0),
+            max_workers=config.get('embedding_workers', 1)
         )
         
+        # Decoded JSON metadata fields by doc_id
+        self.metadata_cache_size = config.get('metadata_cache_size', 10000)
+        self._metadata_cache: OrderedDict = OrderedDict()
+        
+        # Per-area monthly trend counts, kept current by add_document
+        self.trend_index = TrendIndex(config.get('trend_document_types', ('research_article', 'review')))
+        self._trend_index_built = False
+        self._trend_index_lock = asyncio.Lock()
+        # Documents added while rebuilds are scanning, replayed into their new index
+        self._trend_rebuild_buffers: List[List[tuple]] = []
+        self._trend_buffer_lock = threading.Lock()
+        
+        # Citation/authorship graph built up by build_knowledge_graph
+        self.graph = KnowledgeGraphStore(config.get('graph_path'))
+        
         # Research area hierarchies
         self.research_hierarchies = {
             'cosmetic_chemistry': [
@@ -101,7 +143,7 @@ class ResearchVectorDB:
             # Generate embedding if not provided
             if document.embedding is None:
                 text_for_embedding = f"{document.title} {document.abstract} {' '.join(document.keywords)}"
-                document.embedding = self.model.encode(text_for_embedding).tolist()
+                document.embedding = (await self.embedder.encode(text_for_embedding)).tolist()
             
             # Prepare metadata
             metadata = {
@@ -120,12 +162,22 @@ class ResearchVectorDB:
             }
             
             # Add to ChromaDB
+            self._metadata_cache.pop(document.doc_id, None)
             self.collection.add(
                 embeddings=[document.embedding],
                 documents=[f"{document.title}\n\n{document.abstract}"],
                 metadatas=[metadata],
                 ids=[document.doc_id]
             )
+            trend_entry = (
+                document.doc_id, document.research_areas, document.keywords, document.methodology,
+                document.publication_date, document.citation_count, document.novelty_score,
+                document.document_type
+            )
+            with self._trend_buffer_lock:
+                self.trend_index.add(*trend_entry)
+                for buffer in self._trend_rebuild_buffers:
+                    buffer.append(trend_entry)
             
             logger.info(f"Added document {document.doc_id} to vector database")
             return True
@@ -134,11 +186,17 @@ class ResearchVectorDB:
             logger.error(f"Error adding document to vector database: {e}")
             return False
     
-    async def search_research(self, query: ResearchQuery, limit: int = 20) -> List[ResearchResult]:
-        """Search research documents using semantic similarity"""
+    async def search_research(self, query: ResearchQuery, limit: int = 20,
+                              include_related: bool = True, related_limit: int = 5) -> List[ResearchResult]:
+        """Search research documents using semantic similarity
+        
+        Hit embeddings come back with the search itself, and related
+        documents for all hits are found with one batched query, so a search
+        costs two index round-trips (one without ``include_related``).
+        """
         try:
             # Generate query embedding
-            query_embedding = self.model.encode(query.query_text).tolist()
+            query_embedding = (await self.embedder.encode(query.query_text)).tolist()
             
             # Build metadata filters
             where_filters = {}
@@ -154,59 +212,54 @@ class ResearchVectorDB:
                 where_filters['document_type'] = {'$in': query.document_types}
             
             # Perform vector search
+            include = ['metadatas', 'documents', 'distances']
+            if include_related:
+                include.append('embeddings')
             results = self.collection.query(
                 query_embeddings=[query_embedding],
                 n_results=limit,
-                where=where_filters if where_filters else None
+                where=where_filters if where_filters else None,
+                include=include
             )
             
+            # Keep hits above the similarity threshold
+            hits = []
+            for i in range(len(results['ids'][0])):
+                similarity = 1 - results['distances'][0][i]  # Convert distance to similarity
+                if similarity >= query.similarity_threshold:
+                    hits.append((i, similarity))
+            
+            # Find related documents for all hits at once
+            related = [[] for _ in hits]
+            if include_related and hits:
+                related = self._find_related_documents_batch(
+                    [results['ids'][0][i] for i, _ in hits],
+                    [results['embeddings'][0][i] for i, _ in hits],
+                    limit=related_limit
+                )
+            
             # Process results
             search_results = []
-            for i in range(len(results['ids'][0])):
-                doc_id = results['ids'][0][i]
-                distance = results['distances'][0][i]
-                similarity = 1 - distance  # Convert distance to similarity
+            for (i, similarity), related_docs in zip(hits, related):
+                document = self._document_from_metadata(
+                    results['ids'][0][i], results['metadatas'][0][i], results['documents'][0][i]
+                )
                 
-                if similarity >= query.similarity_threshold:
-                    # Reconstruct document from metadata
-                    metadata = results['metadatas'][0][i]
-                    document = ResearchDocument(
-                        doc_id=doc_id,
-                        title=metadata['title'],
-                        abstract=results['documents'][0][i].split('\n\n', 1)[1] if '\n\n' in results['documents'][0][i] else '',
-                        authors=json.loads(metadata['authors']),
-                        keywords=json.loads(metadata['keywords']),
-                        doi=metadata['doi'],
-                        publication_date=metadata['publication_date'],
-                        journal=metadata['journal'],
-                        citation_count=metadata['citation_count'],
-                        full_text='',  # Not stored in vector DB
-                        document_type=metadata['document_type'],
-                        research_areas=json.loads(metadata['research_areas']),
-                        methodology=metadata['methodology'],
-                        findings=[],  # Would need separate storage
-                        significance_score=metadata['significance_score'],
-                        novelty_score=metadata['novelty_score']
-                    )
-                    
-                    # Generate relevance reasoning
-                    relevance_reasons = await self._generate_relevance_reasons(query, document, similarity)
-                    
-                    # Identify trend indicators
-                    trend_indicators = await self._identify_trend_indicators(document)
-                    
-                    # Find related documents
-                    related_docs = await self._find_related_documents(doc_id, limit=5)
-                    
-                    result = ResearchResult(
-                        document=document,
-                        similarity_score=similarity,
-                        relevance_reasons=relevance_reasons,
-                        trend_indicators=trend_indicators,
-                        related_documents=related_docs
-                    )
-                    
-                    search_results.append(result)
+                # Generate relevance reasoning
+                relevance_reasons = await self._generate_relevance_reasons(query, document, similarity)
+                
+                # Identify trend indicators
+                trend_indicators = await self._identify_trend_indicators(document)
+                
+                result = ResearchResult(
+                    document=document,
+                    similarity_score=similarity,
+                    relevance_reasons=relevance_reasons,
+                    trend_indicators=trend_indicators,
+                    related_documents=related_docs
+                )
+                
+                search_results.append(result)
             
             return search_results
             
@@ -214,78 +267,134 @@ class ResearchVectorDB:
             logger.error(f"Error searching research database: {e}")
             return []
     
-    async def find_research_trends(self, research_area: str, time_window: int = 24) -> Dict[str, Any]:
-        """Identify research trends in specific area"""
+    def _document_from_metadata(self, doc_id: str, metadata: Dict[str, Any], stored_text: str) -> ResearchDocument:
+        """Reconstruct a document from its stored metadata"""
+        decoded = self._decoded_metadata(doc_id, metadata)
+        return ResearchDocument(
+            doc_id=doc_id,
+            title=metadata['title'],
+            abstract=stored_text.split('\n\n', 1)[1] if '\n\n' in stored_text else '',
+            authors=list(decoded['authors']),
+            keywords=list(decoded['keywords']),
+            doi=metadata['doi'],
+            publication_date=metadata['publication_date'],
+            journal=metadata['journal'],
+            citation_count=metadata['citation_count'],
+            full_text='',  # Not stored in vector DB
+            document_type=metadata['document_type'],
+            research_areas=list(decoded['research_areas']),
+            methodology=metadata['methodology'],
+            findings=[],  # Would need separate storage
+            significance_score=metadata['significance_score'],
+            novelty_score=metadata['novelty_score']
+        )
+    
+    def _decoded_metadata(self, doc_id: str, metadata: Dict[str, Any]) -> Dict[str, tuple]:
+        """JSON metadata fields of a document, decoded once per doc_id"""
+        decoded = self._metadata_cache.get(doc_id)
+        if decoded is not None:
+            self._metadata_cache.move_to_end(doc_id)
+            return decoded
+        
+        decoded = {field: tuple(json.loads(metadata[field])) for field in self.JSON_METADATA_FIELDS}
+        self._metadata_cache[doc_id] = decoded
+        if len(self._metadata_cache) > self.metadata_cache_size:
+            self._metadata_cache.popitem(last=False)
+        return decoded
+    
+    async def find_research_trends(self, research_area: str, time_window: int = 24,
+                                   as_of: Optional[datetime] = None) -> Dict[str, Any]:
+        """Identify research trends in specific area
+        
+        Reads the trend index: ``time_window`` months ending with the month
+        of ``as_of`` (default now), for every indexed paper in the area.
+        """
         try:
-            # Calculate date range
-            end_date = datetime.now()
-            start_date = end_date.replace(month=end_date.month - time_window)
-            
-            # Search for recent papers in area
-            query = ResearchQuery(
-                query_text=research_area,
-                research_areas=[research_area],
-                date_range=(start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')),
-                min_citation_count=0,
-                document_types=['research_article', 'review'],
-                methodology_filter=[],
-                similarity_threshold=0.6
-            )
+            if not self._trend_index_built:
+                # The first call scans the whole collection; keep it off the event loop
+                async with self._trend_index_lock:
+                    if not self._trend_index_built:
+                        await asyncio.to_thread(self.rebuild_trend_index)
             
-            recent_papers = await self.search_research(query, limit=100)
+            end_month = month_index(as_of or datetime.now())
+            start_month = end_month - time_window + 1
+            window = self.trend_index.window(research_area, start_month, end_month)
             
-            # Analyze trends
-            keyword_freq = defaultdict(int)
-            methodology_trends = defaultdict(int)
-            citation_trends = defaultdict(list)
-            
-            for result in recent_papers:
-                doc = result.document
-                
-                # Keyword analysis
-                for keyword in doc.keywords:
-                    keyword_freq[keyword.lower()] += 1
-                
-                # Methodology trends
-                if doc.methodology:
-                    methodology_trends[doc.methodology] += 1
-                
-                # Citation trends by month
-                pub_date = datetime.strptime(doc.publication_date, '%Y-%m-%d')
-                month_key = pub_date.strftime('%Y-%m')
-                citation_trends[month_key].append(doc.citation_count)
-            
-            # Generate trend summary
-            trending_keywords = sorted(keyword_freq.items(), key=lambda x: x[1], reverse=True)[:10]
-            trending_methods = sorted(methodology_trends.items(), key=lambda x: x[1], reverse=True)[:5]
-            
-            # Calculate growth metrics
-            total_papers = len(recent_papers)
-            avg_citations = sum(r.document.citation_count for r in recent_papers) / total_papers if total_papers > 0 else 0
-            avg_novelty = sum(r.document.novelty_score for r in recent_papers) / total_papers if total_papers > 0 else 0
+            total_papers = window.total_papers
             
             return {
                 'research_area': research_area,
                 'time_window_months': time_window,
+                'period': {'start': month_key(start_month), 'end': month_key(end_month)},
                 'total_papers': total_papers,
-                'trending_keywords': trending_keywords,
-                'trending_methodologies': trending_methods,
-                'average_citations': avg_citations,
-                'average_novelty_score': avg_novelty,
-                'growth_indicators': self._calculate_growth_indicators(citation_trends),
-                'emerging_topics': await self._identify_emerging_topics(recent_papers),
-                'research_gaps': await self._identify_research_gaps(research_area, recent_papers)
+                'monthly_papers': window.monthly_papers(),
+                'trending_keywords': window.top_keywords(10),
+                'trending_methodologies': window.top_methodologies(5),
+                'average_citations': window.total_citations / total_papers if total_papers > 0 else 0,
+                'average_novelty_score': window.novelty_sum / total_papers if total_papers > 0 else 0,
+                'growth_indicators': self._calculate_growth_indicators(window.monthly_average_citations()),
+                'emerging_topics': await self._identify_emerging_topics(
+                    window.keywords_above(window.keyword_novelty / 10.0, 5.0)),
+                'research_gaps': await self._identify_research_gaps(
+                    research_area, window.covered_keywords(), window.used_methodologies())
             }
             
         except Exception as e:
             logger.error(f"Error finding research trends: {e}")
             return {}
     
+    def rebuild_trend_index(self, batch_size: int = 1000) -> int:
+        """Rebuild the trend index from collection metadata in one streaming pass
+        
+        The new index is filled on the side and swapped in at the end, so
+        readers never see a half-built one. Documents added during the scan
+        are replayed into it before the swap; the index skips ones it has
+        already counted.
+        """
+        trend_index = TrendIndex(self.trend_index.document_types)
+        buffer = []
+        with self._trend_buffer_lock:
+            self._trend_rebuild_buffers.append(buffer)
+        try:
+            offset = 0
+            while True:
+                batch = self.collection.get(include=['metadatas'], limit=batch_size, offset=offset)
+                if not batch['ids']:
+                    break
+                for doc_id, metadata in zip(batch['ids'], batch['metadatas']):
+                    try:
+                        trend_index.add(
+                            doc_id, json.loads(metadata['research_areas']), json.loads(metadata['keywords']),
+                            metadata.get('methodology', ''), metadata.get('publication_date'),
+                            metadata.get('citation_count', 0), metadata.get('novelty_score', 0.0),
+                            metadata.get('document_type')
+                        )
+                    except (KeyError, TypeError, ValueError) as e:
+                        logger.warning(f"Skipping {doc_id} while rebuilding trend index: {e}")
+                offset += len(batch['ids'])
+            
+            with self._trend_buffer_lock:
+                for trend_entry in buffer:
+                    trend_index.add(*trend_entry)
+                self.trend_index = trend_index
+        finally:
+            with self._trend_buffer_lock:
+                self._trend_rebuild_buffers.remove(buffer)
+        self._trend_index_built = True
+        logger.info(f"Rebuilt trend index from {offset} documents ({len(self.trend_index)} indexed)")
+        return len(self.trend_index)
+    
     async def build_knowledge_graph(self, documents: List[ResearchDocument]) -> Dict[str, Any]:
-        """Build knowledge graph from research documents"""
+        """Build knowledge graph from research documents
+        
+        Nodes and edges are added to the graph store (edges of a document
+        only the first time it is seen); the response describes the subgraph
+        of ``documents``, ranked by PageRank over the whole graph.
+        """
         try:
             nodes = {}
             edges = []
+            new_edges = []
             
             for doc in documents:
                 # Add document node
@@ -297,6 +406,9 @@ class ResearchVectorDB:
                     'citation_count': doc.citation_count,
                     'significance_score': doc.significance_score
                 }
+                is_new = not self.graph.has_node(doc.doc_id) or self.graph.node_type(doc.doc_id) != 'document'
+                self.graph.add_node(doc.doc_id, 'document', {'title': doc.title})
+                doc_edges_start = len(edges)
                 
                 # Add author nodes and edges
                 for author in doc.authors:
@@ -307,6 +419,7 @@ class ResearchVectorDB:
                             'type': 'author',
                             'name': author
                         }
+                        self.graph.add_node(author_id, 'author', {'name': author})
                     
                     edges.append({
                         'source': author_id,
@@ -324,6 +437,7 @@ class ResearchVectorDB:
                             'type': 'keyword',
                             'term': keyword
                         }
+                        self.graph.add_node(keyword_id, 'keyword', {'term': keyword})
                     
                     edges.append({
                         'source': doc.doc_id,
@@ -331,9 +445,15 @@ class ResearchVectorDB:
                         'type': 'contains_keyword',
                         'weight': 1.0
                     })
+                
+                if is_new:
+                    new_edges.extend(edges[doc_edges_start:])
+            
+            self.graph.add_edges((edge['source'], edge['target'], edge['type'], edge['weight']) for edge in new_edges)
             
             # Calculate centrality and importance scores
-            node_importance = self._calculate_node_importance(nodes, edges)
+            scores = self.graph.pagerank(direction='both')
+            node_importance = {node_id: float(scores[self.graph.node_index[node_id]]) for node_id in nodes}
             
             return {
                 'nodes': list(nodes.values()),
@@ -343,7 +463,8 @@ class ResearchVectorDB:
                     'total_edges': len(edges),
                     'document_nodes': len([n for n in nodes.values() if n['type'] == 'document']),
                     'author_nodes': len([n for n in nodes.values() if n['type'] == 'author']),
-                    'keyword_nodes': len([n for n in nodes.values() if n['type'] == 'keyword'])
+                    'keyword_nodes': len([n for n in nodes.values() if n['type'] == 'keyword']),
+                    'graph': self.graph.statistics()
                 },
                 'important_nodes': sorted(node_importance.items(), key=lambda x: x[1], reverse=True)[:20]
             }
@@ -352,6 +473,56 @@ class ResearchVectorDB:
             logger.error(f"Error building knowledge graph: {e}")
             return {}
     
+    async def explore_knowledge_graph(self, query: ResearchQuery, hops: int = 2, seed_count: int = 5,
+                                      node_types: Optional[List[str]] = None, limit: int = 50) -> Dict[str, Any]:
+        """Expand the knowledge graph around the documents matching ``query``
+        
+        Vector search only picks the seed documents; the neighbourhood comes
+        from a k-hop traversal and is ranked by PageRank personalised to the
+        seeds' similarity scores.
+        """
+        try:
+            seeds = await self.search_research(query, limit=seed_count, include_related=False)
+            seed_scores = {result.document.doc_id: result.similarity_score for result in seeds
+                           if self.graph.has_node(result.document.doc_id)}
+            if not seed_scores:
+                return {'seeds': [], 'nodes': []}
+            
+            neighbourhood = self.graph.k_hop(seed_scores, hops=hops, node_types=node_types)
+            scores = self.graph.pagerank(personalization=seed_scores, direction='both')
+            ranked = sorted(neighbourhood, key=lambda node_id: scores[self.graph.node_index[node_id]],
+                            reverse=True)[:limit]
+            
+            return {
+                'seeds': list(seed_scores),
+                'nodes': [
+                    {**self.graph.node(node_id), 'hops': neighbourhood[node_id],
+                     'score': float(scores[self.graph.node_index[node_id]])}
+                    for node_id in ranked
+                ]
+            }
+            
+        except Exception as e:
+            logger.error(f"Error exploring knowledge graph: {e}")
+            return {}
+    
+    def persist(self) -> bool:
+        """Save the knowledge graph to ``graph_path``; ChromaDB persists the collection itself"""
+        try:
+            if self.graph.path:
+                self.graph.save()
+                logger.info("Research knowledge graph persisted to disk")
+            return True
+        except Exception as e:
+            logger.error(f"Error persisting research knowledge graph: {e}")
+            return False
+    
+    def close(self) -> bool:
+        """Persist the graph and stop the embedding workers"""
+        persisted = self.persist()
+        self.embedder.close()
+        return persisted
+    
     async def _generate_relevance_reasons(self, query: ResearchQuery, document: ResearchDocument, similarity: float) -> List[str]:
         """Generate reasons why document is relevant to query"""
         reasons = []
@@ -449,8 +620,28 @@ class ResearchVectorDB:
             logger.error(f"Error finding related documents: {e}")
             return []
     
-    def _calculate_growth_indicators(self, citation_trends: Dict[str, List[int]]) -> Dict[str, float]:
-        """Calculate growth indicators from citation trends"""
+    def _find_related_documents_batch(self, doc_ids: List[str], embeddings: List[List[float]],
+                                      limit: int = 5) -> List[List[str]]:
+        """Related documents for several documents in one multi-embedding query"""
+        try:
+            similar_results = self.collection.query(
+                query_embeddings=[list(embedding) for embedding in embeddings],
+                n_results=limit + 1,  # +1 because each will include its own document
+                include=['distances']
+            )
+            
+            # Return IDs excluding each original document
+            return [
+                [related_id for related_id in related_ids if related_id != doc_id][:limit]
+                for doc_id, related_ids in zip(doc_ids, similar_results['ids'])
+            ]
+            
+        except Exception as e:
+            logger.error(f"Error finding related documents: {e}")
+            return [[] for _ in doc_ids]
+    
+    def _calculate_growth_indicators(self, citation_trends: Dict[str, float]) -> Dict[str, float]:
+        """Calculate growth indicators from mean citations per month"""
         indicators = {}
         
         if not citation_trends:
@@ -461,18 +652,15 @@ class ResearchVectorDB:
         
         if len(sorted_months) >= 2:
             # Calculate month-over-month growth
-            recent_avg = np.mean(citation_trends[sorted_months[-1]]) if citation_trends[sorted_months[-1]] else 0
-            previous_avg = np.mean(citation_trends[sorted_months[-2]]) if citation_trends[sorted_months[-2]] else 0
+            recent_avg = citation_trends[sorted_months[-1]]
+            previous_avg = citation_trends[sorted_months[-2]]
             
             if previous_avg > 0:
                 mom_growth = (recent_avg - previous_avg) / previous_avg
                 indicators['month_over_month_growth'] = mom_growth
             
             # Calculate overall trend slope
-            monthly_avgs = []
-            for month in sorted_months:
-                avg_citations = np.mean(citation_trends[month]) if citation_trends[month] else 0
-                monthly_avgs.append(avg_citations)
+            monthly_avgs = [citation_trends[month] for month in sorted_months]
             
             if len(monthly_avgs) > 1:
                 # Simple linear trend
@@ -482,25 +670,17 @@ class ResearchVectorDB:
         
         return indicators
     
-    async def _identify_emerging_topics(self, recent_papers: List[ResearchResult]) -> List[str]:
-        """Identify emerging research topics"""
-        # Analyze keyword co-occurrence and novelty
-        topic_scores = defaultdict(float)
+    async def _identify_emerging_topics(self, topic_scores: Dict[str, float]) -> List[str]:
+        """Identify emerging research topics
         
-        for result in recent_papers:
-            doc = result.document
-            
-            # Weight by novelty and recency
-            weight = doc.novelty_score / 10.0
-            
-            for keyword in doc.keywords:
-                topic_scores[keyword.lower()] += weight
-        
-        # Return top emerging topics
+        ``topic_scores`` are novelty-weighted keyword counts (novelty / 10
+        per paper) for keywords scoring over 5.0.
+        """
         emerging = sorted(topic_scores.items(), key=lambda x: x[1], reverse=True)
         return [topic for topic, score in emerging[:10] if score > 5.0]
     
-    async def _identify_research_gaps(self, research_area: str, recent_papers: List[ResearchResult]) -> List[str]:
+    async def _identify_research_gaps(self, research_area: str, covered_topics: set,
+                                      methodologies_used: set) -> List[str]:
         """Identify potential research gaps"""
         gaps = []
         
@@ -508,20 +688,12 @@ class ResearchVectorDB:
         expected_topics = self.research_hierarchies.get(research_area, [])
         
         # Find which topics are underrepresented
-        covered_topics = set()
-        for result in recent_papers:
-            for keyword in result.document.keywords:
-                covered_topics.add(keyword.lower())
-        
         for expected_topic in expected_topics:
             if expected_topic not in covered_topics:
                 gaps.append(f"Limited research on {expected_topic}")
         
         # Identify methodology gaps
-        methodologies_used = set()
-        for result in recent_papers:
-            if result.document.methodology:
-                methodologies_used.add(result.document.methodology.lower())
+        methodologies_used = {methodology.lower() for methodology in methodologies_used}
         
         expected_methods = ['experimental', 'computational', 'clinical', 'meta-analysis']
         for method in expected_methods:
@@ -529,23 +701,6 @@ class ResearchVectorDB:
                 gaps.append(f"Gap in {method} approaches")
         
         return gaps[:5]
-    
-    def _calculate_node_importance(self, nodes: Dict[str, Any], edges: List[Dict[str, Any]]) -> Dict[str, float]:
-        """Calculate node importance scores"""
-        importance = defaultdict(float)
-        
-        # Calculate degree centrality
-        degree_count = defaultdict(int)
-        for edge in edges:
-            degree_count[edge['source']] += 1
-            degree_count[edge['target']] += 1
-        
-        max_degree = max(degree_count.values()) if degree_count else 1
-        
-        for node_id, degree in degree_count.items():
-            importance[node_id] = degree / max_degree
-        
-        return dict(importance)
 
 
 # Utility functions
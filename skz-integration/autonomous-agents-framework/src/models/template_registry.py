@@ -0,0 +1,176 @@
+"""
+Template Registry - Compiled Communication Templates
+Compiles each template's subject and body once per content version and
+renders batches of contexts, evaluating the parts of a template that read
+only values shared by the whole batch once instead of once per recipient
+"""
+
+import hashlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import jinja2
+from jinja2 import nodes
+from markupsafe import escape
+
+_MISSING = object()
+
+
+def content_hash(source: str) -> str:
+    return hashlib.sha1(source.encode('utf-8')).hexdigest()
+
+
+def _same(a: Any, b: Any) -> bool:
+    """Whether two context values render identically (1 == True, but not as text)"""
+    return a is b or (type(a) is type(b) and a == b)
+
+
+def _names(node: nodes.Node) -> frozenset:
+    """Context variables read by an expression"""
+    found = [node] if isinstance(node, nodes.Name) else []
+    return frozenset(name.name for name in found + list(node.find_all(nodes.Name)))
+
+
+class CompiledTemplate:
+    """
+    One template source, compiled once
+
+    If the template is plain output (text and ``{{ }}`` expressions, no
+    statements), its output is kept as a list of fragments tagged with the
+    variables they read. ``render_many`` renders the runs of fragments that
+    read only values shared by every context once, and writes bare
+    per-recipient ``{{ name }}`` fragments without going through Jinja.
+    """
+
+    def __init__(self, environment: jinja2.Environment, source: str):
+        self.environment = environment
+        self.source = source
+        self.hash = content_hash(source)
+        self.template = environment.from_string(source)
+        self.fragments = self._split(environment.parse(source))
+        self.names = frozenset().union(*(names for _, names in self.fragments)) if self.fragments else frozenset()
+        self._plans: Dict[frozenset, List[Tuple[str, Any]]] = {}
+
+        autoescape = environment.autoescape
+        self.autoescape = autoescape(None) if callable(autoescape) else bool(autoescape)
+        # Bare names can skip Jinja only when rendering one is just str/escape
+        self._direct_names = environment.finalize is None and environment.undefined is jinja2.Undefined
+
+    @staticmethod
+    def _split(tree: nodes.Template) -> Optional[List[Tuple[nodes.Node, frozenset]]]:
+        if not all(isinstance(node, nodes.Output) for node in tree.body):
+            return None
+        return [(node, _names(node)) for output in tree.body for node in output.nodes]
+
+    def render(self, context: Dict[str, Any]) -> str:
+        return self.template.render(**context)
+
+    def render_many(self, contexts: Iterable[Dict[str, Any]]) -> List[str]:
+        """Render every context; same output as ``render`` on each"""
+        contexts = list(contexts)
+        if self.fragments is None or len(contexts) < 2:
+            return [self.template.render(**context) for context in contexts]
+
+        first = contexts[0]
+        shared = frozenset(
+            name for name in self.names
+            if all(_same(context.get(name, _MISSING), first.get(name, _MISSING)) for context in contexts)
+        )
+        parts = [(kind, part.render(**first) if kind == 'shared' else part)
+                 for kind, part in self._plan(shared)]
+
+        convert = escape if self.autoescape else str
+        rendered = []
+        for context in contexts:
+            pieces = []
+            for kind, part in parts:
+                if kind == 'shared':
+                    pieces.append(part)
+                elif kind == 'name':
+                    value = context.get(part, self.template.globals.get(part, _MISSING))
+                    pieces.append('' if value is _MISSING else convert(value))
+                else:
+                    pieces.append(part.render(**context))
+            rendered.append(''.join(pieces))
+        return rendered
+
+    def _plan(self, shared: frozenset) -> List[Tuple[str, Any]]:
+        """Runs of fragments as ('shared', template), ('name', variable) or ('varying', template)"""
+        plan = self._plans.get(shared)
+        if plan is not None:
+            return plan
+
+        plan, run, run_shared = [], [], None
+
+        def close_run():
+            if run:
+                plan.append(('shared' if run_shared else 'varying', self._compile(run)))
+                run.clear()
+
+        for node, names in self.fragments:
+            is_shared = names <= shared
+            if not is_shared and self._direct_names and isinstance(node, nodes.Name):
+                close_run()
+                plan.append(('name', node.name))
+                continue
+            if run and is_shared != run_shared:
+                close_run()
+            run_shared = is_shared
+            run.append(node)
+        close_run()
+
+        self._plans[shared] = plan
+        return plan
+
+    def _compile(self, fragment_nodes: List[nodes.Node]) -> jinja2.Template:
+        tree = nodes.Template([nodes.Output(list(fragment_nodes), lineno=1)], lineno=1)
+        tree.set_environment(self.environment)
+        return self.environment.from_string(tree)
+
+
+class TemplateRegistry:
+    """
+    Compiled subject and body templates by template id
+
+    A template is recompiled when its source changes, so edits to a
+    registered ``CommunicationTemplate`` take effect on the next render.
+    """
+
+    def __init__(self, environment: jinja2.Environment):
+        self.environment = environment
+        self._compiled: Dict[Tuple[str, str], CompiledTemplate] = {}
+        self.compilations = 0
+
+    def compiled(self, template_id: str, field: str, source: str) -> CompiledTemplate:
+        key = (template_id, field)
+        entry = self._compiled.get(key)
+        if entry is None or (entry.source is not source and entry.source != source):
+            entry = self._compiled[key] = CompiledTemplate(self.environment, source)
+            self.compilations += 1
+        return entry
+
+    def render(self, template, context: Dict[str, Any]) -> Tuple[str, str]:
+        """Subject and body of a CommunicationTemplate for one context"""
+        return (self.compiled(template.template_id, 'subject', template.subject_template).render(context),
+                self.compiled(template.template_id, 'body', template.body_template).render(context))
+
+    def render_many(self, template, contexts: Iterable[Dict[str, Any]]) -> List[Tuple[str, str]]:
+        """Subjects and bodies for many contexts, sharing work across the batch"""
+        contexts = list(contexts)
+        subjects = self.compiled(template.template_id, 'subject', template.subject_template).render_many(contexts)
+        bodies = self.compiled(template.template_id, 'body', template.body_template).render_many(contexts)
+        return list(zip(subjects, bodies))
+
+    def invalidate(self, template_id: Optional[str] = None):
+        """Drop compiled templates for one template id, or all"""
+        if template_id is None:
+            self._compiled.clear()
+        else:
+            for key in [key for key in self._compiled if key[0] == template_id]:
+                del self._compiled[key]
+
+    def versions(self) -> Dict[str, Dict[str, str]]:
+        """Content hash of each compiled field by template id"""
+        versions: Dict[str, Dict[str, str]] = {}
+        for (template_id, field), entry in self._compiled.items():
+            versions.setdefault(template_id, {})[field] = entry.hash
+        return versions
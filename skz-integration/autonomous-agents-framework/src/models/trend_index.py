@@ -0,0 +1,251 @@
+"""
+Research Trend Index - Month-Bucketed Counts per Research Area
+Keeps, for every research area, per-month paper counts, citation and novelty
+sums, and keyword/methodology counts in dense NumPy arrays, so trend queries
+over any window are array slices rather than searches
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def month_index(date: Any) -> int:
+    """Months since year 0 for a datetime or a 'YYYY-MM[-DD]' string"""
+    if isinstance(date, datetime):
+        return date.year * 12 + date.month - 1
+    year, month = str(date)[:7].split('-')
+    if not 1 <= int(month) <= 12:
+        raise ValueError(f"Invalid month in date: {date}")
+    return int(year) * 12 + int(month) - 1
+
+
+def month_key(index: int) -> str:
+    """'YYYY-MM' for a month index"""
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def _grow(array: np.ndarray, rows: int = 0, columns: int = 0, before: int = 0) -> np.ndarray:
+    """Zero-pad ``array`` with ``before`` leading rows and extra trailing rows/columns"""
+    padding = [(before, rows)] + ([(0, columns)] if array.ndim == 2 else [])
+    return np.pad(array, padding)
+
+
+class Vocabulary:
+    """Term to column mapping"""
+
+    def __init__(self):
+        self.columns: Dict[str, int] = {}
+        self.names: List[str] = []
+
+    def column(self, term: str) -> int:
+        column = self.columns.get(term)
+        if column is None:
+            column = self.columns[term] = len(self.names)
+            self.names.append(term)
+        return column
+
+    def __len__(self):
+        return len(self.names)
+
+
+class AreaCube:
+    """
+    Per-month aggregates for one research area
+
+    Row ``r`` holds month ``origin + r``. Rows and keyword/methodology columns
+    are over-allocated and grown by doubling, so adding a paper is amortised
+    O(keywords).
+    """
+
+    def __init__(self, first_month: int):
+        self.origin = first_month
+        self.months = 0
+        self.keywords = Vocabulary()
+        self.methodologies = Vocabulary()
+        self.papers = np.zeros(16, dtype=np.int32)
+        self.citations = np.zeros(16, dtype=np.int64)
+        self.novelty = np.zeros(16, dtype=np.float64)
+        self.keyword_counts = np.zeros((16, 64), dtype=np.int32)
+        self.keyword_novelty = np.zeros((16, 64), dtype=np.float32)
+        self.methodology_counts = np.zeros((16, 8), dtype=np.int32)
+
+    def _row(self, month: int) -> int:
+        if month < self.origin:
+            before = self.origin - month
+            self._resize(before=before)
+            self.origin = month
+            self.months += before
+        row = month - self.origin
+        if row >= len(self.papers):
+            self._resize(rows=max(row + 1, 2 * len(self.papers)) - len(self.papers))
+        self.months = max(self.months, row + 1)
+        return row
+
+    def _resize(self, rows: int = 0, before: int = 0):
+        self.papers = _grow(self.papers, rows, before=before)
+        self.citations = _grow(self.citations, rows, before=before)
+        self.novelty = _grow(self.novelty, rows, before=before)
+        self.keyword_counts = _grow(self.keyword_counts, rows, before=before)
+        self.keyword_novelty = _grow(self.keyword_novelty, rows, before=before)
+        self.methodology_counts = _grow(self.methodology_counts, rows, before=before)
+
+    def _keyword_column(self, keyword: str) -> int:
+        column = self.keywords.column(keyword)
+        if column >= self.keyword_counts.shape[1]:
+            extra = self.keyword_counts.shape[1]
+            self.keyword_counts = _grow(self.keyword_counts, columns=extra)
+            self.keyword_novelty = _grow(self.keyword_novelty, columns=extra)
+        return column
+
+    def _methodology_column(self, methodology: str) -> int:
+        column = self.methodologies.column(methodology)
+        if column >= self.methodology_counts.shape[1]:
+            self.methodology_counts = _grow(self.methodology_counts, columns=self.methodology_counts.shape[1])
+        return column
+
+    def add(self, month: int, keywords: Iterable[str], methodology: str, citations: int, novelty: float):
+        row = self._row(month)
+        self.papers[row] += 1
+        self.citations[row] += citations
+        self.novelty[row] += novelty
+        for keyword in keywords:
+            column = self._keyword_column(keyword)
+            self.keyword_counts[row, column] += 1
+            self.keyword_novelty[row, column] += novelty
+        if methodology:
+            self.methodology_counts[row, self._methodology_column(methodology)] += 1
+
+    def window(self, start_month: int, end_month: int) -> 'TrendWindow':
+        first = max(start_month, self.origin)
+        last = min(end_month, self.origin + self.months - 1)
+        rows = slice(first - self.origin, max(last - self.origin + 1, first - self.origin))
+        keyword_columns, methodology_columns = len(self.keywords), len(self.methodologies)
+        return TrendWindow(
+            start_month=start_month,
+            end_month=end_month,
+            first_month=first,
+            papers=self.papers[rows].copy(),
+            citations=self.citations[rows].copy(),
+            novelty_sum=float(self.novelty[rows].sum()),
+            keyword_names=self.keywords.names,
+            keyword_counts=self.keyword_counts[rows, :keyword_columns].sum(axis=0),
+            keyword_novelty=self.keyword_novelty[rows, :keyword_columns].sum(axis=0, dtype=np.float64),
+            methodology_names=self.methodologies.names,
+            methodology_counts=self.methodology_counts[rows, :methodology_columns].sum(axis=0)
+        )
+
+
+@dataclass
+class TrendWindow:
+    """Aggregates of one research area over a range of months"""
+    start_month: int
+    end_month: int
+    first_month: int
+    papers: np.ndarray
+    citations: np.ndarray
+    novelty_sum: float
+    keyword_names: List[str]
+    keyword_counts: np.ndarray
+    keyword_novelty: np.ndarray
+    methodology_names: List[str]
+    methodology_counts: np.ndarray
+
+    @property
+    def total_papers(self) -> int:
+        return int(self.papers.sum())
+
+    @property
+    def total_citations(self) -> int:
+        return int(self.citations.sum())
+
+    def monthly_papers(self) -> Dict[str, int]:
+        return {month_key(self.first_month + row): int(count) for row, count in enumerate(self.papers)}
+
+    def monthly_average_citations(self) -> Dict[str, float]:
+        """Mean citations per paper for months with papers"""
+        return {
+            month_key(self.first_month + row): float(self.citations[row] / count)
+            for row, count in enumerate(self.papers) if count
+        }
+
+    def top_keywords(self, limit: int) -> List[Tuple[str, int]]:
+        return _top(self.keyword_names, self.keyword_counts, limit)
+
+    def top_methodologies(self, limit: int) -> List[Tuple[str, int]]:
+        return _top(self.methodology_names, self.methodology_counts, limit)
+
+    def keywords_above(self, values: np.ndarray, threshold: float) -> Dict[str, float]:
+        return {self.keyword_names[column]: float(values[column]) for column in np.flatnonzero(values > threshold)}
+
+    def covered_keywords(self) -> set:
+        return {self.keyword_names[column] for column in np.flatnonzero(self.keyword_counts)}
+
+    def used_methodologies(self) -> set:
+        return {self.methodology_names[column] for column in np.flatnonzero(self.methodology_counts)}
+
+
+def _top(names: List[str], counts: np.ndarray, limit: int) -> List[Tuple[str, int]]:
+    """The ``limit`` highest non-zero counts, highest first (ties by first seen)"""
+    if not len(counts):
+        return []
+    order = np.argsort(-counts, kind='stable')[:limit]
+    return [(names[column], int(counts[column])) for column in order if counts[column] > 0]
+
+
+class TrendIndex:
+    """
+    Trend cubes for all research areas
+
+    Documents are counted once per listed research area, in the month of
+    their publication date. ``document_types`` restricts which documents are
+    counted (all when None).
+    """
+
+    def __init__(self, document_types: Optional[Iterable[str]] = None):
+        self.document_types = set(document_types) if document_types else None
+        self.cubes: Dict[str, AreaCube] = {}
+        self.doc_ids: set = set()
+        self.skipped = 0
+
+    def add(self, doc_id: str, research_areas: Iterable[str], keywords: Iterable[str], methodology: str,
+            publication_date: str, citation_count: int = 0, novelty_score: float = 0.0,
+            document_type: Optional[str] = None) -> bool:
+        """Count one document; returns False if it was already counted or is excluded"""
+        if doc_id in self.doc_ids:
+            return False
+        if self.document_types is not None and document_type not in self.document_types:
+            return False
+        try:
+            month = month_index(publication_date)
+        except (TypeError, ValueError):
+            self.skipped += 1
+            logger.debug(f"Not indexing trends for {doc_id}: bad publication date {publication_date!r}")
+            return False
+
+        self.doc_ids.add(doc_id)
+        keywords = [keyword.lower() for keyword in keywords]
+        for area in set(research_areas):
+            cube = self.cubes.get(area)
+            if cube is None:
+                cube = self.cubes[area] = AreaCube(month)
+            cube.add(month, keywords, methodology, citation_count or 0, novelty_score or 0.0)
+        return True
+
+    def window(self, research_area: str, start_month: int, end_month: int) -> TrendWindow:
+        """Aggregates for ``research_area`` over months ``start_month..end_month`` inclusive"""
+        cube = self.cubes.get(research_area) or AreaCube(start_month)
+        return cube.window(start_month, end_month)
+
+    def clear(self):
+        self.cubes.clear()
+        self.doc_ids.clear()
+        self.skipped = 0
+
+    def __len__(self):
+        return len(self.doc_ids)
@@ -90,6 +90,113 @@ class OptimizationResult:
     recommendations: List[str]
     timestamp: str
 
+# Suitability weights: success rate and spare capacity are stored per slot,
+# the speed factor depends on the task and is added at selection
+SUCCESS_WEIGHT, LOAD_WEIGHT, SPEED_WEIGHT = 0.4, 0.3, 0.3
+
+
+class AgentSlotIndex:
+    """Agent execution slots indexed by capability and ordered by free time
+    
+    Every agent offers ``max_capacity - current_load`` concurrent slots. A slot
+    is listed in one heap per key it can serve (its agent ID, each capability
+    and its agent type), keyed by ``(next_free_time, -suitability, slot)``.
+    Occupying a slot pushes fresh entries; outdated ones are dropped lazily
+    when they reach the top of a heap. The stored suitability leaves out the
+    task-dependent speed factor, which is added when tied slots are compared.
+    """
+    
+    def __init__(self, agents: List[AgentResource]):
+        self.agents = []
+        self.free_time = []
+        self.score = []
+        self.slot_keys = []
+        self.heaps = defaultdict(list)
+        self._selected = None
+        
+        for agent in agents:
+            # Task-independent part of the agent suitability score
+            load_factor = 1.0 - (agent.current_load / agent.max_capacity) if agent.max_capacity else 0.0
+            score = agent.success_rate * SUCCESS_WEIGHT + load_factor * LOAD_WEIGHT
+            keys = [('agent', agent.agent_id), ('agent_type', agent.agent_type)]
+            keys.extend(('agent', capability) for capability in agent.capabilities)
+            
+            for _ in range(max(0, agent.max_capacity - agent.current_load)):
+                slot = len(self.agents)
+                self.agents.append(agent)
+                self.free_time.append(0)
+                self.score.append(score)
+                self.slot_keys.append(keys)
+                for key in keys:
+                    self.heaps[key].append((0, -score, slot))
+        
+        for heap in self.heaps.values():
+            heapq.heapify(heap)
+    
+    def _peek(self, key: Tuple[str, str]) -> Optional[Tuple[int, float, int]]:
+        heap = self.heaps.get(key)
+        while heap:
+            free_time, _, slot = heap[0]
+            if free_time == self.free_time[slot]:
+                return heap[0]
+            heapq.heappop(heap)
+        return None
+    
+    def earliest_slot(self, task: WorkflowTask) -> Optional[Tuple[AgentResource, int]]:
+        """Eligible slot that frees up first, preferring more suitable agents on ties
+        
+        An agent is eligible when its ID or one of its capabilities matches
+        ``task.agent_id``, or its type is listed in the task's
+        ``resource_requirements['agent_types']``. Ties on free time go to the
+        highest suitability including the task's speed factor, so tied
+        entries are scanned until the speed factor can no longer close the gap.
+        """
+        keys = [('agent', task.agent_id)]
+        keys.extend(('agent_type', agent_type) for agent_type in task.resource_requirements.get('agent_types', []))
+        
+        tops = [(key, self._peek(key)) for key in keys]
+        free_times = [entry[0] for _, entry in tops if entry is not None]
+        if not free_times:
+            self._selected = None
+            return None
+        free_time = min(free_times)
+        
+        best_slot, best_score, scanned = None, None, []
+        for key, entry in tops:
+            if entry is None or entry[0] != free_time:
+                continue
+            heap = self.heaps[key]
+            # Tied entries come off in descending stored score
+            while entry is not None and entry[0] == free_time:
+                if best_score is not None and -entry[1] + SPEED_WEIGHT <= best_score:
+                    break
+                scanned.append((key, heapq.heappop(heap)))
+                slot = entry[2]
+                score = self.score[slot] + self._speed_factor(slot, task)
+                if best_score is None or score > best_score:
+                    best_slot, best_score = slot, score
+                entry = self._peek(key)
+        for key, entry in scanned:
+            heapq.heappush(self.heaps[key], entry)
+        
+        self._selected = best_slot
+        return self.agents[best_slot], free_time
+    
+    def _speed_factor(self, slot: int, task: WorkflowTask) -> float:
+        """Task-dependent part of the suitability score: agents at least as fast as the estimate score highest"""
+        avg_task_time = self.agents[slot].avg_task_time
+        if avg_task_time <= 0:
+            return 0.0
+        return SPEED_WEIGHT * min(1.0, task.estimated_duration / avg_task_time)
+    
+    def occupy_until(self, end_time: int):
+        """Mark the slot returned by the last ``earliest_slot`` busy until ``end_time``"""
+        slot = self._selected
+        self.free_time[slot] = end_time
+        for key in self.slot_keys[slot]:
+            heapq.heappush(self.heaps[key], (end_time, -self.score[slot], slot))
+
+
 class WorkflowOptimizer:
     """Advanced workflow optimization and coordination system"""
     
@@ -166,9 +273,10 @@ class WorkflowOptimizer:
             graph.add_node(task.task_id, task_data=task)
         
         # Add dependency edges
+        task_ids = {task.task_id for task in tasks}
         for task in tasks:
             for dependency in task.dependencies:
-                if dependency in [t.task_id for t in tasks]:
+                if dependency in task_ids:
                     graph.add_edge(dependency, task.task_id)
         
         return graph
@@ -247,120 +355,113 @@ class WorkflowOptimizer:
         
         return bottlenecks[:5]  # Top 5 bottlenecks
     
-    async def _generate_optimal_schedule(self, 
+    async def _generate_optimal_schedule(self,
                                        workflow: WorkflowDefinition,
                                        agents: List[AgentResource],
                                        dependency_graph: nx.DiGraph) -> List[Dict[str, Any]]:
-        """Generate optimal task execution schedule"""
+        """Generate optimal task execution schedule
+        
+        HEFT-style list scheduling: ready tasks are taken in order of upward
+        rank (longest remaining path to an exit task, then priority) and placed
+        on the eligible agent slot that frees up first.
+        """
         
         schedule = []
         
         try:
-            # Get topological order for dependency constraints
-            execution_order = list(nx.topological_sort(dependency_graph))
+            tasks_by_id = {task.task_id: task for task in workflow.tasks}
+            task_order = {task.task_id: index for index, task in enumerate(workflow.tasks)}
+            upward_rank = self._calculate_upward_ranks(dependency_graph, tasks_by_id)
+            critical_length = max(upward_rank.values(), default=0)
+            slots = AgentSlotIndex(agents)
             
-            # Create agent availability tracking
-            agent_availability = {}
-            for agent in agents:
-                agent_availability[agent.agent_id] = {
-                    'next_free_time': 0,
-                    'current_tasks': [],
-                    'capacity_remaining': agent.max_capacity - agent.current_load
-                }
+            # Ready queue ordered by critical-path priority
+            remaining_dependencies = {task_id: dependency_graph.in_degree(task_id) for task_id in tasks_by_id}
+            ready = [
+                (-upward_rank[task.task_id], -task.priority.value, task_order[task.task_id], task.task_id)
+                for task in workflow.tasks
+                if remaining_dependencies[task.task_id] == 0
+            ]
+            heapq.heapify(ready)
             
-            # Schedule tasks in dependency order
+            # Latest dependency completion time per task
             scheduled_tasks = {}
-            current_time = 0
+            ready_time = defaultdict(int)
             
-            for task_id in execution_order:
-                task = next(t for t in workflow.tasks if t.task_id == task_id)
+            while ready:
+                _, _, _, task_id = heapq.heappop(ready)
+                task = tasks_by_id[task_id]
+                slot = slots.earliest_slot(task)
                 
-                # Find best agent for this task
-                best_agent = await self._find_best_agent(task, agents, agent_availability)
-                
-                if best_agent:
-                    # Calculate start time based on dependencies and agent availability
-                    dependency_completion_time = 0
-                    for dep_id in task.dependencies:
-                        if dep_id in scheduled_tasks:
-                            dependency_completion_time = max(
-                                dependency_completion_time,
-                                scheduled_tasks[dep_id]['end_time']
-                            )
-                    
-                    start_time = max(
-                        dependency_completion_time,
-                        agent_availability[best_agent.agent_id]['next_free_time']
-                    )
-                    
+                if slot is not None:
+                    agent, free_time = slot
+                    start_time = max(ready_time[task_id], free_time)
                     end_time = start_time + task.estimated_duration
                     
                     # Schedule the task
                     schedule_entry = {
                         'task_id': task.task_id,
-                        'agent_id': best_agent.agent_id,
+                        'agent_id': agent.agent_id,
                         'start_time': start_time,
                         'end_time': end_time,
                         'duration': task.estimated_duration,
                         'priority': task.priority.value,
-                        'dependencies_met': all(dep in scheduled_tasks for dep in task.dependencies)
+                        'dependencies_met': all(dep in scheduled_tasks for dep in task.dependencies),
+                        'on_critical_path': start_time + upward_rank[task_id] == critical_length
                     }
                     
                     schedule.append(schedule_entry)
                     scheduled_tasks[task_id] = schedule_entry
                     
                     # Update agent availability
-                    agent_availability[best_agent.agent_id]['next_free_time'] = end_time
-                    agent_availability[best_agent.agent_id]['capacity_remaining'] -= 1
-                    
+                    slots.occupy_until(end_time)
+                    dependency_end = end_time
+                
                 else:
                     logger.warning(f"No suitable agent found for task {task_id}")
+                    dependency_end = ready_time[task_id]
+                
+                # Release dependents once all their dependencies are placed
+                for successor in dependency_graph.successors(task_id):
+                    ready_time[successor] = max(ready_time[successor], dependency_end)
+                    remaining_dependencies[successor] -= 1
+                    if remaining_dependencies[successor] == 0:
+                        heapq.heappush(ready, (
+                            -upward_rank[successor], -tasks_by_id[successor].priority.value,
+                            task_order[successor], successor
+                        ))
+            
+            if any(remaining_dependencies.values()):
+                logger.warning("Workflow contains cycles - tasks on or after a cycle were not scheduled")
             
             # Sort schedule by start time
             schedule.sort(key=lambda x: x['start_time'])
-            
+        
         except Exception as e:
             logger.error(f"Error generating schedule: {e}")
         
         return schedule
     
-    async def _find_best_agent(self, task: WorkflowTask, agents: List[AgentResource], availability: Dict) -> Optional[AgentResource]:
-        """Find best agent for a task"""
+    def _calculate_upward_ranks(self, graph: nx.DiGraph, tasks_by_id: Dict[str, WorkflowTask]) -> Dict[str, int]:
+        """Longest path from each task to an exit task, including its own duration"""
         
-        suitable_agents = []
+        upward_rank = {}
         
-        for agent in agents:
-            # Check if agent can handle this task type
-            if (task.agent_id == agent.agent_id or 
-                task.agent_id in agent.capabilities or
-                agent.agent_type in task.resource_requirements.get('agent_types', [])):
-                
-                # Check capacity
-                if availability[agent.agent_id]['capacity_remaining'] > 0:
-                    
-                    # Calculate suitability score
-                    score = 0.0
-                    
-                    # Success rate factor
-                    score += agent.success_rate * 0.4
-                    
-                    # Load factor (prefer less loaded agents)
-                    load_factor = 1.0 - (agent.current_load / agent.max_capacity)
-                    score += load_factor * 0.3
-                    
-                    # Speed factor
-                    if agent.avg_task_time > 0:
-                        speed_factor = min(1.0, task.estimated_duration / agent.avg_task_time)
-                        score += speed_factor * 0.3
-                    
-                    suitable_agents.append((agent, score))
+        try:
+            order = list(nx.topological_sort(graph))
+        except nx.NetworkXUnfeasible:
+            order = []
         
-        # Return best agent
-        if suitable_agents:
-            suitable_agents.sort(key=lambda x: x[1], reverse=True)
-            return suitable_agents[0][0]
+        for task_id in reversed(order):
+            upward_rank[task_id] = tasks_by_id[task_id].estimated_duration + max(
+                (upward_rank[successor] for successor in graph.successors(task_id)), default=0
+            )
         
-        return None
+        # Tasks of a cyclic graph fall back to their own duration
+        for task_id, task in tasks_by_id.items():
+            upward_rank.setdefault(task_id, task.estimated_duration)
+        
+        return upward_rank
     
     async def _estimate_completion_time(self, schedule: List[Dict[str, Any]], tasks: List[WorkflowTask]) -> int:
         """Estimate total workflow completion time"""
@@ -380,14 +481,12 @@ class WorkflowOptimizer:
         
         total_time = max(entry['end_time'] for entry in schedule)
         
+        busy_time = defaultdict(int)
+        for entry in schedule:
+            busy_time[entry['agent_id']] += entry['duration']
+        
         for agent in agents:
-            agent_tasks = [entry for entry in schedule if entry['agent_id'] == agent.agent_id]
-            
-            if agent_tasks:
-                busy_time = sum(entry['duration'] for entry in agent_tasks)
-                utilization[agent.agent_id] = busy_time / total_time if total_time > 0 else 0.0
-            else:
-                utilization[agent.agent_id] = 0.0
+            utilization[agent.agent_id] = busy_time[agent.agent_id] / total_time if total_time > 0 else 0.0
         
         return utilization
     
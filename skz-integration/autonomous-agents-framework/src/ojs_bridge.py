@@ -215,6 +215,37 @@ class OJSBridge:
             logger.error(f"Failed to get manuscripts: {response.data}")
             return []
     
+    def get_manuscripts_page(self, filters: Optional[Dict[str, Any]] = None, count: int = 20,
+                             offset: int = 0, order_by: str = 'dateSubmitted',
+                             order_direction: str = 'DESC') -> Optional[Dict[str, Any]]:
+        """Get one ordered page of manuscripts from OJS
+        
+        The submissions API pages by ``offset`` and caps ``count`` at 100;
+        filters are passed through as query parameters, so only the ones OJS
+        reads (status, searchPhrase, sectionIds, assignedTo, ...) take effect.
+        Returns ``{'items': [...], 'items_max': total or None}``, or None if
+        the request failed.
+        """
+        endpoint = '/api/v1/submissions'
+        params = {
+            **(filters or {}),
+            'count': count,
+            'offset': offset,
+            'orderBy': order_by,
+            'orderDirection': order_direction
+        }
+        
+        response = self._make_request(endpoint, 'GET', data=params)
+        
+        if response.status_code == 200:
+            return {
+                'items': response.data.get('submissions', response.data.get('items', [])),
+                'items_max': response.data.get('itemsMax')
+            }
+        else:
+            logger.error(f"Failed to get manuscript page: {response.data}")
+            return None
+    
     def get_manuscript(self, submission_id: str) -> Optional[Dict[str, Any]]:
         """Get specific manuscript from OJS"""
         endpoint = f'/api/v1/submissions/{submission_id}'
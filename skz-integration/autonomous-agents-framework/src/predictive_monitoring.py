@@ -5,15 +5,16 @@ using LSTM neural networks, isolation forests, and transformer models.
 """
 
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 import pandas as pd
-import torch
-import torch.nn as nn
-import torch.optim as optim
 from sklearn.preprocessing import MinMaxScaler, StandardScaler
 from sklearn.ensemble import IsolationForest
 from sklearn.metrics import mean_squared_error, accuracy_score
 import sqlite3
+import copy
 import json
+import os
+import pickle
 import logging
 import threading
 import time
@@ -22,193 +23,394 @@ from typing import Dict, List, Optional, Any, Tuple
 from collections import defaultdict, deque
 import asyncio
 import warnings
+from functools import lru_cache
+from ml_runtime import load_torch, default_device, quantize_for_cpu, export_model
 warnings.filterwarnings('ignore')
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class LSTMTrendAnalyzer(nn.Module):
-    """LSTM Neural Network for time series trend analysis and forecasting"""
+@lru_cache(maxsize=None)
+def _lstm_trend_analyzer_class():
+    """Build the LSTM model class once torch is actually needed"""
+    torch = load_torch()
+    nn = torch.nn
     
-    def __init__(self, input_size: int = 5, hidden_size: int = 64, 
-                 num_layers: int = 2, output_size: int = 1, dropout: float = 0.2):
-        super(LSTMTrendAnalyzer, self).__init__()
+    class LSTMTrendAnalyzer(nn.Module):
+        """LSTM Neural Network for time series trend analysis and forecasting"""
         
-        self.hidden_size = hidden_size
-        self.num_layers = num_layers
-        
-        self.lstm = nn.LSTM(
-            input_size=input_size,
-            hidden_size=hidden_size,
-            num_layers=num_layers,
-            dropout=dropout,
-            batch_first=True
-        )
-        
-        self.linear = nn.Linear(hidden_size, output_size)
-        self.dropout = nn.Dropout(dropout)
-        
-    def forward(self, x):
-        # Initialize hidden state
-        h0 = torch.zeros(self.num_layers, x.size(0), self.hidden_size)
-        c0 = torch.zeros(self.num_layers, x.size(0), self.hidden_size)
-        
-        # LSTM forward pass
-        lstm_out, _ = self.lstm(x, (h0, c0))
-        
-        # Take the last output
-        last_output = lstm_out[:, -1, :]
-        
-        # Apply dropout and linear layer
-        output = self.dropout(last_output)
-        output = self.linear(output)
+        def __init__(self, input_size: int = 5, hidden_size: int = 64, 
+                     num_layers: int = 2, output_size: int = 1, dropout: float = 0.2):
+            super(LSTMTrendAnalyzer, self).__init__()
+            
+            self.hidden_size = hidden_size
+            self.num_layers = num_layers
+            
+            self.lstm = nn.LSTM(
+                input_size=input_size,
+                hidden_size=hidden_size,
+                num_layers=num_layers,
+                dropout=dropout,
+                batch_first=True
+            )
+            
+            self.linear = nn.Linear(hidden_size, output_size)
+            self.dropout = nn.Dropout(dropout)
+            
+        def forward(self, x):
+            # Initialize hidden state
+            h0 = torch.zeros(self.num_layers, x.size(0), self.hidden_size, device=x.device)
+            c0 = torch.zeros(self.num_layers, x.size(0), self.hidden_size, device=x.device)
+            
+            # LSTM forward pass
+            lstm_out, _ = self.lstm(x, (h0, c0))
+            
+            # Take the last output
+            last_output = lstm_out[:, -1, :]
+            
+            # Apply dropout and linear layer
+            output = self.dropout(last_output)
+            output = self.linear(output)
+            
+            return output
         
-        return output
+    LSTMTrendAnalyzer.__module__ = __name__
+    LSTMTrendAnalyzer.__qualname__ = 'LSTMTrendAnalyzer'
+    return LSTMTrendAnalyzer
+
+
+def __getattr__(name: str):
+    # Keeps ``from predictive_monitoring import LSTMTrendAnalyzer`` working without importing torch eagerly
+    if name == 'LSTMTrendAnalyzer':
+        return _lstm_trend_analyzer_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class TrendAnalyzer:
     """ML-based trend analysis using LSTM neural networks"""
     
-    def __init__(self, sequence_length: int = 24, prediction_horizon: int = 6):
+    def __init__(self, sequence_length: int = 24, prediction_horizon: int = 6,
+                 checkpoint_path: Optional[str] = None, batch_size: int = 64,
+                 max_epochs: int = 100, patience: int = 10, validation_split: float = 0.1,
+                 quantize_inference: bool = False):
+        """
+        Args:
+            sequence_length: Hours of history fed to the model
+            prediction_horizon: Hours predicted ahead
+            checkpoint_path: Base path for the saved model (``.pt``) and scaler
+                (``.scaler.pkl``); loaded on start-up when present
+            batch_size: Mini-batch size for training
+            max_epochs: Upper bound on training epochs
+            patience: Epochs without validation improvement before stopping
+            validation_split: Trailing fraction of sequences held out for early stopping
+            quantize_inference: Serve predictions from a dynamically int8-quantized
+                CPU copy of the model, rebuilt after each training or checkpoint load
+        """
         self.sequence_length = sequence_length
         self.prediction_horizon = prediction_horizon
+        self.checkpoint_path = checkpoint_path
+        self.batch_size = batch_size
+        self.max_epochs = max_epochs
+        self.patience = patience
+        self.validation_split = validation_split
+        self.quantize_inference = quantize_inference
         self.scaler = MinMaxScaler()
         self.model = None
+        self.inference_model = None
         self.is_trained = False
         self.feature_columns = ['execution_time', 'cpu_usage', 'memory_usage', 'success_rate', 'operation_count']
-        self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+        self.trained_features: List[str] = []
+        self._device = None
+        
+        if checkpoint_path:
+            self.load_checkpoint()
+    
+    @property
+    def device(self):
+        # Resolved on first model use so constructing the analyzer doesn't import torch
+        if self._device is None:
+            self._device = default_device()
+        return self._device
+    
+    def _resample_hourly(self, metrics_df: pd.DataFrame) -> pd.DataFrame:
+        """Aggregate raw operation metrics into hourly feature rows"""
+        metrics_df = metrics_df.assign(timestamp=pd.to_datetime(metrics_df['timestamp'])).set_index('timestamp')
+        
+        aggregations = {
+            'execution_time': 'mean',
+            'cpu_usage': 'mean',
+            'memory_usage': 'mean',
+            'success': 'mean',  # success rate
+            'agent_id': 'count'  # operation count
+        }
+        aggregations = {column: how for column, how in aggregations.items() if column in metrics_df.columns}
+        
+        hourly_data = metrics_df.resample('1h').agg(aggregations).rename(
+            columns={'agent_id': 'operation_count', 'success': 'success_rate'}
+        )
+        
+        # Fill missing values
+        return hourly_data.ffill().fillna(0)
         
     def prepare_time_series_data(self, metrics_df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
-        """Prepare time series data for LSTM training"""
-        if metrics_df.empty:
+        """Prepare time series data for LSTM training
+        
+        Fits the scaler on the full history. ``X`` and ``y`` are strided views
+        over the scaled array (no per-sequence copies): ``X`` has shape
+        ``(n, sequence_length, features)`` and ``y`` holds the next
+        ``prediction_horizon`` values of the first feature (execution_time).
+        """
+        if metrics_df.empty or 'timestamp' not in metrics_df.columns:
+            return np.array([]), np.array([])
+        
+        hourly_data = self._resample_hourly(metrics_df)
+        
+        if len(hourly_data) < self.sequence_length + self.prediction_horizon:
+            logger.warning("Insufficient data for time series analysis")
             return np.array([]), np.array([])
             
-        # Resample data to hourly intervals
-        if 'timestamp' in metrics_df.columns:
-            metrics_df['timestamp'] = pd.to_datetime(metrics_df['timestamp'])
-            metrics_df = metrics_df.set_index('timestamp')
-            
-            # Aggregate metrics by hour
-            hourly_data = metrics_df.resample('1H').agg({
-                'execution_time': 'mean',
-                'cpu_usage': 'mean',
-                'memory_usage': 'mean',
-                'success': 'mean',  # success rate
-                'agent_id': 'count'  # operation count
-            }).rename(columns={'agent_id': 'operation_count', 'success': 'success_rate'})
-            
-            # Fill missing values
-            hourly_data = hourly_data.fillna(method='ffill').fillna(0)
-            
-            if len(hourly_data) < self.sequence_length + self.prediction_horizon:
-                logger.warning("Insufficient data for time series analysis")
-                return np.array([]), np.array([])
-                
-            # Select features
-            available_features = [col for col in self.feature_columns if col in hourly_data.columns]
-            if not available_features:
-                return np.array([]), np.array([])
-                
-            data = hourly_data[available_features].values
-            
-            # Scale data
-            scaled_data = self.scaler.fit_transform(data)
-            
-            # Create sequences
-            X, y = [], []
-            for i in range(len(scaled_data) - self.sequence_length - self.prediction_horizon + 1):
-                # Input sequence
-                X.append(scaled_data[i:(i + self.sequence_length)])
-                # Target is the next prediction_horizon values of the first feature (execution_time)
-                y.append(scaled_data[i + self.sequence_length:i + self.sequence_length + self.prediction_horizon, 0])
-                
-            return np.array(X), np.array(y)
+        # Select features
+        available_features = [col for col in self.feature_columns if col in hourly_data.columns]
+        if not available_features:
+            return np.array([]), np.array([])
+        
+        data = hourly_data[available_features].to_numpy(dtype=np.float32)
+        
+        # Scale data
+        scaled_data = self.scaler.fit_transform(data).astype(np.float32)
+        self.trained_features = available_features
+        
+        # Windows of shape (n, features, sequence_length + prediction_horizon)
+        windows = sliding_window_view(scaled_data, self.sequence_length + self.prediction_horizon, axis=0)
+        X = windows[:, :, :self.sequence_length].transpose(0, 2, 1)
+        y = windows[:, 0, self.sequence_length:]
+        
+        return X, y
+    
+    def prepare_prediction_window(self, recent_metrics: pd.DataFrame) -> np.ndarray:
+        """Scale only the last ``sequence_length`` hours with the frozen training scaler"""
+        if recent_metrics.empty or 'timestamp' not in recent_metrics.columns:
+            return np.array([])
+        
+        timestamps = pd.to_datetime(recent_metrics['timestamp'])
+        window_start = timestamps.max().floor('h') - pd.Timedelta(hours=self.sequence_length - 1)
+        # One extra hour so forward-fill has a value to carry into the window
+        recent = recent_metrics[timestamps >= window_start - pd.Timedelta(hours=1)]
+        
+        hourly_data = self._resample_hourly(recent)
+        hourly_data = hourly_data[hourly_data.index >= window_start]
         
-        return np.array([]), np.array([])
+        if len(hourly_data) < self.sequence_length or any(
+                col not in hourly_data.columns for col in self.trained_features):
+            return np.array([])
+        
+        data = hourly_data[self.trained_features].to_numpy(dtype=np.float32)[-self.sequence_length:]
+        return self.scaler.transform(data).astype(np.float32)[np.newaxis]
         
     def train_trend_model(self, metrics_df: pd.DataFrame) -> Dict[str, Any]:
-        """Train LSTM model for trend analysis"""
+        """Train LSTM model for trend analysis
+        
+        Uses shuffled mini-batches with early stopping on a chronological
+        hold-out; the best weights are kept and checkpointed when
+        ``checkpoint_path`` is set.
+        """
         logger.info("Training LSTM trend analysis model")
         
         X, y = self.prepare_time_series_data(metrics_df)
         
         if len(X) == 0:
             return {'status': 'no_data', 'message': 'Insufficient data for training'}
+        
+        torch = load_torch()
+        nn = torch.nn
+        optim = torch.optim
             
         # Initialize model
         input_size = X.shape[2]  # Number of features
-        self.model = LSTMTrendAnalyzer(
+        self.model = _lstm_trend_analyzer_class()(
             input_size=input_size,
             hidden_size=64,
             num_layers=2,
             output_size=self.prediction_horizon
         ).to(self.device)
         
-        # Prepare training data
-        X_tensor = torch.FloatTensor(X).to(self.device)
-        y_tensor = torch.FloatTensor(y).to(self.device)
+        # Chronological hold-out for early stopping
+        n_validation = int(len(X) * self.validation_split) if len(X) >= 10 else 0
+        n_train = len(X) - n_validation
         
         # Training parameters
         criterion = nn.MSELoss()
         optimizer = optim.Adam(self.model.parameters(), lr=0.001)
-        epochs = 100
         
-        # Training loop
-        self.model.train()
-        training_losses = []
+        best_loss = float('inf')
+        best_state = None
+        epochs_without_improvement = 0
+        epochs_run = 0
         
-        for epoch in range(epochs):
-            optimizer.zero_grad()
-            outputs = self.model(X_tensor)
-            loss = criterion(outputs, y_tensor)
-            loss.backward()
-            optimizer.step()
+        for epoch in range(self.max_epochs):
+            self.model.train()
+            epoch_loss = 0.0
+            
+            for batch_rows in np.array_split(np.random.permutation(n_train),
+                                             max(1, int(np.ceil(n_train / self.batch_size)))):
+                # Only the mini-batch is materialized from the strided views
+                X_batch = torch.from_numpy(np.ascontiguousarray(X[batch_rows])).to(self.device)
+                y_batch = torch.from_numpy(np.ascontiguousarray(y[batch_rows])).to(self.device)
+                
+                optimizer.zero_grad()
+                loss = criterion(self.model(X_batch), y_batch)
+                loss.backward()
+                optimizer.step()
+                epoch_loss += loss.item() * len(batch_rows)
             
-            training_losses.append(loss.item())
+            epochs_run = epoch + 1
+            epoch_loss /= n_train
+            monitored_loss = self._evaluate_loss(X[n_train:], y[n_train:], criterion) if n_validation else epoch_loss
             
             if epoch % 20 == 0:
-                logger.info(f"Epoch {epoch}, Loss: {loss.item():.6f}")
-                
+                logger.info(f"Epoch {epoch}, Loss: {epoch_loss:.6f}, Validation: {monitored_loss:.6f}")
+            
+            if monitored_loss < best_loss - 1e-6:
+                best_loss = monitored_loss
+                best_state = {k: v.detach().clone() for k, v in self.model.state_dict().items()}
+                epochs_without_improvement = 0
+            else:
+                epochs_without_improvement += 1
+                if epochs_without_improvement >= self.patience:
+                    logger.info(f"Early stopping after {epochs_run} epochs")
+                    break
+        
+        if best_state is not None:
+            self.model.load_state_dict(best_state)
         self.is_trained = True
+        self._refresh_inference_model()
         
         # Calculate final metrics
-        self.model.eval()
-        with torch.no_grad():
-            predictions = self.model(X_tensor)
-            final_loss = criterion(predictions, y_tensor).item()
+        final_loss = self._evaluate_loss(X, y, criterion)
+        
+        if self.checkpoint_path:
+            self.save_checkpoint()
             
         return {
             'status': 'success',
             'training_samples': len(X),
             'final_loss': final_loss,
-            'training_epochs': epochs,
+            'training_epochs': epochs_run,
             'features_used': input_size
         }
+    
+    def _evaluate_loss(self, X: np.ndarray, y: np.ndarray, criterion) -> float:
+        """Mean loss over ``X``/``y`` in eval mode, batched to bound memory"""
+        torch = load_torch()
+        self.model.eval()
+        total = 0.0
+        with torch.inference_mode():
+            for start in range(0, len(X), self.batch_size * 4):
+                X_batch = torch.from_numpy(np.ascontiguousarray(X[start:start + self.batch_size * 4])).to(self.device)
+                y_batch = torch.from_numpy(np.ascontiguousarray(y[start:start + self.batch_size * 4])).to(self.device)
+                total += criterion(self.model(X_batch), y_batch).item() * len(X_batch)
+        return total / len(X)
+    
+    def save_checkpoint(self, checkpoint_path: Optional[str] = None):
+        """Save model weights and the fitted scaler"""
+        path = checkpoint_path or self.checkpoint_path
+        if not path or self.model is None:
+            return
+        
+        torch = load_torch()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        torch.save(self.model.state_dict(), f"{path}.pt")
+        with open(f"{path}.scaler.pkl", 'wb') as f:
+            pickle.dump({
+                'scaler': self.scaler,
+                'trained_features': self.trained_features,
+                'sequence_length': self.sequence_length,
+                'prediction_horizon': self.prediction_horizon
+            }, f)
+        logger.info(f"Saved trend model checkpoint to {path}")
+    
+    def load_checkpoint(self, checkpoint_path: Optional[str] = None) -> bool:
+        """Restore a checkpoint saved by ``save_checkpoint``; returns whether one was loaded"""
+        path = checkpoint_path or self.checkpoint_path
+        if not path or not os.path.exists(f"{path}.pt") or not os.path.exists(f"{path}.scaler.pkl"):
+            return False
+        
+        with open(f"{path}.scaler.pkl", 'rb') as f:
+            state = pickle.load(f)
+        if (state['sequence_length'], state['prediction_horizon']) != (self.sequence_length, self.prediction_horizon):
+            logger.warning(f"Ignoring trend model checkpoint {path}: window configuration differs")
+            return False
+        
+        torch = load_torch()
+        self.scaler = state['scaler']
+        self.trained_features = state['trained_features']
+        self.model = _lstm_trend_analyzer_class()(
+            input_size=len(self.trained_features),
+            hidden_size=64,
+            num_layers=2,
+            output_size=self.prediction_horizon
+        ).to(self.device)
+        self.model.load_state_dict(torch.load(f"{path}.pt", map_location=self.device))
+        self.model.eval()
+        self.is_trained = True
+        self._refresh_inference_model()
+        logger.info(f"Loaded trend model checkpoint from {path}")
+        return True
+    
+    def _refresh_inference_model(self):
+        self.inference_model = None
+        if self.quantize_inference:
+            self.optimize_for_inference()
+    
+    def optimize_for_inference(self, quantize: bool = True):
+        """Prepare a CPU serving copy of the trained model
+        
+        With ``quantize`` the LSTM and linear layers are dynamically quantized
+        to int8, otherwise the copy stays float; ``predict_trends`` then runs on
+        this copy.
+        """
+        if self.model is None:
+            return
+        if quantize:
+            self.inference_model = quantize_for_cpu(self.model)
+        else:
+            self.inference_model = copy.deepcopy(self.model).to('cpu').eval()
+    
+    def export_inference_model(self, path: str, export_format: str = 'torchscript') -> str:
+        """Export the trained model as TorchScript or ONNX for out-of-process serving"""
+        if self.model is None:
+            raise ValueError("Trend model has not been trained")
+        torch = load_torch()
+        example_input = torch.zeros(1, self.sequence_length, len(self.trained_features), device=self.device)
+        return export_model(self.model, example_input, path, export_format)
         
     def predict_trends(self, recent_metrics: pd.DataFrame) -> Dict[str, Any]:
         """Predict future trends using trained LSTM model"""
         if not self.is_trained or self.model is None:
             return {'status': 'model_not_trained', 'predictions': []}
             
-        # Prepare recent data for prediction
-        X, _ = self.prepare_time_series_data(recent_metrics)
+        # Prepare only the last window, scaled with the training scaler
+        last_sequence = self.prepare_prediction_window(recent_metrics)
         
-        if len(X) == 0:
+        if len(last_sequence) == 0:
             return {'status': 'insufficient_data', 'predictions': []}
             
-        # Use the last sequence for prediction
-        last_sequence = X[-1:]
-        X_tensor = torch.FloatTensor(last_sequence).to(self.device)
+        torch = load_torch()
+        if self.inference_model is not None:
+            model, device = self.inference_model, 'cpu'
+        else:
+            model, device = self.model, self.device
+        X_tensor = torch.from_numpy(last_sequence).to(device)
         
-        self.model.eval()
-        with torch.no_grad():
-            prediction = self.model(X_tensor)
+        model.eval()
+        with torch.inference_mode():
+            prediction = model(X_tensor)
             prediction_np = prediction.cpu().numpy().flatten()
             
         # Inverse scale predictions (only for execution_time feature)
         # Create dummy array for inverse transform
-        dummy_array = np.zeros((len(prediction_np), len(self.feature_columns)))
+        dummy_array = np.zeros((len(prediction_np), len(self.trained_features)))
         dummy_array[:, 0] = prediction_np  # execution_time predictions
         
         try:
@@ -0,0 +1,245 @@
+"""
+Fast Serialization Layer
+orjson-based JSON encoding that understands datetimes and NumPy values,
+content-negotiated msgpack for service-to-service calls, and chunked encoding
+of large list responses, with adapters for the FastAPI SSR server and the
+Flask agent servers
+"""
+
+import dataclasses
+import json
+import logging
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from pathlib import PurePath
+from typing import Any, Dict, Iterator, Optional, Sequence
+from uuid import UUID
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_MEDIA_TYPES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack", "application/vnd.msgpack")
+
+# List responses with at least this many items are streamed in chunks
+STREAM_THRESHOLD = 1000
+STREAM_CHUNK_SIZE = 256
+
+
+def to_builtin(obj: Any) -> Any:
+    """Fallback conversion for values the encoders do not handle natively"""
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if NUMPY_AVAILABLE:
+        if isinstance(obj, np.generic):
+            return obj.item()
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (UUID, PurePath)):
+        return str(obj)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
+
+
+def dumps(obj: Any, sort_keys: bool = False, indent: bool = False) -> bytes:
+    """Encode ``obj`` as compact UTF-8 JSON"""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=to_builtin, option=option)
+    return json.dumps(
+        obj, default=to_builtin, sort_keys=sort_keys, ensure_ascii=False,
+        indent=2 if indent else None, separators=None if indent else (",", ":")
+    ).encode("utf-8")
+
+
+def loads(data: Any) -> Any:
+    """Decode JSON from bytes or str"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def packb(obj: Any) -> bytes:
+    """Encode ``obj`` as msgpack, with the same value conversions as JSON"""
+    if not MSGPACK_AVAILABLE:
+        raise RuntimeError("msgpack is not installed")
+    return msgpack.packb(obj, default=to_builtin, use_bin_type=True, datetime=False)
+
+
+def unpackb(data: bytes) -> Any:
+    """Decode msgpack bytes"""
+    if not MSGPACK_AVAILABLE:
+        raise RuntimeError("msgpack is not installed")
+    return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """Pick msgpack or JSON from an Accept header
+
+    msgpack is only chosen when the client asks for it with a higher quality
+    than JSON and the encoder is installed; browsers and plain clients keep
+    getting JSON.
+    """
+    if not accept or not MSGPACK_AVAILABLE:
+        return JSON_MEDIA_TYPE
+
+    json_quality = msgpack_quality = 0.0
+    for media_range in accept.split(","):
+        media_type, _, params = media_range.strip().partition(";")
+        media_type = media_type.strip().lower()
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if media_type in MSGPACK_MEDIA_TYPES:
+            msgpack_quality = max(msgpack_quality, quality)
+        elif media_type in (JSON_MEDIA_TYPE, "application/*", "*/*"):
+            json_quality = max(json_quality, quality)
+
+    return MSGPACK_MEDIA_TYPE if msgpack_quality > json_quality else JSON_MEDIA_TYPE
+
+
+def encode(obj: Any, media_type: str = JSON_MEDIA_TYPE) -> bytes:
+    """Encode ``obj`` for a negotiated media type"""
+    return packb(obj) if media_type == MSGPACK_MEDIA_TYPE else dumps(obj)
+
+
+def iter_encoded_list(key: str, items: Sequence[Any], envelope: Optional[Dict[str, Any]] = None,
+                      media_type: str = JSON_MEDIA_TYPE, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    """Encode ``{**envelope, key: items}`` as a sequence of chunks
+
+    The envelope fields come first, then the items are encoded
+    ``chunk_size`` at a time, so no single buffer holds the whole response.
+    """
+    envelope = {name: value for name, value in (envelope or {}).items() if name != key}
+
+    if media_type == MSGPACK_MEDIA_TYPE:
+        packer = msgpack.Packer(default=to_builtin, use_bin_type=True, datetime=False)
+        head = packer.pack_map_header(len(envelope) + 1)
+        for name, value in envelope.items():
+            head += packer.pack(name) + packer.pack(value)
+        yield head + packer.pack(key) + packer.pack_array_header(len(items))
+        for start in range(0, len(items), chunk_size):
+            yield b"".join(packer.pack(item) for item in items[start:start + chunk_size])
+        return
+
+    head = dumps(envelope)[:-1]
+    yield head + (b"," if envelope else b"") + dumps(key) + b":["
+    for start in range(0, len(items), chunk_size):
+        chunk = b",".join(dumps(item) for item in items[start:start + chunk_size])
+        yield (b"," + chunk) if start else chunk
+    yield b"]}"
+
+
+# FastAPI / Starlette adapters
+try:
+    from fastapi import Request
+    from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+    class FastJSONResponse(JSONResponse):
+        """JSONResponse rendered with the fast encoder"""
+
+        def render(self, content: Any) -> bytes:
+            return dumps(content)
+
+    def negotiated_response(request: Request, content: Any, status_code: int = 200,
+                            headers: Optional[Dict[str, str]] = None) -> Response:
+        """Encode ``content`` as msgpack or JSON depending on the Accept header"""
+        media_type = negotiate(request.headers.get("accept"))
+        if media_type == JSON_MEDIA_TYPE:
+            return FastJSONResponse(content=content, status_code=status_code, headers=headers)
+        return Response(content=packb(content), status_code=status_code, headers=headers, media_type=media_type)
+
+    def list_response(request: Request, key: str, items: Sequence[Any],
+                      envelope: Optional[Dict[str, Any]] = None, status_code: int = 200) -> Response:
+        """Negotiated list response, streamed in chunks for large lists"""
+        if len(items) < STREAM_THRESHOLD:
+            return negotiated_response(request, {key: items, **(envelope or {})}, status_code)
+        media_type = negotiate(request.headers.get("accept"))
+        return StreamingResponse(iter_encoded_list(key, items, envelope, media_type),
+                                 status_code=status_code, media_type=media_type)
+
+    FASTAPI_AVAILABLE = True
+except ImportError:
+    FASTAPI_AVAILABLE = False
+
+
+# Flask adapters
+try:
+    from flask import current_app, has_request_context, request as flask_request
+    from flask.json.provider import DefaultJSONProvider
+
+    class FastJSONProvider(DefaultJSONProvider):
+        """Flask JSON provider backed by the fast encoder
+
+        ``jsonify`` goes through ``response``, which also honours an Accept
+        header asking for msgpack.
+        """
+
+        def dumps(self, obj: Any, **kwargs: Any) -> str:
+            return dumps(obj, sort_keys=kwargs.get("sort_keys", self.sort_keys),
+                         indent=bool(kwargs.get("indent"))).decode("utf-8")
+
+        def loads(self, s: Any, **kwargs: Any) -> Any:
+            return loads(s)
+
+        def response(self, *args: Any, **kwargs: Any):
+            obj = self._prepare_response_obj(args, kwargs)
+            media_type = negotiate(flask_request.headers.get("Accept")) if has_request_context() else JSON_MEDIA_TYPE
+            if media_type == MSGPACK_MEDIA_TYPE:
+                return self._app.response_class(packb(obj), mimetype=media_type)
+
+            indent = (self.compact is None and self._app.debug) or self.compact is False
+            return self._app.response_class(dumps(obj, sort_keys=self.sort_keys, indent=indent) + b"\n",
+                                            mimetype=self.mimetype)
+
+    def install_json_provider(app):
+        """Route ``jsonify`` and ``request.get_json`` through the fast encoder"""
+        app.json = FastJSONProvider(app)
+        return app
+
+    def flask_list_response(key: str, items: Sequence[Any], envelope: Optional[Dict[str, Any]] = None):
+        """Negotiated list response for Flask, streamed in chunks for large lists"""
+        if len(items) < STREAM_THRESHOLD:
+            return current_app.json.response({key: items, **(envelope or {})})
+        media_type = negotiate(flask_request.headers.get("Accept"))
+        return current_app.response_class(iter_encoded_list(key, list(items), envelope, media_type),
+                                          mimetype=media_type)
+
+    FLASK_AVAILABLE = True
+except ImportError:
+    FLASK_AVAILABLE = False
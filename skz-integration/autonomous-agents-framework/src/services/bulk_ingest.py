@@ -0,0 +1,264 @@
+"""
+Bulk Ingest Pipeline - Chunked, Resumable Loading of Research Papers
+Streams papers from JSONL/CSV (or any iterator), drops duplicates by content
+hash, encodes in large batches and writes to a vector collection in chunks,
+checkpointing after every chunk so an interrupted import can resume
+"""
+
+import csv
+import hashlib
+import itertools
+import json
+import logging
+import os
+import sqlite3
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+PAPER_FIELDS = ("paper_id", "title", "abstract")
+
+
+def iter_papers_jsonl(path: str, skip: int = 0) -> Iterator[Dict[str, Any]]:
+    """Papers from a JSON Lines file, one object per line"""
+    with open(path, encoding="utf-8") as handle:
+        records = (line for line in handle if line.strip())
+        for line in itertools.islice(records, skip, None):
+            yield json.loads(line)
+
+
+def iter_papers_csv(path: str, skip: int = 0) -> Iterator[Dict[str, Any]]:
+    """Papers from a CSV file with a header row"""
+    with open(path, encoding="utf-8", newline="") as handle:
+        yield from itertools.islice(csv.DictReader(handle), skip, None)
+
+
+def iter_papers(source: Union[str, Iterable[Dict[str, Any]]], skip: int = 0) -> Iterator[Dict[str, Any]]:
+    """Papers from a file path (by extension) or an iterable, skipping the first ``skip``"""
+    if isinstance(source, (str, os.PathLike)):
+        path = os.fspath(source)
+        if path.endswith((".jsonl", ".ndjson")):
+            return iter_papers_jsonl(path, skip)
+        if path.endswith(".csv"):
+            return iter_papers_csv(path, skip)
+        raise ValueError(f"Unsupported paper source format: {path}")
+    return itertools.islice(iter(source), skip, None)
+
+
+def content_hash(title: str, abstract: str) -> str:
+    """Hash of the normalised title and abstract"""
+    normalised = " ".join(f"{title}\n{abstract}".lower().split())
+    return hashlib.sha1(normalised.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class IngestReport:
+    """Counters for one ingest run"""
+    source: str
+    read: int = 0
+    written: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    resumed_from: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def docs_per_second(self) -> float:
+        return self.read / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "docs_per_second": round(self.docs_per_second, 1)}
+
+
+class IngestState:
+    """
+    On-disk ingest progress and dedup index
+
+    Content hashes live in SQLite rather than memory, so dedup stays bounded
+    regardless of corpus size. Hashes and the source position are committed
+    together after each chunk is written.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS content_hashes (hash TEXT PRIMARY KEY, paper_id TEXT)")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                source TEXT PRIMARY KEY, position INTEGER, written INTEGER,
+                duplicates INTEGER, invalid INTEGER, updated_at TEXT
+            )
+        """)
+        self.conn.commit()
+
+    def position(self, source: str) -> Dict[str, int]:
+        row = self.conn.execute(
+            "SELECT position, written, duplicates, invalid FROM checkpoints WHERE source = ?", (source,)
+        ).fetchone()
+        return dict(zip(("position", "written", "duplicates", "invalid"), row or (0, 0, 0, 0)))
+
+    def known_hashes(self, hashes: List[str]) -> set:
+        known = set()
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(hashes), 900):
+            batch = hashes[start:start + 900]
+            placeholders = ",".join("?" * len(batch))
+            known.update(row[0] for row in self.conn.execute(
+                f"SELECT hash FROM content_hashes WHERE hash IN ({placeholders})", batch
+            ))
+        return known
+
+    def commit_chunk(self, source: str, hashes: Dict[str, str], report: IngestReport, position: int):
+        with self.conn:
+            self.conn.executemany("INSERT OR IGNORE INTO content_hashes VALUES (?, ?)", hashes.items())
+            self.conn.execute(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?)",
+                (source, position, report.written, report.duplicates, report.invalid, datetime.utcnow().isoformat())
+            )
+
+    def reset(self, source: str):
+        with self.conn:
+            self.conn.execute("DELETE FROM checkpoints WHERE source = ?", (source,))
+
+    def close(self):
+        self.conn.close()
+
+
+class BulkIngestor:
+    """
+    Chunked, resumable import of papers into a vector collection
+
+    Each chunk of ``chunk_size`` records is deduplicated, encoded with one
+    batched ``encoder.encode`` call and written with one ``upsert``, then
+    checkpointed. Upserts are idempotent, so a crash between a write and its
+    checkpoint only repeats that chunk on resume. Memory use is bounded by
+    the chunk size.
+    """
+
+    def __init__(self, collection, encoder, state_path: str, chunk_size: int = 1000,
+                 encode_batch_size: int = 256, progress: Optional[Callable[[IngestReport], None]] = None):
+        self.collection = collection
+        self.encoder = encoder
+        self.state = IngestState(state_path)
+        self.chunk_size = chunk_size
+        self.encode_batch_size = encode_batch_size
+        self.progress = progress
+
+    def ingest(self, source: Union[str, Iterable[Dict[str, Any]]], source_name: Optional[str] = None,
+               resume: bool = True) -> IngestReport:
+        """
+        Import all papers from ``source``
+
+        Args:
+            source: JSONL/CSV path, or an iterable of paper dicts with
+                ``paper_id``, ``title``, ``abstract`` and extra metadata
+            source_name: Checkpoint key; defaults to the path. Iterables
+                need one to resume, and must yield papers in the same order
+            resume: Continue from the last checkpoint for this source
+        """
+        source_name = source_name or (os.fspath(source) if isinstance(source, (str, os.PathLike)) else None)
+        if source_name is None:
+            resume = False
+            source_name = f"iterable-{id(source)}"
+        if not resume:
+            self.state.reset(source_name)
+
+        checkpoint = self.state.position(source_name)
+        report = IngestReport(source=source_name, resumed_from=checkpoint["position"],
+                              written=checkpoint["written"], duplicates=checkpoint["duplicates"],
+                              invalid=checkpoint["invalid"])
+        if report.resumed_from:
+            logger.info(f"Resuming ingest of {source_name} after {report.resumed_from} records")
+
+        position = checkpoint["position"]
+        started = time.perf_counter()
+        records = iter_papers(source, skip=position)
+
+        while True:
+            chunk = list(itertools.islice(records, self.chunk_size))
+            if not chunk:
+                break
+
+            written_hashes = self._write_chunk(chunk, report)
+            position += len(chunk)
+            report.read += len(chunk)
+            report.elapsed_seconds = time.perf_counter() - started
+            self.state.commit_chunk(source_name, written_hashes, report, position)
+
+            logger.info(f"Ingested {position} records from {source_name} "
+                        f"({report.written} written, {report.duplicates} duplicates, "
+                        f"{report.docs_per_second:.0f} docs/sec)")
+            if self.progress:
+                self.progress(report)
+
+        report.elapsed_seconds = time.perf_counter() - started
+        return report
+
+    def _write_chunk(self, chunk: List[Dict[str, Any]], report: IngestReport) -> Dict[str, str]:
+        """Write the new papers of one chunk; returns their content hashes"""
+        # ChromaDB rejects an upsert that repeats an id, so the last record
+        # for each paper_id wins within the chunk
+        latest = {}
+        for record in chunk:
+            paper = self._normalise(record)
+            if paper is None:
+                report.invalid += 1
+                continue
+            if latest.pop(paper["paper_id"], None) is not None:
+                report.duplicates += 1
+            latest[paper["paper_id"]] = paper
+
+        papers = {}
+        for paper in latest.values():
+            digest = content_hash(paper["title"], paper["abstract"])
+            if digest in papers:
+                report.duplicates += 1
+                continue
+            papers[digest] = paper
+
+        known = self.state.known_hashes(list(papers))
+        report.duplicates += len(known)
+        papers = {digest: paper for digest, paper in papers.items() if digest not in known}
+        if not papers:
+            return {}
+
+        documents = [f"{paper['title']}\n\n{paper['abstract']}" for paper in papers.values()]
+        embeddings = self.encoder.encode(documents, batch_size=self.encode_batch_size,
+                                         convert_to_numpy=True, show_progress_bar=False)
+        timestamp = datetime.utcnow().isoformat()
+
+        self.collection.upsert(
+            ids=[paper["paper_id"] for paper in papers.values()],
+            embeddings=embeddings.tolist(),
+            documents=documents,
+            metadatas=[
+                {"paper_id": paper["paper_id"], "title": paper["title"], "timestamp": timestamp,
+                 "content_hash": digest, **paper["metadata"]}
+                for digest, paper in papers.items()
+            ]
+        )
+        report.written += len(papers)
+        return {digest: paper["paper_id"] for digest, paper in papers.items()}
+
+    @staticmethod
+    def _normalise(record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        paper_id, title, abstract = (record.get(field) for field in PAPER_FIELDS)
+        if not paper_id or not (title or abstract):
+            return None
+
+        # Collection metadata must be scalar; nested values are stored as JSON
+        metadata = {}
+        for key, value in record.get("metadata", record).items():
+            if key in PAPER_FIELDS or key == "metadata" or value is None:
+                continue
+            metadata[key] = value if isinstance(value, (str, int, float, bool)) else json.dumps(value)
+
+        return {"paper_id": str(paper_id), "title": title or "", "abstract": abstract or "", "metadata": metadata}
+
+    def close(self):
+        self.state.close()
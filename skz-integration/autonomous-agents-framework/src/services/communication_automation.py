@@ -1,6 +1,8 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Callable, List, Optional, Tuple
 import os
 import json
+import socket
+import threading
 import time
 
 try:
@@ -38,23 +40,51 @@ except Exception:
     Environment = None  # type: ignore
     FileSystemLoader = None  # type: ignore
 
+from .local_redis import LocalRedis
+
 
 class TemplateEngine:
     def __init__(self, template_dir: Optional[str] = None):
         self.template_dir = template_dir or os.getenv("TEMPLATE_DIR", "")
         self.env = None
+        # With auto reload off, templates are compiled once until invalidate()
+        self.auto_reload = os.getenv("TEMPLATE_AUTO_RELOAD", "true").lower() == "true"
+        self._templates: Dict[str, Any] = {}
         if Environment is not None and FileSystemLoader is not None and self.template_dir:
-            self.env = Environment(loader=FileSystemLoader(self.template_dir), autoescape=True)
+            self.env = Environment(loader=FileSystemLoader(self.template_dir), autoescape=True,
+                                   auto_reload=self.auto_reload)
+
+    def _template(self, name: str):
+        tpl = self._templates.get(name)
+        if tpl is None or (self.auto_reload and not tpl.is_up_to_date):
+            tpl = self._templates[name] = self.env.get_template(name)
+        return tpl
 
     def render(self, name: str, context: Dict[str, Any]) -> str:
         if self.env:
             try:
-                tpl = self.env.get_template(name)
-                return tpl.render(**context)
+                return self._template(name).render(**context)
             except Exception:
                 pass
         return str(context)
 
+    def render_many(self, name: str, contexts: List[Dict[str, Any]]) -> List[str]:
+        if self.env:
+            try:
+                tpl = self._template(name)
+                return [tpl.render(**context) for context in contexts]
+            except Exception:
+                pass
+        return [str(context) for context in contexts]
+
+    def invalidate(self, name: Optional[str] = None):
+        if name is None:
+            self._templates.clear()
+            if self.env and self.env.cache is not None:
+                self.env.cache.clear()
+        else:
+            self._templates.pop(name, None)
+
 
 class EmailService:
     def __init__(self, template_engine: Optional[TemplateEngine] = None):
@@ -66,35 +96,58 @@ class EmailService:
             return self._send_sendgrid(to_email, subject, template_name_or_body, context or {})
         return self._send_smtp(to_email, subject, template_name_or_body, context or {})
 
+    def send_batch(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Send queued email payloads; SMTP batches share one connection."""
+        if self.provider == "sendgrid":
+            return [self.send(item["to"], item["subject"], item.get("template_or_body", ""), item.get("context", {}))
+                    for item in items]
+        return self._send_smtp_many(items)
+
     def _send_smtp(self, to_email: str, subject: str, template_or_body: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        return self._send_smtp_many([{"to": to_email, "subject": subject, "template_or_body": template_or_body,
+                                      "context": context}])[0]
+
+    def _send_smtp_many(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         if not smtplib or not MIMEText:
-            return {"status": "error", "message": "smtplib not available"}
+            return [{"status": "error", "message": "smtplib not available"} for _ in items]
         host = os.getenv("SMTP_HOST", "localhost")
         port = int(os.getenv("SMTP_PORT", "25"))
         user = os.getenv("SMTP_USER")
         password = os.getenv("SMTP_PASS")
         from_email = os.getenv("SMTP_FROM", user or "no-reply@example.com")
 
-        body = template_or_body
-        if self.template_engine and self.template_engine.template_dir:
-            body = self.template_engine.render(template_or_body, context)
-
-        msg = MIMEText(body, "html")
-        msg["Subject"] = subject
-        msg["From"] = from_email
-        msg["To"] = to_email
-
         try:
             server = smtplib.SMTP(host, port, timeout=10)
             if os.getenv("SMTP_STARTTLS", "false").lower() == "true":
                 server.starttls()
             if user and password:
                 server.login(user, password)
-            server.sendmail(from_email, [to_email], msg.as_string())
-            server.quit()
-            return {"status": "sent", "provider": "smtp"}
         except Exception as e:
-            return {"status": "error", "message": str(e)}
+            return [{"status": "error", "message": str(e)} for _ in items]
+
+        results = []
+        for item in items:
+            body = item.get("template_or_body", "")
+            if self.template_engine and self.template_engine.template_dir:
+                body = self.template_engine.render(body, item.get("context", {}))
+
+            msg = MIMEText(body, "html")
+            msg["Subject"] = item["subject"]
+            msg["From"] = from_email
+            msg["To"] = item["to"]
+            try:
+                server.sendmail(from_email, [item["to"]], msg.as_string())
+                results.append({"status": "sent", "provider": "smtp"})
+            except smtplib.SMTPServerDisconnected as e:
+                results.extend({"status": "error", "message": str(e)} for _ in items[len(results):])
+                return results
+            except Exception as e:
+                results.append({"status": "error", "message": str(e)})
+        try:
+            server.quit()
+        except Exception:
+            pass
+        return results
 
     def _send_sendgrid(self, to_email: str, subject: str, template_or_body: str, context: Dict[str, Any]) -> Dict[str, Any]:
         if not SendGridAPIClient or not Mail:
@@ -153,46 +206,247 @@ class SMSService:
 
 
 class MessageQueue:
-    def __init__(self, namespace: str = "comm"):
+    """Redis list queues with priority lanes and per-consumer processing lists.
+
+    Items are moved (LMOVE) from a lane into the consumer's processing list
+    and removed only after delivery, so a crashed consumer's items can be put
+    back with recover(). Idle consumers block on a wake-up list that
+    producers ring after each push instead of polling.
+    """
+
+    LANES = ("high", "normal", "low")
+    KINDS = ("email", "sms")
+
+    def __init__(self, namespace: str = "comm", client: Any = None):
         self.provider = os.getenv("QUEUE_PROVIDER", "redis").lower()
         self.ns = namespace
-        self.client = None
-        if self.provider == "redis" and redis:
+        self.client = client
+        if self.client is None and self.provider == "local":
+            self.client = LocalRedis()
+        elif self.client is None and self.provider == "redis" and redis:
             try:
                 self.client = redis.Redis(host=os.getenv("REDIS_HOST", "localhost"), port=int(os.getenv("REDIS_PORT", "6379")), db=0)
             except Exception:
                 self.client = None
+        self.wake_key = f"{self.ns}:wake"
+
+    def lane_key(self, kind: str, lane: str = "normal") -> str:
+        # The normal lane keeps the original key, so queued items stay readable
+        return f"{self.ns}:{kind}" if lane == "normal" else f"{self.ns}:{kind}:{lane}"
+
+    def processing_key(self, consumer_id: str, source: str) -> str:
+        return f"{self.ns}:processing:{consumer_id}:{source}"
+
+    def enqueue(self, kind: str, payload: Dict[str, Any], priority: str = "normal") -> bool:
+        return self.enqueue_many(kind, [payload], priority) == 1
+
+    def enqueue_many(self, kind: str, payloads: List[Dict[str, Any]], priority: str = "normal") -> int:
+        if not self.client or not payloads:
+            return 0
+        if priority not in self.LANES:
+            raise ValueError(f"Unknown priority lane: {priority}")
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.rpush(self.lane_key(kind, priority), *(json.dumps(payload) for payload in payloads))
+            self._ring(pipe)
+            pipe.execute()
+            return len(payloads)
+        except Exception:
+            return 0
+
+    def _ring(self, pipe):
+        # At most one pending wake-up token
+        pipe.lpush(self.wake_key, 1)
+        pipe.ltrim(self.wake_key, 0, 0)
 
-    def enqueue(self, kind: str, payload: Dict[str, Any]) -> bool:
-        if self.client and self.provider == "redis":
+    def fetch(self, consumer_id: str, batch_size: int = 50) -> List[Tuple[str, str, bytes]]:
+        """Move up to batch_size items, highest lane first, into processing lists."""
+        batch: List[Tuple[str, str, bytes]] = []
+        for lane in self.LANES:
+            for kind in self.KINDS:
+                source = self.lane_key(kind, lane)
+                wanted = batch_size - len(batch)
+                if wanted <= 0:
+                    return batch
+                pipe = self.client.pipeline(transaction=False)
+                for _ in range(wanted):
+                    pipe.lmove(source, self.processing_key(consumer_id, source), "LEFT", "RIGHT")
+                batch.extend((kind, source, raw) for raw in pipe.execute() if raw is not None)
+        return batch
+
+    def ack(self, consumer_id: str, items: List[Tuple[str, str, bytes]]):
+        if not items:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for _, source, raw in items:
+            pipe.lrem(self.processing_key(consumer_id, source), 1, raw)
+        pipe.execute()
+
+    def wait(self, timeout: float) -> bool:
+        """Block until an item may be available or timeout seconds pass."""
+        return self.client.blpop([self.wake_key], timeout=timeout) is not None
+
+    def ring(self):
+        pipe = self.client.pipeline(transaction=False)
+        self._ring(pipe)
+        pipe.execute()
+
+    def heartbeat(self, consumer_id: str, ttl: int = 30):
+        self.client.set(f"{self.ns}:consumer:{consumer_id}", int(time.time()), ex=ttl)
+
+    def recover(self, consumer_id: Optional[str] = None) -> int:
+        """Put unacknowledged items back at the head of their lanes.
+
+        With a consumer_id, recovers that consumer (e.g. restarting under the
+        same id); otherwise every consumer whose heartbeat has expired.
+        """
+        prefix = f"{self.ns}:processing:"
+        recovered = 0
+        for key in list(self.client.scan_iter(match=f"{prefix}*")):
+            key = key.decode() if isinstance(key, bytes) else key
+            owner, _, source = key[len(prefix):].partition(":")
+            if consumer_id is not None and owner != consumer_id:
+                continue
+            if consumer_id is None and self.client.exists(f"{self.ns}:consumer:{owner}"):
+                continue
+            # Oldest unacknowledged item ends up first in the lane
+            while self.client.lmove(key, source, "RIGHT", "LEFT") is not None:
+                recovered += 1
+        if recovered:
+            self.ring()
+        return recovered
+
+    def depth(self) -> Dict[str, int]:
+        return {self.lane_key(kind, lane): self.client.llen(self.lane_key(kind, lane))
+                for lane in self.LANES for kind in self.KINDS}
+
+    def deliver(self, items: List[Tuple[str, str, bytes]], email_service: EmailService,
+                sms_service: SMSService) -> List[Dict[str, Any]]:
+        processed = []
+        for kind in self.KINDS:
+            group = []
+            for item_kind, _, raw in items:
+                if item_kind != kind:
+                    continue
+                try:
+                    group.append(json.loads(raw))
+                except Exception as e:
+                    processed.append({"kind": kind, "raw": raw.decode(errors="replace"),
+                                      "result": {"status": "error", "message": f"bad payload: {e}"}})
+            if not group:
+                continue
             try:
-                self.client.rpush(f"{self.ns}:{kind}", json.dumps(payload))
-                return True
-            except Exception:
-                return False
-        return False
+                if kind == "email":
+                    results = email_service.send_batch(group)
+                else:
+                    results = [sms_service.send(data["to"], data["body"]) for data in group]
+            except Exception as e:
+                results = [{"status": "error", "message": str(e)} for _ in group]
+            for data, result in zip(group, results):
+                data["result"] = result
+                processed.append(data)
+        return processed
+
+    def _record_failures(self, processed: List[Dict[str, Any]]):
+        failed = [data for data in processed if data.get("result", {}).get("status") == "error"]
+        if failed:
+            self.client.rpush(f"{self.ns}:failed", *(json.dumps(data, default=str) for data in failed))
+
+    def process_batch(self, email_service: EmailService, sms_service: SMSService, consumer_id: str = "main",
+                      batch_size: int = 50) -> List[Dict[str, Any]]:
+        if not self.client:
+            return []
+        self.heartbeat(consumer_id)
+        items = self.fetch(consumer_id, batch_size)
+        if not items:
+            return []
+        processed = self.deliver(items, email_service, sms_service)
+        self._record_failures(processed)
+        self.ack(consumer_id, items)
+        return processed
 
     def process_once(self, email_service: EmailService, sms_service: SMSService) -> Optional[Dict[str, Any]]:
-        if not self.client or self.provider != "redis":
+        try:
+            processed = self.process_batch(email_service, sms_service, batch_size=1)
+        except Exception:
             return None
-        for kind in ["email", "sms"]:
+        return processed[0] if processed else None
+
+    def process_loop(self, email_service: EmailService, sms_service: SMSService, interval: float = 1.0,
+                     batch_size: int = 50):
+        while True:
+            if not self.process_batch(email_service, sms_service, batch_size=batch_size):
+                self.wait(interval)
+
+
+class QueueWorker:
+    """Concurrent MessageQueue consumers, each fetching, sending and acking in batches."""
+
+    def __init__(self, queue: MessageQueue, email_service: EmailService, sms_service: SMSService,
+                 consumers: int = 4, batch_size: int = 50, block_timeout: float = 1.0,
+                 on_result: Optional[Callable[[Dict[str, Any]], None]] = None, name: Optional[str] = None):
+        self.queue = queue
+        self.email_service = email_service
+        self.sms_service = sms_service
+        self.consumers = consumers
+        self.batch_size = batch_size
+        self.block_timeout = block_timeout
+        self.on_result = on_result
+        self.name = name or f"{socket.gethostname()}-{os.getpid()}"
+        self.processed = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def consumer_id(self, index: int) -> str:
+        return f"{self.name}-{index}"
+
+    def start(self):
+        self._stop.clear()
+        for index in range(self.consumers):
+            # Items a previous run under the same id left unacknowledged
+            self.queue.recover(self.consumer_id(index))
+        self.queue.recover()
+        for index in range(self.consumers):
+            thread = threading.Thread(target=self.run_consumer, args=(self.consumer_id(index),),
+                                      name=self.consumer_id(index), daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        for _ in self._threads:
+            self.queue.ring()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def run_consumer(self, consumer_id: str):
+        last_heartbeat = 0.0
+        while not self._stop.is_set():
+            now = time.monotonic()
+            if now - last_heartbeat > self.block_timeout:
+                self.queue.heartbeat(consumer_id, ttl=max(30, int(self.block_timeout * 10)))
+                last_heartbeat = now
             try:
-                item = self.client.lpop(f"{self.ns}:{kind}")
-                if not item:
+                items = self.queue.fetch(consumer_id, self.batch_size)
+                if not items:
+                    self.queue.wait(self.block_timeout)
                     continue
-                data = json.loads(item)
-                if kind == "email":
-                    res = email_service.send(data["to"], data["subject"], data.get("template_or_body", ""), data.get("context", {}))
-                else:
-                    res = sms_service.send(data["to"], data["body"])
-                data["result"] = res
-                return data
+                if len(items) == self.batch_size:
+                    # Likely more queued: wake an idle peer
+                    self.queue.ring()
+                processed = self.queue.deliver(items, self.email_service, self.sms_service)
+                self.queue._record_failures(processed)
+                self.queue.ack(consumer_id, items)
             except Exception:
+                time.sleep(self.block_timeout)
                 continue
-        return None
-
-    def process_loop(self, email_service: EmailService, sms_service: SMSService, interval: float = 1.0):
-        while True:
-            processed = self.process_once(email_service, sms_service)
-            if not processed:
-                time.sleep(interval)
+            failed = sum(1 for data in processed if data.get("result", {}).get("status") == "error")
+            with self._lock:
+                self.processed += len(processed)
+                self.failed += failed
+            if self.on_result:
+                for data in processed:
+                    self.on_result(data)
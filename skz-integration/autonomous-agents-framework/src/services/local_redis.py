@@ -0,0 +1,178 @@
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import fnmatch
+import threading
+import time
+from collections import deque
+
+
+def _bytes(value: Any) -> bytes:
+    if isinstance(value, bytes):
+        return value
+    return str(value).encode()
+
+
+class LocalRedis:
+    """In-process stand-in for the subset of redis.Redis used by MessageQueue.
+
+    Lists, strings with expiry, blocking BLPOP and pipelines, thread-safe, so
+    queue workers can run and be tested without a Redis server.
+    """
+
+    def __init__(self):
+        self._lists: Dict[bytes, deque] = {}
+        self._strings: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+        self._cond = threading.Condition()
+
+    def rpush(self, name: Any, *values: Any) -> int:
+        with self._cond:
+            items = self._lists.setdefault(_bytes(name), deque())
+            items.extend(_bytes(value) for value in values)
+            self._cond.notify_all()
+            return len(items)
+
+    def lpush(self, name: Any, *values: Any) -> int:
+        with self._cond:
+            items = self._lists.setdefault(_bytes(name), deque())
+            items.extendleft(_bytes(value) for value in values)
+            self._cond.notify_all()
+            return len(items)
+
+    def _pop(self, name: bytes, left: bool = True) -> Optional[bytes]:
+        items = self._lists.get(name)
+        if not items:
+            return None
+        value = items.popleft() if left else items.pop()
+        if not items:
+            del self._lists[name]
+        return value
+
+    def lpop(self, name: Any) -> Optional[bytes]:
+        with self._cond:
+            return self._pop(_bytes(name))
+
+    def blpop(self, keys: Any, timeout: float = 0) -> Optional[Tuple[bytes, bytes]]:
+        keys = [_bytes(key) for key in ([keys] if isinstance(keys, (str, bytes)) else keys)]
+        deadline = time.monotonic() + timeout if timeout else None
+        with self._cond:
+            while True:
+                for key in keys:
+                    value = self._pop(key)
+                    if value is not None:
+                        return key, value
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+
+    def lmove(self, first_list: Any, second_list: Any, src: str = "LEFT", dest: str = "RIGHT") -> Optional[bytes]:
+        with self._cond:
+            value = self._pop(_bytes(first_list), left=src.upper() == "LEFT")
+            if value is None:
+                return None
+            items = self._lists.setdefault(_bytes(second_list), deque())
+            if dest.upper() == "LEFT":
+                items.appendleft(value)
+            else:
+                items.append(value)
+            self._cond.notify_all()
+            return value
+
+    def lrem(self, name: Any, count: int, value: Any) -> int:
+        with self._cond:
+            items = self._lists.get(_bytes(name))
+            if not items:
+                return 0
+            value = _bytes(value)
+            kept, removed = deque(), 0
+            source = reversed(items) if count < 0 else items
+            for item in source:
+                if item == value and (count == 0 or removed < abs(count)):
+                    removed += 1
+                elif count < 0:
+                    kept.appendleft(item)
+                else:
+                    kept.append(item)
+            if kept:
+                self._lists[_bytes(name)] = kept
+            else:
+                del self._lists[_bytes(name)]
+            return removed
+
+    def ltrim(self, name: Any, start: int, end: int) -> bool:
+        with self._cond:
+            items = self._lists.get(_bytes(name))
+            if items:
+                kept = list(items)[start:(end + 1) or None]
+                if kept:
+                    self._lists[_bytes(name)] = deque(kept)
+                else:
+                    del self._lists[_bytes(name)]
+            return True
+
+    def llen(self, name: Any) -> int:
+        with self._cond:
+            return len(self._lists.get(_bytes(name), ()))
+
+    def lrange(self, name: Any, start: int, end: int) -> List[bytes]:
+        with self._cond:
+            return list(self._lists.get(_bytes(name), ()))[start:(end + 1) or None]
+
+    def set(self, name: Any, value: Any, ex: Optional[float] = None) -> bool:
+        with self._cond:
+            self._strings[_bytes(name)] = (_bytes(value), time.monotonic() + ex if ex else None)
+            return True
+
+    def get(self, name: Any) -> Optional[bytes]:
+        with self._cond:
+            entry = self._strings.get(_bytes(name))
+            if entry is None:
+                return None
+            if entry[1] is not None and entry[1] <= time.monotonic():
+                del self._strings[_bytes(name)]
+                return None
+            return entry[0]
+
+    def exists(self, *names: Any) -> int:
+        return sum(1 for name in names if self.get(name) is not None or self.llen(name))
+
+    def delete(self, *names: Any) -> int:
+        with self._cond:
+            removed = 0
+            for name in map(_bytes, names):
+                removed += (self._lists.pop(name, None) is not None) + (self._strings.pop(name, None) is not None)
+            return removed
+
+    def scan_iter(self, match: Optional[str] = None, count: Optional[int] = None) -> Iterator[bytes]:
+        with self._cond:
+            names = list(self._lists) + list(self._strings)
+        for name in names:
+            if match is None or fnmatch.fnmatchcase(name.decode(), match):
+                yield name
+
+    def pipeline(self, transaction: bool = True) -> "LocalPipeline":
+        return LocalPipeline(self)
+
+
+class LocalPipeline:
+    def __init__(self, client: LocalRedis):
+        self.client = client
+        self.commands: List[Tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, command: str):
+        if command.startswith("_") or not hasattr(self.client, command):
+            raise AttributeError(command)
+
+        def queue(*args, **kwargs):
+            self.commands.append((command, args, kwargs))
+            return self
+        return queue
+
+    def execute(self) -> List[Any]:
+        commands, self.commands = self.commands, []
+        return [getattr(self.client, command)(*args, **kwargs) for command, args, kwargs in commands]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.commands = []
@@ -10,8 +10,12 @@ import sys
 import json
 import logging
 import asyncio
+import base64
+import hashlib
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Tuple, Union
 from pathlib import Path
 
 # Add project paths
@@ -37,17 +41,56 @@ except ImportError as e:
 
 logger = logging.getLogger(__name__)
 
+# List filters pushed down to OJS, mapped to the query parameters its
+# submissions API reads; other filters are passed through unchanged
+FILTER_PUSHDOWN = {
+    "status": "status",
+    "search": "searchPhrase",
+    "section_id": "sectionIds",
+    "assigned_to": "assignedTo"
+}
+
+# Submission date bounds OJS does not filter on; applied to the fetched rows
+# by prefix, so a date bound includes the whole day
+LOCAL_DATE_FILTERS = ("submitted_after", "submitted_before")
+
+def encode_list_cursor(after: Optional[List[Any]], offset: int, fingerprint: str) -> str:
+    """Opaque cursor for the page that follows ``after``"""
+    payload = json.dumps({"a": after, "o": offset, "f": fingerprint}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_list_cursor(cursor: str, fingerprint: str) -> Tuple[Optional[List[Any]], int]:
+    """Keyset position and offset from a cursor issued for the same filters"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        after, offset, cursor_fingerprint = payload["a"], int(payload["o"]), payload["f"]
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Malformed list cursor")
+    if cursor_fingerprint != fingerprint:
+        raise ValueError("List cursor was issued for different filters")
+    return after, offset
+
 class SSRServiceIntegration:
     """
     Server-side service integration for OJS 7.1
     Handles all server-side data processing and integration
     """
     
-    def __init__(self):
+    def __init__(self, prefetch: bool = True, max_prefetched_pages: int = 64, prefetch_ttl: float = 30.0):
         self.ojs_bridge: Optional[OJSBridge] = None
         self.ml_engine = None
         self.comm_automation = None
         self.data_sync = None
+        
+        # Manuscript list state: total per filter set, and next pages fetched
+        # ahead while the current one renders
+        self.count_ttl = self._get_server_config()["cache_timeout"]
+        self._count_cache: Dict[str, Tuple[int, float]] = {}
+        self.prefetch = prefetch
+        self.max_prefetched_pages = max_prefetched_pages
+        self.prefetch_ttl = prefetch_ttl
+        self._prefetched: "OrderedDict[Tuple, Tuple[asyncio.Future, float]]" = OrderedDict()
+        
         self._initialize_services()
     
     def _initialize_services(self):
@@ -86,29 +129,56 @@ class SSRServiceIntegration:
         self, 
         page: int = 1, 
         limit: int = 20, 
-        filters: Optional[Dict[str, Any]] = None
+        filters: Optional[Dict[str, Any]] = None,
+        cursor: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Server-side manuscript list retrieval with caching and filtering
+        
+        ``pagination.next_cursor`` is an opaque cursor for the following page.
+        It holds the OJS offset to resume from and the submission date of the
+        last manuscript shown with the IDs already shown for that date: OJS
+        only pages by offset, so rows that shifted back onto the next page are
+        skipped by key, and a fetch that never moves past the key ends the
+        list. Filters are pushed down
+        to OJS where it supports them, totals are cached per filter set, and
+        the next page is prefetched while the current one is rendered.
+        ``page`` is still honoured when no cursor is given.
         """
         try:
-            manuscripts = []
+            query, date_bounds = self._pushdown_filters(filters)
+            fingerprint = self._filter_fingerprint({**query, **date_bounds})
             
-            # Server-side data fetching from OJS
-            if self.ojs_bridge:
-                try:
-                    ojs_result = self.ojs_bridge.get_submissions({
-                        "page": page,
-                        "count": limit,
-                        "status": filters.get("status") if filters else None
-                    })
-                    manuscripts = ojs_result.get("items", [])
-                except Exception as e:
-                    logger.warning(f"OJS data fetch failed, using fallback: {e}")
+            if cursor:
+                after, offset = decode_list_cursor(cursor, fingerprint)
+            else:
+                after, offset = None, (max(page, 1) - 1) * limit
+            
+            # Server-side data fetching from OJS (or an already prefetched page)
+            task = self._take_prefetched((fingerprint, json.dumps(after), offset, limit))
+            if task is not None:
+                items, items_max, positions = await task
+            else:
+                items, items_max, positions = await self._fetch_manuscript_page(query, date_bounds, after, offset, limit)
             
             # Fallback server-side data generation
-            if not manuscripts:
-                manuscripts = self._generate_fallback_manuscripts(page, limit, filters)
+            if items is None:
+                items = self._generate_fallback_manuscripts(page, limit + 1, filters, offset=offset)
+                positions = [(offset + i + 1, None) for i in range(len(items))]
+            
+            has_next = len(items) > limit
+            manuscripts = items[:limit]
+            
+            if items_max is not None:
+                self._count_cache[fingerprint] = (items_max, time.monotonic())
+            total = self._cached_count(fingerprint)
+            
+            next_cursor = None
+            if has_next and manuscripts:
+                next_offset, next_after = positions[len(manuscripts) - 1]
+                next_cursor = encode_list_cursor(next_after, next_offset, fingerprint)
+                if self.prefetch:
+                    self._prefetch_manuscript_page(query, date_bounds, fingerprint, next_after, next_offset, limit)
             
             # Server-side manuscript enrichment
             enriched_manuscripts = []
@@ -119,10 +189,13 @@ class SSRServiceIntegration:
             return {
                 "manuscripts": enriched_manuscripts,
                 "pagination": {
-                    "page": page,
+                    "page": offset // limit + 1,
                     "limit": limit,
-                    "total": len(enriched_manuscripts),
-                    "has_next": len(enriched_manuscripts) == limit
+                    "offset": offset,
+                    "total": total if total is not None else offset + len(enriched_manuscripts),
+                    "total_exact": total is not None,
+                    "has_next": has_next,
+                    "next_cursor": next_cursor
                 },
                 "filters": filters or {},
                 "server_rendered": True,
@@ -133,12 +206,131 @@ class SSRServiceIntegration:
             logger.error(f"Manuscript list retrieval failed: {e}")
             return {
                 "manuscripts": [],
-                "pagination": {"page": page, "limit": limit, "total": 0, "has_next": False},
+                "pagination": {"page": page, "limit": limit, "total": 0, "has_next": False, "next_cursor": None},
                 "error": str(e),
                 "server_rendered": True,
                 "timestamp": datetime.now().isoformat()
             }
     
+    async def _fetch_manuscript_page(self, query: Dict[str, Any], date_bounds: Dict[str, str],
+                                     after: Optional[List[Any]], offset: int, limit: int
+                                     ) -> Tuple[Optional[List[Dict[str, Any]]], Optional[int], Optional[List[Tuple]]]:
+        """One page plus a lookahead row from OJS, paged by offset
+        
+        Returns ``(items, items_max, positions)`` where ``positions[i]`` is
+        the OJS offset just past ``items[i]`` and the cursor key after it;
+        ``(None, None, None)`` when OJS is unavailable. Rows not past
+        ``after`` or outside ``date_bounds`` are skipped, fetching further
+        while OJS has rows left.
+        """
+        if not self.ojs_bridge:
+            return None, None, None
+        
+        items, positions, items_max, fetched = [], [], None, False
+        while len(items) <= limit:
+            try:
+                result = await asyncio.to_thread(self.ojs_bridge.get_manuscripts_page, query, limit + 1, offset)
+            except Exception as e:
+                logger.warning(f"OJS data fetch failed, using fallback: {e}")
+                result = None
+            if result is None:
+                if not fetched:
+                    return None, None, None
+                break
+            
+            rows = result.get("items", [])
+            if not fetched:
+                # The OJS total only matches when no rows are filtered here
+                items_max = None if date_bounds else result.get("items_max")
+                fetched = True
+            
+            moved, exhausted = False, len(rows) <= limit
+            for row in rows:
+                offset += 1
+                submitted, manuscript_id = self._keyset_position(row)
+                if not self._moves_past(submitted, manuscript_id, after):
+                    continue
+                moved = True
+                if after is not None and submitted == after[0]:
+                    after = [submitted, after[1] + [manuscript_id]]
+                else:
+                    after = [submitted, [manuscript_id]]
+                
+                submitted = str(submitted or "")
+                lower, upper = date_bounds.get("submitted_after"), date_bounds.get("submitted_before")
+                if lower and submitted[:len(lower)] < lower:
+                    # Rows come newest first, so the rest are older still
+                    exhausted = True
+                    break
+                if upper and submitted[:len(upper)] > upper:
+                    continue
+                items.append(row)
+                positions.append((offset, after))
+            
+            if exhausted:
+                break
+            if not moved:
+                logger.warning(f"OJS page at offset {offset - len(rows)} did not move past the cursor; ending the list")
+                break
+        
+        return items, items_max, positions
+    
+    def _moves_past(self, submitted: Any, manuscript_id: Any, after: Optional[List[Any]]) -> bool:
+        """Whether a row comes after the cursor key ``[date, shown IDs]``, newest first"""
+        if after is None:
+            return True
+        if submitted == after[0]:
+            return manuscript_id not in after[1]
+        try:
+            return submitted < after[0]
+        except TypeError:
+            # Rows without a comparable date cannot be checked
+            return True
+    
+    def _prefetch_manuscript_page(self, query: Dict[str, Any], date_bounds: Dict[str, str], fingerprint: str,
+                                  after: Optional[List[Any]], offset: int, limit: int):
+        """Start fetching the next page in the background"""
+        key = (fingerprint, json.dumps(after), offset, limit)
+        if key in self._prefetched:
+            return
+        
+        task = asyncio.ensure_future(self._fetch_manuscript_page(query, date_bounds, after, offset, limit))
+        self._prefetched[key] = (task, time.monotonic())
+        while len(self._prefetched) > self.max_prefetched_pages:
+            _, (stale, _) = self._prefetched.popitem(last=False)
+            stale.cancel()
+    
+    def _take_prefetched(self, key: Tuple) -> Optional[asyncio.Future]:
+        """Prefetched page for ``key`` if it is recent and belongs to the running loop"""
+        entry = self._prefetched.pop(key, None)
+        if entry is None:
+            return None
+        task, started = entry
+        if time.monotonic() - started > self.prefetch_ttl or task.get_loop() is not asyncio.get_running_loop():
+            task.cancel()
+            return None
+        return task
+    
+    def _pushdown_filters(self, filters: Optional[Dict[str, Any]]) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """List filters as OJS query parameters, plus the date bounds applied locally"""
+        filters = {name: value for name, value in sorted((filters or {}).items()) if value is not None}
+        date_bounds = {name: str(filters.pop(name)) for name in LOCAL_DATE_FILTERS if name in filters}
+        query = {FILTER_PUSHDOWN.get(name, name): value for name, value in filters.items()}
+        return query, date_bounds
+    
+    def _filter_fingerprint(self, query: Dict[str, Any]) -> str:
+        return hashlib.sha1(json.dumps(query, sort_keys=True, default=str).encode()).hexdigest()[:16]
+    
+    def _cached_count(self, fingerprint: str) -> Optional[int]:
+        cached = self._count_cache.get(fingerprint)
+        if cached is None or time.monotonic() - cached[1] > self.count_ttl:
+            return None
+        return cached[0]
+    
+    def _keyset_position(self, manuscript: Dict[str, Any]) -> Tuple[Any, Any]:
+        """``(dateSubmitted, id)`` of a manuscript; OJS orders pages by the date"""
+        return manuscript.get("dateSubmitted", manuscript.get("submitted_date")), manuscript.get("id")
+    
     async def get_manuscript_details_server_side(self, manuscript_id: str) -> Dict[str, Any]:
         """Server-side manuscript detail retrieval with agent analysis"""
         try:
@@ -322,10 +514,11 @@ class SSRServiceIntegration:
     
     # Server-side helper methods
     
-    def _generate_fallback_manuscripts(self, page: int, limit: int, filters: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _generate_fallback_manuscripts(self, page: int, limit: int, filters: Optional[Dict[str, Any]],
+                                       offset: Optional[int] = None) -> List[Dict[str, Any]]:
         """Generate fallback manuscript data server-side"""
         manuscripts = []
-        start_id = (page - 1) * limit + 1
+        start_id = (offset if offset is not None else (page - 1) * limit) + 1
         
         for i in range(limit):
             manuscript = {
@@ -6,13 +6,17 @@ Phase 1: Foundation ML Infrastructure - Week 1
 
 import chromadb
 from chromadb.config import Settings
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, List, Any, Optional, Union
 import numpy as np
+import os
 from datetime import datetime
 import json
 import logging
 from sentence_transformers import SentenceTransformer
 
+from models.knowledge_graph_store import KnowledgeGraphStore
+from .bulk_ingest import BulkIngestor, IngestReport
+
 logger = logging.getLogger(__name__)
 
 
@@ -41,6 +45,9 @@ class VectorMemorySystem:
         self.knowledge_graph = self._get_or_create_collection("knowledge_graph")
         self.experience_memory = self._get_or_create_collection("agent_experiences")
         
+        # Graph structure lives in a CSR store; the collection only holds node embeddings
+        self.graph_store = KnowledgeGraphStore(os.path.join(persist_directory, "knowledge_graph_csr"))
+        
         logger.info(f"VectorMemorySystem initialized with persist_directory: {persist_directory}")
     
     def _get_or_create_collection(self, name: str):
@@ -88,6 +95,40 @@ class VectorMemorySystem:
             logger.error(f"Error storing research paper {paper_id}: {e}")
             return False
     
+    def bulk_import_research_papers(self, source: Union[str, Iterable[Dict[str, Any]]],
+                                    state_path: Optional[str] = None, source_name: Optional[str] = None,
+                                    chunk_size: int = 1000, encode_batch_size: int = 256,
+                                    resume: bool = True) -> IngestReport:
+        """
+        Import a back catalogue of research papers in chunks
+        
+        Args:
+            source: JSONL/CSV path or iterable of paper dicts
+                (``paper_id``, ``title``, ``abstract`` plus metadata)
+            state_path: SQLite file for checkpoints and the content-hash
+                index; defaults to ``ingest_state.db`` in the persist directory
+            source_name: Checkpoint key for iterables (paths use themselves)
+            chunk_size: Records encoded, written and checkpointed together
+            encode_batch_size: Batch size passed to the embedding model
+            resume: Continue from the last checkpoint for this source
+        
+        Returns:
+            IngestReport with written/duplicate counts and docs/sec
+        """
+        if state_path is None:
+            os.makedirs(self.persist_directory, exist_ok=True)
+            state_path = os.path.join(self.persist_directory, "ingest_state.db")
+        
+        ingestor = BulkIngestor(self.research_memory, self.embedding_model, state_path,
+                                chunk_size=chunk_size, encode_batch_size=encode_batch_size)
+        try:
+            report = ingestor.ingest(source, source_name=source_name, resume=resume)
+        finally:
+            ingestor.close()
+        
+        logger.info(f"Bulk import of {report.source} finished: {report.to_dict()}")
+        return report
+    
     def semantic_search_papers(self, query: str, n_results: int = 10) -> List[Dict[str, Any]]:
         """
         Perform semantic search across research papers
@@ -287,6 +328,12 @@ class VectorMemorySystem:
                 ids=[node_id]
             )
             
+            # Re-adding a node must not duplicate the edges it already has
+            self.graph_store.add_node(node_id, node_type, properties)
+            existing = set(self.graph_store.neighbors(node_id, 'out', ['connected']))
+            new_connections = [connection for connection in dict.fromkeys(connections) if connection not in existing]
+            self.graph_store.add_edges((node_id, connection, "connected") for connection in new_connections)
+            
             logger.info(f"Added knowledge graph node: {node_id}")
             return True
             
@@ -338,10 +385,50 @@ class VectorMemorySystem:
             logger.error(f"Error querying knowledge graph: {e}")
             return []
     
+    def expand_knowledge_graph(self, query: str, hops: int = 2, n_seeds: int = 5,
+                               node_type: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Find the graph neighbourhood of the nodes matching a query
+        
+        Args:
+            query: Natural language query used to pick seed nodes
+            hops: Maximum number of edges from a seed
+            n_seeds: Number of seed nodes from semantic search
+            node_type: Only return nodes of this type (traversal crosses all types)
+            limit: Maximum number of nodes returned
+        
+        Returns:
+            Nodes ranked by PageRank personalised to the seeds, with hop distance
+        """
+        try:
+            seeds = {node['node_id']: max(node['relevance'] or 0.0, 1e-6)
+                     for node in self.query_knowledge_graph(query, n_results=n_seeds)}
+            neighbourhood = self.graph_store.k_hop(seeds, hops=hops,
+                                                   node_types=[node_type] if node_type else None)
+            scores = self.graph_store.pagerank(personalization=seeds, direction='both')
+            ranked = sorted(neighbourhood, key=lambda node_id: scores[self.graph_store.node_index[node_id]],
+                            reverse=True)[:limit]
+            
+            return [
+                {**self.graph_store.node(node_id), 'hops': neighbourhood[node_id],
+                 'score': float(scores[self.graph_store.node_index[node_id]])}
+                for node_id in ranked
+            ]
+            
+        except Exception as e:
+            logger.error(f"Error expanding knowledge graph: {e}")
+            return []
+    
+    def knowledge_graph_path(self, source_id: str, target_id: str,
+                             max_depth: Optional[int] = None) -> Optional[List[str]]:
+        """Shortest chain of connections between two knowledge graph nodes"""
+        return self.graph_store.shortest_path(source_id, target_id, max_depth=max_depth)
+    
     def persist(self):
         """Persist all collections to disk"""
         try:
             self.client.persist()
+            self.graph_store.save()
             logger.info("Vector memory system persisted to disk")
             return True
         except Exception as e:
@@ -355,6 +442,7 @@ class VectorMemorySystem:
             "agent_experiences": self.experience_memory.count(),
             "episodic_memories": self.episodic_memory.count(),
             "knowledge_graph_nodes": self.knowledge_graph.count(),
+            "knowledge_graph_edges": self.graph_store.edge_count,
             "persist_directory": self.persist_directory,
             "embedding_model": "sentence-transformers/allenai-specter"
         }
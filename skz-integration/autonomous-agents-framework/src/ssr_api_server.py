@@ -10,6 +10,7 @@ import sys
 import json
 import logging
 import asyncio
+import uuid
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from pathlib import Path
@@ -40,6 +41,8 @@ except ImportError as e:
     import uvicorn
     FASTAPI_AVAILABLE = True
 
+from serialization import FastJSONResponse, list_response, negotiated_response
+
 # Import agent services
 try:
     from ojs_bridge import OJSBridge, AgentOJSBridge
@@ -76,7 +79,8 @@ app = FastAPI(
     description="Server-side rendering API for autonomous academic publishing agents",
     version="1.0.0",
     docs_url="/api/docs",  # API documentation endpoint
-    redoc_url="/api/redoc"  # Alternative API documentation
+    redoc_url="/api/redoc",  # Alternative API documentation
+    default_response_class=FastJSONResponse
 )
 
 # Template configuration for server-side rendering
@@ -89,8 +93,158 @@ static_dir = Path(__file__).parent / "static"
 static_dir.mkdir(exist_ok=True)
 app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
 
+# The page shell is not named dashboard.html: earlier servers wrote a single-file
+# dashboard.html that expects the raw registry, and it may still sit in templates/
+DASHBOARD_TEMPLATES = ("dashboard_page.html", "dashboard_stats.html", "dashboard_agent.html")
+
+class AgentRegistrySnapshot:
+    """Aggregate view of the agent registry, kept current as agent state changes
+    
+    Counts and performance sums are adjusted per change instead of being
+    recomputed per request. Every change bumps ``version`` and the changed
+    agent's entry in ``agent_versions``; rendered fragments and ETags are
+    keyed by these.
+    """
+    
+    def __init__(self):
+        # Distinguishes ETags across restarts, when versions start over
+        self.instance = uuid.uuid4().hex[:8]
+        self.version = 0
+        self.load({})
+    
+    def load(self, registry: Dict[str, Dict[str, Any]]):
+        """Take over a registry and recompute all aggregates"""
+        self.registry = registry
+        self.active = 0
+        self.total_tasks = 0
+        self.success_rate_sum = 0.0
+        self.response_time_sum = 0.0
+        for agent in registry.values():
+            self._apply(agent, 1)
+        
+        self.version += 1
+        self.agent_versions = {agent_id: self.version for agent_id in registry}
+        self.updated_at = datetime.now()
+    
+    def _apply(self, agent: Dict[str, Any], sign: int):
+        performance = agent["performance"]
+        self.active += sign * (agent["status"] == "active")
+        self.total_tasks += sign * performance["total_actions"]
+        self.success_rate_sum += sign * performance["success_rate"]
+        self.response_time_sum += sign * performance["avg_response_time"]
+    
+    def update_agent(self, agent_id: str, status: Optional[str] = None,
+                     performance: Optional[Dict[str, Any]] = None):
+        """Apply a state change to one agent and update the aggregates"""
+        agent = self.registry[agent_id]
+        self._apply(agent, -1)
+        if status is not None:
+            agent["status"] = status
+        if performance:
+            agent["performance"].update(performance)
+        agent["last_activity"] = datetime.now()
+        self._apply(agent, 1)
+        
+        self.version += 1
+        self.agent_versions[agent_id] = self.version
+        self.updated_at = agent["last_activity"]
+    
+    def record_action(self, agent_id: str):
+        """Count one completed action for an agent"""
+        total_actions = self.registry[agent_id]["performance"]["total_actions"] + 1
+        self.update_agent(agent_id, performance={"total_actions": total_actions})
+    
+    @property
+    def total(self) -> int:
+        return len(self.registry)
+    
+    @property
+    def inactive(self) -> int:
+        return self.total - self.active
+    
+    @property
+    def etag(self) -> str:
+        return f'W/"agents-{self.instance}-{self.version}"'
+    
+    def status_summary(self) -> Dict[str, Any]:
+        """Agent counts and performance averages for the status endpoint"""
+        total = self.total
+        return {
+            "agents": {
+                "total": total,
+                "active": self.active,
+                "inactive": self.inactive
+            },
+            "performance": {
+                "total_tasks": self.total_tasks,
+                "avg_success_rate": self.success_rate_sum / total if total else 0.0,
+                "avg_response_time": self.response_time_sum / total if total else 0.0
+            }
+        }
+
+class DashboardRenderer:
+    """Renders the dashboard page from cached fragments
+    
+    The stats block is cached per snapshot version and each agent card per
+    agent version, so a change to one agent re-renders only its card and the
+    stats before the page is reassembled. The assembled page is cached until
+    the snapshot changes again.
+    """
+    
+    def __init__(self, templates: Jinja2Templates, snapshot: AgentRegistrySnapshot):
+        self.env = templates.env
+        self.snapshot = snapshot
+        self._fragments: Dict[Any, tuple] = {}
+        self._page: Optional[tuple] = None
+        self.renders = {"page": 0, "stats": 0, "agent": 0}
+    
+    def _fragment(self, key: Any, version: int, template_name: str, fragments: Dict[Any, tuple], **context) -> str:
+        cached = self._fragments.get(key)
+        if cached is None or cached[0] != version:
+            cached = (version, self.env.get_template(template_name).render(**context))
+            self.renders[key[0]] += 1
+        fragments[key] = cached
+        return cached[1]
+    
+    def render(self) -> str:
+        """Dashboard HTML for the current snapshot version"""
+        snapshot = self.snapshot
+        if self._page is not None and self._page[0] == snapshot.version:
+            return self._page[1]
+        
+        # Only fragments used by this page are kept, dropping removed agents
+        fragments = {}
+        stats = self._fragment(
+            ("stats",), snapshot.version, "dashboard_stats.html", fragments,
+            total_agents=snapshot.total, active_agents=snapshot.active, total_tasks=snapshot.total_tasks
+        )
+        agent_cards = [
+            self._fragment(("agent", agent_id), snapshot.agent_versions[agent_id], "dashboard_agent.html",
+                           fragments, agent_id=agent_id, agent=agent)
+            for agent_id, agent in snapshot.registry.items()
+        ]
+        self._fragments = fragments
+        
+        html = self.env.get_template("dashboard_page.html").render(
+            stats=stats, agent_cards=agent_cards, server_time=snapshot.updated_at.isoformat()
+        )
+        self.renders["page"] += 1
+        self._page = (snapshot.version, html)
+        return html
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    strip_weak = lambda tag: tag.strip()[2:] if tag.strip().startswith("W/") else tag.strip()
+    return strip_weak(etag) in {strip_weak(tag) for tag in if_none_match.split(",")}
+
 # Global agent registry for server-side data access
 AGENT_REGISTRY: Dict[str, Dict[str, Any]] = {}
+AGENT_SNAPSHOT = AgentRegistrySnapshot()
+DASHBOARD_RENDERER = DashboardRenderer(templates, AGENT_SNAPSHOT)
 OJS_BRIDGE: Optional[OJSBridge] = None
 
 def initialize_ssr_services():
@@ -160,6 +314,7 @@ def initialize_ssr_services():
             }
         }
         
+        AGENT_SNAPSHOT.load(AGENT_REGISTRY)
         logger.info(f"Initialized {len(AGENT_REGISTRY)} agents for SSR")
         
     except Exception as e:
@@ -176,32 +331,26 @@ async def startup_event():
 
 @app.get("/", response_class=HTMLResponse)
 async def root(request: Request):
-    """Root endpoint with server-rendered HTML dashboard"""
+    """Root endpoint with server-rendered HTML dashboard
+    
+    The page is keyed by the agent snapshot version: an unchanged dashboard
+    answers ``If-None-Match`` with 304, a changed one re-renders only the
+    fragments whose agents changed.
+    """
     try:
-        # Server-side data fetching
-        active_agents = sum(1 for agent in AGENT_REGISTRY.values() if agent["status"] == "active")
-        total_tasks = sum(agent["performance"]["total_actions"] for agent in AGENT_REGISTRY.values())
-        
-        # Render server-side template
-        dashboard_data = {
-            "total_agents": len(AGENT_REGISTRY),
-            "active_agents": active_agents,
-            "total_tasks": total_tasks,
-            "agents": AGENT_REGISTRY,
-            "server_time": datetime.now().isoformat()
-        }
+        headers = {"ETag": AGENT_SNAPSHOT.etag, "Cache-Control": "no-cache"}
+        if etag_matches(request.headers.get("if-none-match"), AGENT_SNAPSHOT.etag):
+            return Response(status_code=304, headers=headers)
         
-        return templates.TemplateResponse("dashboard.html", {
-            "request": request,
-            **dashboard_data
-        })
+        # Render server-side template from cached fragments
+        return HTMLResponse(content=DASHBOARD_RENDERER.render(), headers=headers)
         
     except Exception as e:
         logger.error(f"Dashboard rendering failed: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @app.get("/api/v1/status")
-async def get_system_status():
+async def get_system_status(request: Request):
     """System status endpoint with server-rendered JSON"""
     try:
         # Server-side status computation
@@ -209,26 +358,17 @@ async def get_system_status():
             "status": "operational",
             "timestamp": datetime.now().isoformat(),
             "version": "1.0.0",
-            "agents": {
-                "total": len(AGENT_REGISTRY),
-                "active": sum(1 for agent in AGENT_REGISTRY.values() if agent["status"] == "active"),
-                "inactive": sum(1 for agent in AGENT_REGISTRY.values() if agent["status"] != "active")
-            },
-            "performance": {
-                "total_tasks": sum(agent["performance"]["total_actions"] for agent in AGENT_REGISTRY.values()),
-                "avg_success_rate": sum(agent["performance"]["success_rate"] for agent in AGENT_REGISTRY.values()) / len(AGENT_REGISTRY),
-                "avg_response_time": sum(agent["performance"]["avg_response_time"] for agent in AGENT_REGISTRY.values()) / len(AGENT_REGISTRY)
-            }
+            **AGENT_SNAPSHOT.status_summary()
         }
         
-        return JSONResponse(content=status)
+        return negotiated_response(request, status)
         
     except Exception as e:
         logger.error(f"Status request failed: {e}")
         raise HTTPException(status_code=500, detail="Status computation failed")
 
 @app.get("/api/v1/agents")
-async def get_agents():
+async def get_agents(request: Request):
     """Get all agents with server-rendered JSON response"""
     try:
         # Server-side agent data preparation
@@ -243,8 +383,7 @@ async def get_agents():
                 "performance": agent_data["performance"]
             })
         
-        return JSONResponse(content={
-            "agents": agents_response,
+        return list_response(request, "agents", agents_response, {
             "total": len(agents_response),
             "timestamp": datetime.now().isoformat()
         })
@@ -254,7 +393,7 @@ async def get_agents():
         raise HTTPException(status_code=500, detail="Failed to fetch agents")
 
 @app.get("/api/v1/agents/{agent_id}")
-async def get_agent_details(agent_id: str):
+async def get_agent_details(agent_id: str, request: Request):
     """Get specific agent details with server-rendered JSON"""
     try:
         if agent_id not in AGENT_REGISTRY:
@@ -276,7 +415,7 @@ async def get_agent_details(agent_id: str):
             }
         }
         
-        return JSONResponse(content=response)
+        return negotiated_response(request, response)
         
     except HTTPException:
         raise
@@ -285,7 +424,7 @@ async def get_agent_details(agent_id: str):
         raise HTTPException(status_code=500, detail="Failed to fetch agent details")
 
 @app.post("/api/v1/agents/{agent_id}/action")
-async def execute_agent_action(agent_id: str, request_data: AgentActionRequest):
+async def execute_agent_action(agent_id: str, request_data: AgentActionRequest, request: Request):
     """Execute agent action with server-side processing"""
     try:
         if agent_id not in AGENT_REGISTRY:
@@ -296,8 +435,6 @@ async def execute_agent_action(agent_id: str, request_data: AgentActionRequest):
             raise HTTPException(status_code=400, detail="Action is required")
         
         # Server-side action processing
-        agent_data = AGENT_REGISTRY[agent_id]
-        
         # Simulate server-side processing with real data paths
         if AGENT_SERVICES_AVAILABLE and OJS_BRIDGE:
             # Use real agent services for processing
@@ -317,10 +454,9 @@ async def execute_agent_action(agent_id: str, request_data: AgentActionRequest):
             }
         
         # Update agent performance metrics server-side
-        agent_data["performance"]["total_actions"] += 1
-        agent_data["last_activity"] = datetime.now()
+        AGENT_SNAPSHOT.record_action(agent_id)
         
-        return JSONResponse(content={
+        return negotiated_response(request, {
             "success": True,
             "result": result,
             "timestamp": datetime.now().isoformat(),
@@ -359,7 +495,7 @@ async def process_agent_action_server_side(agent_id: str, action: str, parameter
 
 # Health check endpoint for monitoring
 @app.get("/health")
-async def health_check():
+async def health_check(request: Request):
     """Health check endpoint for server monitoring"""
     try:
         health_status = {
@@ -378,22 +514,24 @@ async def health_check():
         if not all_healthy:
             health_status["status"] = "degraded"
             
-        return JSONResponse(content=health_status)
+        return negotiated_response(request, health_status)
         
     except Exception as e:
         logger.error(f"Health check failed: {e}")
-        return JSONResponse(
-            status_code=500,
-            content={
-                "status": "unhealthy",
-                "error": str(e),
-                "timestamp": datetime.now().isoformat()
-            }
-        )
+        return negotiated_response(request, {
+            "status": "unhealthy",
+            "error": str(e),
+            "timestamp": datetime.now().isoformat()
+        }, status_code=500)
 
-def create_default_template():
-    """Create default server-side template"""
-    template_content = """<!DOCTYPE html>
+def create_default_template(directory: Path = templates_dir):
+    """Create the default server-side templates that are missing
+    
+    ``dashboard_page.html`` is the page shell; the stats block and the agent cards
+    are separate templates so they can be rendered and cached on their own.
+    Existing, possibly customized, templates are left untouched.
+    """
+    page_template = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -420,7 +558,20 @@ def create_default_template():
             <p>Server-Side Rendered | {{ server_time }}</p>
         </div>
         
-        <div class="stats">
+        {{ stats|safe }}
+        
+        <div class="agent-grid">
+            {% for card in agent_cards %}{{ card|safe }}{% endfor %}
+        </div>
+        
+        <div class="footer">
+            <p>OJS 7.1 Enhanced with SKZ Autonomous Agents | Server-Side Rendered</p>
+        </div>
+    </div>
+</body>
+</html>"""
+    
+    stats_template = """<div class="stats">
             <div class="stat-card">
                 <div class="stat-number">{{ total_agents }}</div>
                 <div>Total Agents</div>
@@ -433,10 +584,9 @@ def create_default_template():
                 <div class="stat-number">{{ total_tasks }}</div>
                 <div>Tasks Completed</div>
             </div>
-        </div>
-        
-        <div class="agent-grid">
-            {% for agent_id, agent in agents.items() %}
+        </div>"""
+    
+    agent_template = """
             <div class="agent-card">
                 <h3>{{ agent.name }}</h3>
                 <span class="agent-status status-{{ agent.status }}">{{ agent.status.upper() }}</span>
@@ -444,26 +594,19 @@ def create_default_template():
                 <p><strong>Success Rate:</strong> {{ (agent.performance.success_rate * 100)|round }}%</p>
                 <p><strong>Avg Response:</strong> {{ agent.performance.avg_response_time }}s</p>
                 <p><strong>Total Actions:</strong> {{ agent.performance.total_actions }}</p>
-            </div>
-            {% endfor %}
-        </div>
-        
-        <div class="footer">
-            <p>OJS 7.1 Enhanced with SKZ Autonomous Agents | Server-Side Rendered</p>
-        </div>
-    </div>
-</body>
-</html>"""
+            </div>"""
     
-    template_file = templates_dir / "dashboard.html"
-    template_file.write_text(template_content)
-    logger.info(f"Created default SSR template at {template_file}")
+    for name, content in zip(DASHBOARD_TEMPLATES, (page_template, stats_template, agent_template)):
+        template_file = directory / name
+        if template_file.exists():
+            continue
+        template_file.write_text(content)
+        logger.info(f"Created default SSR template at {template_file}")
 
 def run_ssr_server():
     """Run the SSR-compliant FastAPI server"""
-    # Create default template if it doesn't exist
-    if not (templates_dir / "dashboard.html").exists():
-        create_default_template()
+    # Create any missing default templates
+    create_default_template()
     
     # Production-grade ASGI server configuration
     config = uvicorn.Config(
@@ -6,92 +6,112 @@ using transformer models, time series analysis, and multi-objective optimization
 
 import numpy as np
 import pandas as pd
-import torch
-import torch.nn as nn
-from transformers import AutoTokenizer, AutoModel, pipeline
 from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
+from sklearn.linear_model import SGDRegressor
 from sklearn.cluster import KMeans
 from sklearn.preprocessing import StandardScaler, MinMaxScaler
 from sklearn.decomposition import PCA
 from sklearn.metrics import mean_squared_error, silhouette_score
 import sqlite3
 import json
+import os
+import pickle
 import logging
 import threading
 import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
 import asyncio
 import warnings
+from functools import lru_cache
+from ml_runtime import load_torch, load_transformers
 warnings.filterwarnings('ignore')
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class TransformerInsightModel(nn.Module):
-    """Transformer-based model for strategic insight generation"""
+@lru_cache(maxsize=None)
+def _transformer_insight_model_class():
+    """Build the transformer model class once torch is actually needed"""
+    torch = load_torch()
+    nn = torch.nn
     
-    def __init__(self, vocab_size: int = 10000, d_model: int = 256, 
-                 nhead: int = 8, num_layers: int = 6, num_classes: int = 5):
-        super(TransformerInsightModel, self).__init__()
-        
-        self.d_model = d_model
-        self.embedding = nn.Embedding(vocab_size, d_model)
-        self.pos_encoding = self._create_positional_encoding(5000, d_model)
-        
-        encoder_layer = nn.TransformerEncoderLayer(
-            d_model=d_model,
-            nhead=nhead,
-            dim_feedforward=d_model * 4,
-            dropout=0.1,
-            batch_first=True
-        )
-        
-        self.transformer = nn.TransformerEncoder(encoder_layer, num_layers=num_layers)
-        self.classifier = nn.Linear(d_model, num_classes)
-        self.dropout = nn.Dropout(0.1)
-        
-    def _create_positional_encoding(self, max_len: int, d_model: int):
-        """Create positional encoding for transformer"""
-        pe = torch.zeros(max_len, d_model)
-        position = torch.arange(0, max_len, dtype=torch.float).unsqueeze(1)
-        
-        div_term = torch.exp(torch.arange(0, d_model, 2).float() * 
-                           (-np.log(10000.0) / d_model))
-        
-        pe[:, 0::2] = torch.sin(position * div_term)
-        pe[:, 1::2] = torch.cos(position * div_term)
+    class TransformerInsightModel(nn.Module):
+        """Transformer-based model for strategic insight generation"""
         
-        return pe.unsqueeze(0)
-        
-    def forward(self, x, attention_mask=None):
-        # Add positional encoding
-        seq_len = x.size(1)
-        pos_encoding = self.pos_encoding[:, :seq_len, :].to(x.device)
-        
-        # Embedding and position
-        x = self.embedding(x) * np.sqrt(self.d_model) + pos_encoding
-        x = self.dropout(x)
-        
-        # Transformer encoding
-        if attention_mask is not None:
-            attention_mask = attention_mask.bool()
+        def __init__(self, vocab_size: int = 10000, d_model: int = 256, 
+                     nhead: int = 8, num_layers: int = 6, num_classes: int = 5):
+            super(TransformerInsightModel, self).__init__()
             
-        transformer_output = self.transformer(x, src_key_padding_mask=~attention_mask if attention_mask is not None else None)
-        
-        # Global average pooling
-        if attention_mask is not None:
-            mask = attention_mask.unsqueeze(-1).float()
-            pooled = (transformer_output * mask).sum(dim=1) / mask.sum(dim=1)
-        else:
-            pooled = transformer_output.mean(dim=1)
+            self.d_model = d_model
+            self.embedding = nn.Embedding(vocab_size, d_model)
+            self.pos_encoding = self._create_positional_encoding(5000, d_model)
             
-        # Classification
-        output = self.classifier(pooled)
-        
-        return output
+            encoder_layer = nn.TransformerEncoderLayer(
+                d_model=d_model,
+                nhead=nhead,
+                dim_feedforward=d_model * 4,
+                dropout=0.1,
+                batch_first=True
+            )
+            
+            self.transformer = nn.TransformerEncoder(encoder_layer, num_layers=num_layers)
+            self.classifier = nn.Linear(d_model, num_classes)
+            self.dropout = nn.Dropout(0.1)
+            
+        def _create_positional_encoding(self, max_len: int, d_model: int):
+            """Create positional encoding for transformer"""
+            pe = torch.zeros(max_len, d_model)
+            position = torch.arange(0, max_len, dtype=torch.float).unsqueeze(1)
+            
+            div_term = torch.exp(torch.arange(0, d_model, 2).float() * 
+                               (-np.log(10000.0) / d_model))
+            
+            pe[:, 0::2] = torch.sin(position * div_term)
+            pe[:, 1::2] = torch.cos(position * div_term)
+            
+            return pe.unsqueeze(0)
+            
+        def forward(self, x, attention_mask=None):
+            # Add positional encoding
+            seq_len = x.size(1)
+            pos_encoding = self.pos_encoding[:, :seq_len, :].to(x.device)
+            
+            # Embedding and position
+            x = self.embedding(x) * np.sqrt(self.d_model) + pos_encoding
+            x = self.dropout(x)
+            
+            # Transformer encoding
+            if attention_mask is not None:
+                attention_mask = attention_mask.bool()
+                
+            transformer_output = self.transformer(x, src_key_padding_mask=~attention_mask if attention_mask is not None else None)
+            
+            # Global average pooling
+            if attention_mask is not None:
+                mask = attention_mask.unsqueeze(-1).float()
+                pooled = (transformer_output * mask).sum(dim=1) / mask.sum(dim=1)
+            else:
+                pooled = transformer_output.mean(dim=1)
+                
+            # Classification
+            output = self.classifier(pooled)
+            
+            return output
+    
+    TransformerInsightModel.__module__ = __name__
+    TransformerInsightModel.__qualname__ = 'TransformerInsightModel'
+    return TransformerInsightModel
+
+
+def __getattr__(name: str):
+    # Keeps ``from strategic_analytics import TransformerInsightModel`` working without importing torch eagerly
+    if name == 'TransformerInsightModel':
+        return _transformer_insight_model_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class InsightGenerator:
@@ -103,17 +123,26 @@ class InsightGenerator:
         self.insight_model = None
         self.scaler = StandardScaler()
         self.is_initialized = False
-        
-        # Initialize pre-trained models
-        self._initialize_models()
+        self._initialization_attempted = False
         
     def _initialize_models(self):
-        """Initialize pre-trained models for insight generation"""
+        """Initialize pre-trained models for insight generation
+        
+        Runs on the first ``generate_insights`` call rather than at
+        construction, so importing or constructing the analytics system does
+        not load torch/transformers.
+        """
+        if self._initialization_attempted:
+            return
+        self._initialization_attempted = True
+        
         try:
+            transformers = load_transformers()
+            
             # Use a lightweight BERT model for text analysis
             model_name = "distilbert-base-uncased"
-            self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-            self.bert_model = AutoModel.from_pretrained(model_name)
+            self.tokenizer = transformers.AutoTokenizer.from_pretrained(model_name)
+            self.bert_model = transformers.AutoModel.from_pretrained(model_name)
             self.bert_model.eval()
             
             # Initialize insight categories
@@ -135,6 +164,7 @@ class InsightGenerator:
     def generate_insights(self, performance_data: Dict[str, Any], 
                          historical_trends: List[Dict]) -> List[Dict[str, Any]]:
         """Generate strategic insights from performance data and trends"""
+        self._initialize_models()
         if not self.is_initialized:
             return self._generate_fallback_insights(performance_data)
             
@@ -367,16 +397,206 @@ class InsightGenerator:
         return insights
 
 
+FORECAST_LAGS = [1, 2, 3, 6, 12, 24]
+FORECAST_ROLLING_WINDOWS = [3, 6, 12]
+
+
+def _build_metric_features(data: pd.DataFrame, metric: str) -> Tuple[pd.DataFrame, List[str]]:
+    """Time, lag and rolling features for one metric (rows with NaNs are kept)"""
+    features = pd.DataFrame(index=data.index)
+    
+    if 'timestamp' in data.columns:
+        features['hour'] = data['timestamp'].dt.hour
+        features['day_of_week'] = data['timestamp'].dt.dayofweek
+        features['day_of_month'] = data['timestamp'].dt.day
+    
+    # Create lag features
+    for lag in FORECAST_LAGS:
+        features[f'{metric}_lag_{lag}'] = data[metric].shift(lag)
+    
+    # Create rolling statistics
+    for window in FORECAST_ROLLING_WINDOWS:
+        features[f'{metric}_rolling_mean_{window}'] = data[metric].rolling(window).mean()
+        features[f'{metric}_rolling_std_{window}'] = data[metric].rolling(window).std()
+    
+    return features, list(features.columns)
+
+
+def _fit_metric_forecaster(data: pd.DataFrame, metric: str, incremental: bool,
+                           state: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Train or update the forecaster for one metric
+    
+    Module-level so it can run in a worker process. ``data`` holds only the
+    timestamp and metric columns; in incremental mode with an existing
+    ``state`` it holds only rows newer than the state's watermark and the
+    models are updated with ``partial_fit`` on features scaled by the
+    scaler from the first fit. Returns the new state, with the
+    training summary under ``'result'``.
+    """
+    context = state['context'] if state else None
+    if context is not None:
+        # Prepend the retained tail so lag/rolling features of new rows are complete
+        data = pd.concat([context, data], ignore_index=True)
+    
+    features, feature_columns = _build_metric_features(data, metric)
+    if context is not None:
+        features = features.iloc[len(context):]
+    
+    # Remove rows with NaN values
+    features = features.dropna()
+    y = data.loc[features.index, metric]
+    
+    minimum_rows = 1 if state else 10
+    if len(features) < minimum_rows:
+        return {**(state or {}), 'result': {'status': 'insufficient_data' if not state else 'up_to_date',
+                                           'training_samples': 0}}
+    
+    X = features[feature_columns].to_numpy()
+    
+    if state:
+        # The scaler stays as first fitted: rescaling would shift the
+        # inputs under the coefficients the models have already learned
+        scaler = state['scaler']
+        trained_models = state['models']
+        X_scaled = scaler.transform(X)
+        for model in trained_models.values():
+            model.partial_fit(X_scaled, y)
+    else:
+        # Scale features
+        scaler = StandardScaler()
+        X_scaled = scaler.fit_transform(X)
+        
+        if incremental:
+            # Online regressors that can be updated with partial_fit later
+            models = {
+                'sgd': SGDRegressor(random_state=42),
+                'sgd_huber': SGDRegressor(loss='huber', random_state=42)
+            }
+        else:
+            # Train ensemble model
+            models = {
+                'rf': RandomForestRegressor(n_estimators=100, random_state=42),
+                'gbm': GradientBoostingRegressor(n_estimators=100, random_state=42)
+            }
+        
+        trained_models = {}
+        for name, model in models.items():
+            try:
+                model.fit(X_scaled, y)
+                trained_models[name] = model
+            except Exception as e:
+                logger.error(f"Failed to train {name} for {metric}: {e}")
+        
+        if not trained_models:
+            return {'result': {'status': 'training_failed'}}
+    
+    # Calculate training accuracy
+    predictions = {}
+    for name, model in trained_models.items():
+        pred = model.predict(X_scaled)
+        predictions[name] = {'mse': mean_squared_error(y, pred), 'predictions': pred}
+    
+    watermark = data['timestamp'].iloc[-1] if 'timestamp' in data.columns else None
+    
+    return {
+        'models': trained_models,
+        'scaler': scaler,
+        'feature_columns': feature_columns,
+        'watermark': watermark,
+        'context': data.tail(max(FORECAST_LAGS + FORECAST_ROLLING_WINDOWS)).reset_index(drop=True),
+        'result': {
+            'status': 'success',
+            'mode': 'incremental_update' if state else 'full_training',
+            'models_trained': list(trained_models.keys()),
+            'training_samples': len(X),
+            'features_used': len(feature_columns),
+            'performance': predictions
+        }
+    }
+
+
 class EvolutionForecaster:
     """Time series forecasting for system evolution prediction"""
     
-    def __init__(self):
+    def __init__(self, incremental: bool = False, max_workers: Optional[int] = None,
+                 cache_dir: Optional[str] = None):
+        """
+        Args:
+            incremental: Use online regressors that are updated with only the
+                rows newer than each metric's watermark, instead of retraining
+                the random forest / gradient boosting ensemble on all history
+            max_workers: Train metrics in parallel across a process pool of
+                this size (sequential when None or 1)
+            cache_dir: Directory where fitted models, scalers and watermarks
+                are cached per metric and reloaded on start-up
+        """
+        self.incremental = incremental
+        self.max_workers = max_workers
+        self.cache_dir = cache_dir
         self.forecasting_models = {}
         self.scalers = {}
+        self.metric_states: Dict[str, Dict[str, Any]] = {}
         self.is_trained = False
         
+        if cache_dir:
+            self._load_cached_models()
+    
+    def _cache_path(self, metric: str) -> str:
+        return os.path.join(self.cache_dir, f"{metric}_forecaster.pkl")
+    
+    def _load_cached_models(self):
+        """Load per-metric forecasters cached by a previous run"""
+        for metric in ['execution_time', 'cpu_usage', 'memory_usage', 'success_rate']:
+            path = self._cache_path(metric)
+            if not os.path.exists(path):
+                continue
+            try:
+                with open(path, 'rb') as f:
+                    state = pickle.load(f)
+                if state.get('incremental') != self.incremental:
+                    continue
+                self._set_metric_state(metric, state)
+            except Exception as e:
+                logger.warning(f"Ignoring cached forecaster for {metric}: {e}")
+        
+        self.is_trained = bool(self.forecasting_models)
+    
+    def _set_metric_state(self, metric: str, state: Dict[str, Any]):
+        self.metric_states[metric] = state
+        self.forecasting_models[metric] = state['models']
+        self.scalers[metric] = state['scaler']
+    
+    def _save_metric_state(self, metric: str, state: Dict[str, Any]):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        cached = {key: value for key, value in state.items() if key != 'result'}
+        cached['incremental'] = self.incremental
+        with open(self._cache_path(metric), 'wb') as f:
+            pickle.dump(cached, f)
+    
+    def get_watermarks(self) -> Dict[str, Any]:
+        """Timestamp of the newest observation each metric's model has seen"""
+        return {metric: state.get('watermark') for metric, state in self.metric_states.items()}
+    
+    def _metric_training_data(self, historical_data: pd.DataFrame, metric: str) -> Tuple[pd.DataFrame, Optional[Dict]]:
+        """Columns (and, incrementally, rows) needed to train one metric"""
+        columns = ['timestamp', metric] if 'timestamp' in historical_data.columns else [metric]
+        data = historical_data[columns]
+        
+        state = self.metric_states.get(metric) if self.incremental else None
+        if state is not None and state.get('watermark') is not None and 'timestamp' in data.columns:
+            data = data[data['timestamp'] > state['watermark']]
+        else:
+            state = None
+        
+        return data.reset_index(drop=True), state
+        
     def train_forecasting_models(self, historical_data: pd.DataFrame) -> Dict[str, Any]:
-        """Train forecasting models on historical performance data"""
+        """Train forecasting models on historical performance data
+        
+        In incremental mode, metrics that already have a model are updated
+        with only the rows after their watermark, so the cost follows the new
+        data volume rather than the full history.
+        """
         logger.info("Training evolution forecasting models")
         
         if historical_data.empty:
@@ -385,24 +605,46 @@ class EvolutionForecaster:
         try:
             # Prepare time series data
             if 'timestamp' in historical_data.columns:
-                historical_data['timestamp'] = pd.to_datetime(historical_data['timestamp'])
+                historical_data = historical_data.assign(timestamp=pd.to_datetime(historical_data['timestamp']))
                 historical_data = historical_data.sort_values('timestamp')
                 
             # Metrics to forecast
             forecast_metrics = ['execution_time', 'cpu_usage', 'memory_usage', 'success_rate']
+            jobs = {
+                metric: self._metric_training_data(historical_data, metric)
+                for metric in forecast_metrics if metric in historical_data.columns
+            }
             
-            training_results = {}
-            
-            for metric in forecast_metrics:
-                if metric in historical_data.columns:
+            states = {}
+            if self.max_workers and self.max_workers > 1 and len(jobs) > 1:
+                with ProcessPoolExecutor(max_workers=min(self.max_workers, len(jobs))) as executor:
+                    futures = {
+                        metric: executor.submit(_fit_metric_forecaster, data, metric, self.incremental, state)
+                        for metric, (data, state) in jobs.items()
+                    }
+                    for metric, future in futures.items():
+                        try:
+                            states[metric] = future.result()
+                        except Exception as e:
+                            logger.error(f"Failed to train forecaster for {metric}: {e}")
+                            states[metric] = {'result': {'status': 'failed', 'error': str(e)}}
+            else:
+                for metric, (data, state) in jobs.items():
                     try:
-                        model_result = self._train_metric_forecaster(historical_data, metric)
-                        training_results[metric] = model_result
+                        states[metric] = _fit_metric_forecaster(data, metric, self.incremental, state)
                     except Exception as e:
                         logger.error(f"Failed to train forecaster for {metric}: {e}")
-                        training_results[metric] = {'status': 'failed', 'error': str(e)}
+                        states[metric] = {'result': {'status': 'failed', 'error': str(e)}}
+            
+            training_results = {}
+            for metric, state in states.items():
+                training_results[metric] = state.pop('result')
+                if 'models' in state:
+                    self._set_metric_state(metric, state)
+                    if self.cache_dir and training_results[metric].get('status') == 'success':
+                        self._save_metric_state(metric, state)
                         
-            self.is_trained = len([r for r in training_results.values() if r.get('status') == 'success']) > 0
+            self.is_trained = bool(self.forecasting_models)
             
             return {
                 'status': 'success' if self.is_trained else 'partial_failure',
@@ -413,84 +655,16 @@ class EvolutionForecaster:
         except Exception as e:
             logger.error(f"Forecasting model training failed: {e}")
             return {'status': 'error', 'error': str(e)}
-            
-    def _train_metric_forecaster(self, data: pd.DataFrame, metric: str) -> Dict[str, Any]:
-        """Train forecasting model for specific metric"""
-        # Create time-based features
-        data_copy = data.copy()
-        
-        if 'timestamp' in data_copy.columns:
-            data_copy['hour'] = data_copy['timestamp'].dt.hour
-            data_copy['day_of_week'] = data_copy['timestamp'].dt.dayofweek
-            data_copy['day_of_month'] = data_copy['timestamp'].dt.day
-            
-        # Create lag features
-        for lag in [1, 2, 3, 6, 12, 24]:  # Various lag periods
-            data_copy[f'{metric}_lag_{lag}'] = data_copy[metric].shift(lag)
-            
-        # Create rolling statistics
-        for window in [3, 6, 12]:
-            data_copy[f'{metric}_rolling_mean_{window}'] = data_copy[metric].rolling(window).mean()
-            data_copy[f'{metric}_rolling_std_{window}'] = data_copy[metric].rolling(window).std()
-            
-        # Prepare features
-        feature_columns = ['hour', 'day_of_week', 'day_of_month']
-        feature_columns.extend([col for col in data_copy.columns if f'{metric}_lag_' in col or f'{metric}_rolling_' in col])
-        
-        # Remove rows with NaN values
-        data_clean = data_copy.dropna()
-        
-        if len(data_clean) < 10:
-            return {'status': 'insufficient_data'}
-            
-        X = data_clean[feature_columns]
-        y = data_clean[metric]
-        
-        # Scale features
-        scaler = StandardScaler()
-        X_scaled = scaler.fit_transform(X)
-        
-        # Train ensemble model
-        models = {
-            'rf': RandomForestRegressor(n_estimators=100, random_state=42),
-            'gbm': GradientBoostingRegressor(n_estimators=100, random_state=42)
-        }
-        
-        trained_models = {}
-        for name, model in models.items():
-            try:
-                model.fit(X_scaled, y)
-                trained_models[name] = model
-            except Exception as e:
-                logger.error(f"Failed to train {name} for {metric}: {e}")
-                
-        if not trained_models:
-            return {'status': 'training_failed'}
-            
-        # Store models and scaler
-        self.forecasting_models[metric] = trained_models
-        self.scalers[metric] = scaler
-        
-        # Calculate training accuracy
-        predictions = {}
-        for name, model in trained_models.items():
-            pred = model.predict(X_scaled)
-            mse = mean_squared_error(y, pred)
-            predictions[name] = {'mse': mse, 'predictions': pred}
-            
-        return {
-            'status': 'success',
-            'models_trained': list(trained_models.keys()),
-            'training_samples': len(X),
-            'features_used': len(feature_columns),
-            'performance': predictions
-        }
         
     def forecast_evolution(self, recent_data: pd.DataFrame, 
                           forecast_horizon: int = 24) -> Dict[str, Any]:
         """Forecast system evolution over specified horizon"""
         if not self.is_trained:
             return {'status': 'models_not_trained'}
+        
+        if 'timestamp' in recent_data.columns:
+            recent_data = recent_data.assign(timestamp=pd.to_datetime(recent_data['timestamp']))
+            recent_data = recent_data.sort_values('timestamp')
             
         forecasts = {}
         
@@ -515,63 +689,53 @@ class EvolutionForecaster:
         
     def _forecast_metric(self, recent_data: pd.DataFrame, metric: str, 
                         forecast_horizon: int) -> Dict[str, Any]:
-        """Forecast specific metric evolution"""
+        """Forecast specific metric evolution
+        
+        Lag and rolling features come from the recent values once; only the
+        time features vary per horizon step, so every model predicts the
+        whole horizon in a single batched call.
+        """
         if metric not in self.forecasting_models:
             return {'status': 'model_not_available'}
-            
-        # Prepare recent data similar to training
-        data_copy = recent_data.copy()
         
-        if 'timestamp' in data_copy.columns:
-            data_copy['timestamp'] = pd.to_datetime(data_copy['timestamp'])
-            data_copy = data_copy.sort_values('timestamp')
+        values = recent_data[metric].to_numpy(dtype=float) if metric in recent_data.columns else np.array([])
+        recent_values = values[-24:]  # Last 24 hours
+        fallback = float(values.mean()) if len(values) else 0.0
+        
+        history_features = {}
+        for lag in FORECAST_LAGS:
+            history_features[f'{metric}_lag_{lag}'] = values[-lag] if len(values) >= lag else fallback
+        for window in FORECAST_ROLLING_WINDOWS:
+            window_values = recent_values[-window:] if len(recent_values) >= window else recent_values
+            history_features[f'{metric}_rolling_mean_{window}'] = float(np.mean(window_values)) if len(window_values) else 0.0
+            history_features[f'{metric}_rolling_std_{window}'] = float(np.std(window_values, ddof=1)) if len(window_values) > 1 else 0.0
             
         # Create time features
         current_time = datetime.now()
         forecast_times = [current_time + timedelta(hours=h) for h in range(1, forecast_horizon + 1)]
+        time_features = {
+            'hour': [t.hour for t in forecast_times],
+            'day_of_week': [t.weekday() for t in forecast_times],
+            'day_of_month': [t.day for t in forecast_times]
+        }
         
-        predictions = []
+        feature_columns = self.metric_states.get(metric, {}).get(
+            'feature_columns', list(time_features) + list(history_features))
+        feature_matrix = np.column_stack([
+            time_features[column] if column in time_features else np.full(forecast_horizon, history_features[column])
+            for column in feature_columns
+        ])
+        feature_scaled = self.scalers[metric].transform(feature_matrix)
+        
+        # Ensemble prediction
+        model_predictions = np.vstack([
+            model.predict(feature_scaled) for model in self.forecasting_models[metric].values()
+        ])
+        ensemble_preds = model_predictions.mean(axis=0)
+        prediction_stds = model_predictions.std(axis=0)
         
-        for forecast_time in forecast_times:
-            # Create features for this time point
-            features = {
-                'hour': forecast_time.hour,
-                'day_of_week': forecast_time.weekday(),
-                'day_of_month': forecast_time.day
-            }
-            
-            # Add lag features (using recent actual values and previous predictions)
-            for lag in [1, 2, 3, 6, 12, 24]:
-                if len(data_copy) >= lag:
-                    features[f'{metric}_lag_{lag}'] = data_copy[metric].iloc[-lag]
-                else:
-                    features[f'{metric}_lag_{lag}'] = data_copy[metric].mean() if not data_copy.empty else 0
-                    
-            # Add rolling statistics
-            if not data_copy.empty:
-                recent_values = data_copy[metric].tail(24).values  # Last 24 hours
-                for window in [3, 6, 12]:
-                    if len(recent_values) >= window:
-                        features[f'{metric}_rolling_mean_{window}'] = np.mean(recent_values[-window:])
-                        features[f'{metric}_rolling_std_{window}'] = np.std(recent_values[-window:])
-                    else:
-                        features[f'{metric}_rolling_mean_{window}'] = np.mean(recent_values)
-                        features[f'{metric}_rolling_std_{window}'] = np.std(recent_values)
-                        
-            # Convert to array and scale
-            feature_array = np.array(list(features.values())).reshape(1, -1)
-            feature_scaled = self.scalers[metric].transform(feature_array)
-            
-            # Ensemble prediction
-            model_predictions = []
-            for model_name, model in self.forecasting_models[metric].items():
-                pred = model.predict(feature_scaled)[0]
-                model_predictions.append(pred)
-                
-            # Average ensemble prediction
-            ensemble_pred = np.mean(model_predictions)
-            prediction_std = np.std(model_predictions)
-            
+        predictions = []
+        for forecast_time, ensemble_pred, prediction_std in zip(forecast_times, ensemble_preds, prediction_stds):
             predictions.append({
                 'timestamp': forecast_time.isoformat(),
                 'predicted_value': float(ensemble_pred),
@@ -924,10 +1088,16 @@ class StrategicRecommendationEngine:
 class StrategicAnalytics:
     """Main strategic analytics system"""
     
-    def __init__(self, db_path: str = "src/database/strategic_analytics.db"):
+    def __init__(self, db_path: str = "src/database/strategic_analytics.db",
+                 incremental_forecasting: bool = False, forecast_workers: Optional[int] = None,
+                 forecast_cache_dir: Optional[str] = None):
         self.db_path = db_path
         self.insight_generator = InsightGenerator()
-        self.evolution_forecaster = EvolutionForecaster()
+        self.evolution_forecaster = EvolutionForecaster(
+            incremental=incremental_forecasting,
+            max_workers=forecast_workers,
+            cache_dir=forecast_cache_dir
+        )
         self.recommendation_engine = StrategicRecommendationEngine()
         self._initialize_database()
         
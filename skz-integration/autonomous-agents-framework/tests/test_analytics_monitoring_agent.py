@@ -272,6 +272,89 @@ class TestTrendAnalyzer:
                 assert 'confidence' in pred
                 assert 'horizon_hours' in pred
 
+    def test_sequences_are_strided_views(self):
+        """Test sequence construction without per-window copies"""
+        test_data = self.create_time_series_data()
+
+        X, y = self.analyzer.prepare_time_series_data(test_data)
+
+        assert X.shape[1:] == (12, 5)
+        assert y.shape == (len(X), 6)
+        assert np.shares_memory(X, y)
+        np.testing.assert_array_equal(X[1, 0], X[0, 1])
+        np.testing.assert_array_equal(y[0], X[12, 0:6, 0])
+
+    def test_prediction_uses_frozen_scaler(self):
+        """Test prediction scales only the last window with the training scaler"""
+        test_data = self.create_time_series_data()
+        self.analyzer.max_epochs = 2
+        self.analyzer.train_trend_model(test_data)
+        data_max = self.analyzer.scaler.data_max_.copy()
+
+        window = self.analyzer.prepare_prediction_window(test_data.tail(100))
+
+        assert window.shape == (1, 12, 5)
+        np.testing.assert_array_equal(self.analyzer.scaler.data_max_, data_max)
+
+    def test_checkpoint_reused_across_instances(self, tmp_path):
+        """Test saved model and scaler are loaded by a new analyzer"""
+        checkpoint = str(tmp_path / "trend_model")
+        trainer = TrendAnalyzer(sequence_length=12, prediction_horizon=6,
+                                checkpoint_path=checkpoint, max_epochs=2)
+        test_data = self.create_time_series_data()
+        trainer.train_trend_model(test_data)
+
+        restored = TrendAnalyzer(sequence_length=12, prediction_horizon=6, checkpoint_path=checkpoint)
+
+        assert restored.is_trained
+        expected = trainer.predict_trends(test_data.tail(30))['predictions']
+        actual = restored.predict_trends(test_data.tail(30))['predictions']
+        assert [p['predicted_execution_time'] for p in actual] == pytest.approx(
+            [p['predicted_execution_time'] for p in expected])
+
+    def test_quantized_and_exported_inference(self, tmp_path):
+        """Test int8-quantized serving and TorchScript export"""
+        from ml_runtime import load_torchscript
+
+        test_data = self.create_time_series_data()
+        analyzer = TrendAnalyzer(sequence_length=12, prediction_horizon=6,
+                                 max_epochs=2, quantize_inference=True)
+        analyzer.train_trend_model(test_data)
+
+        assert analyzer.inference_model is not None
+        assert analyzer.predict_trends(test_data.tail(30))['status'] == 'success'
+
+        exported = analyzer.export_inference_model(str(tmp_path / "trend"))
+        analyzer.inference_model = load_torchscript(exported)
+        assert len(analyzer.predict_trends(test_data.tail(30))['predictions']) == 6
+
+
+    def test_float_inference_copy_is_on_cpu(self):
+        """Test the unquantized serving copy is a CPU copy, not the training model"""
+        test_data = self.create_time_series_data()
+        analyzer = TrendAnalyzer(sequence_length=12, prediction_horizon=6, max_epochs=1)
+        analyzer.train_trend_model(test_data)
+        analyzer.optimize_for_inference(quantize=False)
+
+        assert analyzer.inference_model is not analyzer.model
+        assert all(parameter.device.type == 'cpu' for parameter in analyzer.inference_model.parameters())
+        assert analyzer.predict_trends(test_data.tail(30))['status'] == 'success'
+
+
+def test_analytics_modules_import_without_torch():
+    """Test torch/transformers load only on first model use"""
+    import subprocess
+    src_dir = os.path.join(os.path.dirname(__file__), '..', 'src')
+    code = (
+        "import sys; sys.path.insert(0, %r); "
+        "import predictive_monitoring, strategic_analytics; "
+        "strategic_analytics.StrategicAnalytics(':memory:'); "
+        "predictive_monitoring.TrendAnalyzer(); "
+        "print('torch' in sys.modules, 'transformers' in sys.modules)" % src_dir
+    )
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    assert output.stdout.strip().splitlines()[-1] == 'False False'
+
 
 class TestAnomalyDetector:
     """Test advanced anomaly detection"""
@@ -375,6 +458,77 @@ class TestParameterTuner:
         assert abs(suggestion['x']) < 2.0  # Should be reasonably close to optimum
 
 
+class TestEvolutionForecaster:
+    """Test incremental and parallel evolution forecasting"""
+
+    def create_history(self, hours, start=None):
+        start = start or datetime(2024, 1, 1)
+        timestamps = pd.date_range(start=start, periods=hours, freq='h')
+        rng = np.random.default_rng(3)
+        return pd.DataFrame({
+            'timestamp': timestamps,
+            'execution_time': 2.0 + np.sin(np.arange(hours) / 24 * 2 * np.pi) * 0.5 + rng.normal(0, 0.1, hours),
+            'cpu_usage': 40 + rng.normal(0, 5, hours)
+        })
+
+    def test_incremental_update_uses_only_new_rows(self):
+        """Test models are updated with rows after the watermark"""
+        forecaster = EvolutionForecaster(incremental=True)
+        history = self.create_history(240)
+
+        first = forecaster.train_forecasting_models(history.iloc[:200])
+        assert first['training_results']['cpu_usage']['mode'] == 'full_training'
+        assert forecaster.get_watermarks()['cpu_usage'] == history['timestamp'].iloc[199]
+
+        second = forecaster.train_forecasting_models(history)
+        update = second['training_results']['cpu_usage']
+        assert update['mode'] == 'incremental_update'
+        assert update['training_samples'] == 40
+        assert forecaster.get_watermarks()['cpu_usage'] == history['timestamp'].iloc[-1]
+
+        forecast = forecaster.forecast_evolution(history.tail(48), forecast_horizon=6)
+        assert len(forecast['forecasts']['execution_time']['predictions']) == 6
+
+    def test_incremental_update_keeps_scaler(self):
+        """Test updates reuse the first fit's scaling under the fitted coefficients"""
+        forecaster = EvolutionForecaster(incremental=True)
+        history = self.create_history(240)
+        history.loc[200:, 'cpu_usage'] += 100
+
+        forecaster.train_forecasting_models(history.iloc[:200])
+        scaler = forecaster.scalers['cpu_usage']
+        mean = scaler.mean_.copy()
+        forecaster.train_forecasting_models(history)
+
+        assert forecaster.scalers['cpu_usage'] is scaler
+        np.testing.assert_array_equal(scaler.mean_, mean)
+
+    def test_cached_models_survive_restart(self, tmp_path):
+        """Test fitted models and watermarks are reloaded from the cache"""
+        history = self.create_history(120)
+        EvolutionForecaster(incremental=True, cache_dir=str(tmp_path)).train_forecasting_models(history)
+
+        restored = EvolutionForecaster(incremental=True, cache_dir=str(tmp_path))
+
+        assert restored.is_trained
+        assert restored.get_watermarks()['execution_time'] == history['timestamp'].iloc[-1]
+        result = restored.train_forecasting_models(history)
+        assert result['training_results']['execution_time']['status'] == 'up_to_date'
+
+    def test_parallel_training_matches_sequential(self):
+        """Test metrics trained across a process pool"""
+        history = self.create_history(120)
+        sequential = EvolutionForecaster(incremental=True)
+        parallel = EvolutionForecaster(incremental=True, max_workers=2)
+
+        sequential.train_forecasting_models(history)
+        parallel.train_forecasting_models(history)
+
+        a = sequential.forecast_evolution(history.tail(48), 4)['forecasts']['cpu_usage']['predictions']
+        b = parallel.forecast_evolution(history.tail(48), 4)['forecasts']['cpu_usage']['predictions']
+        assert [p['predicted_value'] for p in a] == pytest.approx([p['predicted_value'] for p in b])
+
+
 class TestStrategicAnalytics:
     """Test strategic analytics system"""
     
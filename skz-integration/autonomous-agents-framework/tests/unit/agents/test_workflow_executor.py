@@ -0,0 +1,231 @@
+"""
+Unit Tests for the Workflow Orchestration Agent executor
+Tests DAG compilation, parallel stage execution, priorities, timeouts and retries
+"""
+
+import sys
+import os
+import threading
+import time
+
+import pytest
+
+# Add agents to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../../agents'))
+
+from workflow_orchestration_agent import WorkflowExecutor, WorkflowOrchestrationAgent
+
+
+def _template(*stages):
+    return {'stages': list(stages)}
+
+
+class _Recorder:
+    """Collects executor callbacks"""
+
+    def __init__(self):
+        self.results = []
+        self.finished = {}
+
+    def on_stage_result(self, workflow_id, stage_index, stage, result, attempts):
+        self.results.append((workflow_id, stage_index, result['success'], attempts))
+
+    def on_workflow_finished(self, workflow_id, status):
+        self.finished[workflow_id] = status
+
+
+def _executor(stage_runner, recorder, **kwargs):
+    return WorkflowExecutor(stage_runner, recorder.on_stage_result, recorder.on_workflow_finished, **kwargs)
+
+
+class TestTemplateCompilation:
+    """Test template to DAG compilation"""
+
+    def test_default_dependencies_are_sequential(self):
+        compiled = WorkflowExecutor.compile_template(_template({'agent': 'a'}, {'agent': 'b'}, {'agent': 'c'}))
+        assert compiled['indegree'] == [0, 1, 1]
+        assert compiled['dependents'] == [[1], [2], []]
+
+    def test_fan_out(self):
+        compiled = WorkflowExecutor.compile_template(
+            _template({'agent': 'a'}, {'agent': 'b', 'depends_on': [0]}, {'agent': 'c', 'depends_on': [0]})
+        )
+        assert compiled['dependents'][0] == [1, 2]
+
+    def test_cycle_is_rejected(self):
+        with pytest.raises(ValueError):
+            WorkflowExecutor.compile_template(
+                _template({'agent': 'a', 'depends_on': [1]}, {'agent': 'b', 'depends_on': [0]})
+            )
+
+
+class TestWorkflowExecutor:
+    """Test stage execution on the bounded pool"""
+
+    def test_independent_stages_run_in_parallel(self):
+        recorder = _Recorder()
+
+        def runner(workflow_id, stage):
+            time.sleep(0.2)
+            return {'success': True}
+
+        executor = _executor(runner, recorder, max_workers=4)
+        template = _template({'agent': 'a'}, {'agent': 'b', 'depends_on': []}, {'agent': 'c', 'depends_on': []})
+        start = time.perf_counter()
+        executor.submit('wf1', 'fan', template)
+        assert executor.wait('wf1', timeout=5)
+
+        assert time.perf_counter() - start < 0.5
+        assert recorder.finished == {'wf1': 'completed'}
+
+    def test_dependencies_are_respected(self):
+        recorder = _Recorder()
+        order = []
+        lock = threading.Lock()
+
+        def runner(workflow_id, stage):
+            with lock:
+                order.append(stage['agent'])
+            return {'success': True}
+
+        executor = _executor(runner, recorder, max_workers=4)
+        template = _template({'agent': 'a'}, {'agent': 'b', 'depends_on': [0]},
+                             {'agent': 'c', 'depends_on': [0]}, {'agent': 'd', 'depends_on': [1, 2]})
+        executor.submit('wf1', 'diamond', template)
+        assert executor.wait('wf1', timeout=5)
+
+        assert order[0] == 'a' and order[-1] == 'd'
+        assert sorted(order[1:3]) == ['b', 'c']
+
+    def test_each_stage_runs_once_under_concurrent_release(self):
+        recorder = _Recorder()
+        calls = []
+        lock = threading.Lock()
+
+        def runner(workflow_id, stage):
+            with lock:
+                calls.append((workflow_id, stage['agent']))
+            return {'success': True}
+
+        executor = _executor(runner, recorder, max_workers=8)
+        template = _template({'agent': 'a'}, {'agent': 'b', 'depends_on': [0]},
+                             {'agent': 'c', 'depends_on': [0]}, {'agent': 'd', 'depends_on': [1, 2]})
+        for i in range(200):
+            executor.submit(f"wf{i}", 'diamond', template)
+        for i in range(200):
+            assert executor.wait(f"wf{i}", timeout=5)
+
+        assert sorted(calls) == sorted((f"wf{i}", agent) for i in range(200) for agent in 'abcd')
+        assert executor.get_metrics()['workers'] <= 8
+
+    def test_priority_orders_queued_stages(self):
+        recorder = _Recorder()
+        order = []
+        gate = threading.Event()
+
+        def runner(workflow_id, stage):
+            if workflow_id == 'blocker':
+                gate.wait(5)
+            order.append(workflow_id)
+            return {'success': True}
+
+        executor = _executor(runner, recorder, max_workers=1)
+        template = _template({'agent': 'a'})
+        executor.submit('blocker', 'single', template)
+        time.sleep(0.1)
+        executor.submit('low', 'single', template, priority='low')
+        executor.submit('urgent', 'single', template, priority='urgent')
+        gate.set()
+        assert executor.wait('low', timeout=5)
+
+        assert order == ['blocker', 'urgent', 'low']
+
+    def test_failed_stage_is_retried(self):
+        recorder = _Recorder()
+        calls = []
+
+        def runner(workflow_id, stage):
+            calls.append(stage['agent'])
+            return {'success': len(calls) > 1, 'retry_recommended': True}
+
+        executor = _executor(runner, recorder, default_retries=2, retry_backoff=0.01)
+        executor.submit('wf1', 'single', _template({'agent': 'a'}))
+        assert executor.wait('wf1', timeout=5)
+
+        assert recorder.finished == {'wf1': 'completed'}
+        assert recorder.results == [('wf1', 0, True, 2)]
+        assert executor.get_metrics()['stage_retries'] == 1
+
+    def test_unmarked_failure_is_not_retried(self):
+        recorder = _Recorder()
+        calls = []
+
+        def runner(workflow_id, stage):
+            calls.append(stage['agent'])
+            return {'success': False, 'error': 'Agent a not registered'}
+
+        executor = _executor(runner, recorder, default_retries=2, retry_backoff=0.01)
+        executor.submit('wf1', 'single', _template({'agent': 'a'}))
+        assert executor.wait('wf1', timeout=5)
+
+        assert calls == ['a']
+        assert recorder.finished == {'wf1': 'failed'}
+
+    def test_timed_out_stage_is_not_rerun_while_running(self):
+        recorder = _Recorder()
+        calls = []
+
+        def runner(workflow_id, stage):
+            calls.append(stage['agent'])
+            time.sleep(0.3 if stage['agent'] == 'a' else 0)
+            return {'success': True}
+
+        executor = _executor(runner, recorder, retry_backoff=0.01)
+        template = _template({'agent': 'a', 'timeout': 0.05, 'retries': 1}, {'agent': 'b'})
+        executor.submit('wf1', 'slow', template)
+        assert executor.wait('wf1', timeout=5)
+
+        # The late success is kept instead of running the stage again
+        assert calls == ['a', 'b']
+        assert recorder.finished == {'wf1': 'completed'}
+        assert executor.get_metrics()['stage_timeouts'] == 1
+
+    def test_timeout_fails_workflow_after_retries(self):
+        recorder = _Recorder()
+        running = []
+        overlaps = []
+
+        def runner(workflow_id, stage):
+            overlaps.append(len(running))
+            running.append(stage['agent'])
+            time.sleep(0.3)
+            running.pop()
+            return {'success': False}
+
+        executor = _executor(runner, recorder, retry_backoff=0.01)
+        template = _template({'agent': 'a', 'timeout': 0.05, 'retries': 1}, {'agent': 'b'})
+        executor.submit('wf1', 'slow', template)
+        assert executor.wait('wf1', timeout=5)
+
+        assert recorder.finished == {'wf1': 'failed'}
+        assert recorder.results == [('wf1', 0, False, 2)]
+        assert executor.get_metrics()['stage_timeouts'] == 2
+        assert overlaps == [0, 0]
+
+
+class TestOrchestrationAgentExecution:
+    """Test the agent wiring around the executor"""
+
+    def test_initiate_workflow_completes_without_thread_per_workflow(self):
+        agent = WorkflowOrchestrationAgent(max_concurrent_stages=8, state_db_path=':memory:')
+        agent.simulate_agent_interaction = lambda name, action, timeout: {'success': True, 'agent': name}
+        threads_before = threading.active_count()
+
+        workflow_id = agent.initiate_workflow('manuscript_submission', {}, 'high')
+        assert agent.workflow_executor.wait(workflow_id, timeout=5)
+
+        workflow = agent.workflow_store.get(workflow_id)
+        assert workflow['status'] == 'completed'
+        assert workflow['progress_percentage'] == 100
+        assert len(workflow['stages_completed']) == 3
+        assert threading.active_count() - threads_before <= 1 + 8
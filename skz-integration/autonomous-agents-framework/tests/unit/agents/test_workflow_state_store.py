@@ -0,0 +1,100 @@
+"""
+Unit Tests for the Workflow Orchestration Agent state store
+Tests hot/cold tiering, the interaction log, restart recovery and analytics
+"""
+
+import sys
+import os
+
+# Add agents to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../../agents'))
+
+from workflow_orchestration_agent import WorkflowOrchestrationAgent, WorkflowStateStore
+
+
+def _record(store, workflow_type='review', status='initiated', start_time='2024-01-01T00:00:00'):
+    workflow_id = store.new_workflow_id(workflow_type)
+    store.add({
+        'id': workflow_id, 'type': workflow_type, 'status': status, 'priority': 'normal', 'data': {},
+        'current_stage': 0, 'total_stages': 1, 'stages_completed': [], 'stages_failed': [],
+        'start_time': start_time, 'estimated_completion': start_time, 'completion_time': None,
+        'progress_percentage': 0, 'interactions_count': 0, 'last_activity': start_time, 'issues': []
+    })
+    return workflow_id
+
+
+class TestWorkflowStateStore:
+    """Test hot/cold workflow state tiering"""
+
+    def test_ids_do_not_collide(self):
+        ids = {WorkflowStateStore.new_workflow_id('review') for _ in range(10000)}
+        assert len(ids) == 10000
+
+    def test_finished_workflows_are_evicted_to_database(self, tmp_path):
+        store = WorkflowStateStore(str(tmp_path / 'state.db'), hot_limit=2)
+        workflow_ids = [_record(store) for _ in range(5)]
+        for workflow_id in workflow_ids:
+            store.set_status(workflow_id, 'running')
+            store.finish(workflow_id, 'completed', '2024-01-01T06:00:00')
+
+        assert store.hot_size() == 2
+        assert store.get_status(workflow_ids[0]) == 'completed'
+        assert store.get(workflow_ids[0])['completion_time'] == '2024-01-01T06:00:00'
+        assert store.status_counts() == {'completed': 5}
+
+    def test_interactions_are_logged_outside_the_record(self, tmp_path):
+        store = WorkflowStateStore(str(tmp_path / 'state.db'))
+        workflow_id = _record(store)
+        for i in range(3):
+            store.append_interaction(workflow_id, {'agent': 'a', 'action': f'step_{i}',
+                                                   'timestamp': f'2024-01-01T00:0{i}:00', 'result': {'success': True}})
+
+        assert store.get(workflow_id)['interactions_count'] == 3
+        assert [e['action'] for e in store.get_interactions(workflow_id)] == ['step_0', 'step_1', 'step_2']
+
+    def test_state_survives_restart(self, tmp_path):
+        db_path = str(tmp_path / 'state.db')
+        store = WorkflowStateStore(db_path)
+        finished = _record(store)
+        store.finish(finished, 'failed', '2024-01-01T01:00:00')
+        running = _record(store)
+        store.set_status(running, 'running')
+        store.close()
+
+        restored = WorkflowStateStore(db_path)
+        assert restored.get_status(finished) == 'failed'
+        assert restored.get_status(running) == 'interrupted'
+
+    def test_default_path_is_under_data_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('WORKFLOW_DATA_DIR', str(tmp_path / 'workflows'))
+        store = WorkflowStateStore()
+        store.close()
+
+        assert store.db_path == str(tmp_path / 'workflows' / 'workflow_state.db')
+        assert os.path.exists(store.db_path)
+
+    def test_query_statistics_filters_by_start_time(self, tmp_path):
+        store = WorkflowStateStore(str(tmp_path / 'state.db'))
+        old = _record(store, start_time='2023-01-01T00:00:00')
+        store.finish(old, 'completed', '2023-01-01T10:00:00')
+        recent = _record(store, start_time='2024-06-01T00:00:00')
+        store.finish(recent, 'completed', '2024-06-01T02:00:00')
+
+        statistics = store.query_statistics(since='2024-01-01T00:00:00')
+        assert statistics['status_counts'] == {'completed': 1}
+        assert statistics['average_duration_hours'] == 2
+
+
+class TestOrchestrationAgentState:
+    """Test the agent reading workflow state from the store"""
+
+    def test_analytics_come_from_the_store(self, tmp_path):
+        agent = WorkflowOrchestrationAgent(state_db_path=str(tmp_path / 'state.db'))
+        agent.simulate_agent_interaction = lambda name, action, timeout: {'success': True, 'agent': name}
+        workflow_id = agent.initiate_workflow('manuscript_submission', {}, 'normal')
+        assert agent.workflow_executor.wait(workflow_id, timeout=5)
+
+        analytics = agent.calculate_workflow_analytics('30d')
+        assert analytics['workflow_statistics']['completed_workflows'] == 1
+        assert analytics['workflow_statistics']['success_rate'] == 1.0
+        assert agent.get_workflow_details(workflow_id)['agent_interactions_count'] == 3
@@ -0,0 +1,132 @@
+"""
+Test the chunked, resumable bulk ingest pipeline
+"""
+
+import sys
+import os
+import csv
+import json
+
+import numpy as np
+import pytest
+
+# Add src to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
+
+from services.bulk_ingest import BulkIngestor, content_hash, iter_papers
+
+
+class FakeCollection:
+    def __init__(self):
+        self.records = {}
+        self.upserts = 0
+
+    def upsert(self, ids, embeddings, documents, metadatas):
+        if len(set(ids)) != len(ids):
+            raise ValueError("Expected IDs to be unique")
+        self.upserts += 1
+        for record in zip(ids, embeddings, documents, metadatas):
+            self.records[record[0]] = record
+
+
+class FakeEncoder:
+    def __init__(self, fail_on_call=None):
+        self.calls = []
+        self.fail_on_call = fail_on_call
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True, show_progress_bar=False):
+        self.calls.append(len(texts))
+        if len(self.calls) == self.fail_on_call:
+            raise RuntimeError("encoder crashed")
+        return np.array([[float(len(text)), 1.0] for text in texts])
+
+
+def _papers(count, duplicate_every=0):
+    for i in range(count):
+        source = i - 1 if duplicate_every and i % duplicate_every == 0 and i else i
+        yield {"paper_id": f"p{i}", "title": f"Title {source}", "abstract": f"Abstract {source}",
+               "authors": ["A. Author"], "year": 2020}
+
+
+def _write_jsonl(path, papers):
+    with open(path, "w") as handle:
+        for paper in papers:
+            handle.write(json.dumps(paper) + "\n")
+
+
+class TestBulkIngestor:
+    """Test dedup, batching and checkpointed resume"""
+
+    def test_batches_and_dedup(self, tmp_path):
+        collection, encoder = FakeCollection(), FakeEncoder()
+        ingestor = BulkIngestor(collection, encoder, str(tmp_path / "state.db"), chunk_size=100)
+        report = ingestor.ingest(list(_papers(250, duplicate_every=10)))
+
+        assert report.read == 250
+        assert report.duplicates == 24
+        assert report.written == 226 == len(collection.records)
+        assert encoder.calls == [91, 90, 45]
+        assert collection.upserts == 3
+        assert report.docs_per_second > 0
+
+        metadata = collection.records["p1"][3]
+        assert metadata["authors"] == '["A. Author"]'
+        assert metadata["content_hash"] == content_hash("Title 1", "Abstract 1")
+
+    def test_resume_after_crash(self, tmp_path):
+        source = tmp_path / "papers.jsonl"
+        _write_jsonl(source, _papers(500))
+        state = str(tmp_path / "state.db")
+
+        collection = FakeCollection()
+        crashing = BulkIngestor(collection, FakeEncoder(fail_on_call=3), state, chunk_size=100)
+        with pytest.raises(RuntimeError):
+            crashing.ingest(str(source))
+        crashing.close()
+        assert len(collection.records) == 200
+
+        encoder = FakeEncoder()
+        report = BulkIngestor(collection, encoder, state, chunk_size=100).ingest(str(source))
+
+        assert report.resumed_from == 200
+        assert report.read == 300
+        assert report.written == 500 == len(collection.records)
+        assert encoder.calls == [100, 100, 100]
+
+    def test_reimport_skips_known_content(self, tmp_path):
+        state = str(tmp_path / "state.db")
+        collection = FakeCollection()
+        BulkIngestor(collection, FakeEncoder(), state).ingest(list(_papers(50)))
+
+        encoder = FakeEncoder()
+        report = BulkIngestor(collection, encoder, state).ingest(list(_papers(60)))
+
+        assert report.duplicates == 50
+        assert report.written == 10
+        assert encoder.calls == [10]
+
+    def test_repeated_paper_id_keeps_last_record(self, tmp_path):
+        collection = FakeCollection()
+        papers = [{"paper_id": "p1", "title": "Draft", "abstract": "Old"},
+                  {"paper_id": "p2", "title": "Other", "abstract": "Paper"},
+                  {"paper_id": "p1", "title": "Final", "abstract": "Revised"}]
+        report = BulkIngestor(collection, FakeEncoder(), str(tmp_path / "state.db")).ingest(papers)
+
+        assert (report.written, report.duplicates) == (2, 1)
+        assert collection.records["p1"][2] == "Final\n\nRevised"
+
+    def test_csv_source_and_invalid_rows(self, tmp_path):
+        source = tmp_path / "papers.csv"
+        with open(source, "w", newline="") as handle:
+            writer = csv.DictWriter(handle, fieldnames=["paper_id", "title", "abstract", "journal"])
+            writer.writeheader()
+            writer.writerow({"paper_id": "c1", "title": "Emulsions", "abstract": "Stability", "journal": "JCS"})
+            writer.writerow({"paper_id": "", "title": "No id", "abstract": "", "journal": "JCS"})
+            writer.writerow({"paper_id": "c2", "title": "Peptides", "abstract": "Ageing", "journal": "IJD"})
+
+        collection = FakeCollection()
+        report = BulkIngestor(collection, FakeEncoder(), str(tmp_path / "state.db")).ingest(str(source))
+
+        assert (report.written, report.invalid) == (2, 1)
+        assert collection.records["c2"][3]["journal"] == "IJD"
+        assert [paper["paper_id"] for paper in iter_papers(str(source), skip=2)] == ["c2"]
@@ -0,0 +1,225 @@
+"""
+Test bounded, rate-limited bulk delivery and pooled SMTP connections
+"""
+
+import sys
+import os
+import asyncio
+import smtplib
+import threading
+import time
+from dataclasses import replace
+
+import pytest
+
+# Add src to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
+
+from models.delivery_pipeline import DeliveryError, DeliveryPipeline, SMTPConnectionPool, TokenBucket
+from models.provider_clients import ProviderClientPool
+from models.communication_automation import (
+    CommunicationAutomation, CommunicationStatus, MessageType, Recipient
+)
+
+
+class FakeSMTP:
+    """SMTP client that records handshakes and messages"""
+
+    instances = []
+    lock = threading.Lock()
+
+    def __init__(self, host, port, timeout=None):
+        self.sent = []
+        self.logged_in = False
+        self.disconnect_next = False
+        with FakeSMTP.lock:
+            FakeSMTP.instances.append(self)
+
+    def starttls(self):
+        pass
+
+    def login(self, username, password):
+        self.logged_in = True
+
+    def sendmail(self, from_address, to_addresses, message):
+        if self.disconnect_next:
+            self.disconnect_next = False
+            raise smtplib.SMTPServerDisconnected("idle timeout")
+        self.sent.append((from_address, tuple(to_addresses)))
+
+    def quit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def reset_fake_smtp():
+    FakeSMTP.instances = []
+
+
+def _recipient(number):
+    return Recipient(
+        recipient_id=f"r{number}",
+        name=f"Reviewer {number}",
+        email=f"reviewer{number}@example.com",
+        phone=None,
+        preferred_communication=MessageType.EMAIL,
+        timezone="UTC",
+        language="en",
+        role="reviewer",
+        organization="Test University",
+        communication_preferences={}
+    )
+
+
+CONTEXT = {
+    'reviewer_name': 'Dr. Test Reviewer',
+    'manuscript_title': 'Test Manuscript',
+    'authors': 'Test Authors',
+    'journal_name': 'Test Journal',
+    'submission_date': '2024-01-15',
+    'estimated_time': '14',
+    'expertise_areas': 'testing',
+    'abstract': 'Test abstract',
+    'response_deadline': '2024-02-01',
+    'review_link': 'https://test.com/review',
+    'editorial_team': 'Test Team',
+    'reviewer_availability': 'available'
+}
+
+
+def test_smtp_pool_reuses_connections():
+    pool = SMTPConnectionPool(size=2, max_messages=4, username='user', password='secret', smtp_factory=FakeSMTP)
+
+    for number in range(10):
+        pool.send('editor@example.com', [f'author{number}@example.com'], 'body')
+
+    # Sequential sends share one connection, replaced every 4 messages
+    assert pool.messages_sent == 10
+    assert pool.connections_opened == 3
+    assert all(server.logged_in for server in FakeSMTP.instances)
+    assert [len(server.sent) for server in FakeSMTP.instances] == [4, 4, 2]
+
+
+def test_smtp_pool_retries_dropped_connection():
+    pool = SMTPConnectionPool(size=2, smtp_factory=FakeSMTP)
+    pool.send('editor@example.com', ['a@example.com'], 'body')
+    FakeSMTP.instances[0].disconnect_next = True
+
+    pool.send('editor@example.com', ['b@example.com'], 'body')
+
+    assert pool.connections_opened == 2
+    assert FakeSMTP.instances[1].sent == [('editor@example.com', ('b@example.com',))]
+
+
+def test_smtp_pool_waiter_opens_a_connection_when_one_is_discarded():
+    pool = SMTPConnectionPool(size=1, timeout=5.0, smtp_factory=FakeSMTP)
+    held = pool._checkout()
+    waiter = threading.Thread(target=pool.send, args=('editor@example.com', ['a@example.com'], 'body'))
+    waiter.start()
+    time.sleep(0.05)
+
+    started = time.monotonic()
+    pool._discard(held)
+    waiter.join(timeout=5.0)
+
+    assert not waiter.is_alive() and time.monotonic() - started < 1.0
+    assert pool.connections_opened == 2 and pool.messages_sent == 1
+
+
+def test_smtp_pool_timeout_raises_delivery_error():
+    pool = SMTPConnectionPool(size=1, timeout=0.05, smtp_factory=FakeSMTP)
+    pool._checkout()
+
+    with pytest.raises(DeliveryError):
+        pool.send('editor@example.com', ['a@example.com'], 'body')
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=50, capacity=1)
+
+    started = time.monotonic()
+    for _ in range(6):
+        await bucket.acquire()
+
+    # One token up front, then one every 20 ms
+    assert time.monotonic() - started >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_pipeline_bounds_concurrency_and_isolates_failures():
+    pipeline = DeliveryPipeline({'smtp': {'concurrency': 3}})
+    active, peak = 0, 0
+
+    async def send_batch(batch):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.005)
+        active -= 1
+        if batch[0] == 7:
+            raise RuntimeError("provider rejected batch")
+        return [True] * len(batch)
+
+    results = await pipeline.deliver('smtp', [[number] for number in range(20)], send_batch)
+    pipeline.close()
+
+    assert peak == 3
+    assert results[7] == [False]
+    assert sum(result[0] for result in results) == 19
+    assert pipeline.stats['smtp'] == {'calls': 20, 'sent': 19, 'failed': 1}
+
+
+@pytest.mark.asyncio
+async def test_bulk_messages_share_smtp_connections():
+    automation = CommunicationAutomation({
+        'smtp': {'enabled': True, 'from_address': 'editor@example.com', 'use_tls': False}
+    })
+    automation._smtp_pool = SMTPConnectionPool(use_tls=False, size=4, smtp_factory=FakeSMTP)
+
+    messages = await automation.send_bulk_messages(
+        'reviewer_invitation', [_recipient(number) for number in range(25)], CONTEXT)
+    await automation.close()
+
+    assert all(message.status == CommunicationStatus.SENT for message in messages)
+    assert len({message.message_id for message in messages}) == 25
+    assert len(FakeSMTP.instances) <= 4
+    assert sum(len(server.sent) for server in FakeSMTP.instances) == 25
+
+
+class FakeSendGrid:
+    """Records SendGrid v3 request bodies"""
+
+    def __init__(self):
+        self.requests = []
+
+    def post(self, path, json=None, data=None):
+        assert path == '/v3/mail/send'
+        self.requests.append(json)
+        return type('Response', (), {'status_code': 202, 'headers': {'X-Message-Id': 'sg-1'}})()
+
+
+@pytest.mark.asyncio
+async def test_bulk_sendgrid_groups_recipients_by_content():
+    automation = CommunicationAutomation({
+        'smtp': {'from_address': 'editor@example.com'},
+        'email_providers': {'sendgrid': {'enabled': True, 'api_key': 'test'}},
+        'delivery': {'providers': {'sendgrid': {'batch_size': 3}}}
+    })
+    sendgrid = FakeSendGrid()
+    automation.provider_clients = ProviderClientPool(factories={'sendgrid': lambda settings, pool_size: sendgrid})
+    recipients = [_recipient(number) for number in range(7)]
+    # Role-personalised content differs, so it goes in its own request
+    recipients[0] = replace(recipients[0], role='senior_editor')
+
+    messages = await automation.send_bulk_messages('reviewer_invitation', recipients, CONTEXT)
+    await automation.close()
+
+    requests = sendgrid.requests
+    assert all(message.status == CommunicationStatus.SENT for message in messages)
+    assert sorted(len(request['personalizations']) for request in requests) == [1, 3, 3]
+    tracked = [p['custom_args']['message_id'] for request in requests for p in request['personalizations']]
+    assert sorted(tracked) == sorted(message.message_id for message in messages)
@@ -0,0 +1,98 @@
+"""
+Test micro-batched, off-loop encoding in EmbeddingService
+"""
+
+import sys
+import os
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pytest
+
+# Add src to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
+
+from models.embedding_service import EmbeddingService
+
+
+class SlowModel:
+    """Encoder that blocks its thread like a real forward pass"""
+
+    def __init__(self, delay=0.02, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.batches = []
+        self.threads = set()
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True, show_progress_bar=False):
+        self.batches.append(list(texts))
+        self.threads.add(threading.get_ident())
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("encoder crashed")
+        return np.array([[float(len(text)), 1.0] for text in texts])
+
+
+class TestEmbeddingService:
+    """Test coalescing, off-loop execution, errors and metrics"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_are_coalesced(self):
+        model = SlowModel()
+        service = EmbeddingService(model, max_batch_size=64, max_wait_ms=5)
+        texts = [f"query {'x' * i}" for i in range(50)]
+
+        embeddings = await asyncio.gather(*(service.encode(text) for text in texts))
+
+        assert [embedding[0] for embedding in embeddings] == [float(len(text)) for text in texts]
+        assert len(model.batches) == 1
+        assert threading.get_ident() not in model.threads
+        metrics = service.metrics()
+        assert metrics['batches'] == 1 and metrics['encoded'] == 50 and metrics['mean_batch_size'] == 50
+        assert metrics['queue_depth'] == 0 and metrics['in_flight_batches'] == 0
+        service.close()
+
+    @pytest.mark.asyncio
+    async def test_batches_are_capped_and_grow_while_busy(self):
+        model = SlowModel(delay=0.05)
+        service = EmbeddingService(model, max_batch_size=16, max_wait_ms=1)
+
+        first = service.encode("first")
+        await asyncio.sleep(0.01)
+        # Arrive while the worker is busy with the first batch
+        rest = [service.encode(f"text {i}") for i in range(40)]
+        assert service.queue_depth == 40
+
+        await asyncio.gather(first, *rest)
+        assert [len(batch) for batch in model.batches] == [1, 16, 16, 8]
+        assert service.metrics()['largest_batch_size'] == 16
+        service.close()
+
+    @pytest.mark.asyncio
+    async def test_event_loop_keeps_running_during_encode(self):
+        service = EmbeddingService(SlowModel(delay=0.2), max_wait_ms=1)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        await service.encode("slow")
+        task.cancel()
+        assert ticks >= 10
+        service.close()
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_caller(self):
+        service = EmbeddingService(SlowModel(delay=0, fail=True), max_wait_ms=1)
+
+        results = await asyncio.gather(service.encode("a"), service.encode("b"), return_exceptions=True)
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert service.metrics()['failed_batches'] == 1
+        service.close()
@@ -0,0 +1,128 @@
+"""
+Test due-time escalation scheduling in CommunicationAutomation
+"""
+
+import sys
+import os
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+# Add src to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
+
+from models.escalation_scheduler import EscalationScheduler
+from models.communication_automation import (
+    CommunicationAutomation, CommunicationMessage, CommunicationStatus, EscalationRule,
+    MessagePriority, MessageType, Recipient
+)
+
+
+def test_scheduler_pops_only_due_entries_in_order():
+    scheduler = EscalationScheduler()
+    scheduler.schedule('m1', 'r1', 30.0)
+    scheduler.schedule('m2', 'r1', 10.0)
+    scheduler.schedule('m3', 'r1', 20.0)
+    scheduler.schedule('m2', 'r2', 50.0)
+
+    assert scheduler.pop_due(25.0) == [('m2', 'r1'), ('m3', 'r1')]
+    assert scheduler.pending('m2') and not scheduler.pending('m3')
+    assert scheduler.next_due() == 30.0
+    assert len(scheduler) == 2
+
+
+def test_scheduler_cancel_and_reschedule():
+    scheduler = EscalationScheduler()
+    for number in range(200):
+        scheduler.schedule(f"m{number}", 'r1', float(number))
+        scheduler.schedule(f"m{number}", 'r2', float(number))
+    scheduler.schedule('m5', 'r1', 1000.0)
+
+    assert scheduler.cancel('m7') == 2
+    assert sum(scheduler.cancel(f"m{number}", 'r2') for number in range(200)) == 199
+    # Dead entries are compacted away once they dominate the heap
+    assert len(scheduler._heap) < 400
+
+    due = scheduler.pop_due(999.0)
+    assert ('m5', 'r1') not in due and ('m7', 'r1') not in due
+    assert len(due) == 198
+    assert scheduler.pop_due(1000.0) == [('m5', 'r1')]
+    assert len(scheduler) == 0 and scheduler.next_due() is None
+
+
+def _message(number, sent_time):
+    recipient = Recipient(
+        recipient_id=f"r{number}", name=f"Reviewer {number}", email=f"r{number}@example.com", phone=None,
+        preferred_communication=MessageType.EMAIL, timezone="UTC", language="en", role="reviewer",
+        organization="Test University", communication_preferences={}
+    )
+    return CommunicationMessage(
+        message_id=f"msg_{number}", template_id='reviewer_invitation', recipient=recipient,
+        sender_agent='review_coordination_agent', subject='Invitation', body='Body',
+        message_type=MessageType.EMAIL, priority=MessagePriority.MEDIUM, scheduled_time=sent_time.isoformat(),
+        sent_time=sent_time.isoformat(), status=CommunicationStatus.SENT, context_data={}, attachments=[],
+        tracking_data={}
+    )
+
+
+@pytest.fixture
+def automation(tmp_path):
+    automation = CommunicationAutomation({
+        'message_retention_minutes': 10,
+        'message_archive_path': str(tmp_path / 'archive.jsonl')
+    })
+    escalated = []
+
+    async def perform_escalation(message, rule):
+        escalated.append((message.message_id, rule.rule_id))
+        message.tracking_data['escalation_count'] = message.tracking_data.get('escalation_count', 0) + 1
+
+    automation._perform_escalation = perform_escalation
+    automation.escalated = escalated
+    return automation
+
+
+@pytest.mark.asyncio
+async def test_escalations_fire_when_due_and_stop_on_response(automation):
+    sent = datetime(2024, 1, 15, 9, 0)
+    await automation.setup_escalation_rule(EscalationRule(
+        rule_id='no_reply', trigger_condition='no_response', escalation_delay=60,
+        escalation_recipients=['editor'], escalation_template='quality_issue_alert', max_escalations=2,
+        escalation_agent='review_coordination_agent'
+    ))
+    for number in range(3):
+        automation._record_message(_message(number, sent + timedelta(minutes=number * 30)))
+
+    await automation.check_escalations(sent + timedelta(minutes=59))
+    assert automation.escalated == []
+
+    await automation.check_escalations(sent + timedelta(minutes=90))
+    assert automation.escalated == [('msg_0', 'no_reply'), ('msg_1', 'no_reply')]
+
+    assert await automation.record_response('msg_1')
+    await automation.check_escalations(sent + timedelta(minutes=160))
+    assert automation.escalated[2:] == [('msg_2', 'no_reply'), ('msg_0', 'no_reply')]
+
+    # msg_0 reached max_escalations, so nothing more is scheduled for it
+    assert not automation.escalations.pending('msg_0', 'no_reply')
+    assert automation.escalations.pending('msg_2', 'no_reply')
+
+
+@pytest.mark.asyncio
+async def test_settled_messages_are_archived(automation):
+    now = datetime.now()
+    automation._record_message(_message(1, now))
+    automation._record_message(_message(2, now))
+    await automation.record_response('msg_2')
+
+    await automation.check_escalations(now + timedelta(minutes=5))
+    assert set(automation.sent_messages) == {'msg_1', 'msg_2'}
+
+    await automation.check_escalations(now + timedelta(minutes=11))
+    assert automation.sent_messages == {}
+    assert automation.archived_messages == 2
+    with open(automation.message_archive_path) as archive:
+        records = [json.loads(line) for line in archive]
+    assert [record['message_id'] for record in records] == ['msg_1', 'msg_2']
+    assert records[1]['status'] == 'sent' and 'responded_at' in records[1]['tracking_data']
@@ -0,0 +1,171 @@
+"""
+Test the CSR knowledge graph store and its traversal queries
+"""
+
+import sys
+import os
+import hashlib
+
+import numpy as np
+import pytest
+
+# Add src to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
+
+from models.knowledge_graph_store import KnowledgeGraphStore
+
+
+@pytest.fixture
+def graph():
+    graph = KnowledgeGraphStore(compact_threshold=1000)
+    for author in ("alice", "bob", "carol"):
+        graph.add_node(author, "author")
+    for paper in ("p1", "p2", "p3", "p4"):
+        graph.add_node(paper, "document", {"title": paper.upper()})
+    graph.add_edges([
+        ("alice", "p1", "authored"), ("bob", "p1", "authored"), ("bob", "p2", "authored"),
+        ("carol", "p3", "authored"), ("p2", "p1", "cites"), ("p3", "p2", "cites"), ("p4", "p3", "cites", 5.0),
+        ("p1", "emulsion", "contains_keyword"), ("p3", "emulsion", "contains_keyword"),
+    ])
+    return graph
+
+
+class TestKnowledgeGraphStore:
+    """Test traversal, ranking, compaction and persistence"""
+
+    def test_k_hop_neighbourhood(self, graph):
+        assert graph.k_hop(["alice"], hops=1) == {"alice": 0, "p1": 1}
+        two_hops = graph.k_hop(["alice"], hops=2)
+        assert two_hops["bob"] == 2 and two_hops["emulsion"] == 2 and "carol" not in two_hops
+        assert set(graph.k_hop(["alice"], hops=4, node_types=["author"])) == {"alice", "bob", "carol"}
+        citations = graph.k_hop(["p4"], hops=3, direction="out", edge_types=["cites"])
+        assert citations == {"p4": 0, "p3": 1, "p2": 2, "p1": 3}
+        assert graph.neighbors("p1", direction="in", edge_types=["authored"]) == ["alice", "bob"]
+
+    def test_shortest_paths(self, graph):
+        path = graph.shortest_path("alice", "carol")
+        assert len(path) == 5 and path[:2] == ["alice", "p1"] and path[-2:] == ["p3", "carol"]
+        assert graph.shortest_path("p4", "p1", direction="out") == ["p4", "p3", "p2", "p1"]
+        assert graph.shortest_path("p1", "p4", direction="out") is None
+        assert graph.shortest_path("alice", "carol", max_depth=2) is None
+        # Weighted paths add up edge weights, so the heavy p4 -> p3 edge costs 5
+        graph.add_edge("p4", "p1", "cites", 2.0)
+        assert graph.shortest_path("p4", "emulsion") == ["p4", "p1", "emulsion"]
+        assert graph.shortest_path("p4", "p3", weighted=True, edge_types=["cites"]) == ["p4", "p1", "p2", "p3"]
+
+    def test_pagerank_matches_dense_power_iteration(self, graph):
+        scores = graph.pagerank(damping=0.85)
+        dense = graph.adjacency_matrix().toarray()
+        out_weight = dense.sum(axis=1)
+        transition = np.divide(dense, out_weight[:, None], out=np.zeros_like(dense), where=out_weight[:, None] > 0)
+        count = len(graph)
+        expected = np.full(count, 1 / count)
+        for _ in range(200):
+            expected = 0.85 * (expected @ transition + expected[out_weight == 0].sum() / count) + 0.15 / count
+
+        assert scores.sum() == pytest.approx(1.0)
+        np.testing.assert_allclose(scores, expected, atol=1e-6)
+        assert graph.top_nodes(scores, limit=1, node_types=["document"])[0][0] == "p1"
+
+        personalised = graph.pagerank(personalization={"carol": 1.0}, direction="both")
+        assert personalised[graph.node_index["p3"]] > personalised[graph.node_index["alice"]]
+
+    def test_compaction_and_memory_mapped_reload(self, graph, tmp_path):
+        before = graph.k_hop(["carol"], hops=4)
+        graph.save(str(tmp_path / "graph"))
+        assert graph.statistics()["pending_edges"] == 0
+
+        reloaded = KnowledgeGraphStore(str(tmp_path / "graph"))
+        assert isinstance(reloaded._out.indices, np.memmap)
+        assert reloaded.k_hop(["carol"], hops=4) == before
+        assert reloaded.node("p2") == {"id": "p2", "type": "document", "title": "P2"}
+
+        # New edges are visible before the next compaction
+        reloaded.add_edge("dave", "p4", "authored")
+        assert reloaded.shortest_path("dave", "alice") == ["dave", "p4", "p3", "p2", "p1", "alice"]
+        assert reloaded.edge_count == 10
+        assert reloaded.statistics()["nodes_by_type"] == {"untyped": 2, "author": 3, "document": 4}
+
+    def test_interrupted_save_keeps_a_whole_generation(self, graph, tmp_path, monkeypatch):
+        path = str(tmp_path / "graph")
+        graph.save(path)
+        graph.add_edge("dave", "p4", "authored")
+
+        replace = os.replace
+        def crash_after_moving_aside(source, target):
+            replace(source, target)
+            if target.endswith(".previous"):
+                raise OSError("crashed mid-save")
+        monkeypatch.setattr(os, "replace", crash_after_moving_aside)
+        with pytest.raises(OSError):
+            graph.save()
+        monkeypatch.setattr(os, "replace", replace)
+
+        restored = KnowledgeGraphStore(path)
+        assert restored.edge_count == 9 and not restored.has_node("dave")
+        assert sorted(os.listdir(tmp_path)) == ["graph", "graph.saving"]
+
+        graph.save()
+        assert KnowledgeGraphStore(path).edge_count == 10
+        assert sorted(os.listdir(tmp_path)) == ["graph"]
+
+    def test_threshold_compacts_automatically(self):
+        graph = KnowledgeGraphStore(compact_threshold=50)
+        graph.add_edges((f"n{i}", f"n{i + 1}") for i in range(120))
+        assert graph.statistics()["pending_edges"] == 0
+        graph.add_edges((f"n{i}", "hub") for i in range(10))
+        assert graph.statistics()["pending_edges"] == 10
+        assert graph.degree("hub") == 10
+        assert len(graph.shortest_path("n0", "n120", direction="out")) == 121
+
+
+class TestResearchGraph:
+    """Test ResearchVectorDB building on the store"""
+
+    @pytest.mark.asyncio
+    async def test_build_knowledge_graph_is_incremental(self):
+        from models.research_vector_db import ResearchDocument, ResearchVectorDB
+
+        vector_db = ResearchVectorDB({}, model=object(), collection=object())
+        documents = [
+            ResearchDocument(
+                doc_id=f"d{i}", title=f"Paper {i}", abstract="", authors=["A. Shared", f"B. Author {i}"],
+                keywords=["emulsion"], doi="", publication_date="2024-01-01", journal="JCS", citation_count=0,
+                full_text="", document_type="research_article", research_areas=[], methodology="",
+                findings=[], significance_score=0.5, novelty_score=0.5
+            )
+            for i in range(3)
+        ]
+
+        first = await vector_db.build_knowledge_graph(documents)
+        again = await vector_db.build_knowledge_graph(documents[:1])
+
+        assert first['statistics']['total_edges'] == 9
+        assert vector_db.graph.edge_count == 9
+        assert again['statistics']['graph']['total_edges'] == 9
+        scores = dict(first['important_nodes'])
+        shared, single = (f"author_{hashlib.md5(name.encode()).hexdigest()[:8]}" for name in ("A. Shared", "B. Author 0"))
+        assert scores[shared] > scores[single]
+
+    @pytest.mark.asyncio
+    async def test_persist_restores_graph_on_restart(self, tmp_path):
+        from models.research_vector_db import ResearchDocument, ResearchVectorDB
+
+        config = {'graph_path': str(tmp_path / 'graph')}
+        vector_db = ResearchVectorDB(config, model=object(), collection=object())
+        documents = [
+            ResearchDocument(
+                doc_id=f"d{i}", title=f"Paper {i}", abstract="", authors=["A. Shared"], keywords=["emulsion"],
+                doi="", publication_date="2024-01-01", journal="JCS", citation_count=0, full_text="",
+                document_type="research_article", research_areas=[], methodology="", findings=[],
+                significance_score=0.5, novelty_score=0.5
+            )
+            for i in range(2)
+        ]
+        await vector_db.build_knowledge_graph(documents)
+        assert vector_db.close()
+
+        restarted = ResearchVectorDB(config, model=object(), collection=object())
+        assert restarted.graph.edge_count == vector_db.graph.edge_count
+        assert restarted.graph.has_node("d1")
+        restarted.close()
@@ -0,0 +1,71 @@
+"""
+Test streaming clustering and anomaly detection in UnsupervisedLearner
+"""
+
+import sys
+import os
+import random
+
+# Add src to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
+
+from models.learning_framework import UnsupervisedLearner
+
+
+def _experiences(n, outlier_every=None, seed=7):
+    rng = random.Random(seed)
+    for i in range(n):
+        if outlier_every and i % outlier_every == 0:
+            yield {'unexpected_field': 'corrupted', 'latency_ms': 1e9}
+        else:
+            yield {'score': rng.random(), 'area': rng.choice(['dermatology', 'chemistry']), 'reviews': rng.randint(1, 4)}
+
+
+class TestUnsupervisedLearnerClustering:
+    """Test mini-batch k-means clustering"""
+
+    def test_discover_patterns_returns_indices_not_copies(self):
+        learner = UnsupervisedLearner("agent_001", n_clusters=4, batch_size=100)
+        points = list(_experiences(1000))
+        patterns = learner.discover_patterns(points)
+
+        assert sum(p['frequency'] for p in patterns) <= 1000
+        for pattern in patterns:
+            assert 'all_points' not in pattern
+            assert len(pattern['point_indices']) == pattern['frequency']
+            assert points[pattern['representative_index']] is pattern['representative_point']
+
+    def test_discover_patterns_accepts_iterators(self):
+        learner = UnsupervisedLearner("agent_001", n_clusters=4, batch_size=256)
+        patterns = learner.discover_patterns(_experiences(5000))
+
+        assert learner.points_seen == 5000
+        assert sum(p['frequency'] for p in patterns) <= 5000
+
+    def test_observe_fits_in_mini_batches(self):
+        learner = UnsupervisedLearner("agent_001", n_clusters=2, batch_size=10)
+        for point in _experiences(25):
+            learner.observe(point)
+
+        assert learner.points_seen == 20
+        learner.flush()
+        assert learner.points_seen == 25
+        assert sum(c['size'] for c in learner.get_cluster_summary()) == 25
+
+
+class TestUnsupervisedLearnerAnomalies:
+    """Test centroid-distance anomaly scoring"""
+
+    def test_rare_outliers_are_flagged(self):
+        learner = UnsupervisedLearner("agent_001", n_clusters=4, batch_size=500)
+        learner.discover_patterns(_experiences(5000))
+
+        anomalies = learner.find_anomalies(_experiences(1000, outlier_every=200, seed=11), update=False)
+        flagged = {a['index'] for a in anomalies}
+
+        assert {0, 200, 400, 600, 800} <= flagged
+        assert len(flagged) < 50
+
+    def test_too_few_points(self):
+        learner = UnsupervisedLearner("agent_001")
+        assert learner.find_anomalies([{'a': 1}, {'a': 2}]) == []
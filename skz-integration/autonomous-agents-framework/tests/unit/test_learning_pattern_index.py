@@ -0,0 +1,86 @@
+"""
+Test the vector pattern index behind SupervisedLearner.find_similar_patterns
+"""
+
+import sys
+import os
+import pickle
+
+import numpy as np
+
+# Add src to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
+
+from models.learning_framework import LearningFramework, PatternIndex, SupervisedLearner
+
+
+class TestPatternIndex:
+    """Test feature encoding and nearest-pattern lookup"""
+
+    def test_encoded_vectors_are_unit_length(self):
+        index = PatternIndex(dimensions=64)
+        vector = index.encode({'score': 0.85, 'field': 'Dermatology', 'pages': 12})
+
+        assert vector.shape == (64,)
+        assert np.isclose(np.linalg.norm(vector), 1.0, atol=1e-5)
+
+    def test_top_k_prefers_matching_inputs(self):
+        index = PatternIndex(dimensions=128)
+        index.add({'input': {'field': 'dermatology', 'score': 0.9}, 'output': {}, 'success': True})
+        index.add({'input': {'author_count': 3, 'venue': 'x'}, 'output': {}, 'success': True})
+
+        rows = index.top_k({'field': 'Dermatology', 'score': 0.8}, 1)
+        assert rows[0][0] == 0
+
+    def test_large_numerics_stay_distinguishable(self):
+        index = PatternIndex(dimensions=64)
+        for count in (40, 900, 25000):
+            index.add({'input': {'venue': 'x', 'citations': count}, 'output': {}, 'success': True})
+
+        assert index.top_k({'venue': 'x', 'citations': 1000}, 1)[0][0] == 1
+        assert index.top_k({'venue': 'x', 'citations': 30000}, 1)[0][0] == 2
+        # Growing the scale re-encodes earlier rows to match fresh encodings
+        assert np.allclose(index._vectors[0], index.encode({'venue': 'x', 'citations': 40}))
+
+    def test_ring_buffer_evicts_oldest(self):
+        index = PatternIndex(dimensions=16, max_patterns=4, initial_capacity=1)
+        for i in range(6):
+            index.add({'input': {'i': i}, 'output': {}, 'success': True})
+
+        assert len(index) == 4
+        assert [r['input']['i'] for r in index.records()] == [2, 3, 4, 5]
+
+
+class TestSupervisedLearnerIndex:
+    """Test SupervisedLearner on top of the pattern index"""
+
+    def test_history_is_not_truncated_to_fifty(self):
+        learner = SupervisedLearner("agent_001")
+        for i in range(250):
+            learner.learn_pattern('review', {'manuscript': i}, {'ok': True}, True)
+
+        assert len(learner.export_patterns()['review']) == 250
+
+    def test_rerank_keeps_exact_similarity(self):
+        learner = SupervisedLearner("agent_001", candidate_pool=10)
+        for i in range(500):
+            learner.learn_pattern('review', {'field': f'topic_{i}', 'score': i}, {'id': i}, True)
+
+        query = {'field': 'topic_42', 'score': 42}
+        results = learner.find_similar_patterns(query, 'review', threshold=0.0)
+
+        assert results[0]['output'] == {'id': 42}
+        assert results[0]['similarity'] == learner._calculate_similarity(query, results[0]['input'])
+
+    def test_learning_state_round_trip(self, tmp_path):
+        framework = LearningFramework(agent_id="agent_001", db_path=":memory:")
+        framework.supervised_learner.learn_pattern('general', {'a': 1}, {'b': 2}, True)
+        state_file = str(tmp_path / "state.pkl")
+        framework.save_learning_state(state_file)
+
+        restored = LearningFramework(agent_id="agent_001", db_path=":memory:")
+        restored.load_learning_state(state_file)
+
+        with open(state_file, 'rb') as f:
+            assert 'general' in pickle.load(f)['supervised_learner']
+        assert restored.supervised_learner.find_similar_patterns({'a': 1}, 'general')[0]['output'] == {'b': 2}
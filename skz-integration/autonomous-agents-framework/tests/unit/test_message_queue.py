@@ -0,0 +1,128 @@
+"""
+Test the acknowledged, batched MessageQueue worker against the local Redis stand-in
+"""
+
+import sys
+import os
+import json
+import threading
+import time
+
+# Add src to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
+
+from services.communication_automation import MessageQueue, QueueWorker
+from services.local_redis import LocalRedis
+
+
+class RecordingEmail:
+    def __init__(self, fail_to=None, delay=0.0):
+        self.batches = []
+        self.fail_to = fail_to
+        self.delay = delay
+        self.threads = set()
+        self.lock = threading.Lock()
+
+    def send_batch(self, items):
+        time.sleep(self.delay)
+        with self.lock:
+            self.batches.append([item["to"] for item in items])
+            self.threads.add(threading.current_thread().name)
+        return [{"status": "error", "message": "rejected"} if item["to"] == self.fail_to else {"status": "sent"}
+                for item in items]
+
+
+class RecordingSMS:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, to_number, body):
+        self.sent.append(to_number)
+        return {"status": "sent"}
+
+
+def _email(number):
+    return {"to": f"user{number}@example.com", "subject": "Hello", "template_or_body": "Body"}
+
+
+def test_batches_follow_priority_lanes():
+    queue = MessageQueue(client=LocalRedis())
+    queue.enqueue_many("email", [_email(number) for number in range(3)], priority="low")
+    queue.enqueue_many("email", [_email(number) for number in range(3, 6)])
+    queue.enqueue("email", _email(6), priority="high")
+    queue.enqueue("sms", {"to": "+15550000", "body": "Hi"}, priority="high")
+    email, sms = RecordingEmail(), RecordingSMS()
+
+    first = queue.process_batch(email, sms, batch_size=4)
+    second = queue.process_batch(email, sms, batch_size=4)
+
+    assert [data["to"] for data in first] == ["user6@example.com", "user3@example.com", "user4@example.com",
+                                              "+15550000"]
+    assert email.batches == [["user6@example.com", "user3@example.com", "user4@example.com"],
+                             ["user5@example.com", "user0@example.com", "user1@example.com", "user2@example.com"]]
+    assert len(second) == 4
+    assert sum(queue.depth().values()) == 0
+
+
+def test_unacknowledged_items_are_recovered_in_order():
+    client = LocalRedis()
+    queue = MessageQueue(client=client)
+    queue.enqueue_many("email", [_email(number) for number in range(5)])
+
+    # A consumer takes three items and dies before acknowledging them
+    taken = queue.fetch("crashed", batch_size=3)
+    assert len(taken) == 3 and client.llen("comm:email") == 2
+
+    assert queue.recover() == 3
+    assert [json.loads(raw)["to"] for raw in client.lrange("comm:email", 0, -1)] == \
+        [f"user{number}@example.com" for number in range(5)]
+
+    # A live consumer keeps its in-flight items
+    queue.heartbeat("live")
+    queue.fetch("live", batch_size=2)
+    assert queue.recover() == 0
+    assert queue.recover("live") == 2
+
+
+def test_failed_deliveries_are_acknowledged_and_recorded():
+    client = LocalRedis()
+    queue = MessageQueue(client=client)
+    queue.enqueue_many("email", [_email(number) for number in range(3)])
+    client.rpush("comm:email", b"not json")
+
+    processed = queue.process_batch(RecordingEmail(fail_to="user1@example.com"), RecordingSMS())
+
+    assert len(processed) == 4
+    failed = [json.loads(raw) for raw in client.lrange("comm:failed", 0, -1)]
+    assert [data.get("to", data.get("raw")) for data in failed] == ["not json", "user1@example.com"]
+    assert list(client.scan_iter(match="comm:processing:*")) == []
+
+
+def test_concurrent_consumers_deliver_each_item_once():
+    queue = MessageQueue(client=LocalRedis())
+    email = RecordingEmail(delay=0.002)
+    worker = QueueWorker(queue, email, RecordingSMS(), consumers=4, batch_size=10, block_timeout=0.05)
+    worker.start()
+
+    for start in range(0, 300, 30):
+        queue.enqueue_many("email", [_email(number) for number in range(start, start + 30)])
+    deadline = time.monotonic() + 5
+    while worker.processed < 300 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    worker.stop(timeout=2)
+
+    delivered = [to for batch in email.batches for to in batch]
+    assert sorted(delivered) == sorted(f"user{number}@example.com" for number in range(300))
+    assert len(email.threads) > 1
+    assert worker.failed == 0
+
+
+def test_process_once_keeps_single_item_contract():
+    queue = MessageQueue(client=LocalRedis())
+    queue.enqueue("sms", {"to": "+15550001", "body": "Hi"})
+    sms = RecordingSMS()
+
+    data = queue.process_once(RecordingEmail(), sms)
+
+    assert data["to"] == "+15550001" and data["result"] == {"status": "sent"}
+    assert queue.process_once(RecordingEmail(), sms) is None
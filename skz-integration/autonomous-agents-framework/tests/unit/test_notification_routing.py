@@ -0,0 +1,101 @@
+"""
+Test indexed notification routing, batched recipient lookup and sliding-window limits
+"""
+
+import sys
+import os
+import asyncio
+
+import pytest
+
+# Add src to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
+
+from models.communication_automation import (
+    CommunicationAutomation, CommunicationStatus, CommunicationTemplate, MessageType, NotificationConfig, Recipient
+)
+
+
+def _recipient(recipient_id):
+    return Recipient(
+        recipient_id=recipient_id, name=recipient_id.title(), email=f"{recipient_id}@example.com", phone=None,
+        preferred_communication=MessageType.INTERNAL, timezone="UTC", language="en", role="editor",
+        organization="Journal", communication_preferences={}
+    )
+
+
+def _config(config_id, agent_id, event_types, recipients, limit=None, enabled=True):
+    return NotificationConfig(
+        config_id=config_id, agent_id=agent_id, event_types=event_types, recipients=recipients,
+        templates={event_type: 'internal_alert' for event_type in event_types},
+        frequency_limits={event_type: limit for event_type in event_types} if limit else {},
+        quiet_hours={'enabled': False}, enabled=enabled
+    )
+
+
+@pytest.fixture
+def automation():
+    automation = CommunicationAutomation({'notification_window_minutes': 0.001})
+    automation.templates['internal_alert'] = CommunicationTemplate(
+        template_id='internal_alert', name='Internal Alert', subject_template='{{event}} from {{agent}}',
+        body_template='{{event}} needs attention', message_type=MessageType.INTERNAL, agent_id='system',
+        scenario='alert', variables=['event', 'agent'], personalization_rules={}, send_conditions={},
+        follow_up_rules={}
+    )
+    automation.lookups = []
+    original_lookup = automation._get_recipient_by_id
+
+    async def counting_lookup(recipient_id):
+        automation.lookups.append(recipient_id)
+        return await original_lookup(recipient_id)
+
+    automation._get_recipient_by_id = counting_lookup
+    return automation
+
+
+@pytest.mark.asyncio
+async def test_events_route_only_to_matching_configs(automation):
+    automation.register_recipients([_recipient('alice'), _recipient('bob')])
+    await automation.setup_automated_notifications(_config('c1', 'quality', ['issue'], ['alice', 'bob']))
+    await automation.setup_automated_notifications(_config('c2', 'quality', ['issue', 'passed'], ['alice', 'carol']))
+    await automation.setup_automated_notifications(_config('c3', 'review', ['issue'], ['bob']))
+    await automation.setup_automated_notifications(_config('c4', 'quality', ['issue'], ['bob'], enabled=False))
+
+    messages = await automation.trigger_notification('quality', 'issue', {'event': 'issue', 'agent': 'quality'})
+
+    assert sorted(message.recipient.recipient_id for message in messages) == ['alice', 'alice', 'bob', 'carol']
+    assert all(message.status == CommunicationStatus.SENT for message in messages)
+    # Only carol was not registered, and she is looked up once for both configs
+    assert automation.lookups == ['carol']
+
+    assert await automation.remove_automated_notifications('c2')
+    messages = await automation.trigger_notification('quality', 'issue', {'event': 'issue', 'agent': 'quality'})
+    assert sorted(message.recipient.recipient_id for message in messages) == ['alice', 'bob']
+    assert await automation.trigger_notification('quality', 'unknown', {}) == []
+
+
+@pytest.mark.asyncio
+async def test_frequency_limit_uses_sliding_window(automation):
+    automation.register_recipients([_recipient('alice')])
+    await automation.setup_automated_notifications(_config('c1', 'quality', ['issue'], ['alice'], limit=2))
+    context = {'event': 'issue', 'agent': 'quality'}
+
+    sent = [len(await automation.trigger_notification('quality', 'issue', context)) for _ in range(3)]
+    assert sent == [1, 1, 0]
+
+    # The 0.06 s window slides past the first two notifications
+    await asyncio.sleep(0.07)
+    assert len(await automation.trigger_notification('quality', 'issue', context)) == 1
+
+
+@pytest.mark.asyncio
+async def test_edited_config_is_rerouted_after_rebuild(automation):
+    config = _config('c1', 'quality', ['issue'], ['alice'])
+    await automation.setup_automated_notifications(config)
+
+    config.event_types.append('passed')
+    config.templates['passed'] = 'internal_alert'
+    automation.rebuild_notification_routes()
+
+    messages = await automation.trigger_notification('quality', 'passed', {'event': 'passed', 'agent': 'quality'})
+    assert [message.recipient.recipient_id for message in messages] == ['alice']
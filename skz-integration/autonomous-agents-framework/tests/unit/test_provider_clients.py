@@ -0,0 +1,224 @@
+"""
+Test pooled provider clients, provider health ordering and email/SMS failover
+"""
+
+import sys
+import os
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import pytest
+
+# Add src to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
+
+from models.provider_clients import ProviderClientPool, ProviderHealth
+from models.communication_automation import (
+    CommunicationAutomation, CommunicationStatus, CommunicationTemplate, MessageType, Recipient
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeSendGrid:
+    def __init__(self, status_code=202):
+        self.status_code = status_code
+        self.requests = []
+
+    def post(self, path, json=None, data=None):
+        self.requests.append(json)
+        return type('Response', (), {'status_code': self.status_code, 'headers': {'X-Message-Id': 'sg-1'}})()
+
+
+class FakeSES:
+    def __init__(self):
+        self.sent = []
+
+    def send_email(self, Source, Destination, Message):
+        self.sent.extend(Destination['ToAddresses'])
+        return {'MessageId': f"ses-{len(self.sent)}"}
+
+
+class TwilioHandler(BaseHTTPRequestHandler):
+    """Twilio Messages endpoint that records form posts and connections"""
+
+    protocol_version = 'HTTP/1.1'
+    connections = []
+    messages = []
+
+    def setup(self):
+        super().setup()
+        TwilioHandler.connections.append(self.client_address)
+
+    def do_POST(self):
+        form = parse_qs(self.rfile.read(int(self.headers['Content-Length'])).decode())
+        TwilioHandler.messages.append((self.path, form['To'][0], form['Body'][0]))
+        body = json.dumps({'sid': f"SM{len(TwilioHandler.messages)}"}).encode()
+        self.send_response(201)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _recipient(number):
+    return Recipient(
+        recipient_id=f"user_{number}", name=f"User {number}", email=f"user{number}@example.com",
+        phone=f"+1555000{number:04d}", preferred_communication=MessageType.EMAIL,
+        timezone="UTC", language="en", role="reviewer", organization="University", communication_preferences={}
+    )
+
+
+CONTEXT = {
+    'manuscript_title': 'On Testing', 'journal_name': 'Journal', 'deadline': '2024-01-01',
+    'manuscript_abstract': 'Abstract', 'keywords': 'testing', 'review_link': 'https://example.com/review',
+    'editor_name': 'Editor', 'reviewer_availability': 'available'
+}
+
+
+def test_health_orders_by_latency_and_skips_failing_providers():
+    clock = FakeClock()
+    health = ProviderHealth(failure_threshold=2, cooldown=10, clock=clock)
+
+    # Untried providers keep their configured order behind measured ones
+    assert health.order(['sendgrid', 'ses', 'smtp']) == ['sendgrid', 'ses', 'smtp']
+    health.record('ses', True, 0.05)
+    assert health.order(['sendgrid', 'ses', 'smtp']) == ['ses', 'sendgrid', 'smtp']
+    health.record('sendgrid', True, 0.02)
+    assert health.order(['sendgrid', 'ses', 'smtp']) == ['sendgrid', 'ses', 'smtp']
+
+    health.record('sendgrid', False, 0.02)
+    health.record('sendgrid', False, 0.02)
+    assert health.order(['sendgrid', 'ses', 'smtp']) == ['ses', 'smtp', 'sendgrid']
+    assert health.snapshot()['sendgrid']['error_rate'] == pytest.approx(2 / 3)
+
+    # After the cooldown it is tried again, but still ranks on its error rate
+    clock.now = 11
+    assert health.available('sendgrid')
+    assert health.order(['sendgrid', 'ses']) == ['ses', 'sendgrid']
+
+
+def test_demoted_providers_are_probed_periodically():
+    clock = FakeClock()
+    health = ProviderHealth(window=1, probe_interval=60, clock=clock)
+    health.record('ses', True, 0.5)
+    health.record('sendgrid', True, 0.01)
+    assert health.order(['sendgrid', 'ses']) == ['sendgrid', 'ses']
+
+    clock.now = 61
+    health.record('sendgrid', True, 0.01)
+    # One call probes SES; the rest keep going to SendGrid until the next interval
+    assert health.order(['sendgrid', 'ses']) == ['ses', 'sendgrid']
+    assert health.order(['sendgrid', 'ses']) == ['sendgrid', 'ses']
+    health.record('ses', True, 0.001)
+    assert health.order(['sendgrid', 'ses']) == ['ses', 'sendgrid']
+
+    assert ProviderHealth(probe_interval=None, clock=clock)._due_probe(['ses']) is None
+
+
+def test_pool_reuses_clients_per_settings():
+    created = []
+    pool = ProviderClientPool(factories={'sendgrid': lambda settings, pool_size: created.append(settings) or object()})
+
+    first = pool.get('sendgrid', {'enabled': True, 'api_key': 'a'})
+    assert pool.get('sendgrid', {'api_key': 'a'}) is first
+    assert pool.get('sendgrid', {'api_key': 'b'}) is not first
+    assert len(created) == 2
+    assert ProviderClientPool.shared() is ProviderClientPool.shared()
+
+
+@pytest.mark.asyncio
+async def test_email_fails_over_and_routes_around_failing_provider():
+    automation = CommunicationAutomation({
+        'smtp': {'from_address': 'editor@example.com'},
+        'email_providers': {'sendgrid': {'enabled': True, 'api_key': 'test'},
+                            'ses': {'enabled': True, 'region': 'us-east-1'}}
+    })
+    sendgrid, ses = FakeSendGrid(status_code=500), FakeSES()
+    automation.provider_clients = ProviderClientPool(factories={
+        'sendgrid': lambda settings, pool_size: sendgrid, 'ses': lambda settings, pool_size: ses
+    })
+
+    for number in range(2):
+        message = await automation.send_message('reviewer_invitation', _recipient(number), CONTEXT)
+        assert message.status == CommunicationStatus.SENT
+        assert message.tracking_data['provider'] == 'ses'
+    # After one failed SendGrid call SES ranks first, so the second send goes straight there
+    assert len(sendgrid.requests) == 1
+
+    messages = await automation.send_bulk_messages(
+        'reviewer_invitation', [_recipient(number) for number in range(2, 6)], CONTEXT)
+    await automation.close()
+
+    assert all(message.status == CommunicationStatus.SENT for message in messages)
+    assert len(sendgrid.requests) == 1
+    assert len(ses.sent) == 6
+
+
+@pytest.mark.asyncio
+async def test_bulk_failover_runs_under_fallback_provider_limits():
+    automation = CommunicationAutomation({
+        'smtp': {'from_address': 'editor@example.com'},
+        'email_providers': {'sendgrid': {'enabled': True, 'api_key': 'test'},
+                            'ses': {'enabled': True, 'region': 'us-east-1'}}
+    })
+    sendgrid, ses = FakeSendGrid(status_code=500), FakeSES()
+    automation.provider_clients = ProviderClientPool(factories={
+        'sendgrid': lambda settings, pool_size: sendgrid, 'ses': lambda settings, pool_size: ses
+    })
+    pipeline_calls = []
+    deliver = automation.delivery.deliver
+
+    async def recording_deliver(provider, batches, send_batch):
+        pipeline_calls.append((provider, sum(len(batch) for batch in batches)))
+        return await deliver(provider, batches, send_batch)
+
+    automation.delivery.deliver = recording_deliver
+    messages = await automation.send_bulk_messages(
+        'reviewer_invitation', [_recipient(number) for number in range(5)], CONTEXT)
+    await automation.close()
+
+    assert all(message.status == CommunicationStatus.SENT for message in messages)
+    assert pipeline_calls == [('sendgrid', 5), ('ses', 5)]
+    assert len(sendgrid.requests) == 1 and len(ses.sent) == 5
+
+
+@pytest.mark.asyncio
+async def test_twilio_sends_reuse_one_keep_alive_connection():
+    TwilioHandler.connections, TwilioHandler.messages = [], []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), TwilioHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    automation = CommunicationAutomation({
+        'sms_providers': {'twilio': {'enabled': True, 'account_sid': 'AC1', 'auth_token': 'token',
+                                     'from_number': '+15559999999',
+                                     'base_url': f"http://127.0.0.1:{server.server_port}"}}
+    })
+    automation.templates['review_due_sms'] = CommunicationTemplate(
+        template_id='review_due_sms', name='Review Due', subject_template='Review due',
+        body_template='Your review of {{manuscript_title}} is due {{deadline}}', message_type=MessageType.SMS,
+        agent_id='review_coordination', scenario='reminder', variables=['manuscript_title', 'deadline'],
+        personalization_rules={}, send_conditions={}, follow_up_rules={}
+    )
+    automation.provider_clients = ProviderClientPool()
+    messages = [await automation.send_message('review_due_sms', _recipient(number), CONTEXT) for number in range(3)]
+    automation.provider_clients.close()
+    await automation.close()
+    server.shutdown()
+    server.server_close()
+
+    assert [message.tracking_data['external_id'] for message in messages] == ['SM1', 'SM2', 'SM3']
+    assert [to for _, to, _ in TwilioHandler.messages] == ['+15550000000', '+15550000001', '+15550000002']
+    assert TwilioHandler.messages[0][2] == 'Your review of On Testing is due 2024-01-01'
+    assert TwilioHandler.messages[0][0] == '/2010-04-01/Accounts/AC1/Messages.json'
+    assert len(TwilioHandler.connections) == 1
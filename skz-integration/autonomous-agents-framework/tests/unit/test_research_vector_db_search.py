@@ -0,0 +1,118 @@
+"""
+Test batched related-document lookups in ResearchVectorDB.search_research
+"""
+
+import sys
+import os
+import json
+
+import numpy as np
+import pytest
+
+# Add src to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
+
+from models.research_vector_db import ResearchVectorDB, ResearchQuery
+
+
+class FakeModel:
+    def encode(self, texts, **kwargs):
+        return np.array([[1.0, 0.0, 0.0] for _ in texts])
+
+
+class FakeCollection:
+    """Brute-force cosine collection counting index round-trips"""
+
+    def __init__(self, count=60, dims=3):
+        rng = np.random.default_rng(7)
+        vectors = rng.normal(size=(count, dims))
+        vectors[:, 0] = np.abs(vectors[:, 0]) + 2.0
+        self.vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        self.ids = [f"doc{i}" for i in range(count)]
+        self.metadatas = [{
+            'title': f"Paper {i}", 'authors': json.dumps([f"Author {i}"]), 'keywords': json.dumps(["emulsion"]),
+            'doi': f"10.1/{i}", 'publication_date': "2024-01-01", 'journal': "JCS", 'citation_count': i,
+            'document_type': "article", 'research_areas': json.dumps(["formulation"]), 'methodology': "lab",
+            'significance_score': 0.5, 'novelty_score': 0.5
+        } for i in range(count)]
+        self.queries = []
+        self.gets = 0
+
+    def query(self, query_embeddings, n_results, where=None, include=None):
+        self.queries.append({'count': len(query_embeddings), 'include': include})
+        include = include or ['metadatas', 'documents', 'distances']
+        result = {'ids': [], 'distances': [], 'metadatas': [], 'documents': [], 'embeddings': []}
+        for embedding in query_embeddings:
+            similarity = self.vectors @ np.asarray(embedding)
+            top = np.argsort(-similarity)[:n_results]
+            result['ids'].append([self.ids[i] for i in top])
+            result['distances'].append([float(1 - similarity[i]) for i in top])
+            result['metadatas'].append([self.metadatas[i] for i in top])
+            result['documents'].append([f"Paper {i}\n\nAbstract {i}" for i in top])
+            result['embeddings'].append([self.vectors[i].tolist() for i in top])
+        return {key: value for key, value in result.items() if key == 'ids' or key in include}
+
+    def get(self, ids, include=None):
+        self.gets += 1
+        rows = [self.ids.index(doc_id) for doc_id in ids]
+        return {'ids': ids, 'embeddings': [self.vectors[i].tolist() for i in rows],
+                'metadatas': [self.metadatas[i] for i in rows]}
+
+
+def _query(threshold=0.0):
+    return ResearchQuery(query_text="emulsions", research_areas=[], date_range=None, min_citation_count=0,
+                         document_types=[], methodology_filter=[], similarity_threshold=threshold)
+
+
+@pytest.fixture
+def vector_db():
+    return ResearchVectorDB({}, model=FakeModel(), collection=FakeCollection())
+
+
+class TestBatchedSearch:
+    """Test round-trip counts and parity with per-hit lookups"""
+
+    @pytest.mark.asyncio
+    async def test_search_uses_two_round_trips(self, vector_db):
+        results = await vector_db.search_research(_query(),
+                                                  limit=20)
+
+        assert len(results) == 20
+        assert [q['count'] for q in vector_db.collection.queries] == [1, 20]
+        assert vector_db.collection.gets == 0
+        assert 'embeddings' in vector_db.collection.queries[0]['include']
+
+    @pytest.mark.asyncio
+    async def test_related_documents_match_single_lookups(self, vector_db):
+        results = await vector_db.search_research(_query(),
+                                                  limit=10)
+
+        for result in results:
+            expected = await vector_db._find_related_documents(result.document.doc_id, limit=5)
+            assert result.related_documents == expected
+            assert result.document.doc_id not in result.related_documents
+
+    @pytest.mark.asyncio
+    async def test_threshold_and_related_opt_out(self, vector_db):
+        results = await vector_db.search_research(_query(2.0))
+        assert results == []
+        assert len(vector_db.collection.queries) == 1
+
+        results = await vector_db.search_research(_query(),
+                                                  limit=5, include_related=False)
+        assert all(result.related_documents == [] for result in results)
+        assert 'embeddings' not in vector_db.collection.queries[-1]['include']
+
+    @pytest.mark.asyncio
+    async def test_decoded_metadata_is_cached_and_copied(self, vector_db):
+        vector_db.metadata_cache_size = 8
+        query = _query()
+        first = await vector_db.search_research(query, limit=5, include_related=False)
+        first[0].document.authors.append("Mutated")
+        second = await vector_db.search_research(query, limit=5, include_related=False)
+
+        assert second[0].document.authors == [f"Author {second[0].document.doc_id[3:]}"]
+        assert len(vector_db._metadata_cache) == 5
+
+        await vector_db.search_research(query, limit=20, include_related=False)
+        assert len(vector_db._metadata_cache) == 8
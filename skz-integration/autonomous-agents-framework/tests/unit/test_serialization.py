@@ -0,0 +1,118 @@
+"""
+Test the fast serialization layer and its FastAPI / Flask adapters
+"""
+
+import sys
+import os
+import json
+from datetime import datetime
+from enum import Enum
+
+import numpy as np
+import pytest
+
+# Add src to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
+
+import serialization
+from serialization import dumps, iter_encoded_list, loads, negotiate
+
+msgpack = pytest.importorskip("msgpack")
+
+
+class Status(Enum):
+    ACTIVE = "active"
+
+
+PAYLOAD = {
+    "agent": "research_discovery",
+    "status": Status.ACTIVE,
+    "last_activity": datetime(2024, 5, 1, 12, 30, 15, 250),
+    "scores": np.array([0.5, 0.25]),
+    "success_rate": np.float32(0.75),
+    "total_actions": np.int64(156),
+    "tags": {"ml"},
+}
+
+EXPECTED = {
+    "agent": "research_discovery",
+    "status": "active",
+    "last_activity": "2024-05-01T12:30:15.000250",
+    "scores": [0.5, 0.25],
+    "success_rate": 0.75,
+    "total_actions": 156,
+    "tags": ["ml"],
+}
+
+
+class TestEncoding:
+    """Test value conversion and negotiation"""
+
+    def test_json_handles_datetimes_numpy_and_enums(self):
+        assert loads(dumps(PAYLOAD)) == EXPECTED
+
+    def test_stdlib_fallback_matches(self, monkeypatch):
+        monkeypatch.setattr(serialization, "ORJSON_AVAILABLE", False)
+        assert json.loads(dumps(PAYLOAD)) == EXPECTED
+
+    def test_msgpack_round_trip(self):
+        assert serialization.unpackb(serialization.packb(PAYLOAD)) == EXPECTED
+
+    def test_negotiation(self):
+        assert negotiate(None) == "application/json"
+        assert negotiate("text/html,application/xhtml+xml,*/*;q=0.8") == "application/json"
+        assert negotiate("application/msgpack") == "application/msgpack"
+        assert negotiate("application/json;q=0.5, application/x-msgpack") == "application/msgpack"
+        assert negotiate("application/json, application/msgpack;q=0.9") == "application/json"
+
+    @pytest.mark.parametrize("media_type, decode", [
+        ("application/json", loads),
+        ("application/msgpack", serialization.unpackb),
+    ])
+    def test_streamed_list_matches_whole_encoding(self, media_type, decode):
+        items = [{"id": i, "score": np.float64(i / 3)} for i in range(1000)]
+        chunks = list(iter_encoded_list("items", items, {"total": 1000}, media_type, chunk_size=64))
+
+        assert len(chunks) > 10
+        assert decode(b"".join(chunks)) == {"total": 1000, "items": [{"id": i, "score": i / 3} for i in range(1000)]}
+
+    def test_streamed_empty_list(self):
+        assert loads(b"".join(iter_encoded_list("items", []))) == {"items": []}
+
+
+class TestFrameworkAdapters:
+    """Test the FastAPI response helpers and the Flask JSON provider"""
+
+    def test_fastapi_negotiated_and_streamed_responses(self, monkeypatch):
+        pytest.importorskip("fastapi")
+        from fastapi import FastAPI, Request
+        from fastapi.testclient import TestClient
+
+        monkeypatch.setattr(serialization, "STREAM_THRESHOLD", 10)
+        app = FastAPI(default_response_class=serialization.FastJSONResponse)
+
+        @app.get("/items")
+        async def items(request: Request, count: int = 5):
+            return serialization.list_response(request, "items", list(range(count)), {"total": count})
+
+        client = TestClient(app)
+        assert client.get("/items").json() == {"items": [0, 1, 2, 3, 4], "total": 5}
+
+        packed = client.get("/items", params={"count": 20}, headers={"Accept": "application/msgpack"})
+        assert packed.headers["content-type"] == "application/msgpack"
+        assert msgpack.unpackb(packed.content) == {"total": 20, "items": list(range(20))}
+
+    def test_flask_jsonify_uses_provider(self):
+        flask = pytest.importorskip("flask")
+        app = serialization.install_json_provider(flask.Flask(__name__))
+
+        @app.route("/agent")
+        def agent():
+            return flask.jsonify(PAYLOAD)
+
+        client = app.test_client()
+        assert client.get("/agent").get_json() == EXPECTED
+
+        packed = client.get("/agent", headers={"Accept": "application/msgpack"})
+        assert packed.mimetype == "application/msgpack"
+        assert msgpack.unpackb(packed.data) == EXPECTED
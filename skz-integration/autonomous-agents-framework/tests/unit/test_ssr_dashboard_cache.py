@@ -0,0 +1,112 @@
+"""
+Test the SSR dashboard aggregate snapshot and fragment cache
+"""
+
+import sys
+import os
+
+import pytest
+
+pytest.importorskip("fastapi")
+from fastapi.templating import Jinja2Templates
+from fastapi.testclient import TestClient
+
+# Add src to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
+
+import ssr_api_server
+from ssr_api_server import AgentRegistrySnapshot, DashboardRenderer, create_default_template, etag_matches
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    create_default_template(tmp_path)
+    renderer = DashboardRenderer(Jinja2Templates(directory=str(tmp_path)), ssr_api_server.AGENT_SNAPSHOT)
+    monkeypatch.setattr(ssr_api_server, "DASHBOARD_RENDERER", renderer)
+    ssr_api_server.initialize_ssr_services()
+    monkeypatch.setattr(ssr_api_server, "OJS_BRIDGE", None)
+    return TestClient(ssr_api_server.app)
+
+
+class TestAgentRegistrySnapshot:
+    """Test incremental aggregates"""
+
+    def test_updates_match_a_rescan(self):
+        registry = {
+            f"agent_{i}": {"name": f"Agent {i}", "status": "active", "capabilities": [],
+                           "performance": {"success_rate": 0.9, "avg_response_time": 1.0 + i, "total_actions": i}}
+            for i in range(5)
+        }
+        snapshot = AgentRegistrySnapshot()
+        snapshot.load(registry)
+        snapshot.update_agent("agent_1", status="offline")
+        snapshot.update_agent("agent_2", performance={"success_rate": 0.5, "avg_response_time": 4.0})
+        snapshot.record_action("agent_3")
+
+        summary = snapshot.status_summary()
+        assert summary["agents"] == {"total": 5, "active": 4, "inactive": 1}
+        assert summary["performance"]["total_tasks"] == sum(a["performance"]["total_actions"] for a in registry.values())
+        assert summary["performance"]["avg_success_rate"] == pytest.approx(
+            sum(a["performance"]["success_rate"] for a in registry.values()) / 5)
+        assert summary["performance"]["avg_response_time"] == pytest.approx(
+            sum(a["performance"]["avg_response_time"] for a in registry.values()) / 5)
+
+    def test_etag_comparison(self):
+        assert etag_matches('W/"agents-1"', 'W/"agents-1"')
+        assert etag_matches('"other", "agents-1"', 'W/"agents-1"')
+        assert etag_matches('*', 'W/"agents-1"')
+        assert not etag_matches(None, 'W/"agents-1"')
+        assert not etag_matches('W/"agents-2"', 'W/"agents-1"')
+
+
+def test_default_templates_keep_customized_files(tmp_path):
+    (tmp_path / "dashboard_page.html").write_text("custom {{ stats|safe }}")
+    create_default_template(tmp_path)
+
+    assert (tmp_path / "dashboard_page.html").read_text() == "custom {{ stats|safe }}"
+    assert (tmp_path / "dashboard_stats.html").exists()
+    assert (tmp_path / "dashboard_agent.html").exists()
+
+
+class TestDashboardEndpoint:
+    """Test conditional requests and partial re-rendering"""
+
+    def test_legacy_single_file_template_is_not_used(self, tmp_path, client):
+        (tmp_path / "dashboard.html").write_text(
+            "{% for agent_id, agent in agents.items() %}{{ agent.name }}{% endfor %} {{ total_agents }}")
+
+        response = client.get("/")
+        assert response.status_code == 200
+        assert "Autonomous Agent Dashboard" in response.text
+
+    def test_unchanged_dashboard_is_not_modified(self, client):
+        first = client.get("/")
+        assert first.status_code == 200
+        assert "Research Discovery Agent" in first.text
+
+        second = client.get("/", headers={"If-None-Match": first.headers["etag"]})
+        assert second.status_code == 304
+        assert second.headers["etag"] == first.headers["etag"]
+
+    def test_action_rerenders_only_the_changed_card(self, client):
+        renderer = ssr_api_server.DASHBOARD_RENDERER
+        first = client.get("/")
+        assert renderer.renders == {"page": 1, "stats": 1, "agent": 7}
+
+        response = client.post("/api/v1/agents/content_quality/action",
+                               json={"agent_id": "content_quality", "action": "validate"})
+        assert response.status_code == 200
+
+        changed = client.get("/", headers={"If-None-Match": first.headers["etag"]})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != first.headers["etag"]
+        assert "<strong>Total Actions:</strong> 79" in changed.text
+        assert renderer.renders == {"page": 2, "stats": 2, "agent": 8}
+
+    def test_status_uses_snapshot(self, client):
+        client.post("/api/v1/agents/research_discovery/action",
+                    json={"agent_id": "research_discovery", "action": "search"})
+        status = client.get("/api/v1/status").json()
+
+        assert status["agents"] == {"total": 7, "active": 7, "inactive": 0}
+        assert status["performance"]["total_tasks"] == 940
@@ -0,0 +1,153 @@
+"""
+Test keyset pagination, count caching and prefetch in SSRServiceIntegration
+"""
+
+import sys
+import os
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+# Add src to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
+
+import services.ssr_integration as ssr_integration
+from services.ssr_integration import SSRServiceIntegration
+
+
+class FakeOJSBridge:
+    """OJS stand-in ordering by (dateSubmitted, id) descending and paging by offset"""
+
+    def __init__(self, count=95):
+        start = datetime(2024, 1, 1)
+        self.submissions = sorted((
+            {"id": f"{i:05d}", "title": f"Paper {i}", "status": "accepted" if i % 3 == 0 else "under_review",
+             # Pairs of manuscripts share a timestamp, so the id tie-break matters
+             "dateSubmitted": (start + timedelta(hours=i // 2)).isoformat()}
+            for i in range(count)
+        ), key=lambda m: (m["dateSubmitted"], m["id"]), reverse=True)
+        self.calls = []
+
+    def get_manuscripts_page(self, filters=None, count=20, offset=0):
+        filters = filters or {}
+        self.calls.append({"filters": filters, "count": count, "offset": offset})
+        rows = [m for m in self.submissions if "status" not in filters or m["status"] == filters["status"]]
+        return {"items": [dict(m) for m in rows[offset:offset + count]], "items_max": len(rows)}
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(ssr_integration, "BRIDGE_AVAILABLE", False)
+    monkeypatch.setattr(ssr_integration, "PROVIDERS_AVAILABLE", False)
+    service = SSRServiceIntegration()
+    service.ojs_bridge = FakeOJSBridge()
+    return service
+
+
+async def _walk(service, filters=None, limit=10):
+    pages, cursor = [], None
+    while True:
+        result = await service.get_manuscript_list_server_side(limit=limit, filters=filters, cursor=cursor)
+        pages.append(result)
+        cursor = result["pagination"]["next_cursor"]
+        if not cursor:
+            return pages
+
+
+class TestKeysetPagination:
+    """Test cursor walks, filter pushdown and totals"""
+
+    @pytest.mark.asyncio
+    async def test_cursor_walk_visits_every_manuscript_once(self, service):
+        pages = await _walk(service, limit=10)
+
+        ids = [m["id"] for page in pages for m in page["manuscripts"]]
+        assert ids == [m["id"] for m in service.ojs_bridge.submissions]
+        assert [p["pagination"]["page"] for p in pages] == list(range(1, 11))
+        assert all(p["pagination"]["total"] == 95 and p["pagination"]["total_exact"] for p in pages)
+        assert sorted(call["offset"] for call in service.ojs_bridge.calls) == list(range(0, 100, 10))
+
+    @pytest.mark.asyncio
+    async def test_rows_shifted_by_new_submissions_are_not_repeated(self, service):
+        service.prefetch = False
+        first = await service.get_manuscript_list_server_side(limit=10)
+        newest = service.ojs_bridge.submissions[0]["dateSubmitted"]
+        service.ojs_bridge.submissions[:0] = [
+            {"id": f"new_{i}", "title": "New", "status": "under_review", "dateSubmitted": newest + "Z"}
+            for i in range(3)
+        ]
+        second = await service.get_manuscript_list_server_side(limit=10, cursor=first["pagination"]["next_cursor"])
+
+        assert [m["id"] for m in second["manuscripts"]] == [m["id"] for m in service.ojs_bridge.submissions[13:23]]
+
+    @pytest.mark.asyncio
+    async def test_walk_stops_when_ojs_ignores_the_offset(self, service):
+        bridge = service.ojs_bridge
+        fetch = bridge.get_manuscripts_page
+        bridge.get_manuscripts_page = lambda filters=None, count=20, offset=0: fetch(filters, count)
+        pages = await _walk(service, limit=10)
+
+        ids = [m["id"] for page in pages for m in page["manuscripts"]]
+        assert len(pages) == 2 and not pages[1]["pagination"]["has_next"]
+        assert ids == [m["id"] for m in bridge.submissions[:len(ids)]]
+
+    @pytest.mark.asyncio
+    async def test_date_bounds_are_applied_locally(self, service):
+        filters = {"submitted_after": "2024-01-01T20", "submitted_before": "2024-01-02T03"}
+        pages = await _walk(service, filters=filters, limit=5)
+
+        ids = [m["id"] for page in pages for m in page["manuscripts"]]
+        # Bounds are inclusive at their precision: 20:00 through 03:59, two per hour
+        assert ids == [m["id"] for m in service.ojs_bridge.submissions
+                       if "2024-01-01T20" <= m["dateSubmitted"][:13] <= "2024-01-02T03"]
+        assert len(ids) == 16
+        assert all(call["filters"] == {} for call in service.ojs_bridge.calls)
+
+    @pytest.mark.asyncio
+    async def test_filters_are_pushed_down(self, service):
+        pages = await _walk(service, filters={"status": "accepted", "search": "paper", "unused": None}, limit=10)
+
+        assert all(m["status"] == "accepted" for page in pages for m in page["manuscripts"])
+        assert service.ojs_bridge.calls[0]["filters"] == {"status": "accepted", "searchPhrase": "paper"}
+
+    @pytest.mark.asyncio
+    async def test_cursor_is_bound_to_its_filters(self, service):
+        first = await service.get_manuscript_list_server_side(limit=5, filters={"status": "accepted"})
+        result = await service.get_manuscript_list_server_side(
+            limit=5, filters={"status": "under_review"}, cursor=first["pagination"]["next_cursor"])
+
+        assert result["manuscripts"] == []
+        assert "different filters" in result["error"]
+
+    @pytest.mark.asyncio
+    async def test_page_numbers_still_work(self, service):
+        result = await service.get_manuscript_list_server_side(page=3, limit=10)
+
+        assert [m["id"] for m in result["manuscripts"]] == [m["id"] for m in service.ojs_bridge.submissions[20:30]]
+        assert service.ojs_bridge.calls[0]["offset"] == 20
+
+
+class TestPrefetchAndFallback:
+    """Test next-page prefetch and the fallback generator"""
+
+    @pytest.mark.asyncio
+    async def test_next_page_is_prefetched(self, service):
+        first = await service.get_manuscript_list_server_side(limit=10)
+        await asyncio.sleep(0.05)
+        assert len(service.ojs_bridge.calls) == 2
+
+        second = await service.get_manuscript_list_server_side(limit=10, cursor=first["pagination"]["next_cursor"])
+        assert second["manuscripts"][0]["id"] == service.ojs_bridge.submissions[10]["id"]
+        # Served from the prefetch; only the page after it was requested
+        await asyncio.sleep(0.05)
+        assert len(service.ojs_bridge.calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_fallback_without_bridge(self, service):
+        service.ojs_bridge = None
+        first = await service.get_manuscript_list_server_side(limit=5)
+        second = await service.get_manuscript_list_server_side(limit=5, cursor=first["pagination"]["next_cursor"])
+
+        assert [m["id"] for m in second["manuscripts"]] == [f"ms_{i:04d}" for i in range(6, 11)]
+        assert second["pagination"]["has_next"]
@@ -0,0 +1,96 @@
+"""
+Test compiled template caching and batch rendering
+"""
+
+import sys
+import os
+from dataclasses import replace
+
+import jinja2
+import pytest
+
+# Add src to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
+
+from models.template_registry import CompiledTemplate
+from models.communication_automation import CommunicationAutomation
+
+
+def _environment():
+    return jinja2.Environment(loader=jinja2.BaseLoader(), autoescape=jinja2.select_autoescape())
+
+
+def _contexts(count):
+    shared = {'manuscript_title': 'Emulsions & <Foams>', 'journal_name': 'JCS', 'authors': 'A. Author',
+              'submission_date': '2024-01-15', 'estimated_time': 14, 'abstract': 'Abstract',
+              'response_deadline': '2024-02-01', 'review_link': 'https://example.com/r', 'editorial_team': 'Team'}
+    return [dict(shared, reviewer_name=f"Dr. O'Reviewer {number}", expertise_areas='rheology' if number % 2 else 'colloids')
+            for number in range(count)]
+
+
+def test_render_many_matches_individual_renders():
+    automation = CommunicationAutomation({})
+    template = automation.templates['reviewer_invitation']
+    compiled = CompiledTemplate(automation.jinja_env, template.body_template)
+    contexts = _contexts(20)
+    # A value that compares equal to the others but renders differently
+    contexts[3]['estimated_time'] = 14.0
+    del contexts[5]['abstract']
+
+    assert compiled.render_many(contexts) == [compiled.render(context) for context in contexts]
+
+
+def test_render_many_handles_statements_and_expressions():
+    source = ("{% if urgent %}URGENT: {% endif %}{{ name | upper }} has {{ count + 1 }} reviews"
+              "{% for item in items %}, {{ item }}{% endfor %}")
+    compiled = CompiledTemplate(_environment(), source)
+    contexts = [{'urgent': index == 1, 'name': f"r{index}", 'count': index, 'items': ['a', '<b>']}
+                for index in range(4)]
+
+    assert compiled.render_many(contexts) == [compiled.render(context) for context in contexts]
+
+    expression = CompiledTemplate(_environment(), "Dear {{ name | title }}, {{ journal }} issue {{ issue + 1 }}")
+    contexts = [{'name': f"reviewer {index}", 'journal': 'JCS', 'issue': 4} for index in range(3)]
+    assert expression.render_many(contexts) == [f"Dear Reviewer {index}, JCS issue 5" for index in range(3)]
+
+
+def test_render_many_falls_back_to_globals():
+    environment = _environment()
+    environment.globals['site'] = 'GLOBAL'
+    compiled = CompiledTemplate(environment, "{{ site }}-{{ x }}")
+    contexts = [{'site': 'LOCAL', 'x': 1}, {'x': 2}]
+
+    assert compiled.render_many(contexts) == ['LOCAL-1', 'GLOBAL-2']
+
+
+def test_registry_compiles_once_and_recompiles_on_edit():
+    automation = CommunicationAutomation({})
+    registry = automation.template_registry
+    template = automation.templates['reviewer_invitation']
+
+    for context in _contexts(5):
+        registry.render(template, context)
+    assert registry.compilations == 2
+    first_version = registry.versions()['reviewer_invitation']['subject']
+
+    edited = replace(template, subject_template='Review request: {{manuscript_title}}')
+    subject, _ = registry.render(edited, _contexts(1)[0])
+
+    assert subject == 'Review request: Emulsions &amp; &lt;Foams&gt;'
+    assert registry.compilations == 3
+    assert registry.versions()['reviewer_invitation']['subject'] != first_version
+
+    registry.invalidate('reviewer_invitation')
+    assert registry.versions() == {}
+
+
+@pytest.mark.asyncio
+async def test_automation_render_many():
+    automation = CommunicationAutomation({})
+
+    rendered = await automation.render_many('reviewer_invitation', _contexts(3))
+
+    assert [subject for subject, _ in rendered] == ['Invitation to Review: Emulsions &amp; &lt;Foams&gt;'] * 3
+    assert "Dear Dr. O&#39;Reviewer 2," in rendered[2][1]
+    with pytest.raises(ValueError):
+        await automation.render_many('missing_template', _contexts(1))
@@ -0,0 +1,166 @@
+"""
+Test the month-bucketed trend index behind find_research_trends
+"""
+
+import asyncio
+import sys
+import os
+import threading
+from datetime import datetime
+
+import numpy as np
+import pytest
+import pytest_asyncio
+
+# Add src to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
+
+from models.research_vector_db import ResearchDocument, ResearchVectorDB
+from models.trend_index import TrendIndex, month_index, month_key
+
+
+class FakeModel:
+    def encode(self, texts, **kwargs):
+        return np.ones((len(texts), 3))
+
+
+class StoreCollection:
+    """Collection stand-in that stores rows and pages through them"""
+
+    def __init__(self):
+        self.rows = []
+
+    def add(self, embeddings, documents, metadatas, ids):
+        self.rows.extend(zip(ids, metadatas))
+
+    def get(self, include=None, limit=None, offset=0):
+        rows = self.rows[offset:offset + limit]
+        return {'ids': [row[0] for row in rows], 'metadatas': [row[1] for row in rows]}
+
+
+def _document(doc_id, date, keywords, methodology="experimental", citations=10, novelty=5.0,
+              areas=("cosmetic_chemistry",), document_type="research_article"):
+    return ResearchDocument(
+        doc_id=doc_id, title=f"Paper {doc_id}", abstract="Abstract", authors=["A. Author"],
+        keywords=list(keywords), doi="", publication_date=date, journal="JCS", citation_count=citations,
+        full_text="", document_type=document_type, research_areas=list(areas), methodology=methodology,
+        findings=[], significance_score=0.5, novelty_score=novelty, embedding=[1.0, 0.0, 0.0]
+    )
+
+
+@pytest_asyncio.fixture
+async def vector_db():
+    vector_db = ResearchVectorDB({}, model=FakeModel(), collection=StoreCollection())
+    documents = [
+        _document("d1", "2022-11-03", ["Emulsification", "rheology"], citations=4),
+        _document("d2", "2023-06-15", ["emulsification"], methodology="computational", citations=8),
+        _document("d3", "2024-02-01", ["emulsification", "preservation"], citations=30, novelty=9.0),
+        _document("d4", "2024-02-20", ["stability_testing"], citations=10, areas=("cosmetic_chemistry", "toxicology")),
+        _document("d5", "2024-03-01", ["emulsification"], document_type="editorial"),
+        _document("d6", "2019-01-01", ["ingredient_safety"]),
+    ]
+    for document in documents:
+        assert await vector_db.add_document(document)
+    vector_db._trend_index_built = True
+    return vector_db
+
+
+class TestTrendIndex:
+    """Test windows, aggregates and rebuilds"""
+
+    def test_month_helpers(self):
+        assert month_index("2024-01-15") - month_index("2023-12-31") == 1
+        assert month_index(datetime(2024, 3, 5)) == month_index("2024-03")
+        assert month_key(month_index("2024-10-01")) == "2024-10"
+        with pytest.raises(ValueError):
+            month_index("2024-13-01")
+
+    @pytest.mark.asyncio
+    async def test_windows_longer_than_a_year(self, vector_db):
+        trends = await vector_db.find_research_trends("cosmetic_chemistry", time_window=24,
+                                                      as_of=datetime(2024, 3, 10))
+
+        assert trends['period'] == {'start': '2022-04', 'end': '2024-03'}
+        # d5 is an editorial and d6 is outside the window
+        assert trends['total_papers'] == 4
+        assert trends['monthly_papers']['2024-02'] == 2
+        assert trends['trending_keywords'][0] == ('emulsification', 3)
+        assert trends['trending_methodologies'] == [('experimental', 3), ('computational', 1)]
+        assert trends['average_citations'] == pytest.approx(52 / 4)
+        assert 'month_over_month_growth' in trends['growth_indicators']
+        assert "Gap in clinical approaches" in trends['research_gaps']
+        assert "Limited research on emulsification" not in trends['research_gaps']
+
+    @pytest.mark.asyncio
+    async def test_short_and_empty_windows(self, vector_db):
+        trends = await vector_db.find_research_trends("cosmetic_chemistry", time_window=2,
+                                                      as_of=datetime(2024, 3, 10))
+        assert trends['total_papers'] == 2
+        assert trends['average_novelty_score'] == pytest.approx(7.0)
+
+        trends = await vector_db.find_research_trends("dermatology", as_of=datetime(2024, 3, 10))
+        assert trends['total_papers'] == 0 and trends['trending_keywords'] == []
+
+    @pytest.mark.asyncio
+    async def test_rebuild_matches_incremental_index(self, vector_db):
+        before = await vector_db.find_research_trends("cosmetic_chemistry", time_window=120,
+                                                      as_of=datetime(2024, 3, 10))
+        assert vector_db.rebuild_trend_index(batch_size=2) == 5
+        after = await vector_db.find_research_trends("cosmetic_chemistry", time_window=120,
+                                                     as_of=datetime(2024, 3, 10))
+
+        assert after == before
+        assert before['total_papers'] == 5
+
+    @pytest.mark.asyncio
+    async def test_lazy_rebuild_runs_off_the_event_loop(self, vector_db):
+        threads = []
+        get = vector_db.collection.get
+
+        def recording_get(**kwargs):
+            threads.append(threading.current_thread())
+            return get(**kwargs)
+
+        vector_db.collection.get = recording_get
+        vector_db._trend_index_built = False
+        trends = await vector_db.find_research_trends("cosmetic_chemistry", time_window=120,
+                                                      as_of=datetime(2024, 3, 10))
+
+        assert trends['total_papers'] == 5
+        assert threads and threading.main_thread() not in threads
+
+    @pytest.mark.asyncio
+    async def test_documents_added_during_a_rebuild_are_kept(self, vector_db):
+        scanned, added = threading.Event(), threading.Event()
+        get = vector_db.collection.get
+
+        def blocking_get(**kwargs):
+            # The final, empty page was read before the new document lands
+            result = get(**kwargs)
+            if kwargs['offset']:
+                scanned.set()
+                added.wait(5)
+            return result
+
+        vector_db.collection.get = blocking_get
+        vector_db._trend_index_built = False
+        trends = asyncio.ensure_future(vector_db.find_research_trends(
+            "cosmetic_chemistry", time_window=120, as_of=datetime(2024, 3, 10)))
+        await asyncio.to_thread(scanned.wait, 5)
+        assert await vector_db.add_document(_document("d7", "2024-03-05", ["emulsification"]))
+        added.set()
+
+        assert (await trends)['total_papers'] == 6
+        assert vector_db._trend_rebuild_buffers == []
+
+    def test_duplicates_and_earlier_months(self):
+        index = TrendIndex()
+        assert index.add("a", ["area"], ["x"], "lab", "2024-05-01", 3, 1.0)
+        assert not index.add("a", ["area"], ["x"], "lab", "2024-05-01", 3, 1.0)
+        assert index.add("b", ["area"], ["y", "x"], "lab", "2020-01-01", 5, 1.0)
+        assert not index.add("c", ["area"], ["x"], "lab", "not a date")
+
+        window = index.window("area", month_index("2019-12"), month_index("2024-05"))
+        assert window.total_papers == 2 and index.skipped == 1
+        assert window.top_keywords(5) == [('x', 2), ('y', 1)]
+        assert window.monthly_papers()['2020-01'] == 1
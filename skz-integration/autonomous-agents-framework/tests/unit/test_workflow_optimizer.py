@@ -0,0 +1,115 @@
+"""
+Test indexed list scheduling in WorkflowOptimizer
+"""
+
+import sys
+import os
+from datetime import datetime
+
+import pytest
+
+# Add src to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
+
+from models.workflow_optimizer import AgentResource, WorkflowOptimizer, create_simple_workflow
+
+
+def _agent(agent_id, capabilities, max_capacity=1, current_load=0, agent_type='worker', success_rate=0.9,
+           avg_task_time=30.0):
+    return AgentResource(
+        agent_id=agent_id, agent_type=agent_type, current_load=current_load, max_capacity=max_capacity,
+        avg_task_time=avg_task_time, success_rate=success_rate, last_active=datetime.now().isoformat(),
+        capabilities=capabilities, status='online'
+    )
+
+
+async def _schedule(task_configs, agents):
+    optimizer = WorkflowOptimizer({})
+    workflow = await create_simple_workflow(task_configs)
+    graph = await optimizer._build_dependency_graph(workflow.tasks)
+    schedule = await optimizer._generate_optimal_schedule(workflow, agents, graph)
+    return {entry['task_id']: entry for entry in schedule}
+
+
+class TestGenerateOptimalSchedule:
+    """Test HEFT-style schedule generation"""
+
+    @pytest.mark.asyncio
+    async def test_dependencies_are_respected(self):
+        schedule = await _schedule([
+            {'agent_id': 'review', 'duration': 10},
+            {'agent_id': 'review', 'duration': 20, 'dependencies': ['task_1']},
+            {'agent_id': 'review', 'duration': 5, 'dependencies': ['task_1']},
+            {'agent_id': 'review', 'duration': 5, 'dependencies': ['task_2', 'task_3']}
+        ], [_agent('a', ['review']), _agent('b', ['review'])])
+
+        assert schedule['task_2']['start_time'] >= schedule['task_1']['end_time']
+        assert schedule['task_3']['start_time'] >= schedule['task_1']['end_time']
+        assert schedule['task_4']['start_time'] == 30
+        assert schedule['task_2']['agent_id'] != schedule['task_3']['agent_id']
+
+    @pytest.mark.asyncio
+    async def test_critical_path_goes_first(self):
+        # Both roots compete for one agent; the one leading the longer chain wins
+        schedule = await _schedule([
+            {'agent_id': 'review', 'duration': 10},
+            {'agent_id': 'review', 'duration': 10},
+            {'agent_id': 'edit', 'duration': 50, 'dependencies': ['task_2']}
+        ], [_agent('a', ['review']), _agent('e', ['edit'])])
+
+        assert schedule['task_2']['start_time'] == 0
+        assert schedule['task_3']['on_critical_path']
+        assert not schedule['task_1']['on_critical_path']
+
+    @pytest.mark.asyncio
+    async def test_capacity_gives_concurrent_slots(self):
+        schedule = await _schedule(
+            [{'agent_id': 'review', 'duration': 10} for _ in range(3)],
+            [_agent('a', ['review'], max_capacity=4, current_load=1)]
+        )
+
+        assert [entry['start_time'] for entry in schedule.values()] == [0, 0, 0]
+
+    @pytest.mark.asyncio
+    async def test_agent_types_and_missing_agents(self):
+        schedule = await _schedule([
+            {'agent_id': 'layout', 'duration': 10, 'resources': {'agent_types': ['production']}},
+            {'agent_id': 'unknown', 'duration': 10}
+        ], [_agent('p', [], agent_type='production')])
+
+        assert schedule['task_1']['agent_id'] == 'p'
+        assert 'task_2' not in schedule
+
+    @pytest.mark.asyncio
+    async def test_ties_prefer_more_suitable_agents(self):
+        schedule = await _schedule(
+            [{'agent_id': 'review', 'duration': 10}],
+            [_agent('weak', ['review'], success_rate=0.5), _agent('strong', ['review'], success_rate=0.99)]
+        )
+
+        assert schedule['task_1']['agent_id'] == 'strong'
+
+    @pytest.mark.asyncio
+    async def test_ties_prefer_agents_fast_enough_for_the_task(self):
+        schedule = await _schedule(
+            [{'agent_id': 'review', 'duration': 10}],
+            [_agent('slow', ['review'], avg_task_time=40.0), _agent('fast', ['review'], avg_task_time=10.0)]
+        )
+
+        assert schedule['task_1']['agent_id'] == 'fast'
+
+    @pytest.mark.asyncio
+    async def test_large_workflow_is_fully_scheduled(self):
+        configs = [
+            {'agent_id': f'cap_{i % 10}', 'duration': 5 + i % 7,
+             'dependencies': [f'task_{i - 49}'] if i >= 50 else []}
+            for i in range(2000)
+        ]
+        agents = [_agent(f'agent_{i}', [f'cap_{i % 10}']) for i in range(50)]
+        schedule = await _schedule(configs, agents)
+
+        assert len(schedule) == 2000
+        busy = {}
+        for entry in sorted(schedule.values(), key=lambda e: e['start_time']):
+            assert entry['start_time'] >= busy.get(entry['agent_id'], 0)
+            busy[entry['agent_id']] = entry['end_time']
@@ -0,0 +1,204 @@
+"""
+Monte Carlo Scenario Runner
+Runs seeded replicas of AcademicPublishingSimulator configurations across a
+process pool and aggregates the resulting metrics into columnar tables with
+means and confidence intervals
+"""
+
+import itertools
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field, fields
+from statistics import NormalDist
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from simulation_environment import AcademicPublishingSimulator, SimulationMetrics
+
+logger = logging.getLogger(__name__)
+
+
+def metrics_to_row(metrics: SimulationMetrics) -> Dict[str, float]:
+    """Flatten SimulationMetrics into scalar columns"""
+    row = {}
+    for metric_field in fields(metrics):
+        value = getattr(metrics, metric_field.name)
+        if isinstance(value, dict):
+            for key, item in value.items():
+                row[f"{metric_field.name}.{key}"] = float(item)
+        else:
+            row[metric_field.name] = float(value)
+    return row
+
+
+def run_replica(config: Dict[str, Any], duration_days: int, seed: int) -> Dict[str, float]:
+    """Run one seeded simulation and return its flattened metrics
+
+    Module-level so it can be shipped to worker processes.
+    """
+    logging.getLogger('simulation_environment').setLevel(logging.WARNING)
+    simulator = AcademicPublishingSimulator({**config, 'random_seed': seed})
+    simulator.run_simulation(duration_days=duration_days)
+    return metrics_to_row(simulator.metrics)
+
+
+def _t_critical(confidence: float, dof: int) -> float:
+    """Two-sided Student t critical value, normal approximation without scipy"""
+    try:
+        from scipy import stats
+        return float(stats.t.ppf((1 + confidence) / 2, dof))
+    except ImportError:
+        return NormalDist().inv_cdf((1 + confidence) / 2)
+
+
+@dataclass
+class ScenarioResult:
+    """Columnar replica results for one or more scenarios
+
+    ``columns`` maps each metric (and each swept parameter) to a NumPy array
+    with one entry per replica.
+    """
+    columns: Dict[str, np.ndarray]
+    parameters: List[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.columns.get('seed', []))
+
+    def summary(self, confidence: float = 0.95) -> List[Dict[str, Any]]:
+        """Mean, standard deviation and confidence interval per metric and scenario"""
+        metric_names = [name for name in self.columns if name not in self.parameters and name not in ('seed', 'replica')]
+        keys = list(zip(*(self.columns[p].tolist() for p in self.parameters))) or [()] * len(self)
+        positions = {key: index for index, key in enumerate(dict.fromkeys(keys))}
+        scenarios = list(positions)
+        inverse = np.array([positions[key] for key in keys], dtype=int)
+
+        summaries = []
+        for index, scenario in enumerate(scenarios):
+            mask = inverse == index
+            count = int(mask.sum())
+            entry = dict(zip(self.parameters, scenario))
+            entry['replicas'] = count
+            critical = _t_critical(confidence, count - 1) if count > 1 else float('nan')
+            for name in metric_names:
+                values = self.columns[name][mask]
+                values = values[~np.isnan(values)]
+                mean = float(values.mean()) if len(values) else float('nan')
+                std = float(values.std(ddof=1)) if len(values) > 1 else float('nan')
+                half_width = critical * std / np.sqrt(len(values)) if len(values) > 1 else float('nan')
+                entry[name] = {'mean': mean, 'std': std,
+                               'ci_low': mean - half_width, 'ci_high': mean + half_width}
+            summaries.append(entry)
+        return summaries
+
+    def to_frame(self):
+        """Results as a pandas DataFrame"""
+        import pandas as pd
+        return pd.DataFrame(self.columns)
+
+    def save_numpy(self, path: str) -> str:
+        """Write the columns to a compressed ``.npz`` archive"""
+        np.savez_compressed(path, **self.columns)
+        return path if path.endswith('.npz') else f"{path}.npz"
+
+    def save_parquet(self, path: str) -> str:
+        """Write the columns to Parquet (needs ``pyarrow`` or ``fastparquet``)"""
+        self.to_frame().to_parquet(path, index=False)
+        return path
+
+
+class MonteCarloRunner:
+    """Runs N seeded replicas of a simulator config in parallel
+
+    Replica seeds are spawned from ``base_seed`` with NumPy's SeedSequence, so
+    every replica has an independent RNG stream and a rerun with the same
+    base seed reproduces the same results.
+    """
+
+    def __init__(self, base_config: Optional[Dict[str, Any]] = None, duration_days: int = 365,
+                 replicas: int = 30, max_workers: Optional[int] = None, base_seed: int = 0):
+        self.base_config = base_config or {}
+        self.duration_days = duration_days
+        self.replicas = replicas
+        self.max_workers = max_workers or os.cpu_count()
+        self.base_seed = base_seed
+
+    def replica_seeds(self, scenario_index: int = 0) -> List[int]:
+        """Independent seeds for the replicas of one scenario"""
+        sequence = np.random.SeedSequence([self.base_seed, scenario_index])
+        return [int(child.generate_state(1, dtype=np.uint64)[0]) for child in sequence.spawn(self.replicas)]
+
+    def iter_results(self, scenarios: Optional[List[Dict[str, Any]]] = None) -> Iterator[Dict[str, Any]]:
+        """Yield replica rows as they finish
+
+        Each row holds the scenario's parameter overrides, ``replica``,
+        ``seed`` and the flattened SimulationMetrics.
+        """
+        scenarios = scenarios or [{}]
+        jobs = [
+            (overrides, replica, seed)
+            for index, overrides in enumerate(scenarios)
+            for replica, seed in enumerate(self.replica_seeds(index))
+        ]
+
+        if self.max_workers <= 1:
+            for overrides, replica, seed in jobs:
+                yield {**overrides, 'replica': replica, 'seed': seed,
+                       **run_replica({**self.base_config, **overrides}, self.duration_days, seed)}
+            return
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(run_replica, {**self.base_config, **overrides}, self.duration_days, seed):
+                    (overrides, replica, seed)
+                for overrides, replica, seed in jobs
+            }
+            for future in as_completed(futures):
+                overrides, replica, seed = futures[future]
+                yield {**overrides, 'replica': replica, 'seed': seed, **future.result()}
+
+    def run(self, scenarios: Optional[List[Dict[str, Any]]] = None) -> ScenarioResult:
+        """Run all replicas and collect them into columns"""
+        rows = list(self.iter_results(scenarios))
+        parameters = sorted({key for overrides in (scenarios or [{}]) for key in overrides})
+        return ScenarioResult(self._to_columns(rows, parameters), parameters)
+
+    def sweep(self, grid: Dict[str, List[Any]]) -> ScenarioResult:
+        """Run every combination of the given config values
+
+        e.g. ``{'acceptance_rate': [0.1, 0.2], 'reviewer_pool_size': [50, 100]}``
+        """
+        names = sorted(grid)
+        scenarios = [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+        logger.info(f"Sweeping {len(scenarios)} scenarios x {self.replicas} replicas")
+        return self.run(scenarios)
+
+    @staticmethod
+    def _to_columns(rows: List[Dict[str, Any]], parameters: List[str]) -> Dict[str, np.ndarray]:
+        # Replicas finish out of order; restore a stable scenario/replica order
+        order = sorted(range(len(rows)), key=lambda i: (tuple(rows[i].get(p) for p in parameters), rows[i]['replica']))
+        names = list(dict.fromkeys(key for row in rows for key in row))
+        columns = {}
+        for name in names:
+            values = [rows[i].get(name, np.nan) for i in order]
+            if name == 'seed':
+                columns[name] = np.array(values, dtype=np.uint64)
+            elif name == 'replica':
+                columns[name] = np.array(values, dtype=np.int64)
+            else:
+                columns[name] = np.array(values)
+        return columns
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    runner = MonteCarloRunner({'simulation_speed': 1.0}, duration_days=365, replicas=20)
+    result = runner.sweep({'acceptance_rate': [0.1, 0.3], 'reviewer_pool_size': [20, 100]})
+
+    for scenario in result.summary():
+        accepted = scenario['accepted_manuscripts']
+        print(f"acceptance_rate={scenario['acceptance_rate']:.2f} reviewer_pool_size={scenario['reviewer_pool_size']:>3}: "
+              f"accepted {accepted['mean']:.1f} [{accepted['ci_low']:.1f}, {accepted['ci_high']:.1f}]")
+
+    print(f"\nSaved {result.save_numpy('simulation_scenarios.npz')}")
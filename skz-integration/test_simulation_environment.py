@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Simulation Environment Test Suite
+Tests for the discrete-event engine of the academic publishing simulator
+"""
+
+import sys
+import tempfile
+import unittest
+from collections import Counter
+from datetime import timedelta
+from pathlib import Path
+import logging
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+import numpy as np
+
+from simulation_environment import AcademicPublishingSimulator, Domain, ManuscriptStatus, ReviewStore
+from simulation_scenarios import MonteCarloRunner
+
+# Setup logging for tests
+logging.basicConfig(level=logging.WARNING)
+logging.getLogger('simulation_environment').setLevel(logging.WARNING)
+
+
+class TestDiscreteEventEngine(unittest.TestCase):
+    """Test cases for event ordering and time skipping"""
+
+    def setUp(self):
+        self.simulator = AcademicPublishingSimulator({'submissions_per_day': 0, 'random_seed': 7})
+
+    def test_events_run_in_time_order(self):
+        """Events queued out of order are processed by scheduled time"""
+        processed = []
+        self.simulator.process_event = lambda event: processed.append(event['label'])
+        start = self.simulator.current_time
+        for label, days in [('late', 5), ('early', 1), ('middle', 3)]:
+            self.simulator.schedule_event({'type': 'noop', 'label': label,
+                                           'scheduled_time': start + timedelta(days=days)})
+
+        self.simulator.run_simulation(duration_days=10)
+
+        self.assertEqual(processed, ['early', 'middle', 'late'])
+        self.assertEqual(self.simulator.current_time, start + timedelta(days=10))
+
+    def test_clock_jumps_to_next_event(self):
+        """A step moves the clock straight to the next scheduled event"""
+        processed = []
+        self.simulator.process_event = processed.append
+        target = self.simulator.current_time + timedelta(days=400)
+        self.simulator.schedule_event({'type': 'noop', 'scheduled_time': target})
+
+        self.assertTrue(self.simulator.run_simulation_step())
+        self.assertEqual(self.simulator.current_time, target)
+        self.assertFalse(self.simulator.run_simulation_step())
+
+    def test_events_after_the_window_stay_queued(self):
+        """Events beyond the simulated window are left for a later run"""
+        start = self.simulator.current_time
+        self.simulator.schedule_event({'type': 'start_review', 'manuscript_id': 'unknown',
+                                       'scheduled_time': start + timedelta(days=60)})
+
+        self.simulator.run_simulation(duration_days=30)
+
+        self.assertEqual(len(self.simulator.event_queue), 1)
+
+
+class TestArrivalsAndMetrics(unittest.TestCase):
+    """Test Poisson arrivals and incremental metrics"""
+
+    def test_poisson_arrival_rate(self):
+        """Submissions arrive at the configured daily rate"""
+        simulator = AcademicPublishingSimulator({'random_seed': 11, 'submissions_per_day': 5})
+        simulator.run_simulation(duration_days=365)
+
+        self.assertAlmostEqual(len(simulator.manuscripts) / 365, 5, delta=0.4)
+
+    def test_incremental_counters_match_a_rescan(self):
+        """Status counts and review averages agree with a full scan"""
+        simulator = AcademicPublishingSimulator({'random_seed': 3, 'submissions_per_day': 3})
+        simulator.run_simulation(duration_days=400)
+
+        scanned = Counter(m.status for m in simulator.manuscripts.values())
+        self.assertEqual(+simulator.status_counts, scanned)
+
+        completed = [r.review_time for r in simulator.reviews.values()
+                     if r.submitted_date <= simulator.current_time]
+        self.assertAlmostEqual(simulator.metrics.avg_review_time, sum(completed) / len(completed))
+        self.assertEqual(simulator.metrics.total_manuscripts, len(simulator.manuscripts))
+
+    def test_revision_requests_are_followed_up(self):
+        """Manuscripts sent back for revision get revised and re-reviewed"""
+        simulator = AcademicPublishingSimulator({'random_seed': 5, 'submissions_per_day': 3})
+        simulator.run_simulation(duration_days=365)
+
+        revised = [m for m in simulator.manuscripts.values() if len(m.review_rows) > 1]
+        self.assertTrue(revised)
+        self.assertGreater(simulator.status_counts[ManuscriptStatus.REJECTED], 0)
+
+    def test_custom_venues(self):
+        """Venues can be supplied through the config"""
+        venues = [{'name': f'Venue {i}', 'type': 'journal', 'domain': list(Domain)[i % 5],
+                   'impact_factor': 5.0, 'acceptance_rate': 0.3, 'review_time': 90, 'prestige': 0.8}
+                  for i in range(50)]
+        simulator = AcademicPublishingSimulator({'venues': venues})
+
+        self.assertEqual(len(simulator.venues), 50)
+
+
+    def test_review_store_grows_in_place(self):
+        """Reviews keep their rows as the preallocated columns double"""
+        simulator = AcademicPublishingSimulator({'submissions_per_day': 20, 'random_seed': 5})
+        simulator.reviews = ReviewStore(simulator.start_time, capacity=4)
+        simulator.run_simulation(duration_days=120)
+
+        reviews = simulator.reviews
+        self.assertGreater(len(reviews), 4)
+        self.assertGreaterEqual(reviews.capacity, len(reviews))
+        self.assertEqual(len(reviews.column('decision')), len(reviews))
+        for manuscript in simulator.manuscripts.values():
+            for review in reviews.materialize_rows(manuscript.review_rows):
+                self.assertEqual(review.manuscript_id, manuscript.id)
+                self.assertTrue(1.0 <= review.quality_score <= 10.0)
+
+    def test_reviews_due_in_a_step_are_drawn_together(self):
+        """Reviews due within one step share an event and one block of rows"""
+        simulator = AcademicPublishingSimulator({'submissions_per_day': 0, 'random_seed': 4})
+        start = simulator.current_time
+        due = {}
+        for days in [2.1, 2.5, 2.9, 3.2]:
+            manuscript = simulator.generate_manuscript(['author_1'], Domain.COMPUTER_SCIENCE)
+            manuscript.venue_id = 'venue_1'
+            due[manuscript.id] = start + timedelta(days=days)
+            simulator.schedule_event({'type': 'start_review', 'manuscript_id': manuscript.id,
+                                      'scheduled_time': due[manuscript.id]})
+
+        self.assertEqual([event['type'] for _, _, event in simulator.event_queue], ['review_step'] * 2)
+        simulator.run_simulation(duration_days=10)
+
+        blocks = [m.review_rows for m in simulator.manuscripts.values()]
+        self.assertTrue(all(len(rows) == 1 for rows in blocks))
+        self.assertEqual([rows[0][0] for rows in blocks[1:3]], [rows[0][1] for rows in blocks[:2]])
+        for manuscript in simulator.manuscripts.values():
+            history = manuscript.review_history
+            self.assertEqual(history, simulator.get_review_history(manuscript.id))
+            self.assertTrue(all(review['submitted_date'] >= due[manuscript.id] for review in history))
+
+class TestMonteCarloRunner(unittest.TestCase):
+    """Test seeded replicas, sweeps and aggregation"""
+
+    def test_seeded_simulations_are_reproducible(self):
+        """The same seed gives the same run; a different seed does not"""
+        def run(seed):
+            simulator = AcademicPublishingSimulator({'random_seed': seed})
+            simulator.run_simulation(duration_days=120)
+            return sorted(m.quality_score for m in simulator.manuscripts.values())
+
+        self.assertEqual(run(1), run(1))
+        self.assertNotEqual(run(1), run(2))
+
+    def test_parallel_matches_serial(self):
+        """Replicas give identical columns whether run in processes or inline"""
+        serial = MonteCarloRunner(duration_days=60, replicas=4, max_workers=1, base_seed=9).run()
+        parallel = MonteCarloRunner(duration_days=60, replicas=4, max_workers=2, base_seed=9).run()
+
+        self.assertEqual(len(serial), 4)
+        for name, values in serial.columns.items():
+            np.testing.assert_array_equal(values, parallel.columns[name])
+        self.assertEqual(len(set(serial.columns['seed'].tolist())), 4)
+
+    def test_sweep_summary(self):
+        """Sweeps produce one summary entry per parameter combination"""
+        runner = MonteCarloRunner(duration_days=90, replicas=3, max_workers=1)
+        result = runner.sweep({'acceptance_rate': [0.1, 0.5], 'reviewer_pool_size': [10]})
+        summary = result.summary()
+
+        self.assertEqual(len(result), 6)
+        self.assertEqual([(s['acceptance_rate'], s['reviewer_pool_size']) for s in summary], [(0.1, 10), (0.5, 10)])
+        total = summary[0]['total_manuscripts']
+        self.assertLessEqual(total['ci_low'], total['mean'])
+        self.assertGreaterEqual(total['ci_high'], total['mean'])
+
+    def test_save_numpy(self):
+        """Columns round-trip through an npz archive"""
+        result = MonteCarloRunner(duration_days=30, replicas=2, max_workers=1).run()
+        with tempfile.TemporaryDirectory() as directory:
+            path = result.save_numpy(f"{directory}/replicas.npz")
+            with np.load(path) as archive:
+                np.testing.assert_array_equal(archive['total_manuscripts'], result.columns['total_manuscripts'])
+
+
+if __name__ == '__main__':
+    unittest.main()